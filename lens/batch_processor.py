@@ -18,7 +18,6 @@ Usage:
 
 import argparse
 import subprocess
-import yaml
 import json
 import os
 import sys
@@ -32,13 +31,31 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent))
 
 from lib.fuzzy_match import load_matcher
+from lib.gpu_lane import gpu_slot
+from lib.metrics import StepMetrics, aggregate, append_metrics, format_metrics, load_metrics
+from lib.model_policy import transcription_plan
+from lib.postgres import libpq_env
+from lib.priority import PRIORITY_LEVELS, job_deadline, job_priority, job_ticker, schedule_key
+from lib.serialization import read_json, read_yaml, write_json, write_yaml
+from lib.speaker_store import align_speaker_labels, enroll_speakers, label_speakers
+from lib.tracing import TRACE_FILE, configure as configure_tracing, span
+from lib.transcript_store import read_summary, write_sidecar
 from extract_insights_structured import extract_earnings_insights_auto
 from scripts.download_source import download_video
 
+# Storage locations and database (overridable, e.g. by scripts/load_harness.py)
+JOBS_DIR = Path(os.getenv('JOBS_DIR', '/var/markethawk/jobs'))
+DOWNLOADS_DIR = Path(os.getenv('DOWNLOADS_DIR', '/var/markethawk/_downloads'))
+BATCH_RUNS_DIR = Path(os.getenv('BATCH_RUNS_DIR', '/var/markethawk/batch_runs'))
+DEFAULT_DATABASE_URL = 'postgresql://postgres@192.168.86.250:54322/postgres'  # password: PGPASSWORD or ~/.pgpass
+
 
 class BatchProcessor:
     """Process batch of YouTube videos through pipeline"""
 
+    # Transcription script run per job (python <script> <input> --output-dir <dir>)
+    transcribe_script = Path(__file__).parent / 'transcribe_whisperx.py'
+
     def __init__(self, batch_yaml: Path):
         """
         Initialize batch processor
@@ -50,12 +67,14 @@ class BatchProcessor:
         self.batch_dir = batch_yaml.parent
         self.log_file = self.batch_dir / 'batch.log'
 
+        # One trace per job (steps, subprocesses, API calls) → batch_dir/trace.jsonl
+        self.start_tracing()
+
         # Load environment variables
         load_dotenv()
 
         # Load batch config
-        with open(batch_yaml, 'r') as f:
-            self.batch_config = yaml.safe_load(f)
+        self.batch_config = read_yaml(batch_yaml)
 
         # Get batch_name, batch_code, and pipeline type
         self.batch_name = self.batch_config.get('batch_name', 'unknown')
@@ -63,7 +82,7 @@ class BatchProcessor:
         self.pipeline_type = self.batch_config.get('pipeline_type', 'audio-only')
 
         # Job storage directory (unified with single-job pipeline)
-        self.jobs_dir = Path('/var/markethawk/jobs')
+        self.jobs_dir = JOBS_DIR
         self.jobs_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
 
         # Load company matcher
@@ -76,6 +95,15 @@ class BatchProcessor:
         self.log(f"Pipeline type: {self.pipeline_type}")
         self.log(f"Jobs: {len(self.batch_config['jobs'])}")
 
+    def start_tracing(self):
+        """
+        Record spans to this batch's trace.jsonl
+
+        Tracing is process-wide; a process that runs jobs of several batches
+        (queue worker) calls this before each job.
+        """
+        configure_tracing(self.batch_dir / TRACE_FILE, service_name='lens.batch')
+
     def log(self, message: str, level: str = 'INFO'):
         """
         Write log message to batch.log and stdout
@@ -94,8 +122,7 @@ class BatchProcessor:
 
     def save_batch_config(self):
         """Save updated batch config to YAML"""
-        with open(self.batch_yaml, 'w') as f:
-            yaml.dump(self.batch_config, f, default_flow_style=False, sort_keys=False)
+        write_yaml(self.batch_yaml, self.batch_config)
 
     def create_job_yaml(self, job: Dict, job_dir: Path):
         """
@@ -129,8 +156,13 @@ class BatchProcessor:
                 'extract_audio': job['steps'].get('extract_audio', 'pending'),
                 'upload_r2': job['steps'].get('upload_r2', 'pending'),
                 'update_db': job['steps'].get('update_db', 'pending'),
+                **({'upgrade_transcript': job['steps']['upgrade_transcript']}
+                   if 'upgrade_transcript' in job['steps'] else {}),
             },
 
+            # Transcription model choice (lib/model_policy.py)
+            'transcription': job.get('transcription', {}),
+
             # R2 output
             'r2': job.get('r2_upload', {}),
 
@@ -142,8 +174,7 @@ class BatchProcessor:
         }
 
         job_yaml_path = job_dir / 'job.yaml'
-        with open(job_yaml_path, 'w') as f:
-            yaml.dump(job_yaml, f, default_flow_style=False, sort_keys=False)
+        write_yaml(job_yaml_path, job_yaml)
 
     def update_job_yaml(self, job: Dict, job_dir: Path):
         """Update job.yaml with latest state"""
@@ -175,6 +206,49 @@ class BatchProcessor:
 
         self.save_batch_config()
 
+    def run_step(self, job: Dict, job_dir: Path, step: str, step_fn, *args) -> bool:
+        """
+        Run a step method with metrics (appended to the job's metrics.jsonl)
+        and a trace span
+
+        Args:
+            job: Job dictionary
+            job_dir: Job directory path
+            step: Step name
+            step_fn: Step method (returns True on success)
+            *args: Arguments for step_fn
+
+        Returns:
+            step_fn's result
+        """
+        metrics = StepMetrics(step, job_id=job['job_id'], batch=self.batch_name)
+        success = False
+        try:
+            with span(f"step {step}", job_id=job['job_id']) as step_span, metrics:
+                success = step_fn(*args)
+                if not success and job.get('steps', {}).get(step) != 'skipped':
+                    step_span.fail(job.get('errors', {}).get(step) or f"{step} failed")
+        finally:
+            if metrics.result:
+                if not success:
+                    skipped = job.get('steps', {}).get(step) == 'skipped'
+                    metrics.result['status'] = 'skipped' if skipped else 'failed'
+                append_metrics(job_dir, metrics.result)
+                self.log(f"[{job['job_id']}]   {step}: {format_metrics(metrics.result)}")
+        return success
+
+    def update_batch_metrics(self):
+        """Aggregate job metrics into batch.yaml (totals) and metrics.json (per step)"""
+        records = []
+        for job in self.batch_config['jobs']:
+            records.extend(load_metrics(self.jobs_dir / job['job_id']))
+        if not records:
+            return
+
+        summary = aggregate(records)
+        write_json(self.batch_dir / 'metrics.json', summary)
+        self.batch_config['metrics'] = summary['total']
+
     def update_batch_stats(self):
         """Recalculate batch statistics"""
         stats = {
@@ -192,6 +266,7 @@ class BatchProcessor:
                 stats[status] += 1
 
         self.batch_config['stats'] = stats
+        self.update_batch_metrics()
         self.save_batch_config()
 
     def run_command(self, cmd: List[str], cwd: Optional[Path] = None) -> tuple[int, str, str]:
@@ -238,7 +313,7 @@ class BatchProcessor:
         dest_metadata_path = source_dir / 'metadata.json'
 
         # Cache directory for downloaded videos (to avoid re-downloading from Rapid API)
-        cache_dir = Path('/var/markethawk/_downloads') / youtube_id
+        cache_dir = DOWNLOADS_DIR / youtube_id
         cache_video_path = cache_dir / 'source.mp4'
         cache_metadata_path = cache_dir / 'metadata.json'
 
@@ -254,14 +329,13 @@ class BatchProcessor:
                 shutil.copy2(str(cache_metadata_path), str(dest_metadata_path))
 
                 # Load metadata from cache
-                with open(cache_metadata_path, 'r') as f:
-                    metadata = json.load(f)
-                    job['youtube_metadata'] = {
-                        'title': metadata.get('title', ''),
-                        'description': metadata.get('description', ''),
-                        'channel': metadata.get('channel', {}),
-                        'duration': metadata.get('lengthSeconds', 0)
-                    }
+                metadata = read_json(cache_metadata_path)
+                job['youtube_metadata'] = {
+                    'title': metadata.get('title', ''),
+                    'description': metadata.get('description', ''),
+                    'channel': metadata.get('channel', {}),
+                    'duration': metadata.get('lengthSeconds', 0)
+                }
 
                 self.update_job_status(job, 'download', 'completed')
                 self.log(f"[{job['job_id']}] ✓ Copied from cache: {dest_video_path}")
@@ -269,8 +343,7 @@ class BatchProcessor:
 
             # Not cached - download from YouTube
             self.log(f"[{job['job_id']}] Video not cached, downloading from YouTube...")
-            temp_downloads_dir = '/var/markethawk/_downloads'
-            result = download_video(youtube_url, temp_downloads_dir)
+            result = download_video(youtube_url, str(DOWNLOADS_DIR))
 
             # Copy from temp location to job directory (keep cache for future use)
             temp_video_path = Path(result['file_path'])
@@ -308,6 +381,24 @@ class BatchProcessor:
         Returns:
             True if successful, False otherwise
         """
+        input_file, transcripts_dir, plan = self.start_transcription(job, job_dir)
+        cmd = self.transcribe_command([(input_file, transcripts_dir, job_ticker(job))],
+                                      plan['model'], plan['compute_type'])
+
+        # Wait for a GPU slot in priority order (no-op unless GPU_LANE_SLOTS is set)
+        with gpu_slot(job['job_id'], priority=job_priority(job), deadline=job_deadline(job)):
+            returncode, stdout, stderr = self.run_command(cmd)
+
+        return self.finish_transcription(job, transcripts_dir, returncode, stderr)
+
+    def start_transcription(self, job: Dict, job_dir: Path):
+        """
+        Mark a job's transcription started and pick its model
+
+        Returns:
+            (input file, transcripts directory, plan) - the plan is stored
+            on the job as `transcription`
+        """
         self.log(f"[{job['job_id']}] Step 2: Transcribe")
         self.update_job_status(job, 'transcribe', 'processing')
 
@@ -316,17 +407,32 @@ class BatchProcessor:
         transcripts_dir = job_dir / 'transcripts'
         transcripts_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
 
-        script_path = Path(__file__).parent / 'transcribe_whisperx.py'
-
-        cmd = [
-            'python', str(script_path),
-            str(input_file),
-            '--output-dir', str(transcripts_dir)
-        ]
+        # Model size per job from audio, device and queue (draft model for fresh calls
+        # when draft-then-upgrade is on; upgrade_transcript replaces it later)
+        plan = transcription_plan(job, input_file, pending=self.pending_transcriptions(job))
+        job['transcription'] = plan
+        job['steps']['upgrade_transcript'] = 'pending' if plan['draft'] else 'skipped'
+        self.log(f"[{job['job_id']}] Model: {plan['model']} {plan['compute_type']} ({plan['reason']})")
+        return input_file, transcripts_dir, plan
 
-        returncode, stdout, stderr = self.run_command(cmd)
+    def transcribe_command(self, files: List, model: str, compute_type: str) -> List[str]:
+        """
+        transcribe_whisperx.py command for one or several files (one model load)
 
-        # Check if transcript.json was created
+        Args:
+            files: (input file, output directory, ticker or None) per file
+            model: Whisper model size
+            compute_type: CTranslate2 compute type
+        """
+        cmd = ['python', str(self.transcribe_script)] + [str(input_file) for input_file, _, _ in files]
+        cmd += ['--output-dir'] + [str(output_dir) for _, output_dir, _ in files]
+        cmd += ['--model', model, '--compute-type', compute_type]
+        if any(ticker for _, _, ticker in files):
+            cmd += ['--ticker'] + [ticker or '-' for _, _, ticker in files]
+        return cmd
+
+    def finish_transcription(self, job: Dict, transcripts_dir: Path, returncode: int, stderr: str) -> bool:
+        """Record a transcription's outcome from its transcript.json and exit code"""
         transcript_file = transcripts_dir / 'transcript.json'
         if returncode == 0 and transcript_file.exists() and transcript_file.is_file():
             self.update_job_status(job, 'transcribe', 'completed')
@@ -338,6 +444,90 @@ class BatchProcessor:
             self.log(f"[{job['job_id']}] ✗ Transcription failed: {error}", 'ERROR')
             return False
 
+    def pending_transcriptions(self, job: Dict) -> int:
+        """
+        Transcriptions competing for the GPU besides GPU lane tickets (queue pressure)
+
+        A batch runs its jobs one after another, so its own backlog never
+        waits on the GPU alongside this job; other processes show up as
+        lane tickets (model_policy.waiting_transcriptions).
+        """
+        return 0
+
+    def step_upgrade_transcript(self, job: Dict, job_dir: Path) -> bool:
+        """
+        Re-transcribe a draft transcript with the upgrade model and replace it
+
+        The new transcript is written next to the draft and swapped in, so
+        readers never see a partial file. Its speakers are renamed to the
+        draft's labels (time overlap) so insights and speaker mappings stay
+        valid; artifacts already uploaded are uploaded again.
+
+        Args:
+            job: Job dictionary
+            job_dir: Job directory path
+
+        Returns:
+            True if successful (or nothing to upgrade), False otherwise
+        """
+        plan = job.get('transcription', {})
+        if not plan.get('draft'):
+            self.update_job_status(job, 'upgrade_transcript', 'skipped')
+            return True
+
+        self.log(f"[{job['job_id']}] Upgrade transcript: {plan['model']} → {plan['upgrade_model']}")
+        job['steps']['upgrade_transcript'] = 'processing'
+
+        input_file = job_dir / 'source' / 'source.mp4'
+        transcripts_dir = job_dir / 'transcripts'
+        upgrade_dir = job_dir / 'transcripts.upgrade'
+        shutil.rmtree(upgrade_dir, ignore_errors=True)
+
+        cmd = self.transcribe_command([(input_file, upgrade_dir, job_ticker(job))],
+                                      plan['upgrade_model'], plan['upgrade_compute_type'])
+
+        # Background work: waits behind every normal transcription in the GPU lane
+        with gpu_slot(job['job_id'], priority=PRIORITY_LEVELS['backfill']):
+            returncode, stdout, stderr = self.run_command(cmd)
+
+        upgraded = upgrade_dir / 'transcript.json'
+        if returncode != 0 or not upgraded.exists():
+            # The draft stays in place, so a published job is not failed over this
+            error = stderr or 'Upgrade transcription failed'
+            job['steps']['upgrade_transcript'] = 'failed'
+            job.setdefault('errors', {})['upgrade_transcript'] = error
+            self.save_batch_config()
+            self.log(f"[{job['job_id']}] ✗ Transcript upgrade failed (draft kept): {error}", 'ERROR')
+            return False
+
+        # New diarization, same audio: keep the draft's speaker labels, which
+        # insights, the DB row and uploaded speaker mappings refer to
+        if (transcripts_dir / 'transcript.json').exists():
+            relabeled = align_speaker_labels(upgraded, transcripts_dir / 'transcript.json')
+            if relabeled:
+                changes = ', '.join(f"{old}→{new}" for old, new in sorted(relabeled.items()) if old != new)
+                self.log(f"[{job['job_id']}]   Speaker labels aligned to draft: {changes}")
+
+        for name in ('transcript.paragraphs.json', 'transcript.speakers.npz', 'transcript.json'):
+            if (upgrade_dir / name).exists():
+                os.replace(upgrade_dir / name, transcripts_dir / name)
+        write_sidecar(transcripts_dir / 'transcript.json')
+        shutil.rmtree(upgrade_dir, ignore_errors=True)
+
+        job['transcription'].update({
+            'draft': False,
+            'draft_model': plan['model'],
+            'model': plan['upgrade_model'],
+            'compute_type': plan['upgrade_compute_type'],
+            'upgraded_at': datetime.now().isoformat(),
+        })
+        self.update_job_status(job, 'upgrade_transcript', 'completed')
+        self.log(f"[{job['job_id']}] ✓ Transcript upgraded to {plan['upgrade_model']}")
+
+        if job.get('artifacts_upload', {}).get('transcript'):
+            self.step_upload_artifacts(job, job_dir)
+        return True
+
     def step_insights(self, job: Dict, job_dir: Path) -> bool:
         """
         Step 3: Extract insights with GPT-4 auto-detection
@@ -357,11 +547,18 @@ class BatchProcessor:
         raw_output_file = job_dir / 'insights.raw.json'
 
         try:
+            # Speakers the company voice store recognizes don't need LLM identification
+            known_speakers = label_speakers(transcript_file, job_ticker(job))
+            if known_speakers:
+                names = ', '.join(f"{label}={info['name']}" for label, info in sorted(known_speakers.items()))
+                self.log(f"[{job['job_id']}]   Voice-matched speakers: {names}")
+
             # Extract insights with auto-detection
             insights = extract_earnings_insights_auto(
                 transcript_file=transcript_file,
                 youtube_metadata=job.get('youtube_metadata'),
-                output_file=raw_output_file
+                output_file=raw_output_file,
+                known_speakers=known_speakers
             )
 
             # Store insights in job config
@@ -372,6 +569,7 @@ class BatchProcessor:
                 'quarter': insights.quarter,
                 'year': insights.year,
                 'speakers': len(insights.speakers),
+                'voice_matched_speakers': len(known_speakers),
                 'metrics': len(insights.financial_metrics),
                 'highlights': len(insights.highlights)
             }
@@ -450,6 +648,7 @@ class BatchProcessor:
 
                 self.update_job_status(job, 'fuzzy_match', 'completed')
                 self.log(f"[{job['job_id']}] ✓ Matched: {match.name} ({match.symbol}) [score: {match.score:.1f}%, type: {match.match_type}]")
+                self.enroll_job_speakers(job, self.jobs_dir / job['job_id'])
                 return True
             else:
                 error = f"No match found for: {company_name}"
@@ -463,6 +662,21 @@ class BatchProcessor:
             self.log(f"[{job['job_id']}] ✗ Fuzzy match failed: {error}", 'ERROR')
             return False
 
+    def enroll_job_speakers(self, job: Dict, job_dir: Path):
+        """Add the named speakers' voices to the matched company's voice store"""
+        raw_output_file = job_dir / 'insights.raw.json'
+        if not raw_output_file.exists():
+            return
+        speakers = read_json(raw_output_file).get('insights', {}).get('speakers', [])
+        try:
+            added = enroll_speakers(job_dir / 'transcripts' / 'transcript.json', job['company_match']['symbol'],
+                                    speakers, job_id=job['job_id'])
+        except OSError as e:
+            self.log(f"[{job['job_id']}] ⚠️  Speaker enrollment failed: {e}", 'WARNING')
+            return
+        if added:
+            self.log(f"[{job['job_id']}]   Enrolled {added} speaker voice(s) for {job['company_match']['symbol']}")
+
     def step_extract_audio(self, job: Dict, job_dir: Path) -> bool:
         """
         Step 6: Extract audio as MP3 using ffmpeg
@@ -608,10 +822,9 @@ class BatchProcessor:
 
                 # Get file metadata
                 file_size = transcript_file.stat().st_size
-                with open(transcript_file, 'r') as f:
-                    transcript_data = json.load(f)
-                    word_count = len(transcript_data.get('segments', []))
-                    speakers = len(set(seg.get('speaker', 'unknown') for seg in transcript_data.get('segments', [])))
+                summary = read_summary(transcript_file)
+                word_count = summary['segment_count']
+                speakers = summary['speaker_count']
 
                 artifacts['transcript'] = {
                     'r2_url': transcript_url,
@@ -644,12 +857,11 @@ class BatchProcessor:
 
                 # Get file metadata
                 file_size = insights_file.stat().st_size
-                with open(insights_file, 'r') as f:
-                    insights_data = json.load(f)
-                    # Extract from nested 'insights' object
-                    insights_obj = insights_data.get('insights', insights_data)
-                    metrics_count = len(insights_obj.get('financial_metrics', []))
-                    highlights_count = len(insights_obj.get('highlights', []))
+                insights_data = read_json(insights_file)
+                # Extract from nested 'insights' object
+                insights_obj = insights_data.get('insights', insights_data)
+                metrics_count = len(insights_obj.get('financial_metrics', []))
+                highlights_count = len(insights_obj.get('highlights', []))
 
                 artifacts['insights'] = {
                     'r2_url': insights_url,
@@ -738,19 +950,15 @@ COMMIT;
         with open(sql_file, 'w') as f:
             f.write(sql)
 
-        # Execute with psql
+        # Execute with psql (DATABASE_URL, as the update_database step uses)
         cmd = [
             'psql',
-            '-h', '192.168.86.250',
-            '-p', '54322',
-            '-U', 'postgres',
-            '-d', 'postgres',
             '-f', str(sql_file)
         ]
 
-        # Set PGPASSWORD env var for authentication
+        # Connection (and password) via libpq variables, never on the command line
         env = os.environ.copy()
-        env['PGPASSWORD'] = os.getenv('PGPASSWORD', 'postgres')
+        env.update(libpq_env(os.getenv('DATABASE_URL', DEFAULT_DATABASE_URL)))
 
         # Pass env to subprocess
         result = subprocess.run(
@@ -768,8 +976,8 @@ COMMIT;
             self.log(f"[{job['job_id']}] psql stderr: {stderr}")
 
         # Keep SQL file in job directory for debugging (don't delete)
-        job_sql_file = Path(f"/var/markethawk/jobs/{job['job_id']}/db_insert.sql")
-        sql_file.rename(job_sql_file)
+        job_sql_file = self.jobs_dir / job['job_id'] / 'db_insert.sql'
+        shutil.move(str(sql_file), str(job_sql_file))
         self.log(f"[{job['job_id']}] SQL saved to: {job_sql_file}")
 
         if returncode == 0:
@@ -803,7 +1011,7 @@ COMMIT;
             artifacts: Artifacts JSON
         """
         # Export directory: /var/markethawk/batch_runs/{batch_name}/exports/
-        export_dir = Path('/var/markethawk/batch_runs') / self.batch_name / 'exports'
+        export_dir = BATCH_RUNS_DIR / self.batch_name / 'exports'
         export_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
 
         # JSONL file (one per batch, append mode)
@@ -830,23 +1038,18 @@ COMMIT;
 
         self.log(f"[{job['job_id']}] ✓ Exported to JSONL: {jsonl_file}")
 
-    def process_job(self, job: Dict) -> bool:
+    def prepare_job(self, job: Dict) -> Path:
         """
-        Process single job through all pipeline steps
+        Initialize job steps, job directory and job.yaml (resuming from an
+        existing job.yaml)
 
         Args:
             job: Job dictionary
 
         Returns:
-            True if all steps completed successfully
+            Job directory path
         """
         job_id = job['job_id']
-        self.log(f"\n{'='*60}")
-        self.log(f"Processing Job: {job_id}")
-        self.log(f"YouTube ID: {job['youtube_id']}")
-        self.log(f"{'='*60}\n")
-
-        job['status'] = 'processing'
 
         # Initialize processing steps if not present (lazy creation)
         if 'steps' not in job:
@@ -875,69 +1078,89 @@ COMMIT;
         else:
             self.log(f"[{job_id}] Loading existing job.yaml")
             # Load existing job.yaml and merge with batch config
-            with open(job_yaml_path, 'r') as f:
-                existing_job = yaml.safe_load(f)
-                # Preserve processing state from existing job.yaml
-                if 'processing' in existing_job:
-                    for step, status in existing_job['processing'].items():
-                        job['steps'][step] = status
+            existing_job = read_yaml(job_yaml_path)
+            # Preserve processing state from existing job.yaml
+            if 'processing' in existing_job:
+                for step, status in existing_job['processing'].items():
+                    job['steps'][step] = status
+
+        return job_dir
+
+    def process_job(self, job: Dict) -> bool:
+        """
+        Process single job through all pipeline steps
+
+        Args:
+            job: Job dictionary
+
+        Returns:
+            True if all steps completed successfully
+        """
+        job_id = job['job_id']
+        self.log(f"\n{'='*60}")
+        self.log(f"Processing Job: {job_id}")
+        self.log(f"YouTube ID: {job['youtube_id']}")
+        self.log(f"{'='*60}\n")
+
+        job['status'] = 'processing'
+        job_dir = self.prepare_job(job)
 
         # Step 1: Download
         if job['steps']['download'] != 'completed':
-            if not self.step_download(job, job_dir):
+            if not self.run_step(job, job_dir, 'download', self.step_download, job, job_dir):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 2: Transcribe
         if job['steps']['transcribe'] != 'completed':
-            if not self.step_transcribe(job, job_dir):
+            if not self.run_step(job, job_dir, 'transcribe', self.step_transcribe, job, job_dir):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 3: Insights
         if job['steps']['insights'] != 'completed':
-            if not self.step_insights(job, job_dir):
+            if not self.run_step(job, job_dir, 'insights', self.step_insights, job, job_dir):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 4: Validate
         if job['steps']['validate'] != 'completed':
-            if not self.step_validate(job):
+            if not self.run_step(job, job_dir, 'validate', self.step_validate, job):
                 self.update_job_yaml(job, job_dir)
                 return True  # Skipped jobs are considered successful
             self.update_job_yaml(job, job_dir)
 
         # Step 5: Fuzzy Match
         if job['steps']['fuzzy_match'] != 'completed':
-            if not self.step_fuzzy_match(job):
+            if not self.run_step(job, job_dir, 'fuzzy_match', self.step_fuzzy_match, job):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 6: Extract Audio
         if job['steps']['extract_audio'] != 'completed':
-            if not self.step_extract_audio(job, job_dir):
+            if not self.run_step(job, job_dir, 'extract_audio', self.step_extract_audio, job, job_dir):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 7: Upload R2 (audio)
         if job['steps']['upload_r2'] != 'completed':
-            if not self.step_upload_r2(job, job_dir):
+            if not self.run_step(job, job_dir, 'upload_r2', self.step_upload_r2, job, job_dir):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
 
         # Step 7.5: Upload Artifacts (transcript, insights)
-        self.step_upload_artifacts(job, job_dir)
+        self.run_step(job, job_dir, 'upload_artifacts', self.step_upload_artifacts, job, job_dir)
         self.update_job_yaml(job, job_dir)
 
         # Step 8: Update DB
         if job['steps']['update_db'] != 'completed':
-            if not self.step_update_db(job):
+            if not self.run_step(job, job_dir, 'update_db', self.step_update_db, job):
                 self.update_job_yaml(job, job_dir)
                 return False
             self.update_job_yaml(job, job_dir)
@@ -954,6 +1177,25 @@ COMMIT;
 
         return True
 
+    def upgrade_drafts(self):
+        """Run upgrade_transcript for jobs transcribed with a draft model"""
+        for job in self.scheduled_jobs():
+            if job.get('steps', {}).get('upgrade_transcript') != 'pending':
+                continue
+            if job.get('status') != 'completed':
+                continue
+            job_dir = self.jobs_dir / job['job_id']
+            self.run_step(job, job_dir, 'upgrade_transcript', self.step_upgrade_transcript, job, job_dir)
+            self.update_job_yaml(job, job_dir)
+            self.save_batch_config()
+
+    def scheduled_jobs(self) -> List[Dict]:
+        """Jobs in run order: priority and deadline (lib.priority), then batch.yaml order"""
+        jobs = self.batch_config['jobs']
+        order = sorted(range(len(jobs)),
+                       key=lambda i: schedule_key(job_priority(jobs[i]), job_deadline(jobs[i]), i))
+        return [jobs[i] for i in order]
+
     def process_batch(self):
         """Process all jobs in batch"""
         self.log(f"\n{'#'*60}")
@@ -966,15 +1208,16 @@ COMMIT;
         self.batch_config['started_at'] = datetime.now().isoformat()
         self.save_batch_config()
 
-        # Process each job
-        for job in self.batch_config['jobs']:
+        # Process each job (hot and near-deadline jobs first)
+        for job in self.scheduled_jobs():
             # Skip already completed or failed jobs
             if job.get('status') in ['completed', 'skipped']:
                 self.log(f"Skipping {job['job_id']} (already {job['status']})")
                 continue
 
             try:
-                self.process_job(job)
+                with span(f"job {job['job_id']}", job_id=job['job_id'], batch=self.batch_name):
+                    self.process_job(job)
             except KeyboardInterrupt:
                 self.log("Interrupted by user", 'WARNING')
                 job['status'] = 'pending'
@@ -988,6 +1231,9 @@ COMMIT;
             # Update batch stats after each job
             self.update_batch_stats()
 
+        # Draft transcripts of published jobs are upgraded once the batch is through
+        self.upgrade_drafts()
+
         # Batch complete
         self.batch_config['status'] = 'completed'
         self.batch_config['completed_at'] = datetime.now().isoformat()
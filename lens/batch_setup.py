@@ -7,18 +7,24 @@ for processing multiple YouTube videos.
 
 Usage:
     python lens/batch_setup.py video_ids.txt nov-13-2025-audio-only --batch-size 100
+
+Input lines are a video ID, optionally followed by a ticker and publish
+date (`VIDEO_ID[,TICKER[,PUBLISHED_AT]]`); these feed job priority (market
+cap, freshness - see lib/priority.py) before the company is detected.
 """
 
 import argparse
 import uuid
-import yaml
 import time
 import random
 import string
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 from datetime import datetime
 
+from lib.priority import parse_priority, parse_time
+from lib.serialization import write_yaml
+
 
 def generate_batch_code() -> str:
     """
@@ -75,7 +81,10 @@ def create_batch_structure(
     batch_name: str,
     batch_size: int,
     base_path: Path,
-    pipeline_type: str = "audio-only"
+    pipeline_type: str = "audio-only",
+    video_info: Optional[Dict[str, Dict]] = None,
+    priority: Optional[str] = None,
+    deadline: Optional[str] = None
 ) -> Path:
     """
     Create batch directory structure and configuration files
@@ -86,6 +95,9 @@ def create_batch_structure(
         batch_size: Number of videos per batch
         base_path: Base path for batch runs (/var/markethawk/batch_runs)
         pipeline_type: Type of processing pipeline (e.g., "audio-only", "video-full", "thumbnails", "shorts")
+        video_info: Optional per-video fields (ticker, published_at) from the input file
+        priority: Optional priority for every job (number or hot/high/normal/low/backfill)
+        deadline: Optional deadline for every job (ISO timestamp)
 
     Returns:
         Path to pipeline directory
@@ -130,11 +142,20 @@ def create_batch_structure(
             job_id = generate_job_id(youtube_id)
 
             # Just store reference - job.yaml will be created on-demand during processing
-            jobs.append({
+            job = {
                 'job_id': job_id,
                 'youtube_id': youtube_id,
                 'status': 'pending'
-            })
+            }
+
+            # Scheduling hints (lib/priority.py)
+            job.update((video_info or {}).get(youtube_id, {}))
+            if priority is not None:
+                job['priority'] = priority
+            if deadline is not None:
+                job['deadline'] = deadline
+
+            jobs.append(job)
 
         # Create lightweight batch.yaml (no processing steps tracked here)
         batch_config = {
@@ -156,8 +177,7 @@ def create_batch_structure(
         }
 
         batch_yaml_path = batch_dir / 'batch.yaml'
-        with open(batch_yaml_path, 'w') as f:
-            yaml.dump(batch_config, f, default_flow_style=False, sort_keys=False)
+        write_yaml(batch_yaml_path, batch_config)
 
         # Create batch.log file
         batch_log_path = batch_dir / 'batch.log'
@@ -203,8 +223,7 @@ def create_batch_structure(
     }
 
     pipeline_yaml_path = pipeline_dir / 'pipeline.yaml'
-    with open(pipeline_yaml_path, 'w') as f:
-        yaml.dump(pipeline_config, f, default_flow_style=False, sort_keys=False)
+    write_yaml(pipeline_yaml_path, pipeline_config)
 
     print(f"\n✅ Batch structure created successfully!")
     print(f"   Pipeline config: {pipeline_yaml_path}")
@@ -218,18 +237,46 @@ def create_batch_structure(
     return pipeline_dir
 
 
+def read_video_info(input_file: Path) -> Dict[str, Dict]:
+    """
+    Read optional per-video fields from the input file
+
+    Args:
+        input_file: Path to text file with VIDEO_ID[,TICKER[,PUBLISHED_AT]] lines
+
+    Returns:
+        {video_id: {'ticker': ..., 'published_at': ...}} for lines with extra fields
+    """
+    info = {}
+    with open(input_file, 'r') as f:
+        for line in f:
+            fields = [field.strip() for field in line.split(',')]
+            if len(fields) < 2 or not fields[0]:
+                continue
+            extra = {}
+            if fields[1]:
+                extra['ticker'] = fields[1].upper()
+            if len(fields) > 2 and fields[2]:
+                parse_time(fields[2])  # validate
+                extra['published_at'] = fields[2]
+            if extra:
+                info[fields[0]] = extra
+    return info
+
+
 def read_video_ids(input_file: Path) -> List[str]:
     """
     Read YouTube video IDs from text file
 
     Args:
         input_file: Path to text file with one video ID per line
+                    (optionally followed by ,TICKER[,PUBLISHED_AT])
 
     Returns:
         List of video IDs (stripped of whitespace, empty lines removed)
     """
     with open(input_file, 'r') as f:
-        video_ids = [line.strip() for line in f if line.strip()]
+        video_ids = [line.split(',')[0].strip() for line in f if line.split(',')[0].strip()]
 
     # Remove duplicates while preserving order
     seen = set()
@@ -261,6 +308,9 @@ Examples:
   # Create single video batch for testing
   python lens/batch_setup.py test_video.txt nov-13-2025-test --batch-size 1
 
+  # Fresh calls that must publish tonight (ahead of any backfill)
+  python lens/batch_setup.py fresh_calls.txt nov-14-2025-fresh --priority hot --deadline 2025-11-14T18:00
+
   # Custom base path with pipeline type
   python lens/batch_setup.py video_ids.txt dec-2025-production \\
     --pipeline-type shorts \\
@@ -295,6 +345,15 @@ Examples:
         default=Path('/var/markethawk/batch_runs'),
         help='Base path for batch runs (default: /var/markethawk/batch_runs)'
     )
+    parser.add_argument(
+        '--priority',
+        help='Priority for every job: number or hot/high/normal/low/backfill '
+             '(default: from market cap and publish date)'
+    )
+    parser.add_argument(
+        '--deadline',
+        help='Deadline for every job (ISO timestamp, e.g. 2025-11-14T18:00)'
+    )
 
     args = parser.parse_args()
 
@@ -313,6 +372,15 @@ Examples:
 
     print(f"✓ Found {len(video_ids)} unique video IDs")
 
+    # Scheduling hints
+    try:
+        video_info = read_video_info(args.input_file)
+        parse_priority(args.priority)
+        parse_time(args.deadline)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+
     # Validate batch size
     if args.batch_size < 1:
         print("❌ Error: Batch size must be at least 1")
@@ -324,7 +392,10 @@ Examples:
         batch_name=args.batch_name,
         batch_size=args.batch_size,
         base_path=args.base_path,
-        pipeline_type=args.pipeline_type
+        pipeline_type=args.pipeline_type,
+        video_info=video_info,
+        priority=args.priority,
+        deadline=args.deadline
     )
 
     return 0
@@ -0,0 +1,7 @@
+"""
+Benchmark suite for the pipeline's CPU-side hot paths
+
+Cases live in cases.py (synthetic 30/60/120 minute calls from fixtures.py,
+real companies_master.csv), timing and baselines in runner.py. Run with
+scripts/run_benchmarks.py; baselines are stored in benchmarks/baselines/.
+"""
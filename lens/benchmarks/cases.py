@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Benchmark cases for the CPU-side hot paths
+
+Each case is registered with @case and is a setup function: it receives the
+case parameter (call length in minutes, or None), builds inputs outside the
+timed region, and returns the zero-argument callable that is timed.
+
+Cases whose module cannot be imported here (e.g. whisperx or openai not
+installed) raise ImportError from setup and are reported as skipped.
+"""
+
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .fixtures import (
+    CALL_MINUTES,
+    COMPANIES_CSV,
+    COMPANY_QUERIES,
+    make_highlights,
+    make_job,
+    make_transcript,
+)
+
+
+@dataclass
+class Case:
+    """A registered benchmark"""
+    name: str
+    setup: Callable[[Optional[int]], Callable[[], object]]
+    params: Sequence[Optional[int]]
+
+    def ids(self) -> List[str]:
+        """Benchmark IDs, e.g. 'format_transcript_for_analysis[60m]'"""
+        return [self.id_for(p) for p in self.params]
+
+    def id_for(self, param: Optional[int]) -> str:
+        return self.name if param is None else f"{self.name}[{param}m]"
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, params: Sequence[Optional[int]] = (None,)):
+    """Register a benchmark setup function"""
+    def register(setup):
+        CASES[name] = Case(name, setup, tuple(params))
+        return setup
+    return register
+
+
+# =============================================================================
+# Transcript formatting
+# =============================================================================
+
+@case('create_paragraph_format', CALL_MINUTES)
+def bench_create_paragraph_format(minutes):
+    from transcribe_whisperx import create_paragraph_format
+    transcript = make_transcript(minutes)
+    return lambda: create_paragraph_format(transcript)
+
+
+@case('format_transcript_for_analysis', CALL_MINUTES)
+def bench_format_transcript_for_analysis(minutes):
+    from extract_insights_structured import format_transcript_for_analysis
+    transcript = make_transcript(minutes)
+    return lambda: format_transcript_for_analysis(transcript)
+
+
+@case('transcript_index_build', CALL_MINUTES)
+def bench_transcript_index_build(minutes):
+    from lib.transcript_index import TranscriptIndex
+    transcript = make_transcript(minutes)
+    return lambda: TranscriptIndex(transcript).normalized_words
+
+
+# =============================================================================
+# Timestamp refinement and shorts
+# =============================================================================
+
+@case('refine_timestamp_with_words', CALL_MINUTES)
+def bench_refine_timestamp_with_words(minutes):
+    """refine_timestamps.py: keyword clustering for every highlight of a job"""
+    from lib.transcript_index import TranscriptIndex
+    from refine_timestamps import refine_timestamp_with_words
+    index = TranscriptIndex(make_transcript(minutes))
+    index.normalized_words  # Built once per job in the pipeline
+    highlights = make_highlights(minutes)
+
+    def run():
+        for h in highlights:
+            refine_timestamp_with_words(h['timestamp'], h['keywords'], index)
+    return run
+
+
+@case('insights_refine_timestamp_with_words', CALL_MINUTES)
+def bench_insights_refine_timestamp_with_words(minutes):
+    """extract_insights_structured.py: forward-window keyword search"""
+    from lib.transcript_index import TranscriptIndex
+    from extract_insights_structured import refine_timestamp_with_words
+    index = TranscriptIndex(make_transcript(minutes))
+    highlights = make_highlights(minutes)
+
+    def run():
+        for h in highlights:
+            refine_timestamp_with_words(h['timestamp'], h['keywords'], index)
+    return run
+
+
+@case('extract_words_for_highlight', CALL_MINUTES)
+def bench_extract_words_for_highlight(minutes):
+    from lib.transcript_index import TranscriptIndex
+    from steps.generate_shorts import extract_words_for_highlight
+    index = TranscriptIndex(make_transcript(minutes))
+    highlights = make_highlights(minutes)
+
+    def run():
+        for h in highlights:
+            extract_words_for_highlight(index, h['timestamp'], h['duration'])
+    return run
+
+
+# =============================================================================
+# Company matching (real companies_master.csv)
+# =============================================================================
+
+@case('company_matcher_load')
+def bench_company_matcher_load(_):
+    from lib.fuzzy_match import CompanyMatcher
+    if not COMPANIES_CSV.exists():
+        raise ImportError(f"{COMPANIES_CSV} not found")
+    return lambda: CompanyMatcher(COMPANIES_CSV)
+
+
+@case('company_matcher_match')
+def bench_company_matcher_match(_):
+    from lib.fuzzy_match import CompanyMatcher
+    if not COMPANIES_CSV.exists():
+        raise ImportError(f"{COMPANIES_CSV} not found")
+    matcher = CompanyMatcher(COMPANIES_CSV)
+
+    def run():
+        for name, ticker in COMPANY_QUERIES:
+            matcher.match(name, ticker)
+    return run
+
+
+@case('company_matcher_match_batch')
+def bench_company_matcher_match_batch(_):
+    from lib.fuzzy_match import CompanyMatcher
+    if not COMPANIES_CSV.exists():
+        raise ImportError(f"{COMPANIES_CSV} not found")
+    matcher = CompanyMatcher(COMPANIES_CSV)
+    queries = COMPANY_QUERIES * 10
+    return lambda: matcher.match_batch(queries)
+
+
+# =============================================================================
+# Thumbnails
+# =============================================================================
+
+@case('gradient_background')
+def bench_gradient_background(_):
+    from lib.compositing import gradient_background
+    return lambda: gradient_background(
+        1280, 720, (10, 20, 40), (0, 200, 5), direction='diagonal',
+        overlay_color=(0, 0, 0), overlay_alpha=180, vignette_strength=0.4
+    )
+
+
+@case('render_branding')
+def bench_render_branding(_):
+    from PIL import Image
+    from smart_thumbnail_generator import render_branding
+    frame = Image.new('RGB', (1280, 720), (40, 60, 80))
+    data = make_job()
+
+    def run():
+        for variation in (1, 2, 3, 4):
+            render_branding(frame, data, variation)
+    return run
+
+
+# =============================================================================
+# Job state
+# =============================================================================
+
+@case('job_yaml_save_load')
+def bench_job_yaml_save_load(_):
+    """One update_step() save plus a reload, as workflow.py does per step"""
+    from lib.serialization import write_yaml
+    from job import JobManager
+    tmp_dir = Path(tempfile.mkdtemp(prefix='lens_bench_'))
+    job_file = tmp_dir / 'job.yaml'
+    write_yaml(job_file, make_job())
+    manager = JobManager(job_file)
+
+    def run():
+        manager.update_step('render', 'completed', output='render.mp4')
+        JobManager(job_file)
+    run.cleanup = lambda: shutil.rmtree(tmp_dir, ignore_errors=True)
+    return run
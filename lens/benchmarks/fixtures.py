@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Synthetic, deterministic inputs for the benchmark suite
+
+Transcripts are generated to look like a WhisperX earnings call (speaker
+turns, ~150 words/minute, word-level timing, sentence punctuation, numbers
+and finance vocabulary), so the benchmarked code takes the same paths as on
+real calls. Same minutes + seed always gives the same transcript.
+"""
+
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+LENS_DIR = Path(__file__).parent.parent
+COMPANIES_CSV = LENS_DIR.parent / 'data' / 'companies_master.csv'
+
+# Call lengths benchmarked (minutes)
+CALL_MINUTES = (30, 60, 120)
+
+WORDS_PER_MINUTE = 150
+
+SPEAKERS = ['SPEAKER_00', 'SPEAKER_01', 'SPEAKER_02', 'SPEAKER_03', 'SPEAKER_04', 'SPEAKER_05']
+
+VOCABULARY = (
+    'the we our and of to in for this that quarter year revenue growth margin '
+    'billion million percent guidance operating income cash flow customers demand '
+    'data center gaming automotive supply chain inventory pricing expansion '
+    'gross net earnings per share compared prior strong record sequential '
+    'investment capital return buyback dividend outlook fiscal second third '
+    'fourth first team product launch platform cloud services subscription '
+    'users engagement international region segment question analyst thank you'
+).split()
+
+NUMBERS = ['$4.2', '$18.1', '12%', '35%', '2.5', '$1.08', '71%', '$500', '9%', '$26']
+
+KEYWORD_SETS = [
+    ['revenue', 'record', 'billion'],
+    ['gross', 'margin', 'percent'],
+    ['guidance', 'fiscal', 'outlook'],
+    ['data', 'center', 'demand'],
+    ['cash', 'flow', 'buyback'],
+    ['earnings', 'per', 'share'],
+]
+
+
+def _sentence(rng: random.Random) -> List[str]:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 22))]
+    if rng.random() < 0.4:
+        words.insert(rng.randrange(len(words)), rng.choice(NUMBERS))
+    words[0] = words[0].capitalize()
+    words[-1] += '?' if rng.random() < 0.1 else '.'
+    return words
+
+
+@lru_cache(maxsize=None)
+def make_transcript(minutes: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    WhisperX-style transcript.json dict for a call of the given length
+
+    Cached: benchmarks must not mutate it.
+
+    Args:
+        minutes: Call length
+        seed: Random seed
+
+    Returns:
+        {'language': 'en', 'segments': [{start, end, text, speaker, words}]}
+    """
+    rng = random.Random(seed * 1000 + minutes)
+    seconds_per_word = 60.0 / WORDS_PER_MINUTE
+    duration = minutes * 60.0
+
+    segments = []
+    t = 1.5
+    speaker = SPEAKERS[0]
+    while t < duration:
+        if rng.random() < 0.25:
+            speaker = rng.choice(SPEAKERS)
+        words = []
+        for _ in range(rng.randint(1, 3)):
+            for token in _sentence(rng):
+                length = seconds_per_word * rng.uniform(0.6, 1.3)
+                word = {'word': token, 'start': round(t, 3), 'end': round(t + length * 0.85, 3),
+                        'score': round(rng.uniform(0.5, 1.0), 3), 'speaker': speaker}
+                if rng.random() < 0.01:
+                    # WhisperX leaves some numerals unaligned
+                    word = {'word': token}
+                words.append(word)
+                t += length
+        segments.append({
+            'start': words[0].get('start', round(t, 3)),
+            'end': round(t, 3),
+            'text': ' '.join(w['word'] for w in words),
+            'speaker': speaker,
+            'words': words,
+        })
+        t += rng.uniform(0.2, 1.5)
+
+    return {'language': 'en', 'segments': segments}
+
+
+def make_highlights(minutes: int, count: int = 20, seed: int = 0) -> List[Dict[str, Any]]:
+    """LLM-style highlights spread over the call (timestamp, duration, keywords)"""
+    rng = random.Random(seed * 1000 + minutes + 7)
+    duration = minutes * 60
+    return [
+        {
+            'timestamp': int(rng.uniform(0, duration - 60)),
+            'duration': rng.choice([30, 45, 60]),
+            'keywords': rng.choice(KEYWORD_SETS),
+        }
+        for _ in range(count)
+    ]
+
+
+def make_job(minutes: int = 60, seed: int = 0) -> Dict[str, Any]:
+    """job.yaml dict with the size and shape of a fully processed job"""
+    highlights = make_highlights(minutes, seed=seed)
+    return {
+        'job_id': f'BENCH_{minutes}m',
+        'status': 'completed',
+        'company': {'name': 'NVIDIA Corporation', 'ticker': 'NVDA', 'quarter': 'Q3', 'year': 2025},
+        'input': {'type': 'youtube', 'url': 'https://www.youtube.com/watch?v=bench'},
+        'processing': {
+            step: {'status': 'completed', 'completed_at': '2025-01-01T00:00:00',
+                   'metrics': {'wall_seconds': 1.5, 'cpu_seconds': 1.2, 'peak_rss_mb': 512}}
+            for step in ('download', 'transcribe', 'extract_insights', 'refine_timestamps',
+                         'render', 'upload_youtube', 'update_database')
+        },
+        'insights': {
+            'summary': ' '.join(VOCABULARY[:120]),
+            'financial_metrics': [
+                {'metric': 'Revenue', 'value': '$35.1B', 'change': '+94%', 'timestamp': h['timestamp']}
+                for h in highlights
+            ],
+            'highlights': [
+                {'text': ' '.join(h['keywords'] * 8), 'timestamp': h['timestamp'], 'category': 'financial'}
+                for h in highlights
+            ],
+        },
+    }
+
+
+# Company names as GPT detects them: exact tickers, exact names, near-misses
+# and unknowns (exercises every branch of CompanyMatcher.match)
+COMPANY_QUERIES = [
+    ('NVIDIA Corporation', 'NVDA'),
+    ('Microsoft', None),
+    ('Apple Inc', 'AAPL'),
+    ('Alphabet Inc.', None),
+    ('Robinhood Markets', 'HOOD'),
+    ('Palantir Technologies', None),
+    ('Amazon.com', None),
+    ('Advanced Micro Devices', 'AMD'),
+    ('Salesforce', None),
+    ('Netflix Incorporated', None),
+    ('Totally Unknown Widgets Co', None),
+    ('JP Morgan Chase', None),
+]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Run benchmark cases, store baselines and compare against them
+
+Timing follows timeit: each case is calibrated to run for at least
+`min_time` seconds per round (several loops for fast cases), garbage
+collection is off while timing, and stdout is discarded (several hot paths
+print progress). Per-call time is reported as min and median across rounds.
+
+A result regresses when both its min and median are slower than the
+baseline by more than the threshold - min alone is sensitive to lucky runs,
+median alone to noisy neighbours.
+"""
+
+import contextlib
+import gc
+import math
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from lib.serialization import read_json, write_json
+
+from .cases import CASES
+
+BASELINES_DIR = Path(__file__).parent / 'baselines'
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def machine_info() -> Dict[str, Any]:
+    """Where a baseline was recorded (comparisons across machines are noisy)"""
+    return {
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def measure(fn: Callable[[], object], rounds: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    """
+    Time a callable
+
+    Args:
+        fn: Zero-argument callable
+        rounds: Timed rounds
+        min_time: Minimum seconds per round (sets loops per round)
+
+    Returns:
+        {'min_ms', 'median_ms', 'max_ms', 'loops', 'rounds'} (per call)
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        # Warm-up call (imports, caches) doubles as calibration
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        loops = max(1, math.ceil(min_time / elapsed)) if elapsed > 0 else 1000
+
+        samples = []
+        gc_was_enabled = gc.isenabled()
+        try:
+            for _ in range(rounds):
+                gc.collect()
+                gc.disable()
+                start = time.perf_counter()
+                for _ in range(loops):
+                    fn()
+                samples.append((time.perf_counter() - start) / loops)
+                if gc_was_enabled:
+                    gc.enable()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    return {
+        'min_ms': min(samples) * 1000,
+        'median_ms': statistics.median(samples) * 1000,
+        'max_ms': max(samples) * 1000,
+        'loops': loops,
+        'rounds': rounds,
+    }
+
+
+def iter_benchmarks(pattern: Optional[str] = None) -> Iterator[tuple]:
+    """(benchmark_id, case, param) for every registered case, optionally filtered by substring"""
+    for case in CASES.values():
+        for param in case.params:
+            benchmark_id = case.id_for(param)
+            if pattern and pattern not in benchmark_id:
+                continue
+            yield benchmark_id, case, param
+
+
+def run_suite(pattern: Optional[str] = None, rounds: int = 5, min_time: float = 0.2,
+              progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Run all (or matching) benchmarks
+
+    Args:
+        pattern: Only run benchmark IDs containing this substring
+        rounds: Timed rounds per benchmark
+        min_time: Minimum seconds per round
+        progress: Called with (benchmark_id, result) after each benchmark
+
+    Returns:
+        {'created_at', 'machine', 'results': {benchmark_id: result}}; skipped
+        benchmarks have {'skipped': reason}
+    """
+    results = {}
+    for benchmark_id, case, param in iter_benchmarks(pattern):
+        try:
+            fn = case.setup(param)
+        except ImportError as e:
+            result = {'skipped': str(e)}
+        else:
+            try:
+                result = measure(fn, rounds=rounds, min_time=min_time)
+            finally:
+                cleanup = getattr(fn, 'cleanup', None)
+                if cleanup:
+                    cleanup()
+        results[benchmark_id] = result
+        if progress:
+            progress(benchmark_id, result)
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'results': results,
+    }
+
+
+def baseline_path(name: str) -> Path:
+    """Baseline file for a name, or the name itself if it is a path"""
+    path = Path(name)
+    if path.suffix == '.json' or path.parent != Path('.'):
+        return path
+    return BASELINES_DIR / f"{name}.json"
+
+
+def save_baseline(run: Dict[str, Any], name: str) -> Path:
+    """Store a suite run as a named baseline (merged into an existing one)"""
+    path = baseline_path(name)
+    if path.exists():
+        previous = read_json(path)
+        previous['results'].update(run['results'])
+        run = {**run, 'results': previous['results']}
+    write_json(path, run)
+    return path
+
+
+def load_baseline(name: str) -> Optional[Dict[str, Any]]:
+    path = baseline_path(name)
+    return read_json(path) if path.exists() else None
+
+
+def compare(run: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare a suite run with a baseline
+
+    Returns:
+        One row per benchmark in the run: id, baseline_ms, current_ms
+        (medians), ratio, status ('regressed', 'improved', 'ok', 'new',
+        'skipped')
+    """
+    rows = []
+    for benchmark_id, result in run['results'].items():
+        before = baseline['results'].get(benchmark_id)
+        row = {'id': benchmark_id, 'baseline_ms': None, 'current_ms': result.get('median_ms'), 'ratio': None}
+        if 'skipped' in result:
+            row['status'] = 'skipped'
+        elif not before or 'skipped' in before:
+            row['status'] = 'new'
+        else:
+            row['baseline_ms'] = before['median_ms']
+            row['ratio'] = result['median_ms'] / before['median_ms']
+            min_ratio = result['min_ms'] / before['min_ms']
+            if row['ratio'] > 1 + threshold and min_ratio > 1 + threshold:
+                row['status'] = 'regressed'
+            elif row['ratio'] < 1 - threshold and min_ratio < 1 - threshold:
+                row['status'] = 'improved'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
@@ -7,12 +7,17 @@ Adapted from VideotoBe's transcript_openai_analysis.py
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Literal, Optional, Dict
+from typing import List, Literal, Optional, Dict, Union
 from openai import OpenAI
 import json
 import re
 from pathlib import Path
 
+from lib.transcript_index import TranscriptIndex
+from lib.metrics import record_llm_usage
+from lib.tracing import span
+from lib.transcript_store import load_segments
+
 
 class Speaker(BaseModel):
     """Speaker identification"""
@@ -171,7 +176,8 @@ class EarningsInsights(BaseModel):
 def extract_earnings_insights_auto(
     transcript_file: Path,
     youtube_metadata: Optional[Dict] = None,
-    output_file: Optional[Path] = None
+    output_file: Optional[Path] = None,
+    known_speakers: Optional[Dict[str, Dict]] = None
 ) -> EarningsInsights:
     """
     Extract structured insights with auto-detection of company/quarter/year
@@ -180,16 +186,17 @@ def extract_earnings_insights_auto(
         transcript_file: Path to transcript.json (from WhisperX)
         youtube_metadata: Optional YouTube metadata (title, description, channel)
         output_file: Optional path to save raw OpenAI response
+        known_speakers: Voice-matched speakers (lib.speaker_store.label_speakers)
 
     Returns:
         EarningsInsights object with auto-detected company information
     """
-    # Load transcript
-    with open(transcript_file, 'r', encoding='utf-8') as f:
-        transcript_data = json.load(f)
+    # Load transcript (segment text/speakers only, from the columnar sidecar)
+    transcript_data = load_segments(transcript_file)
 
     # Format transcript for analysis
     formatted_transcript = format_transcript_for_analysis(transcript_data)
+    speaker_section = speaker_identification_prompt(transcript_data, known_speakers)
 
     # Build context from YouTube metadata
     metadata_context = ""
@@ -226,10 +233,7 @@ COMPANY DETECTION:
 - Extract stock ticker if mentioned (e.g., NVDA, AAPL, TSLA)
 - Determine quarter (Q1, Q2, Q3, Q4) and year (2024, 2025)
 
-SPEAKER IDENTIFICATION:
-- Map SPEAKER_00, SPEAKER_01, etc. to actual names
-- Identify roles (CEO, CFO, IR Head, Analyst from [Firm])
-- Use 'Unknown' only if name truly can't be identified from context
+{speaker_section}
 
 FINANCIAL METRICS:
 - Extract key metrics: Revenue, EPS, Operating Income, Free Cash Flow, Margins
@@ -281,16 +285,21 @@ Transcript:
     # Call OpenAI with structured output
     client = OpenAI()
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o-2024-08-06",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        response_format=EarningsInsights,
-    )
+    with span('openai chat.completions.parse', kind='client', **{'gen_ai.request.model': "gpt-4o-2024-08-06"}) as llm_span:
+        completion = client.beta.chat.completions.parse(
+            model="gpt-4o-2024-08-06",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=EarningsInsights,
+        )
+        llm_span.set(**{'gen_ai.usage.input_tokens': completion.usage.prompt_tokens,
+                         'gen_ai.usage.output_tokens': completion.usage.completion_tokens})
 
+    record_llm_usage("gpt-4o-2024-08-06", completion.usage)
     insights = completion.choices[0].message.parsed
+    insights.speakers = apply_known_speakers(insights.speakers, known_speakers)
 
     # Save raw OpenAI response if output file specified
     if output_file:
@@ -318,7 +327,8 @@ def extract_earnings_insights(
     company_name: str,
     ticker: str,
     quarter: str,
-    output_file: Optional[Path] = None
+    output_file: Optional[Path] = None,
+    known_speakers: Optional[Dict[str, Dict]] = None
 ) -> EarningsInsights:
     """
     Extract structured insights from earnings call transcript
@@ -329,16 +339,17 @@ def extract_earnings_insights(
         ticker: Stock ticker
         quarter: Quarter (e.g., Q3-2025)
         output_file: Optional path to save raw OpenAI response
+        known_speakers: Voice-matched speakers (lib.speaker_store.label_speakers)
 
     Returns:
         EarningsInsights object
     """
-    # Load transcript
-    with open(transcript_file, 'r', encoding='utf-8') as f:
-        transcript_data = json.load(f)
+    # Load transcript (segment text/speakers only, from the columnar sidecar)
+    transcript_data = load_segments(transcript_file)
 
     # Format transcript for analysis
     formatted_transcript = format_transcript_for_analysis(transcript_data)
+    speaker_section = speaker_identification_prompt(transcript_data, known_speakers)
 
     # System prompt
     system_prompt = f"""You are an expert financial analyst specializing in earnings calls.
@@ -368,10 +379,7 @@ COMPANY INFORMATION:
 - Year: {year_only}
 - This is a confirmed earnings call (is_earnings_call = True)
 
-SPEAKER IDENTIFICATION:
-- Map SPEAKER_00, SPEAKER_01, etc. to actual names
-- Identify roles (CEO, CFO, IR Head, Analyst from [Firm])
-- Use 'Unknown' only if name truly can't be identified from context
+{speaker_section}
 
 FINANCIAL METRICS:
 - Extract key metrics: Revenue, EPS, Operating Income, Free Cash Flow, Margins
@@ -423,16 +431,21 @@ Transcript:
     # Call OpenAI with structured output
     client = OpenAI()
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o-2024-08-06",
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        response_format=EarningsInsights,
-    )
+    with span('openai chat.completions.parse', kind='client', **{'gen_ai.request.model': "gpt-4o-2024-08-06"}) as llm_span:
+        completion = client.beta.chat.completions.parse(
+            model="gpt-4o-2024-08-06",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=EarningsInsights,
+        )
+        llm_span.set(**{'gen_ai.usage.input_tokens': completion.usage.prompt_tokens,
+                         'gen_ai.usage.output_tokens': completion.usage.completion_tokens})
 
+    record_llm_usage("gpt-4o-2024-08-06", completion.usage)
     insights = completion.choices[0].message.parsed
+    insights.speakers = apply_known_speakers(insights.speakers, known_speakers)
 
     # Save raw OpenAI response if output file specified
     if output_file:
@@ -454,6 +467,49 @@ Transcript:
     return insights
 
 
+def speaker_identification_prompt(transcript_data: Dict, known_speakers: Optional[Dict[str, Dict]] = None) -> str:
+    """
+    SPEAKER IDENTIFICATION section of the prompt
+
+    Speakers already matched by voice are given, so the model only has to
+    name the rest (or nobody, when every speaker is known).
+    """
+    default = """SPEAKER IDENTIFICATION:
+- Map SPEAKER_00, SPEAKER_01, etc. to actual names
+- Identify roles (CEO, CFO, IR Head, Analyst from [Firm])
+- Use 'Unknown' only if name truly can't be identified from context"""
+    if not known_speakers:
+        return default
+
+    labels = sorted({segment.get("speaker") for segment in transcript_data.get("segments", []) if segment.get("speaker")})
+    known_lines = "\n".join(
+        f"- {label} = {info['name']}" + (f" ({info['role']})" if info.get('role') else "")
+        for label, info in sorted(known_speakers.items())
+    )
+    remaining = [label for label in labels if label not in known_speakers]
+    if not remaining:
+        return f"""SPEAKER IDENTIFICATION:
+All speakers are already identified by voice - list them in speakers exactly as given, do not re-identify:
+{known_lines}"""
+    return f"""SPEAKER IDENTIFICATION:
+Already identified by voice (list exactly as given):
+{known_lines}
+- Map only {', '.join(remaining)} to actual names
+- Identify roles (CEO, CFO, IR Head, Analyst from [Firm])
+- Use 'Unknown' only if name truly can't be identified from context"""
+
+
+def apply_known_speakers(speakers: List[Speaker], known_speakers: Optional[Dict[str, Dict]] = None) -> List[Speaker]:
+    """Voice-matched names win over the model's for the same label"""
+    if not known_speakers:
+        return speakers
+    merged = {speaker.speaker_id: speaker for speaker in speakers}
+    for label, info in known_speakers.items():
+        merged[label] = Speaker(speaker_id=label, speaker_name=info['name'],
+                                role=info.get('role') or getattr(merged.get(label), 'role', None))
+    return sorted(merged.values(), key=lambda speaker: speaker.speaker_id)
+
+
 def format_transcript_for_analysis(transcript_data: Dict) -> str:
     """
     Format WhisperX transcript for OpenAI analysis
@@ -563,7 +619,7 @@ def extract_keywords_from_highlight(highlight: Highlight) -> List[str]:
 def refine_timestamp_with_words(
     llm_timestamp: int,
     keywords: List[str],
-    transcript_data: Dict,
+    transcript_data: Union[Dict, TranscriptIndex],
     window_seconds: int = 30
 ) -> float:
     """
@@ -574,7 +630,7 @@ def refine_timestamp_with_words(
     Args:
         llm_timestamp: Timestamp suggested by LLM (from paragraph-level)
         keywords: Keywords to search for
-        transcript_data: Full transcript with word-level data
+        transcript_data: Full transcript with word-level data (or its TranscriptIndex)
         window_seconds: Search window in seconds (forward from llm_timestamp)
 
     Returns:
@@ -583,9 +639,6 @@ def refine_timestamp_with_words(
     if not keywords:
         return llm_timestamp
 
-    # Get all word-level data from segments
-    segments = transcript_data.get("segments", [])
-
     # Search window: llm_timestamp to llm_timestamp + window_seconds
     search_start = llm_timestamp
     search_end = llm_timestamp + window_seconds
@@ -593,31 +646,18 @@ def refine_timestamp_with_words(
     # Build list of all words with timestamps in search window
     word_matches = []
 
-    for segment in segments:
-        segment_start = segment.get("start", 0)
-        segment_end = segment.get("end", 0)
-
-        # Skip segments outside search window
-        if segment_end < search_start or segment_start > search_end:
-            continue
-
-        # Check word-level data if available
-        words = segment.get("words", [])
-        if words:
-            for word_obj in words:
-                word_text = word_obj.get("word", "").lower().strip()
-                word_start = word_obj.get("start", segment_start)
-
-                # Check if word is in search window
-                if search_start <= word_start <= search_end:
-                    # Check if word matches any keyword
-                    for keyword in keywords:
-                        if keyword in word_text or word_text in keyword:
-                            word_matches.append({
-                                'word': word_text,
-                                'keyword': keyword,
-                                'timestamp': word_start
-                            })
+    for word_obj in TranscriptIndex.of(transcript_data).words_between(search_start, search_end):
+        word_text = word_obj['word'].lower().strip()
+        word_start = word_obj['start']
+
+        # Check if word matches any keyword
+        for keyword in keywords:
+            if keyword in word_text or word_text in keyword:
+                word_matches.append({
+                    'word': word_text,
+                    'keyword': keyword,
+                    'timestamp': word_start
+                })
 
     # Return first match timestamp + 0.5s buffer (so overlay appears after word spoken)
     if word_matches:
@@ -630,7 +670,10 @@ def refine_timestamp_with_words(
     return float(llm_timestamp)
 
 
-def refine_all_timestamps(insights: EarningsInsights, transcript_data: Dict) -> EarningsInsights:
+def refine_all_timestamps(
+    insights: EarningsInsights,
+    transcript_data: Union[Dict, TranscriptIndex]
+) -> EarningsInsights:
     """
     Refine all metric and highlight timestamps using word-level data
 
@@ -643,6 +686,9 @@ def refine_all_timestamps(insights: EarningsInsights, transcript_data: Dict) ->
     """
     print("\n🔍 Refining timestamps with word-level data...")
 
+    # Index word timings once for every metric/highlight lookup
+    transcript_data = TranscriptIndex.of(transcript_data)
+
     # Refine financial metrics
     print(f"\nRefining {len(insights.financial_metrics)} financial metrics:")
     for metric in insights.financial_metrics:
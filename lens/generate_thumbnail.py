@@ -22,42 +22,17 @@ from pathlib import Path
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
+from lib.compositing import gradient_background, get_font as load_font
+
 
 def create_gradient_background(width: int, height: int, color1: tuple, color2: tuple) -> Image.Image:
     """Create a gradient background from color1 to color2"""
-    base = Image.new('RGB', (width, height), color1)
-    top = Image.new('RGB', (width, height), color2)
-    mask = Image.new('L', (width, height))
-    mask_data = []
-    for y in range(height):
-        for x in range(width):
-            # Diagonal gradient
-            mask_data.append(int(255 * (y / height)))
-    mask.putdata(mask_data)
-    base.paste(top, (0, 0), mask)
-    return base
+    return gradient_background(width, height, color1, color2)
 
 
 def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    """Get font, trying system fonts"""
-    font_paths = [
-        # Linux fonts
-        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-        '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
-        # Fallback
-        None
-    ]
-
-    font_path = font_paths[0] if bold else font_paths[1]
-
-    try:
-        if font_path and os.path.exists(font_path):
-            return ImageFont.truetype(font_path, size)
-        # Try to find any TTF font
-        return ImageFont.truetype(font_paths[0], size)
-    except:
-        # Fallback to default
-        return ImageFont.load_default()
+    """Get font, trying system fonts (cached per process)"""
+    return load_font(size, bold=bold)
 
 
 def draw_text_with_shadow(
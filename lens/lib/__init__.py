@@ -1,7 +1,61 @@
 """
 MarketHawk utility library
+
+Names are imported from their submodules on first access, so importing one
+submodule (e.g. lib.serialization) does not pull in PIL, rapidfuzz or numpy.
 """
 
-from .fuzzy_match import CompanyMatcher, CompanyMatch, load_matcher
+import importlib
+
+_EXPORTS = {
+    'CompanyMatcher': 'fuzzy_match', 'CompanyMatch': 'fuzzy_match', 'load_matcher': 'fuzzy_match',
+    'get_font': 'compositing', 'gradient_background': 'compositing',
+    'TranscriptIndex': 'transcript_index', 'load_index': 'transcript_index',
+    'open_columns': 'transcript_store', 'read_summary': 'transcript_store', 'write_sidecar': 'transcript_store',
+    'read_json': 'serialization', 'write_json': 'serialization',
+    'read_yaml': 'serialization', 'write_yaml': 'serialization',
+    'find_activity_start': 'audio_activity', 'silence_map': 'audio_activity',
+    'RenderProfile': 'still_render', 'get_render_profile': 'still_render',
+    'get_banner_track': 'still_render', 'render_still_video': 'still_render',
+    'StepMetrics': 'metrics', 'record': 'metrics', 'record_llm_usage': 'metrics',
+    'span': 'tracing',
+    'WorkItem': 'work_queue', 'open_queue': 'work_queue',
+    'step_lease': 'leases',
+    'job_priority': 'priority', 'gpu_slot': 'gpu_lane',
+    'BatchSizer': 'gpu_batching',
+    'transcription_plan': 'model_policy',
+    'SpeakerStore': 'speaker_store', 'label_speakers': 'speaker_store', 'enroll_speakers': 'speaker_store',
+    'libpq_env': 'postgres',
+}
+
+__all__ = [
+    'CompanyMatcher', 'CompanyMatch', 'load_matcher',
+    'get_font', 'gradient_background',
+    'TranscriptIndex', 'load_index',
+    'open_columns', 'read_summary', 'write_sidecar',
+    'read_json', 'write_json', 'read_yaml', 'write_yaml',
+    'find_activity_start', 'silence_map',
+    'RenderProfile', 'get_render_profile', 'get_banner_track', 'render_still_video',
+    'StepMetrics', 'record', 'record_llm_usage',
+    'span',
+    'WorkItem', 'open_queue',
+    'step_lease',
+    'job_priority', 'gpu_slot',
+    'BatchSizer',
+    'transcription_plan',
+    'SpeakerStore', 'label_speakers', 'enroll_speakers',
+    'libpq_env',
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['CompanyMatcher', 'CompanyMatch', 'load_matcher']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
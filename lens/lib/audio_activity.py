@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Audio activity detection over decoded PCM with NumPy
+
+ffmpeg decodes the audio to low-rate mono PCM on a pipe, and windowed RMS
+levels (dBFS) are computed on the array. Finding where sound starts reads the
+pipe in chunks and kills ffmpeg as soon as the first active run is found, so
+trimming leading silence costs milliseconds instead of a full-length
+silencedetect pass. A full silence map is available for stages that need
+every gap (e.g. pause-aware captioning).
+
+Energy cannot tell title music from speech, so callers that must keep intro
+music combine the acoustic start with the transcript's first speech
+(see compute_trim_point).
+
+Usage:
+    from lib.audio_activity import find_activity_start, silence_map
+
+    start = find_activity_start('input/source.mp4', threshold_db=-50)
+    gaps = silence_map('input/source.mp4', min_silence=1.0)
+"""
+
+import subprocess
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# 8 kHz mono is plenty for level detection and keeps decode/pipe cost low
+SAMPLE_RATE = 8000
+
+# RMS window length in seconds
+WINDOW_SECONDS = 0.02
+
+DEFAULT_THRESHOLD_DB = -50.0
+
+
+def parse_threshold(threshold) -> float:
+    """Parse a threshold like '-50dB' (ffmpeg silencedetect style) or -50 to float dBFS"""
+    if isinstance(threshold, str):
+        threshold = threshold.strip().lower().replace('db', '')
+    return float(threshold)
+
+
+def _pcm_cmd(media_path: str, start: float, duration: Optional[float], sample_rate: int) -> List[str]:
+    """ffmpeg command decoding the first audio stream to mono s16le on stdout"""
+    cmd = ['ffmpeg', '-v', 'error', '-nostdin']
+    if start > 0:
+        cmd += ['-ss', f"{start:.3f}"]
+    if duration is not None:
+        cmd += ['-t', f"{duration:.3f}"]
+    cmd += [
+        '-i', str(media_path),
+        '-map', '0:a:0',
+        '-ac', '1',
+        '-ar', str(sample_rate),
+        '-f', 's16le',
+        'pipe:1'
+    ]
+    return cmd
+
+
+def decode_pcm(
+    media_path: str,
+    start: float = 0.0,
+    duration: Optional[float] = None,
+    sample_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Decode audio to a mono float32 array in [-1.0, 1.0]
+
+    Args:
+        media_path: Audio or video file
+        start: Offset in seconds
+        duration: Seconds to decode (None = to the end)
+        sample_rate: Output sample rate
+
+    Returns:
+        float32 samples
+    """
+    result = subprocess.run(_pcm_cmd(media_path, start, duration, sample_rate), capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg audio decode failed: {result.stderr.decode(errors='replace').strip()}")
+    return np.frombuffer(result.stdout, dtype='<i2').astype(np.float32) / 32768.0
+
+
+def _stream_pcm(
+    media_path: str,
+    start: float,
+    sample_rate: int,
+    chunk_seconds: float
+) -> Iterator[np.ndarray]:
+    """Yield decoded float32 chunks; ffmpeg is killed when the generator is closed"""
+    process = subprocess.Popen(
+        _pcm_cmd(media_path, start, None, sample_rate),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    chunk_bytes = int(chunk_seconds * sample_rate) * 2
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            usable = len(data) - (len(data) % 2)
+            yield np.frombuffer(data[:usable], dtype='<i2').astype(np.float32) / 32768.0
+    finally:
+        process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+def window_db(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, window_seconds: float = WINDOW_SECONDS) -> np.ndarray:
+    """
+    RMS level per window in dBFS (trailing partial window is dropped)
+
+    Returns:
+        float32 array, one value per window (-120.0 for digital silence)
+    """
+    window = max(1, int(sample_rate * window_seconds))
+    count = len(samples) // window
+    if count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:count * window].reshape(count, window)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return (20.0 * np.log10(np.maximum(rms, 1e-6))).astype(np.float32)
+
+
+def _first_run(active: np.ndarray, min_windows: int) -> Optional[int]:
+    """Index of the first run of at least min_windows consecutive True values"""
+    if len(active) < min_windows:
+        return None
+    runs = np.convolve(active.astype(np.int32), np.ones(min_windows, dtype=np.int32), mode='valid')
+    hits = np.flatnonzero(runs == min_windows)
+    return int(hits[0]) if len(hits) else None
+
+
+def find_activity_start(
+    media_path: str,
+    threshold_db=DEFAULT_THRESHOLD_DB,
+    min_active: float = 0.2,
+    start: float = 0.0,
+    max_seconds: Optional[float] = None,
+    sample_rate: int = SAMPLE_RATE,
+    window_seconds: float = WINDOW_SECONDS,
+    chunk_seconds: float = 5.0
+) -> Optional[float]:
+    """
+    Find where sound starts, decoding only until it is found
+
+    Args:
+        media_path: Audio or video file
+        threshold_db: Level above which a window counts as active (dBFS or '-50dB')
+        min_active: Seconds of continuous activity required (ignores clicks)
+        start: Offset to start scanning from
+        max_seconds: Give up after scanning this many seconds (None = whole file)
+        sample_rate: Decode sample rate
+        window_seconds: RMS window length
+        chunk_seconds: Seconds decoded per read
+
+    Returns:
+        Absolute time in seconds where activity starts, None if never
+    """
+    threshold = parse_threshold(threshold_db)
+    window = max(1, int(sample_rate * window_seconds))
+    min_windows = max(1, int(round(min_active / window_seconds)))
+
+    # Activity flags not yet resolved into a run (carried across chunk boundaries)
+    pending = np.empty(0, dtype=bool)
+    pending_offset = 0  # Window index of pending[0]
+    leftover = np.empty(0, dtype=np.float32)
+    scanned = 0
+
+    stream = _stream_pcm(media_path, start, sample_rate, chunk_seconds)
+    try:
+        for chunk in stream:
+            samples = np.concatenate([leftover, chunk]) if len(leftover) else chunk
+            usable = len(samples) - (len(samples) % window)
+            leftover = samples[usable:]
+
+            active = window_db(samples[:usable], sample_rate, window_seconds) > threshold
+            pending = np.concatenate([pending, active])
+
+            hit = _first_run(pending, min_windows)
+            if hit is not None:
+                return start + (pending_offset + hit) * window / sample_rate
+
+            # Keep only the tail that could still begin a run
+            keep = min(len(pending), min_windows - 1)
+            pending_offset += len(pending) - keep
+            pending = pending[len(pending) - keep:]
+
+            scanned += len(chunk)
+            if max_seconds is not None and scanned / sample_rate >= max_seconds:
+                break
+    finally:
+        stream.close()
+
+    return None
+
+
+def silence_map(
+    media_path: str,
+    threshold_db=DEFAULT_THRESHOLD_DB,
+    min_silence: float = 0.5,
+    sample_rate: int = SAMPLE_RATE,
+    window_seconds: float = WINDOW_SECONDS
+) -> List[Dict[str, float]]:
+    """
+    Every silent stretch of at least min_silence seconds
+
+    Args:
+        media_path: Audio or video file
+        threshold_db: Level at or below which a window counts as silent
+        min_silence: Minimum gap length in seconds
+        sample_rate: Decode sample rate
+        window_seconds: RMS window length
+
+    Returns:
+        [{"start": 0.0, "end": 3.46, "duration": 3.46}, ...] in time order
+    """
+    threshold = parse_threshold(threshold_db)
+    samples = decode_pcm(media_path, sample_rate=sample_rate)
+    silent = window_db(samples, sample_rate, window_seconds) <= threshold
+    if not len(silent):
+        return []
+
+    # Run boundaries from the edges of the silent mask
+    edges = np.diff(np.concatenate([[0], silent.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    window = max(1, int(sample_rate * window_seconds))
+    step = window / sample_rate
+    total = len(samples) / sample_rate
+
+    gaps = []
+    for s, e in zip(starts, ends):
+        start_time = float(s * step)
+        end_time = float(min(e * step, total))
+        if end_time - start_time >= min_silence:
+            gaps.append({
+                'start': round(start_time, 3),
+                'end': round(end_time, 3),
+                'duration': round(end_time - start_time, 3),
+            })
+    return gaps
+
+
+def first_speech_from_transcript(transcript: Dict[str, Any], min_chars: int = 10) -> Optional[float]:
+    """Start of the first segment with real text (skips music/filler captions)"""
+    for segment in transcript.get('segments', []):
+        text = segment.get('text', '').strip()
+        if text and len(text) > min_chars:
+            return segment.get('start', 0)
+    return None
+
+
+def compute_trim_point(
+    media_path: str,
+    first_speech_time: Optional[float] = None,
+    pre_speech_buffer: float = 5.0,
+    threshold_db=DEFAULT_THRESHOLD_DB
+) -> Dict[str, Any]:
+    """
+    Pick where the video should start
+
+    Keeps pre_speech_buffer seconds before the first speech (title card and
+    intro music) but never keeps leading dead air: the trim point is at least
+    the acoustic start of the audio. Without a transcript, the acoustic start
+    is used directly.
+
+    Args:
+        media_path: Source audio or video
+        first_speech_time: First speech from the transcript (None if unknown)
+        pre_speech_buffer: Seconds to keep before first speech
+        threshold_db: Silence threshold for the acoustic scan
+
+    Returns:
+        Dict with trim_start, sound_start, first_speech_time
+    """
+    max_seconds = None if first_speech_time is None else first_speech_time + 1.0
+    sound_start = find_activity_start(media_path, threshold_db=threshold_db, max_seconds=max_seconds)
+
+    if first_speech_time is None:
+        trim_start = sound_start or 0.0
+    else:
+        trim_start = max(0.0, first_speech_time - pre_speech_buffer)
+        if sound_start is not None:
+            trim_start = min(max(trim_start, sound_start), first_speech_time)
+
+    return {
+        'trim_start': round(trim_start, 3),
+        'sound_start': None if sound_start is None else round(sound_start, 3),
+        'first_speech_time': first_speech_time,
+    }
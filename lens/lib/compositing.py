@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Vectorized image compositing for thumbnails and banners
+
+Builds gradients, overlays and vignettes as NumPy arrays and hands the result
+to Pillow with a single Image.fromarray call, instead of drawing row by row or
+pixel by pixel. Fonts are loaded once per process and shared by every renderer.
+
+Usage:
+    from lib.compositing import gradient_background, get_font
+
+    img = gradient_background(1280, 720, (15, 23, 42), (30, 41, 59))
+    font = get_font(110, bold=True)
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageFont
+
+# System fonts used across thumbnails and banners
+FONT_REGULAR = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+FONT_BOLD = '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+
+Color = Tuple[int, int, int]
+
+
+@lru_cache(maxsize=None)
+def get_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """
+    Get font from process-wide cache (loaded from disk only once per size/weight)
+
+    Args:
+        size: Font size in pixels
+        bold: Use bold weight
+
+    Returns:
+        FreeType font, or Pillow's default font if DejaVu is not installed
+    """
+    font_path = FONT_BOLD if bold else FONT_REGULAR
+
+    for path in (font_path, FONT_BOLD):
+        if os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                continue
+
+    return ImageFont.load_default()
+
+
+def linear_gradient(
+    width: int,
+    height: int,
+    color1: Color,
+    color2: Color,
+    direction: str = 'vertical'
+) -> np.ndarray:
+    """
+    Build a linear gradient from color1 to color2
+
+    Args:
+        width: Image width
+        height: Image height
+        color1: Start color (top / left / top-left)
+        color2: End color (bottom / right / bottom-right)
+        direction: 'vertical', 'horizontal' or 'diagonal'
+
+    Returns:
+        uint8 array of shape (height, width, 3)
+    """
+    if direction == 'vertical':
+        t = (np.arange(height, dtype=np.float32) / height)[:, None]
+        t = np.broadcast_to(t, (height, width))
+    elif direction == 'horizontal':
+        t = (np.arange(width, dtype=np.float32) / width)[None, :]
+        t = np.broadcast_to(t, (height, width))
+    elif direction == 'diagonal':
+        ys = np.arange(height, dtype=np.float32)[:, None] / height
+        xs = np.arange(width, dtype=np.float32)[None, :] / width
+        t = (ys + xs) / 2
+    else:
+        raise ValueError(f"Unknown gradient direction: {direction}")
+
+    c1 = np.asarray(color1, dtype=np.float32)
+    c2 = np.asarray(color2, dtype=np.float32)
+    rgb = c1 + (c2 - c1) * t[..., None]
+    return rgb.astype(np.uint8)
+
+
+def alpha_ramp(height: int, width: int, max_alpha: int, reverse: bool = False) -> np.ndarray:
+    """
+    Build a vertical alpha ramp (0 at top → max_alpha at bottom)
+
+    Args:
+        height: Image height
+        width: Image width
+        max_alpha: Alpha reached at the bottom row (0-255)
+        reverse: Ramp from max_alpha at top to 0 at bottom instead
+
+    Returns:
+        float32 array of shape (height, width) with values in 0.0-1.0
+    """
+    ramp = np.floor(max_alpha * np.arange(height, dtype=np.float32) / height) / 255.0
+    if reverse:
+        ramp = ramp[::-1]
+    return np.broadcast_to(ramp[:, None], (height, width))
+
+
+def blend(base: np.ndarray, color: Color, alpha: np.ndarray) -> np.ndarray:
+    """
+    Alpha-blend a solid color over an RGB array
+
+    Args:
+        base: uint8 array of shape (H, W, 3)
+        color: Overlay color
+        alpha: float array of shape (H, W) with values in 0.0-1.0
+
+    Returns:
+        uint8 array of shape (H, W, 3)
+    """
+    a = alpha[..., None]
+    out = base.astype(np.float32) * (1.0 - a) + np.asarray(color, dtype=np.float32) * a
+    return np.clip(out, 0, 255).astype(np.uint8)
+
+
+def vignette(base: np.ndarray, strength: float = 0.4) -> np.ndarray:
+    """
+    Darken the edges of an RGB array with a radial falloff
+
+    Args:
+        base: uint8 array of shape (H, W, 3)
+        strength: 0.0 (no effect) to 1.0 (black corners)
+
+    Returns:
+        uint8 array of shape (H, W, 3)
+    """
+    height, width = base.shape[:2]
+    ys = np.linspace(-1.0, 1.0, height, dtype=np.float32)[:, None]
+    xs = np.linspace(-1.0, 1.0, width, dtype=np.float32)[None, :]
+    radius = np.sqrt(xs ** 2 + ys ** 2) / np.sqrt(2.0)
+    falloff = 1.0 - strength * radius ** 2
+    out = base.astype(np.float32) * falloff[..., None]
+    return np.clip(out, 0, 255).astype(np.uint8)
+
+
+def gradient_background(
+    width: int,
+    height: int,
+    color1: Color,
+    color2: Optional[Color] = None,
+    direction: str = 'vertical',
+    overlay_color: Optional[Color] = None,
+    overlay_alpha: int = 0,
+    vignette_strength: float = 0.0
+) -> Image.Image:
+    """
+    Compose a background image in one pass and convert it with a single fromarray
+
+    Args:
+        width: Image width
+        height: Image height
+        color1: Base color (or gradient start color)
+        color2: Gradient end color (None = solid color1)
+        direction: Gradient direction ('vertical', 'horizontal', 'diagonal')
+        overlay_color: Optional color faded in from top to bottom
+        overlay_alpha: Alpha of overlay_color at the bottom row (0-255)
+        vignette_strength: Edge darkening (0.0 = off)
+
+    Returns:
+        PIL.Image: RGB background
+    """
+    if color2 is None:
+        arr = np.empty((height, width, 3), dtype=np.uint8)
+        arr[...] = color1
+    else:
+        arr = linear_gradient(width, height, color1, color2, direction)
+
+    if overlay_color is not None and overlay_alpha > 0:
+        arr = blend(arr, overlay_color, alpha_ramp(height, width, overlay_alpha))
+
+    if vignette_strength > 0:
+        arr = vignette(arr, vignette_strength)
+
+    return Image.fromarray(arr, 'RGB')
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Single-pass video frame extraction and scoring
+
+Grabs every candidate frame with ONE ffmpeg process: each timestamp is opened
+as its own keyframe-seeked input (-ss before -i), trimmed to one frame, and the
+frames are concatenated into a single rawvideo stream on stdout. Frames come
+back as in-memory RGB arrays - nothing is written to disk unless the caller
+saves them.
+
+Dense sampling scores many candidates for sharpness, exposure and face
+presence so the best thumbnail frames can be picked without extra decodes.
+
+Usage:
+    from lib.frames import probe_video, extract_frames, sample_best_frames
+
+    info = probe_video('renders/rendered.mp4')
+    frames = extract_frames('renders/rendered.mp4', [60.0, 300.0], info=info)
+    best = sample_best_frames('renders/rendered.mp4', num_candidates=24, top_k=4)
+"""
+
+import json
+import logging
+import re
+import subprocess
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Optional: OpenCV Haar cascade for face presence scoring
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+logger = logging.getLogger(__name__)
+
+# showinfo@f<input> log line for a frame that reached the output
+_SHOWINFO_RE = re.compile(r'\[showinfo@f(\d+) @ [^\]]+\] n:\s*\d+ pts:\s*-?\d+ pts_time:(-?[\d.]+)')
+
+
+@dataclass
+class VideoInfo:
+    """Stream information from a single ffprobe call"""
+    has_video: bool
+    width: int
+    height: int
+    duration: float
+
+
+@dataclass(eq=False)
+class Frame:
+    """Decoded frame with optional quality scores"""
+    timestamp: float
+    image: np.ndarray = field(repr=False)  # uint8 (height, width, 3) RGB
+    sharpness: float = 0.0
+    exposure: float = 0.0
+    faces: int = 0
+    score: float = 0.0
+
+
+def probe_video(video_path: str) -> VideoInfo:
+    """
+    Probe video stream and duration with one ffprobe call
+
+    Args:
+        video_path: Path to media file
+
+    Returns:
+        VideoInfo (has_video=False for audio-only files)
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_type,width,height:format=duration',
+        '-of', 'json',
+        video_path
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr.strip()}")
+
+    probe = json.loads(result.stdout or '{}')
+    streams = [s for s in probe.get('streams', []) if s.get('codec_type') == 'video']
+    duration = float(probe.get('format', {}).get('duration') or 0.0)
+
+    if not streams:
+        return VideoInfo(has_video=False, width=0, height=0, duration=duration)
+
+    stream = streams[0]
+    return VideoInfo(
+        has_video=True,
+        width=int(stream.get('width', 0)),
+        height=int(stream.get('height', 0)),
+        duration=duration
+    )
+
+
+def extract_frames(
+    video_path: str,
+    timestamps: Sequence[float],
+    info: Optional[VideoInfo] = None,
+    accurate: bool = True
+) -> List[Frame]:
+    """
+    Extract frames at several timestamps with a single ffmpeg invocation
+
+    Args:
+        video_path: Path to video file
+        timestamps: Times in seconds
+        info: VideoInfo from probe_video (probed if not given)
+        accurate: Decode up to the exact timestamp. False returns the nearest
+            preceding keyframe, which skips decoding entirely after the seek.
+
+    Returns:
+        Frame objects in the order of timestamps; a frame the decoder could not
+        produce (e.g. past the end) is left out, and each Frame.timestamp is
+        the time of the frame actually decoded (the keyframe when not accurate)
+    """
+    if not timestamps:
+        return []
+
+    info = info or probe_video(video_path)
+    if not info.has_video or info.width <= 0 or info.height <= 0:
+        raise ValueError(f"No video stream in {video_path}")
+
+    # info level for showinfo, which reports which inputs produced a frame
+    cmd = ['ffmpeg', '-hide_banner', '-v', 'info', '-nostdin']
+    for ts in timestamps:
+        if not accurate:
+            cmd += ['-noaccurate_seek']
+        cmd += ['-ss', f"{ts:.3f}", '-i', video_path]
+
+    # One frame per input, concatenated into a single output stream.
+    # Renumber timestamps (0, 1, 2, ... at 25fps) so the constant-rate output
+    # never drops or duplicates a frame.
+    chains = []
+    labels = []
+    for i in range(len(timestamps)):
+        chains.append(f"[{i}:v:0]trim=end_frame=1,setsar=1,showinfo@f{i}[f{i}]")
+        labels.append(f"[f{i}]")
+    filter_complex = (
+        ';'.join(chains) + ';' + ''.join(labels)
+        + f"concat=n={len(timestamps)}:v=1:a=0,settb=1/25,setpts=N[out]"
+    )
+
+    cmd += [
+        '-filter_complex', filter_complex,
+        '-map', '[out]',
+        '-r', '25',
+        '-frames:v', str(len(timestamps)),
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        'pipe:1'
+    ]
+
+    result = subprocess.run(cmd, capture_output=True)
+    stderr = result.stderr.decode(errors='replace')
+    if result.returncode != 0:
+        errors = [line for line in stderr.splitlines() if 'showinfo@' not in line]
+        raise RuntimeError(f"ffmpeg frame extraction failed: {chr(10).join(errors[-5:]).strip()}")
+
+    # Inputs that produced a frame (concat keeps input order), with the
+    # decoded frame's offset from the seek point
+    decoded = {}
+    for match in _SHOWINFO_RE.finditer(stderr):
+        decoded.setdefault(int(match.group(1)), float(match.group(2)))
+    sources = sorted(decoded)
+
+    frame_size = info.width * info.height * 3
+    count = len(result.stdout) // frame_size
+    if count != len(sources):
+        logger.warning(f"Decoded {count} frames but ffmpeg reported {len(sources)}; dropping unverified frames")
+        count = min(count, len(sources)) if count > len(sources) else 0
+    if count < len(timestamps):
+        logger.warning(f"Expected {len(timestamps)} frames, decoded {count}")
+
+    buffer = np.frombuffer(result.stdout, dtype=np.uint8, count=count * frame_size)
+    images = buffer.reshape(count, info.height, info.width, 3)
+
+    return [
+        Frame(timestamp=round(float(timestamps[i]) + decoded[i], 3), image=images[n])
+        for n, i in enumerate(sources[:count])
+    ]
+
+
+def _grayscale(image: np.ndarray, max_width: int = 640) -> np.ndarray:
+    """Downsampled float32 luma for scoring"""
+    step = max(1, image.shape[1] // max_width)
+    rgb = image[::step, ::step].astype(np.float32)
+    return rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+
+
+def sharpness(gray: np.ndarray) -> float:
+    """Variance of the Laplacian (higher = sharper)"""
+    lap = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4.0 * gray[1:-1, 1:-1]
+    )
+    return float(lap.var())
+
+
+def exposure(gray: np.ndarray) -> float:
+    """Exposure quality in 0.0-1.0 (penalizes black, blown-out and flat frames)"""
+    mean = float(gray.mean())
+    contrast = float(gray.std())
+    brightness_score = 1.0 - abs(mean - 128.0) / 128.0
+    contrast_score = min(contrast / 64.0, 1.0)
+    return brightness_score * contrast_score
+
+
+@lru_cache(maxsize=1)
+def _face_cascade():
+    """Load Haar face cascade once (None when OpenCV is unavailable)"""
+    if cv2 is None:
+        return None
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    return None if cascade.empty() else cascade
+
+
+def count_faces(gray: np.ndarray) -> int:
+    """Count frontal faces (0 when OpenCV is not installed)"""
+    cascade = _face_cascade()
+    if cascade is None:
+        return 0
+    faces = cascade.detectMultiScale(gray.astype(np.uint8), scaleFactor=1.2, minNeighbors=5, minSize=(40, 40))
+    return len(faces)
+
+
+def score_frames(frames: List[Frame], face_weight: float = 0.5) -> List[Frame]:
+    """
+    Score frames in place for thumbnail suitability
+
+    Score = relative sharpness (0-1) * exposure (0-1) + face_weight if a face is present
+
+    Args:
+        frames: Frames from extract_frames
+        face_weight: Bonus for frames containing at least one face
+
+    Returns:
+        The same frames, with sharpness/exposure/faces/score populated
+    """
+    if not frames:
+        return frames
+
+    grays = [_grayscale(f.image) for f in frames]
+    for frame, gray in zip(frames, grays):
+        frame.sharpness = sharpness(gray)
+        frame.exposure = exposure(gray)
+        frame.faces = count_faces(gray)
+
+    max_sharpness = max(f.sharpness for f in frames) or 1.0
+    for frame in frames:
+        frame.score = (frame.sharpness / max_sharpness) * frame.exposure
+        if frame.faces:
+            frame.score += face_weight
+
+    return frames
+
+
+def sample_best_frames(
+    video_path: str,
+    num_candidates: int = 24,
+    top_k: int = 4,
+    start: float = 0.05,
+    end: float = 0.95,
+    info: Optional[VideoInfo] = None
+) -> List[Frame]:
+    """
+    Dense-sample candidate frames in one decode pass and keep the best
+
+    Candidates are spread evenly between start and end (fractions of the
+    duration) and seeked to the nearest keyframe. The top_k are picked by
+    score while keeping them spread across the video (at most one pick per
+    1/top_k slice when possible).
+
+    Args:
+        video_path: Path to video file
+        num_candidates: Number of frames to decode and score
+        top_k: Number of frames to return
+        start: First candidate position (fraction of duration)
+        end: Last candidate position (fraction of duration)
+        info: VideoInfo from probe_video (probed if not given)
+
+    Returns:
+        Best frames, ordered by timestamp
+    """
+    info = info or probe_video(video_path)
+    if info.duration <= 0:
+        return []
+
+    positions = np.linspace(start, end, num_candidates)
+    timestamps = [float(info.duration * p) for p in positions]
+
+    frames = score_frames(extract_frames(video_path, timestamps, info=info, accurate=False))
+    ranked = sorted(frames, key=lambda f: f.score, reverse=True)
+
+    # Prefer the best frame from each slice of the video, then fill by score
+    slice_len = info.duration / max(top_k, 1)
+    picked = []
+    used_slices = set()
+    for frame in ranked:
+        slice_idx = int(frame.timestamp // slice_len)
+        if slice_idx not in used_slices:
+            picked.append(frame)
+            used_slices.add(slice_idx)
+        if len(picked) == top_k:
+            break
+
+    for frame in ranked:
+        if len(picked) == top_k:
+            break
+        if frame not in picked:
+            picked.append(frame)
+
+    return sorted(picked, key=lambda f: f.timestamp)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Size inference batches from free GPU memory, backing off on out-of-memory
+
+A fixed batch_size is either too small for a mostly idle GPU or too large
+when something else (a diarization model, another job) holds memory.
+BatchSizer starts from what fits in free memory, halves on OOM, and after
+a run of successful batches grows back towards what currently fits.
+
+Per-item memory is a conservative estimate per Whisper model size
+(ITEM_MEMORY_MB, float16; int8 uses less); WHISPERX_ITEM_MEMORY_MB
+overrides it. torch is imported lazily so this module loads on CPU-only
+hosts.
+
+Usage:
+    from lib.gpu_batching import BatchSizer
+
+    sizer = BatchSizer.for_model('medium', device, compute_type)
+    while pending:
+        try:
+            run(pending[:sizer.size])
+        except Exception as e:
+            if not sizer.on_error(e):
+                raise
+            continue
+        sizer.on_success()
+"""
+
+import gc
+import os
+from typing import Optional
+
+# Approximate MB of GPU memory per batch item (30s chunk) for float16
+ITEM_MEMORY_MB = {
+    'tiny': 30,
+    'base': 40,
+    'small': 60,
+    'medium': 100,
+    'large-v2': 160,
+    'large-v3': 160,
+}
+
+# Fraction of free memory batches may use (the rest covers fragmentation)
+MEMORY_FRACTION = 0.8
+
+MAX_BATCH_SIZE = 64
+CPU_BATCH_SIZE = 8
+GROW_AFTER = 8
+
+
+def free_gpu_memory_mb(device: str = 'cuda') -> Optional[float]:
+    """Free memory on the current CUDA device (None without CUDA)"""
+    if not device.startswith('cuda'):
+        return None
+    try:
+        import torch
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+    free_bytes, _ = torch.cuda.mem_get_info()
+    return free_bytes / (1024 * 1024)
+
+
+def is_oom(error: BaseException) -> bool:
+    """Out-of-memory from torch or CTranslate2 (faster-whisper)"""
+    try:
+        import torch
+        if isinstance(error, torch.cuda.OutOfMemoryError):
+            return True
+    except (ImportError, AttributeError):
+        pass
+    return 'out of memory' in str(error).lower()
+
+
+def release_gpu_memory(device: str = 'cuda') -> None:
+    gc.collect()
+    if device.startswith('cuda'):
+        try:
+            import torch
+            torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+
+class BatchSizer:
+    """Adaptive batch size: memory-based start, halve on OOM, grow back after successes"""
+
+    def __init__(self, item_memory_mb: float, device: str = 'cuda', max_size: int = MAX_BATCH_SIZE):
+        """
+        Args:
+            item_memory_mb: GPU memory one batch item needs
+            device: 'cuda' or 'cpu'
+            max_size: Upper bound on batch size
+        """
+        self.item_memory_mb = item_memory_mb
+        self.device = device
+        self.max_size = max_size
+        self.ceiling = max_size  # lowered by OOM, raised again by GROW_AFTER successes
+        self.successes = 0
+        self.ooms = 0
+        self.size = self.fitting_size()
+
+    @classmethod
+    def for_model(cls, model_size: str, device: str = 'cuda', compute_type: str = 'float16',
+                  max_size: int = MAX_BATCH_SIZE) -> 'BatchSizer':
+        """Sizer for a Whisper model (per-item estimate from ITEM_MEMORY_MB)"""
+        override = os.getenv('WHISPERX_ITEM_MEMORY_MB')
+        item_mb = float(override) if override else ITEM_MEMORY_MB.get(model_size, ITEM_MEMORY_MB['large-v2'])
+        if compute_type.startswith('int8') and not override:
+            item_mb *= 0.6
+        return cls(item_mb, device=device, max_size=max_size)
+
+    def fitting_size(self) -> int:
+        """Largest batch that fits in free memory now (within ceiling)"""
+        free_mb = free_gpu_memory_mb(self.device)
+        if free_mb is None:
+            return min(CPU_BATCH_SIZE, self.ceiling)
+        fits = int(free_mb * MEMORY_FRACTION // self.item_memory_mb)
+        return max(1, min(fits, self.ceiling))
+
+    def on_success(self) -> None:
+        """After a batch ran: re-check free memory and grow after GROW_AFTER successes"""
+        self.successes += 1
+        if self.successes >= GROW_AFTER and self.ceiling < self.max_size:
+            self.ceiling = min(self.max_size, self.ceiling * 2)
+            self.successes = 0
+        self.size = self.fitting_size()
+
+    def on_error(self, error: BaseException) -> bool:
+        """
+        Handle a failed batch
+
+        Returns:
+            True if it was an OOM and a smaller batch should be retried,
+            False if the error should propagate (not OOM, or already at 1)
+        """
+        if not is_oom(error) or self.size <= 1:
+            return False
+        self.ooms += 1
+        self.successes = 0
+        self.ceiling = max(1, self.size // 2)
+        release_gpu_memory(self.device)
+        self.size = self.ceiling
+        return True
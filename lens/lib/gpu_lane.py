@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Priority-ordered GPU lane for transcription
+
+Every transcription on a host - batch_processor.py jobs, `job.py process`
+runs, queue workers - asks the lane for a GPU slot. Waiters leave a ticket
+(priority, deadline) and the best-ranked tickets get the free slots, so a
+hot call waits behind the transcription in flight, not behind every
+backfill job that asked first. Slots are leases (lib/leases.py), so a
+crashed transcription frees its slot after one lease period.
+
+The lane is off unless GPU_LANE_SLOTS is set (slots = concurrent
+transcriptions, usually 1 per GPU). Tickets and slots live in GPU_LANE_DIR
+(default /var/markethawk/_gpu_lane/<host>).
+
+Usage:
+    from lib.gpu_lane import gpu_slot
+
+    with gpu_slot(job_id, priority=job_priority(job), deadline=job_deadline(job)):
+        transcribe(...)
+"""
+
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .leases import LEASE_SECONDS, Lease, LeaseHeld, owner_id
+from .priority import DEFAULT_PRIORITY, schedule_key
+from .serialization import read_json, write_json
+
+GPU_LANE_SLOTS = int(os.getenv('GPU_LANE_SLOTS', '0'))
+GPU_LANE_DIR = Path(os.getenv('GPU_LANE_DIR', f'/var/markethawk/_gpu_lane/{socket.gethostname()}'))
+
+POLL_SECONDS = 2.0
+
+
+def _live_tickets(waiting_dir: Path) -> list:
+    """(schedule key, ticket name) of waiters that refreshed their ticket within a lease period"""
+    now = time.time()
+    tickets = []
+    for path in waiting_dir.glob('*.json'):
+        try:
+            if now - path.stat().st_mtime > LEASE_SECONDS:
+                path.unlink(missing_ok=True)  # waiter died
+                continue
+            ticket = read_json(path)
+        except (FileNotFoundError, ValueError):
+            continue
+        tickets.append((schedule_key(ticket['priority'], ticket.get('deadline'), ticket['order'], now=now),
+                        path.name))
+    return sorted(tickets)
+
+
+@contextmanager
+def gpu_slot(job_id: str, priority: int = DEFAULT_PRIORITY, deadline: Optional[float] = None,
+             slots: Optional[int] = None, lane_dir: Optional[Path] = None) -> Iterator[Optional[Lease]]:
+    """
+    Hold a GPU slot for the duration of the block
+
+    Args:
+        job_id: Job being transcribed (shown to other waiters)
+        priority: Job priority (lib.priority.job_priority)
+        deadline: Job deadline epoch (lib.priority.job_deadline)
+        slots: Concurrent slots (default: GPU_LANE_SLOTS; 0 disables the lane)
+        lane_dir: Lane directory (default: GPU_LANE_DIR)
+
+    Yields:
+        The slot lease, or None when the lane is disabled
+    """
+    slots = GPU_LANE_SLOTS if slots is None else slots
+    if slots <= 0:
+        yield None
+        return
+
+    lane_dir = Path(lane_dir or GPU_LANE_DIR)
+    waiting_dir = lane_dir / 'waiting'
+    waiting_dir.mkdir(parents=True, exist_ok=True)
+
+    owner = owner_id()
+    order = f"{time.time_ns():020d}"
+    ticket = waiting_dir / f"{order}~{job_id}.json"
+    write_json(ticket, {'job_id': job_id, 'owner': owner, 'priority': priority,
+                        'deadline': deadline, 'order': order}, indent=False)
+
+    lease = None
+    announced = False
+    try:
+        while lease is None:
+            ticket.touch()
+            ranked = [name for _, name in _live_tickets(waiting_dir)]
+            rank = ranked.index(ticket.name) if ticket.name in ranked else 0
+            if rank < slots:
+                for slot in range(slots):
+                    candidate = Lease(lane_dir / f"slot-{slot}.json", owner=owner)
+                    try:
+                        lease = candidate.acquire(wait=False)
+                        break
+                    except LeaseHeld:
+                        continue
+            if lease is None:
+                if not announced:
+                    print(f"⏳ GPU lane: {job_id} waiting (priority {priority}, "
+                          f"{rank} ahead in queue, {slots} slot(s))")
+                    announced = True
+                time.sleep(POLL_SECONDS)
+    finally:
+        ticket.unlink(missing_ok=True)
+
+    try:
+        with lease.heartbeat():
+            yield lease
+    finally:
+        lease.release()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Expiring leases with heartbeats, so a step runs in one place at a time and
+work left behind by a crashed process is picked up automatically
+
+A lease is a small JSON file (owner, expires_at) created with O_EXCL, so
+exactly one process gets it. While the work runs, a heartbeat thread pushes
+expires_at forward every ttl/3 seconds. If the owner crashes, the heartbeats
+stop and the lease expires; the next process to ask for it reclaims it
+(under a short-lived .reclaim guard file, so two reclaimers can't both win).
+A live lease makes other processes wait, or fail fast with LeaseHeld.
+
+Expiry uses wall-clock time, so hosts sharing leases over /var/markethawk
+need clocks within a few seconds of each other (LEASE_SECONDS is minutes).
+
+Usage:
+    from lib.leases import step_lease
+
+    with step_lease(job_dir, 'transcribe') as lease:
+        run_transcription()
+        if lease.lost:
+            ...  # lease expired and another process took over
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .serialization import write_json
+
+LEASE_SECONDS = float(os.getenv('LENS_LEASE_SECONDS', '120'))
+LEASES_DIR = '.leases'
+
+
+class LeaseHeld(RuntimeError):
+    """Another live owner holds the lease"""
+
+    def __init__(self, path: Path, holder: Dict[str, Any]):
+        self.holder = holder
+        super().__init__(f"{path.stem} is leased by {holder.get('owner', 'unknown')} "
+                         f"until {_clock(holder.get('expires_at'))}")
+
+
+class LeaseLost(RuntimeError):
+    """The lease expired (missed heartbeats) and another owner took it"""
+
+
+def owner_id() -> str:
+    """host:pid:random - unique per lease holder"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def _clock(timestamp: Optional[float]) -> str:
+    return time.strftime('%H:%M:%S', time.localtime(timestamp)) if timestamp else '?'
+
+
+class Heartbeat:
+    """Call renew() every interval seconds on a daemon thread until stopped or renew() returns False"""
+
+    def __init__(self, renew: Callable[[], bool], interval: float):
+        self.renew = renew
+        self.interval = interval
+        self.failed = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lens-heartbeat', daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                ok = self.renew()
+            except Exception:
+                ok = False
+            if not ok:
+                self.failed = True
+                return
+
+    def start(self) -> 'Heartbeat':
+        """Start renewing (no-op if already started)"""
+        if self._thread.ident is None:
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop renewing and wait for an in-flight renewal (no-op if never started)"""
+        self._stop.set()
+        if self._thread.ident is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'Heartbeat':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class Lease:
+    """Exclusive, expiring claim on a file path"""
+
+    def __init__(self, path: Path, owner: Optional[str] = None, ttl: float = LEASE_SECONDS):
+        """
+        Args:
+            path: Lease file
+            owner: Owner ID (default: owner_id())
+            ttl: Seconds a lease lasts without a heartbeat
+        """
+        self.path = Path(path)
+        self.owner = owner or owner_id()
+        self.ttl = ttl
+        self.acquired_at: Optional[float] = None
+        self.reclaimed_from: Optional[str] = None
+        self._heartbeat: Optional[Heartbeat] = None
+
+    def _record(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            'owner': self.owner,
+            'acquired_at': self.acquired_at or now,
+            'heartbeat_at': now,
+            'expires_at': now + self.ttl,
+        }
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """
+        Current lease record, or None if there is no lease
+
+        A record still being written reads as {'expires_at': mtime + ttl}.
+        """
+        try:
+            text = self.path.read_text()
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        try:
+            return json.loads(text)
+        except ValueError:
+            return {'expires_at': mtime + self.ttl}
+
+    def _try_create(self) -> bool:
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        self.acquired_at = time.time()
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._record(), f)
+        return True
+
+    def _try_reclaim(self, expired: Dict[str, Any]) -> bool:
+        """Take over an expired lease (one reclaimer at a time)"""
+        guard = self.path.with_name(self.path.name + '.reclaim')
+        try:
+            os.close(os.open(guard, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+        except FileExistsError:
+            try:
+                if time.time() - guard.stat().st_mtime > self.ttl:
+                    guard.unlink()  # reclaimer crashed mid-reclaim
+            except FileNotFoundError:
+                pass
+            return False
+        try:
+            current = self.read()
+            if current is None:
+                return self._try_create()
+            if current.get('owner') != expired.get('owner') or current.get('expires_at', 0) >= time.time():
+                return False  # renewed or taken over meanwhile
+            self.acquired_at = time.time()
+            write_json(self.path, self._record(), indent=False)
+            self.reclaimed_from = expired.get('owner', 'unknown')
+            return True
+        finally:
+            guard.unlink(missing_ok=True)
+
+    def acquire(self, wait: bool = True, poll: Optional[float] = None) -> 'Lease':
+        """
+        Take the lease, reclaiming it if the holder's lease expired
+
+        Args:
+            wait: Wait for a live holder to finish (default), else raise LeaseHeld
+            poll: Seconds between attempts while waiting (default: ttl/6, max 10)
+
+        Returns:
+            self
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        poll = poll if poll is not None else min(self.ttl / 6, 10.0)
+        announced = False
+        while True:
+            if self._try_create():
+                return self
+            current = self.read()
+            if current is None:
+                continue  # released between attempts
+            if current.get('expires_at', 0) < time.time():
+                if self._try_reclaim(current):
+                    return self
+                continue
+            if not wait:
+                raise LeaseHeld(self.path, current)
+            if not announced:
+                print(f"⏳ {LeaseHeld(self.path, current)}; waiting")
+                announced = True
+            time.sleep(poll)
+
+    def renew(self) -> bool:
+        """Extend the lease; False if it is no longer ours"""
+        current = self.read()
+        if current is None or current.get('owner') != self.owner:
+            return False
+        write_json(self.path, self._record(), indent=False)
+        return True
+
+    @property
+    def lost(self) -> bool:
+        """Heartbeat found the lease taken over by another owner"""
+        return self._heartbeat is not None and self._heartbeat.failed
+
+    def heartbeat(self) -> Heartbeat:
+        """Context manager renewing the lease every ttl/3 seconds"""
+        self._heartbeat = Heartbeat(self.renew, self.ttl / 3)
+        return self._heartbeat
+
+    def release(self) -> None:
+        """Remove the lease if we still hold it"""
+        current = self.read()
+        if current is not None and current.get('owner') == self.owner:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'Lease':
+        self.acquire()
+        self.heartbeat().__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._heartbeat.__exit__(*exc)
+        self.release()
+
+
+def step_lease(job_dir: Path, step: str, owner: Optional[str] = None, ttl: float = LEASE_SECONDS) -> Lease:
+    """Lease for one step of a job (job_dir/.leases/<step>.json)"""
+    return Lease(Path(job_dir) / LEASES_DIR / f"{step}.json", owner=owner, ttl=ttl)
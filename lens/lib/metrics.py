@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Per-step resource and cost metrics
+
+Wrap a step with StepMetrics to capture, with no changes to the step itself:
+
+- wall_seconds, cpu_seconds (this process)
+- subprocess_cpu_seconds, subprocess_peak_rss_mb (ffmpeg, rclone, whisperx
+  subprocesses - counted once they are waited for)
+- peak_rss_mb (this process, reset per step where Linux allows it)
+- read_bytes / write_bytes (storage I/O from /proc/self/io, including
+  finished subprocesses)
+
+Steps add what only they know with record() - GPU seconds from WhisperX,
+tokens and dollars from OpenAI calls (record_llm_usage). record() also works
+from inside a subprocess of a measured step: counters are appended to a
+spool file named in the environment and merged when the step finishes.
+
+Each finished step is appended to <job_dir>/metrics.jsonl; aggregate() rolls
+records up per step for a job or a whole batch.
+
+Usage:
+    from lib.metrics import StepMetrics, append_metrics
+
+    with StepMetrics('transcribe') as metrics:
+        transcribe(...)
+    append_metrics(job_dir, metrics.result)
+"""
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Environment variable naming the spool file of the step being measured
+SPOOL_ENV = 'LENS_METRICS_SPOOL'
+
+METRICS_FILE = 'metrics.jsonl'
+
+# USD per 1M tokens (input, output)
+LLM_PRICES = {
+    'gpt-4o-2024-08-06': (2.50, 10.00),
+    'gpt-4o-2024-11-20': (2.50, 10.00),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4-turbo': (10.00, 30.00),
+    'o1-mini': (3.00, 12.00),
+    'o1': (15.00, 60.00),
+}
+
+# Counters combined with max() instead of summed
+PEAK_FIELDS = {'peak_rss_mb', 'subprocess_peak_rss_mb', 'gpu_peak_memory_mb'}
+
+_lock = threading.Lock()
+_active: List['StepMetrics'] = []
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Dollar cost of one LLM call (0 for unknown models)"""
+    prices = LLM_PRICES.get(model)
+    if prices is None:
+        # Dated snapshots of a known model (e.g. gpt-4o-mini-2024-07-18)
+        base = max((m for m in LLM_PRICES if model.startswith(m)), key=len, default=None)
+        prices = LLM_PRICES.get(base, (0.0, 0.0))
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+def _merge(target: Dict[str, float], counters: Dict[str, float]) -> None:
+    for key, value in counters.items():
+        if key in PEAK_FIELDS:
+            target[key] = max(target.get(key, 0), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def record(**counters: float) -> None:
+    """
+    Add counters to the step being measured (no-op outside a measured step)
+
+    Example:
+        record(gpu_seconds=312.5, gpu_peak_memory_mb=9120)
+    """
+    with _lock:
+        if _active:
+            for step in _active:
+                _merge(step.counters, counters)
+            return
+
+    # Subprocess of a measured step: hand counters to the parent via the spool
+    spool = os.environ.get(SPOOL_ENV)
+    if spool:
+        with open(spool, 'a') as f:
+            f.write(json.dumps(counters) + '\n')
+
+
+def record_llm_usage(model: str, usage: Any) -> None:
+    """
+    Record tokens and cost of an OpenAI response
+
+    Args:
+        model: Model name sent in the request
+        usage: response.usage (object or dict with prompt/completion tokens)
+    """
+    if usage is None:
+        return
+    if isinstance(usage, dict):
+        prompt_tokens = usage.get('prompt_tokens', 0)
+        completion_tokens = usage.get('completion_tokens', 0)
+    else:
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+
+    record(
+        llm_calls=1,
+        llm_prompt_tokens=prompt_tokens,
+        llm_completion_tokens=completion_tokens,
+        llm_cost_usd=llm_cost(model, prompt_tokens, completion_tokens)
+    )
+
+
+def _proc_io() -> Dict[str, int]:
+    """Storage bytes read/written by this process and its reaped children"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(':', 1) for line in f)
+        return {'read_bytes': int(fields['read_bytes']), 'write_bytes': int(fields['write_bytes'])}
+    except (OSError, KeyError, ValueError):
+        return {}
+
+
+def _reset_peak_rss() -> bool:
+    """Reset VmHWM so peak RSS is per step (Linux >= 4.0)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS since the last reset (VmHWM), else since process start"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def _gpu_peak_memory_mb() -> Optional[float]:
+    """Peak CUDA memory allocated by torch in this process (if torch is loaded)"""
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return None
+    try:
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            return torch.cuda.max_memory_allocated() / (1024 * 1024)
+    except Exception:
+        pass
+    return None
+
+
+class StepMetrics:
+    """Context manager measuring one step; the result dict is in .result"""
+
+    def __init__(self, step: str, handler: Optional[str] = None, **labels: Any):
+        """
+        Args:
+            step: Step name
+            handler: Handler name (workflow steps)
+            **labels: Extra fields stored with the record (e.g. job_id)
+        """
+        self.step = step
+        self.handler = handler
+        self.labels = labels
+        self.counters: Dict[str, float] = {}
+        self.result: Dict[str, Any] = {}
+
+    def __enter__(self) -> 'StepMetrics':
+        self.started_at = datetime.now().isoformat()
+        self.peak_is_per_step = _reset_peak_rss()
+
+        torch = sys.modules.get('torch')
+        if torch is not None:
+            try:
+                if torch.cuda.is_available() and torch.cuda.is_initialized():
+                    torch.cuda.reset_peak_memory_stats()
+            except Exception:
+                pass
+
+        fd, self._spool = tempfile.mkstemp(prefix='lens-metrics-', suffix='.jsonl')
+        os.close(fd)
+        self._previous_spool = os.environ.get(SPOOL_ENV)
+        os.environ[SPOOL_ENV] = self._spool
+
+        self._io = _proc_io()
+        self._self = resource.getrusage(resource.RUSAGE_SELF)
+        self._children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        self._wall = time.perf_counter()
+
+        with _lock:
+            _active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        wall = time.perf_counter() - self._wall
+        usage_self = resource.getrusage(resource.RUSAGE_SELF)
+        usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        io = _proc_io()
+
+        with _lock:
+            _active.remove(self)
+
+        if self._previous_spool is None:
+            os.environ.pop(SPOOL_ENV, None)
+        else:
+            os.environ[SPOOL_ENV] = self._previous_spool
+
+        # Counters recorded by subprocesses
+        try:
+            with open(self._spool) as f:
+                for line in f:
+                    if line.strip():
+                        _merge(self.counters, json.loads(line))
+        except (OSError, ValueError):
+            pass
+        finally:
+            os.unlink(self._spool)
+
+        result: Dict[str, Any] = {
+            'step': self.step,
+            **({'handler': self.handler} if self.handler else {}),
+            **self.labels,
+            'status': 'failed' if exc_type else 'completed',
+            'started_at': self.started_at,
+            'wall_seconds': round(wall, 3),
+            'cpu_seconds': round(
+                (usage_self.ru_utime - self._self.ru_utime) + (usage_self.ru_stime - self._self.ru_stime), 3
+            ),
+            'subprocess_cpu_seconds': round(
+                (usage_children.ru_utime - self._children.ru_utime)
+                + (usage_children.ru_stime - self._children.ru_stime), 3
+            ),
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'peak_rss_scope': 'step' if self.peak_is_per_step else 'process',
+        }
+
+        # Largest finished subprocess (Linux includes the RSS it inherited at fork)
+        if usage_children.ru_maxrss > self._children.ru_maxrss:
+            scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+            result['subprocess_peak_rss_mb'] = round(usage_children.ru_maxrss / scale, 1)
+
+        if io and self._io:
+            result['read_bytes'] = io['read_bytes'] - self._io['read_bytes']
+            result['write_bytes'] = io['write_bytes'] - self._io['write_bytes']
+
+        gpu_peak = _gpu_peak_memory_mb()
+        if gpu_peak:
+            _merge(self.counters, {'gpu_peak_memory_mb': gpu_peak})
+
+        for key, value in self.counters.items():
+            result[key] = round(value, 6) if isinstance(value, float) else value
+
+        self.result = result
+        return False
+
+
+def append_metrics(job_dir: Path, metrics: Dict[str, Any]) -> None:
+    """Append a step record to <job_dir>/metrics.jsonl"""
+    path = Path(job_dir) / METRICS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps(metrics) + '\n')
+
+
+def load_metrics(job_dir: Path) -> List[Dict[str, Any]]:
+    """All step records of a job (oldest first)"""
+    path = Path(job_dir) / METRICS_FILE
+    if not path.exists():
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # Partial line from an interrupted write
+    return records
+
+
+# Fields summed in aggregate() (peaks are maxed)
+SUM_FIELDS = (
+    'wall_seconds', 'cpu_seconds', 'subprocess_cpu_seconds', 'read_bytes', 'write_bytes',
+    'gpu_seconds', 'llm_calls', 'llm_prompt_tokens', 'llm_completion_tokens', 'llm_cost_usd',
+)
+
+
+def aggregate(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Roll step records up per step and in total
+
+    Args:
+        records: Step records (from one or many jobs)
+
+    Returns:
+        {'steps': {step: {runs, failed, <sums>, <peaks>}}, 'total': {...}}
+    """
+    steps: Dict[str, Dict[str, Any]] = {}
+    total: Dict[str, Any] = {'runs': 0, 'failed': 0}
+
+    for rec in records:
+        entry = steps.setdefault(rec.get('step', 'unknown'), {'runs': 0, 'failed': 0})
+        for target in (entry, total):
+            target['runs'] += 1
+            if rec.get('status') == 'failed':
+                target['failed'] += 1
+            for field in SUM_FIELDS:
+                if field in rec:
+                    target[field] = target.get(field, 0) + rec[field]
+            for field in PEAK_FIELDS:
+                if field in rec:
+                    target[field] = max(target.get(field, 0), rec[field])
+
+    for entry in list(steps.values()) + [total]:
+        for field in ('wall_seconds', 'cpu_seconds', 'subprocess_cpu_seconds', 'gpu_seconds'):
+            if field in entry:
+                entry[field] = round(entry[field], 3)
+        if 'llm_cost_usd' in entry:
+            entry['llm_cost_usd'] = round(entry['llm_cost_usd'], 4)
+
+    return {'steps': steps, 'total': total}
+
+
+def step_summary(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact subset of a step record for job.yaml"""
+    keys = (
+        'wall_seconds', 'cpu_seconds', 'subprocess_cpu_seconds', 'peak_rss_mb',
+        'read_bytes', 'write_bytes', 'gpu_seconds', 'llm_prompt_tokens',
+        'llm_completion_tokens', 'llm_cost_usd',
+    )
+    return {k: metrics[k] for k in keys if k in metrics}
+
+
+def format_metrics(metrics: Dict[str, Any]) -> str:
+    """One-line human summary, e.g. '42.1s wall, 38.0s CPU, 812 MB peak, $0.0312'"""
+    parts = [f"{metrics.get('wall_seconds', 0):.1f}s wall"]
+    cpu = metrics.get('cpu_seconds', 0) + metrics.get('subprocess_cpu_seconds', 0)
+    parts.append(f"{cpu:.1f}s CPU")
+    if 'peak_rss_mb' in metrics:
+        parts.append(f"{metrics['peak_rss_mb']:.0f} MB peak")
+    if metrics.get('gpu_seconds'):
+        parts.append(f"{metrics['gpu_seconds']:.1f}s GPU")
+    if metrics.get('llm_cost_usd'):
+        parts.append(f"${metrics['llm_cost_usd']:.4f}")
+    return ', '.join(parts)
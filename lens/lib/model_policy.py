@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Pick the Whisper model size and compute type per transcription
+
+medium for everything wastes accuracy on short or noisy calls (where
+large-v2 is cheap or needed) and GPU time on long clean calls when the
+queue is backed up. The policy starts at medium and adjusts from:
+
+- A quick audio scan (lib/audio_activity.py PCM levels): duration, speech
+  ratio (windows well above the noise floor) and an SNR estimate (speech
+  level over the noise floor). Short, noisy or sparse audio moves up a
+  size; long clean audio under queue pressure moves down.
+- Device: CPU gets small/tiny with int8; GPUs with little memory are
+  capped at medium with int8_float16.
+- Queue pressure: transcriptions waiting for the GPU at the same time
+  (GPU lane tickets plus pending items in a shared work queue, never a
+  sequential batch's own backlog) at or above PRESSURE_HIGH move down a
+  size, as does a job whose deadline is near. On a GPU, pressure never
+  goes below PRESSURE_FLOOR_MODEL.
+
+Draft then upgrade (LENS_DRAFT_TRANSCRIBE=1, or `draft_transcribe: true`
+on a job): fresh calls are transcribed with DRAFT_MODEL so insights and
+publishing don't wait, and an upgrade_transcript step re-transcribes with
+UPGRADE_MODEL at backfill priority and replaces the draft.
+
+A fixed model (job `transcribe_model`, or WHISPERX_MODEL other than
+'auto') bypasses the policy.
+
+Usage:
+    from lib.model_policy import transcription_plan
+
+    plan = transcription_plan(job, 'input/source.mp4', pending=3)
+    cmd += ['--model', plan['model'], '--compute-type', plan['compute_type']]
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .audio_activity import decode_pcm, window_db
+from .gpu_lane import GPU_LANE_DIR
+from .leases import LEASE_SECONDS
+from .priority import FRESH_DAYS, PRIORITY_LEVELS, URGENT_SECONDS, job_deadline, job_priority, job_published_at
+
+MODEL_SIZES = ['tiny', 'small', 'medium', 'large-v2']
+BASE_MODEL = 'medium'
+
+WHISPERX_MODEL = os.getenv('WHISPERX_MODEL', 'auto')
+
+DRAFT_TRANSCRIBE = os.getenv('LENS_DRAFT_TRANSCRIBE', '0') == '1'
+DRAFT_MODEL = 'small'
+UPGRADE_MODEL = 'large-v2'
+
+# Audio thresholds
+SHORT_SECONDS = 20 * 60
+LONG_SECONDS = 90 * 60
+LOW_SNR_DB = 15.0
+CLEAN_SNR_DB = 30.0
+LOW_SPEECH_RATIO = 0.5
+
+# Transcriptions waiting at which the policy trades accuracy for throughput
+PRESSURE_HIGH = int(os.getenv('LENS_TRANSCRIBE_PRESSURE', '6'))
+PRESSURE_FLOOR_MODEL = 'small'
+
+# GPUs below this are capped at medium with int8_float16
+SMALL_GPU_MB = 8000
+
+# Scan: 8 kHz levels in 50 ms windows; speech is SPEECH_MARGIN_DB above the noise floor
+SCAN_SAMPLE_RATE = 8000
+SCAN_WINDOW_SECONDS = 0.05
+SPEECH_MARGIN_DB = 10.0
+
+
+@dataclass
+class AudioScan:
+    """Quick audio statistics for model selection"""
+    duration_seconds: float
+    speech_ratio: float
+    snr_db: float
+
+
+@dataclass
+class ModelChoice:
+    model: str
+    compute_type: str
+    reason: str
+
+
+def scan_audio(media_path: Path) -> AudioScan:
+    """
+    Duration, speech ratio and SNR estimate from windowed PCM levels
+
+    The noise floor is the 10th percentile window level; windows
+    SPEECH_MARGIN_DB above it count as speech, and the SNR is the median
+    speech level over the floor.
+    """
+    samples = decode_pcm(str(media_path), sample_rate=SCAN_SAMPLE_RATE)
+    levels = window_db(samples, SCAN_SAMPLE_RATE, SCAN_WINDOW_SECONDS)
+    duration = len(samples) / SCAN_SAMPLE_RATE
+    if not len(levels):
+        return AudioScan(duration_seconds=duration, speech_ratio=0.0, snr_db=0.0)
+
+    floor = float(np.percentile(levels, 10))
+    speech = levels >= floor + SPEECH_MARGIN_DB
+    snr = float(np.median(levels[speech]) - floor) if speech.any() else 0.0
+    return AudioScan(duration_seconds=round(duration, 1), speech_ratio=round(float(speech.mean()), 3),
+                     snr_db=round(snr, 1))
+
+
+def gpu_memory_mb() -> Optional[float]:
+    """Total memory of the first GPU from nvidia-smi (None without a GPU)"""
+    if not shutil.which('nvidia-smi'):
+        return None
+    try:
+        out = subprocess.run(['nvidia-smi', '--query-gpu=memory.total', '--format=csv,noheader,nounits'],
+                             capture_output=True, text=True, timeout=10)
+        return float(out.stdout.split()[0]) if out.returncode == 0 else None
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        return None
+
+
+def waiting_transcriptions(lane_dir: Path = GPU_LANE_DIR) -> int:
+    """Live GPU lane tickets (transcriptions waiting for a slot on this host)"""
+    waiting_dir = Path(lane_dir) / 'waiting'
+    if not waiting_dir.is_dir():
+        return 0
+    now = time.time()
+    count = 0
+    for path in waiting_dir.glob('*.json'):
+        try:
+            if now - path.stat().st_mtime <= LEASE_SECONDS:
+                count += 1
+        except FileNotFoundError:
+            continue
+    return count
+
+
+def choose_model(scan: AudioScan, gpu_mb: Optional[float], pending: int = 0, urgent: bool = False) -> ModelChoice:
+    """
+    Model size and compute type for one transcription
+
+    Args:
+        scan: Audio statistics (scan_audio)
+        gpu_mb: GPU memory in MB (None: CPU)
+        pending: Transcriptions waiting for the GPU alongside this one
+        urgent: Deadline is near
+
+    Returns:
+        ModelChoice with a short reason
+    """
+    reasons: List[str] = []
+    level = MODEL_SIZES.index(BASE_MODEL)
+
+    if gpu_mb is None:
+        level = MODEL_SIZES.index('small')
+        reasons.append('cpu')
+        if pending >= PRESSURE_HIGH or scan.duration_seconds >= LONG_SECONDS:
+            level -= 1
+            reasons.append('cpu backlog' if pending >= PRESSURE_HIGH else 'long on cpu')
+        return ModelChoice(MODEL_SIZES[level], 'int8', ', '.join(reasons))
+
+    if scan.snr_db < LOW_SNR_DB or scan.speech_ratio < LOW_SPEECH_RATIO:
+        level += 1
+        reasons.append(f"hard audio (snr {scan.snr_db:.0f} dB, speech {scan.speech_ratio:.0%})")
+    elif scan.duration_seconds <= SHORT_SECONDS:
+        level += 1
+        reasons.append(f"short ({scan.duration_seconds / 60:.0f} min)")
+
+    if pending >= PRESSURE_HIGH:
+        level -= 1
+        reasons.append(f"{pending} waiting")
+        if scan.duration_seconds >= LONG_SECONDS and scan.snr_db >= CLEAN_SNR_DB:
+            level -= 1
+            reasons.append('long clean audio')
+    if urgent:
+        level -= 1
+        reasons.append('deadline near')
+    level = max(level, MODEL_SIZES.index(PRESSURE_FLOOR_MODEL))
+
+    compute_type = 'float16'
+    cap = len(MODEL_SIZES) - 1
+    if gpu_mb < SMALL_GPU_MB:
+        cap = MODEL_SIZES.index('medium')
+        compute_type = 'int8_float16'
+        reasons.append(f"{gpu_mb / 1024:.0f} GB GPU")
+
+    level = max(0, min(level, cap))
+    return ModelChoice(MODEL_SIZES[level], compute_type, ', '.join(reasons) or 'default')
+
+
+def wants_draft(job: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """Draft-then-upgrade applies: enabled (env or job) and the call is fresh or hot"""
+    enabled = job.get('draft_transcribe')
+    if enabled is None:
+        enabled = DRAFT_TRANSCRIBE
+    if not enabled:
+        return False
+    now = now if now is not None else time.time()
+    published = job_published_at(job)
+    fresh = published is not None and now - published < FRESH_DAYS * 86400
+    return fresh or job_priority(job, now) >= PRIORITY_LEVELS['hot']
+
+
+def transcription_plan(job: Dict[str, Any], media_path: Path, pending: Optional[int] = None,
+                       gpu_mb: Optional[float] = -1.0) -> Dict[str, Any]:
+    """
+    Model choice for a job's transcription (stored on the job as `transcription`)
+
+    Args:
+        job: Batch job entry or job.yaml dict
+        media_path: Audio or video to transcribe
+        pending: Other transcriptions waiting for the GPU, e.g. pending queue
+            items (added to GPU lane tickets)
+        gpu_mb: GPU memory in MB, None for CPU (default: nvidia-smi)
+
+    Returns:
+        {'model', 'compute_type', 'reason', 'scan', 'draft', 'upgrade_model', 'upgrade_compute_type'}
+    """
+    if gpu_mb == -1.0:
+        gpu_mb = gpu_memory_mb()
+    default_compute = 'int8' if gpu_mb is None else 'float16'
+
+    fixed = job.get('transcribe_model') or (WHISPERX_MODEL if WHISPERX_MODEL != 'auto' else None)
+    if fixed:
+        return {'model': fixed, 'compute_type': default_compute, 'reason': 'fixed', 'draft': False}
+
+    scan = scan_audio(media_path)
+    pending = (pending or 0) + waiting_transcriptions()
+    deadline = job_deadline(job)
+    urgent = deadline is not None and deadline - time.time() < URGENT_SECONDS
+    choice = choose_model(scan, gpu_mb, pending=pending, urgent=urgent)
+    plan = {'model': choice.model, 'compute_type': choice.compute_type, 'reason': choice.reason,
+            'scan': asdict(scan), 'draft': False}
+
+    if gpu_mb is not None and wants_draft(job) and MODEL_SIZES.index(choice.model) > MODEL_SIZES.index(DRAFT_MODEL):
+        upgrade = UPGRADE_MODEL if gpu_mb >= SMALL_GPU_MB else 'medium'
+        plan.update({
+            'model': DRAFT_MODEL,
+            'reason': f"draft for fresh call ({choice.reason})",
+            'draft': True,
+            'upgrade_model': upgrade,
+            'upgrade_compute_type': choice.compute_type,
+        })
+    return plan
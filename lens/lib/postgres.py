@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Connect psql from a DATABASE_URL without putting the password on its command line
+
+A URL argument shows up in the process table (ps) and in exec spans
+(lib/tracing.py); libpq reads the same settings from PG* environment
+variables instead.
+
+Usage:
+    from lib.postgres import libpq_env
+
+    subprocess.run(['psql', '-f', sql_file], env={**os.environ, **libpq_env(database_url)})
+"""
+
+from typing import Dict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def libpq_env(database_url: str) -> Dict[str, str]:
+    """PGHOST/PGPORT/PGUSER/PGPASSWORD/PGDATABASE (and PGSSLMODE) for a postgresql:// URL"""
+    parts = urlsplit(database_url)
+    env = {}
+    if parts.hostname:
+        env['PGHOST'] = unquote(parts.hostname)
+    if parts.port:
+        env['PGPORT'] = str(parts.port)
+    if parts.username:
+        env['PGUSER'] = unquote(parts.username)
+    if parts.password:
+        env['PGPASSWORD'] = unquote(parts.password)
+    if parts.path.lstrip('/'):
+        env['PGDATABASE'] = unquote(parts.path.lstrip('/'))
+    sslmode = parse_qs(parts.query).get('sslmode')
+    if sslmode:
+        env['PGSSLMODE'] = sslmode[-1]
+    return env
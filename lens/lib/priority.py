@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Job priorities and deadlines
+
+A job's priority (higher runs sooner) is either set explicitly - a number or
+one of PRIORITY_LEVELS ('hot', 'backfill', ...) in the job's `priority`
+field - or derived from:
+
+- Company size: market cap from companies_master.csv metadata (ticker from
+  the fuzzy match, the job's company, or the LLM's detected ticker), in
+  tiers from micro to mega cap.
+- Freshness: calls published within LENS_FRESH_DAYS get FRESH_BONUS, so a
+  just-released call outranks a backfill of old ones.
+
+An optional `deadline` (ISO timestamp) orders jobs of equal priority
+earliest-deadline-first, and once a deadline is less than URGENT_SECONDS
+away the job jumps ahead of everything without one (URGENT_BOOST).
+
+Usage:
+    from lib.priority import job_priority, job_deadline, schedule_key
+
+    jobs.sort(key=lambda job: schedule_key(job_priority(job), job_deadline(job)))
+"""
+
+import csv
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+PRIORITY_LEVELS = {'hot': 90, 'high': 70, 'normal': 40, 'low': 20, 'backfill': 10}
+DEFAULT_PRIORITY = PRIORITY_LEVELS['normal']
+
+# (minimum market cap, priority) - mega, large, mid, small, micro
+MARKET_CAP_TIERS = [(200e9, 60), (10e9, 50), (2e9, 40), (300e6, 30), (0, 20)]
+
+FRESH_DAYS = float(os.getenv('LENS_FRESH_DAYS', '14'))
+FRESH_BONUS = 30
+
+URGENT_SECONDS = 3600
+URGENT_BOOST = 100
+
+COMPANIES_CSV = Path(__file__).parent.parent.parent / 'data' / 'companies_master.csv'
+
+
+@lru_cache(maxsize=4)
+def market_caps(companies_csv: Path = COMPANIES_CSV) -> Dict[str, float]:
+    """Ticker → market cap from companies_master.csv metadata"""
+    caps = {}
+    if not companies_csv.exists():
+        return caps
+    with open(companies_csv, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            cap = json.loads(row.get('metadata_json') or '{}').get('market_cap')
+            if cap:
+                caps[row['symbol'].upper()] = float(cap)
+    return caps
+
+
+def parse_priority(value: Any) -> Optional[int]:
+    """Explicit priority: a number or a PRIORITY_LEVELS name (None if unset)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str) and value.lower() in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value.lower()]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid priority {value!r} (number or one of {', '.join(PRIORITY_LEVELS)})")
+
+
+def parse_time(value: Any) -> Optional[float]:
+    """ISO timestamp (naive = local time), datetime or epoch → epoch seconds"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return value.timestamp()
+
+
+def job_ticker(job: Dict[str, Any]) -> Optional[str]:
+    """Best known ticker for a batch or workflow job"""
+    candidates = [
+        (job.get('company_match') or {}).get('symbol'),
+        job.get('ticker'),
+        (job.get('company') or {}).get('ticker') if isinstance(job.get('company'), dict) else None,
+        (job.get('insights') or {}).get('company_ticker'),
+    ]
+    return next((t.upper() for t in candidates if t), None)
+
+
+def job_published_at(job: Dict[str, Any]) -> Optional[float]:
+    """When the call was published (epoch), if known"""
+    for value in (job.get('published_at'), (job.get('youtube_metadata') or {}).get('published_at')):
+        try:
+            published = parse_time(value)
+        except ValueError:
+            continue
+        if published is not None:
+            return published
+    return None
+
+
+def job_priority(job: Dict[str, Any], now: Optional[float] = None) -> int:
+    """
+    Scheduling priority of a job (higher runs sooner)
+
+    Args:
+        job: Batch job entry or job.yaml dict
+        now: Current epoch (default: time.time())
+
+    Returns:
+        Explicit `priority` if set, else market-cap tier + freshness bonus
+    """
+    explicit = parse_priority(job.get('priority'))
+    if explicit is not None:
+        return explicit
+
+    ticker = job_ticker(job)
+    cap = market_caps().get(ticker) if ticker else None
+    if cap is None:
+        priority = DEFAULT_PRIORITY
+    else:
+        priority = next(p for minimum, p in MARKET_CAP_TIERS if cap >= minimum)
+
+    published = job_published_at(job)
+    now = now if now is not None else time.time()
+    if published is not None and now - published < FRESH_DAYS * 86400:
+        priority += FRESH_BONUS
+    return priority
+
+
+def job_deadline(job: Dict[str, Any]) -> Optional[float]:
+    """Job deadline (epoch), if set"""
+    return parse_time(job.get('deadline'))
+
+
+def effective_priority(priority: int, deadline: Optional[float], now: Optional[float] = None) -> int:
+    """Priority with URGENT_BOOST once the deadline is near (or missed)"""
+    now = now if now is not None else time.time()
+    if deadline is not None and deadline - now < URGENT_SECONDS:
+        return priority + URGENT_BOOST
+    return priority
+
+
+def schedule_key(priority: int, deadline: Optional[float], order: Union[int, float, str] = 0,
+                 now: Optional[float] = None) -> tuple:
+    """Sort key: effective priority desc, then earliest deadline, then FIFO `order`"""
+    return (-effective_priority(priority, deadline, now), deadline if deadline is not None else math.inf, order)
+
+
+def format_deadline(deadline: Optional[float]) -> str:
+    if deadline is None:
+        return '-'
+    return datetime.fromtimestamp(deadline, tz=timezone.utc).astimezone().isoformat(timespec='minutes')
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Fast JSON/YAML serialization for job and artifact files
+
+Every stage round-trips job.yaml and large JSON artifacts (transcripts,
+insights). This module is the one place that decides how:
+
+- JSON goes through orjson when installed (several times faster than the
+  stdlib for both parsing and writing), otherwise the stdlib json module.
+  Both write UTF-8 with non-ASCII kept and a 2-space indent, and parse to
+  the same values, but the bytes can differ: orjson writes floats in
+  shortest form (1e-07 → 1e-7, 1e+20 → 1e20) and writes NaN and ±Infinity
+  as null, where the stdlib writes the non-standard NaN/Infinity tokens.
+  Readers comparing files byte for byte, or relying on NaN surviving a
+  round trip, must not assume the stdlib's output.
+- YAML uses libyaml's CSafeLoader/CSafeDumper when PyYAML was built with
+  it, otherwise the pure-Python SafeLoader/SafeDumper. The emitted YAML is
+  the same either way.
+- File writes go to a temp file and are renamed into place, so a crash
+  mid-write never leaves a truncated job.yaml or transcript.json.
+
+Usage:
+    from lib.serialization import read_json, write_json, read_yaml, write_yaml
+
+    job = read_yaml(job_dir / 'job.yaml')
+    write_json(job_dir / 'job.json', job)
+
+Benchmark: python lens/scripts/benchmark_serialization.py <transcript.json>
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+YAML_BACKEND = 'libyaml' if YamlLoader is not yaml.SafeLoader else 'pyyaml'
+
+PathLike = Union[str, Path]
+
+
+def _atomic_write(path: PathLike, data: bytes) -> None:
+    """Write bytes to a temp file next to path and rename it into place"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+# =============================================================================
+# JSON
+# =============================================================================
+
+def dumps_json(data: Any, indent: bool = True, default: Optional[Callable] = None) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes
+
+    Args:
+        data: Object to serialize (numpy arrays/scalars are supported with orjson)
+        indent: Pretty-print with 2-space indent (as the pipeline's files are)
+        default: Fallback for unsupported types (as in json.dumps)
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+
+    return json.dumps(
+        data,
+        indent=2 if indent else None,
+        ensure_ascii=False,
+        default=default
+    ).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: PathLike) -> Any:
+    """Load a JSON file"""
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+def write_json(path: PathLike, data: Any, indent: bool = True, default: Optional[Callable] = None) -> None:
+    """
+    Write a JSON file atomically
+
+    Args:
+        path: Output file
+        data: Object to serialize
+        indent: Pretty-print with 2-space indent
+        default: Fallback for unsupported types
+    """
+    _atomic_write(path, dumps_json(data, indent=indent, default=default))
+
+
+# =============================================================================
+# YAML
+# =============================================================================
+
+def loads_yaml(text: Union[bytes, str]) -> Any:
+    """Parse YAML (safe subset)"""
+    return yaml.load(text, Loader=YamlLoader)
+
+
+def dumps_yaml(data: Any, sort_keys: bool = False) -> str:
+    """Serialize to block-style YAML (key order preserved, Unicode kept)"""
+    return yaml.dump(
+        data,
+        Dumper=YamlDumper,
+        default_flow_style=False,
+        sort_keys=sort_keys,
+        allow_unicode=True
+    )
+
+
+def read_yaml(path: PathLike) -> Any:
+    """Load a YAML file"""
+    with open(path, 'rb') as f:
+        return loads_yaml(f.read())
+
+
+def write_yaml(path: PathLike, data: Any, sort_keys: bool = False) -> None:
+    """Write a YAML file atomically"""
+    _atomic_write(path, dumps_yaml(data, sort_keys=sort_keys).encode('utf-8'))
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Per-company speaker voice store: label diarization clusters by voice
+
+The same CEO and CFO speak on every call, yet each call's SPEAKER_00,
+SPEAKER_01... were named from scratch by the LLM. Diarization now keeps
+one embedding per cluster (transcript.speakers.npz next to
+transcript.json). After insights name the speakers, their embeddings are
+enrolled under the company's ticker; on the next call, clusters are
+matched against the enrolled voices (cosine similarity over a NumPy
+matrix) and labeled before the LLM runs, so the prompt only has to name
+the speakers nobody has heard before.
+
+Layout (SPEAKER_STORE_DIR, default /var/markethawk/_speakers):
+
+    <TICKER>/voices.npy    float32 (rows, dim), L2-normalized
+    <TICKER>/voices.json   one entry per row: name, role, job_id, added_at
+
+Each name keeps its SAMPLES_PER_SPEAKER most recent embeddings (mics and
+rooms change); a cluster matches a name by its best sample, and names are
+assigned one-to-one, best score first, above MATCH_THRESHOLD.
+
+A re-transcription of the same audio (draft upgrade) diarizes again and
+may number the speakers differently; align_speaker_labels renames its
+labels to the earlier transcript's by time overlap, so insights and
+speaker mappings made from the earlier labels stay valid.
+
+Usage:
+    from lib.speaker_store import enroll_speakers, label_speakers
+
+    known = label_speakers(transcript_file, 'NVDA')  # {'SPEAKER_01': {'name': ..., 'role': ..., 'score': ...}}
+    enroll_speakers(transcript_file, 'NVDA', insights['speakers'], job_id)
+"""
+
+import fcntl
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .serialization import read_json, write_json
+
+SPEAKER_STORE_DIR = Path(os.getenv('SPEAKER_STORE_DIR', '/var/markethawk/_speakers'))
+MATCH_THRESHOLD = float(os.getenv('SPEAKER_MATCH_THRESHOLD', '0.7'))
+SAMPLES_PER_SPEAKER = 5
+
+# Diarization hints: regulars are voices heard on two or more of the company's
+# last RECENT_CALLS enrolled calls; MAX_EXTRA_SPEAKERS allows for analysts and the operator
+RECENT_CALLS = 4
+MAX_EXTRA_SPEAKERS = 10
+
+UNKNOWN_NAMES = {'', 'unknown', 'operator'}
+
+
+def embeddings_path(transcript_path: Path) -> Path:
+    """transcript.json → transcript.speakers.npz"""
+    transcript_path = Path(transcript_path)
+    return transcript_path.with_name(f"{transcript_path.stem}.speakers.npz")
+
+
+def write_embeddings(transcript_path: Path, embeddings: Dict[str, Any]) -> None:
+    """Save one embedding per diarization label next to transcript.json"""
+    labels = sorted(embeddings)
+    path = embeddings_path(transcript_path)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}.npz")
+    np.savez(tmp, labels=np.array(labels),
+             embeddings=np.array([np.asarray(embeddings[label], dtype=np.float32) for label in labels]))
+    os.replace(tmp, path)
+
+
+def read_embeddings(transcript_path: Path) -> Dict[str, np.ndarray]:
+    """Diarization label → embedding ({} when diarization kept none)"""
+    path = embeddings_path(transcript_path)
+    if not path.exists():
+        return {}
+    with np.load(path) as data:
+        return {str(label): vector for label, vector in zip(data['labels'], data['embeddings'])}
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+class SpeakerStore:
+    """Enrolled voices of one company"""
+
+    def __init__(self, ticker: str, root: Path = SPEAKER_STORE_DIR):
+        """
+        Args:
+            ticker: Company ticker (store key)
+            root: Store directory
+        """
+        self.ticker = ticker.upper()
+        self.dir = Path(root) / self.ticker
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+        self.rows: List[Dict[str, Any]] = []
+        self.load()
+
+    def load(self) -> None:
+        if (self.dir / 'voices.npy').exists() and (self.dir / 'voices.json').exists():
+            self.vectors = np.load(self.dir / 'voices.npy')
+            self.rows = json.loads((self.dir / 'voices.json').read_text())
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def speakers(self) -> Dict[str, Dict[str, Any]]:
+        """name → {'role', 'samples', 'calls'}"""
+        summary: Dict[str, Dict[str, Any]] = {}
+        for row in self.rows:
+            entry = summary.setdefault(row['name'], {'role': row.get('role'), 'samples': 0, 'calls': set()})
+            entry['samples'] += 1
+            entry['calls'].add(row.get('job_id'))
+            entry['role'] = row.get('role') or entry['role']
+        return {name: {**entry, 'calls': len(entry['calls'])} for name, entry in summary.items()}
+
+    def match(self, embeddings: Dict[str, np.ndarray], threshold: float = MATCH_THRESHOLD) -> Dict[str, Dict[str, Any]]:
+        """
+        Label diarization clusters with enrolled names
+
+        Args:
+            embeddings: Diarization label → embedding
+            threshold: Minimum cosine similarity
+
+        Returns:
+            {label: {'name', 'role', 'score'}} for matched labels (each name used once)
+        """
+        if not self.rows or not embeddings:
+            return {}
+        labels = sorted(embeddings)
+        queries = _normalize([embeddings[label] for label in labels])
+        if queries.shape[1] != self.vectors.shape[1]:
+            return {}  # different embedding model
+        similarity = queries @ self.vectors.T
+
+        # Best sample per (label, name)
+        names = sorted({row['name'] for row in self.rows})
+        columns = {name: [i for i, row in enumerate(self.rows) if row['name'] == name] for name in names}
+        scores = np.stack([similarity[:, columns[name]].max(axis=1) for name in names], axis=1)
+        roles = {row['name']: row.get('role') for row in self.rows}
+
+        matched = {}
+        used_names = set()
+        for flat in np.argsort(scores, axis=None)[::-1]:
+            i, j = np.unravel_index(flat, scores.shape)
+            if scores[i, j] < threshold:
+                break
+            if labels[i] in matched or names[j] in used_names:
+                continue
+            matched[labels[i]] = {'name': names[j], 'role': roles[names[j]], 'score': round(float(scores[i, j]), 3)}
+            used_names.add(names[j])
+        return matched
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive lock for read-modify-write across processes and hosts"""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.dir / '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.load()
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def enroll(self, samples: Iterable[Dict[str, Any]], job_id: Optional[str] = None) -> int:
+        """
+        Add named embeddings, keeping each name's SAMPLES_PER_SPEAKER newest
+
+        Args:
+            samples: {'name', 'role', 'embedding'} dicts
+            job_id: Source job (a job enrolls a name once)
+
+        Returns:
+            Number of embeddings added
+        """
+        with self._locked():
+            vectors = list(self.vectors) if len(self.rows) else []
+            rows = list(self.rows)
+            added = 0
+            for sample in samples:
+                if job_id and any(r['name'] == sample['name'] and r.get('job_id') == job_id for r in rows):
+                    continue
+                vector = _normalize(sample['embedding'])[0]
+                if vectors and vector.shape != vectors[0].shape:
+                    continue  # different embedding model
+                vectors.append(vector)
+                rows.append({'name': sample['name'], 'role': sample.get('role'), 'job_id': job_id,
+                             'added_at': datetime.now().isoformat(timespec='seconds')})
+                added += 1
+
+                # Drop the oldest samples of this name beyond the cap
+                own = [i for i, r in enumerate(rows) if r['name'] == sample['name']]
+                for i in reversed(own[:-SAMPLES_PER_SPEAKER]):
+                    del rows[i], vectors[i]
+
+            if added:
+                self.vectors = np.array(vectors, dtype=np.float32)
+                self.rows = rows
+                tmp = self.dir / f".voices.{os.getpid()}.npy"
+                np.save(tmp, self.vectors)
+                os.replace(tmp, self.dir / 'voices.npy')
+                write_json(self.dir / 'voices.json', self.rows)
+            return added
+
+
+def label_speakers(transcript_path: Path, ticker: Optional[str],
+                   root: Path = SPEAKER_STORE_DIR) -> Dict[str, Dict[str, Any]]:
+    """Voice-matched names for a transcript's speakers ({} without ticker, store or embeddings)"""
+    if not ticker:
+        return {}
+    embeddings = read_embeddings(transcript_path)
+    if not embeddings:
+        return {}
+    return SpeakerStore(ticker, root).match(embeddings)
+
+
+def enroll_speakers(transcript_path: Path, ticker: Optional[str], speakers: Iterable[Dict[str, Any]],
+                    job_id: Optional[str] = None, root: Path = SPEAKER_STORE_DIR) -> int:
+    """
+    Enroll named speakers (insights `speakers`: speaker_id, speaker_name, role) by their embeddings
+
+    Returns:
+        Number of embeddings added
+    """
+    if not ticker:
+        return 0
+    embeddings = read_embeddings(transcript_path)
+    samples = [
+        {'name': s['speaker_name'], 'role': s.get('role'), 'embedding': embeddings[s['speaker_id']]}
+        for s in speakers
+        if s.get('speaker_id') in embeddings and (s.get('speaker_name') or '').strip().lower() not in UNKNOWN_NAMES
+    ]
+    if not samples:
+        return 0
+    return SpeakerStore(ticker, root).enroll(samples, job_id=job_id)
+
+
+def diarization_hints(ticker: Optional[str], root: Path = SPEAKER_STORE_DIR) -> Dict[str, int]:
+    """
+    max_speakers for diarization from the company's regular speakers
+
+    Voices heard on two or more of the last RECENT_CALLS calls bound the
+    cluster-count search from above. No min_speakers: a regular who is not
+    on this call (a CFO who left) would force a spurious cluster. Empty
+    when there are no regulars.
+    """
+    if not ticker:
+        return {}
+    rows = SpeakerStore(ticker, root).rows
+    last_added: Dict[Any, str] = {}
+    for row in rows:
+        last_added[row.get('job_id')] = max(last_added.get(row.get('job_id'), ''), row.get('added_at') or '')
+    recent = set(sorted(last_added, key=last_added.get)[-RECENT_CALLS:])
+
+    calls: Dict[str, set] = {}
+    for row in rows:
+        if row.get('job_id') in recent:
+            calls.setdefault(row['name'], set()).add(row.get('job_id'))
+    regulars = sum(1 for jobs in calls.values() if len(jobs) >= 2)
+    if regulars < 2:
+        return {}
+    return {'max_speakers': regulars + MAX_EXTRA_SPEAKERS}
+
+
+def _timed_segments(transcript: Dict[str, Any]) -> List[Tuple[float, float, str]]:
+    return sorted((seg['start'], seg['end'], seg['speaker']) for seg in transcript.get('segments', [])
+                  if seg.get('speaker') and seg.get('start') is not None and seg.get('end') is not None)
+
+
+def speaker_label_map(transcript: Dict[str, Any], reference: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map a transcript's speaker labels onto a reference transcript of the same audio
+
+    Labels are paired one-to-one, most shared speaking time first; a label
+    with no counterpart gets a SPEAKER_nn number the reference doesn't use.
+
+    Returns:
+        {label: reference label} for every label in transcript
+    """
+    ours, theirs = _timed_segments(transcript), _timed_segments(reference)
+    overlap: Dict[Tuple[str, str], float] = {}
+    j = 0
+    for start, end, label in ours:
+        while j < len(theirs) and theirs[j][1] <= start:
+            j += 1
+        for ref_start, ref_end, ref_label in theirs[j:]:
+            if ref_start >= end:
+                break
+            shared = min(end, ref_end) - max(start, ref_start)
+            if shared > 0:
+                overlap[label, ref_label] = overlap.get((label, ref_label), 0.0) + shared
+
+    mapping: Dict[str, str] = {}
+    for (label, ref_label), _ in sorted(overlap.items(), key=lambda kv: kv[1], reverse=True):
+        if label not in mapping and ref_label not in mapping.values():
+            mapping[label] = ref_label
+
+    taken = {label for _, _, label in theirs} | set(mapping.values())
+    numbers = [int(m.group(1)) for m in (re.fullmatch(r'SPEAKER_(\d+)', label) for label in taken) if m]
+    next_number = max(numbers, default=-1) + 1
+    for label in sorted({label for _, _, label in ours} - set(mapping)):
+        mapping[label] = f"SPEAKER_{next_number:02d}"
+        next_number += 1
+    return mapping
+
+
+def align_speaker_labels(transcript_path: Path, reference_path: Path) -> Dict[str, str]:
+    """
+    Rename speakers in transcript.json (and its paragraphs and embeddings) to match a reference transcript
+
+    Args:
+        transcript_path: Re-transcribed transcript.json (rewritten in place)
+        reference_path: Earlier transcript.json of the same audio
+
+    Returns:
+        The label mapping applied ({} when there was nothing to align)
+    """
+    transcript_path = Path(transcript_path)
+    transcript = read_json(transcript_path)
+    mapping = speaker_label_map(transcript, read_json(reference_path))
+    if all(label == new for label, new in mapping.items()):
+        return {}
+
+    def rename(entries: Iterable[Dict[str, Any]]) -> None:
+        for entry in entries:
+            if entry.get('speaker') in mapping:
+                entry['speaker'] = mapping[entry['speaker']]
+
+    for segment in transcript.get('segments', []):
+        rename([segment])
+        rename(segment.get('words', []))
+    rename(transcript.get('word_segments', []))
+    write_json(transcript_path, transcript)
+
+    paragraphs_path = transcript_path.with_name(f"{transcript_path.stem}.paragraphs.json")
+    if paragraphs_path.exists():
+        paragraphs = read_json(paragraphs_path)
+        rename(paragraphs.get('paragraphs', []))
+        write_json(paragraphs_path, paragraphs)
+
+    embeddings = read_embeddings(transcript_path)
+    if embeddings:
+        write_embeddings(transcript_path, {mapping[label]: vector for label, vector in embeddings.items() if label in mapping})
+    return mapping
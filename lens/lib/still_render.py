@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Render profiles for still-image videos (banner + audio)
+
+A banner video has one distinct frame for the whole call, so it is encoded at
+1 fps with -tune stillimage and a selectable x264 preset/CRF. When the audio
+is already AAC it is stream-copied instead of re-encoded. Duration and size
+are parsed from ffmpeg's -progress output, so no ffprobe pass is needed after
+the render.
+
+Banner tracks are cached: a short looping H.264 segment is encoded once per
+(banner image, profile, filter) and stored under BANNER_CACHE_DIR. A render
+then loops that segment with -stream_loop against the job's audio using
+stream copy, so a 60-minute call is a remux rather than a re-encode, and a
+banner reused across a company's quarters is never encoded twice.
+
+Usage:
+    from lib.still_render import get_render_profile, render_still_video
+
+    profile = get_render_profile('fast')
+    result = render_still_video(banner_path, audio_path, output_path, profile)
+"""
+
+import hashlib
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """x264 settings for a still-image render"""
+    name: str
+    preset: str
+    crf: int
+    framerate: int = 1
+    keyframe_seconds: int = 10  # Seek granularity in players
+    audio_bitrate: str = '192k'
+
+
+RENDER_PROFILES: Dict[str, RenderProfile] = {
+    'fast': RenderProfile(name='fast', preset='ultrafast', crf=28),
+    'balanced': RenderProfile(name='balanced', preset='veryfast', crf=23),
+    'quality': RenderProfile(name='quality', preset='medium', crf=18),
+}
+
+DEFAULT_PROFILE = 'balanced'
+
+# Encoded banner segments, shared by all jobs
+BANNER_CACHE_DIR = Path(os.getenv('BANNER_CACHE_DIR', '/var/markethawk/_renders/banners'))
+
+
+def get_render_profile(
+    name: Optional[str] = None,
+    preset: Optional[str] = None,
+    crf: Optional[int] = None
+) -> RenderProfile:
+    """
+    Look up a render profile, with optional preset/CRF overrides
+
+    Args:
+        name: Profile name ('fast', 'balanced', 'quality'); defaults to
+            RENDER_PROFILE env var, then 'balanced'
+        preset: Override x264 preset
+        crf: Override x264 CRF
+
+    Returns:
+        RenderProfile
+
+    Raises:
+        ValueError: If profile name is unknown
+    """
+    name = name or os.getenv('RENDER_PROFILE', DEFAULT_PROFILE)
+    if name not in RENDER_PROFILES:
+        raise ValueError(
+            f"Unknown render profile: {name}\n"
+            f"Available profiles: {', '.join(RENDER_PROFILES.keys())}"
+        )
+
+    profile = RENDER_PROFILES[name]
+    if preset:
+        profile = replace(profile, preset=preset)
+    if crf is not None:
+        profile = replace(profile, crf=int(crf))
+    return profile
+
+
+def profile_from_job(job_data: Dict[str, Any]) -> RenderProfile:
+    """
+    Resolve render profile from workflow step inputs
+
+    Workflow YAML can set (all optional):
+        inputs:
+          render_profile: "fast"
+          preset: "veryfast"
+          crf: 23
+    """
+    inputs = job_data.get('_resolved_inputs', {})
+    return get_render_profile(
+        inputs.get('render_profile'),
+        preset=inputs.get('preset'),
+        crf=inputs.get('crf')
+    )
+
+
+def probe_audio_codec(media_path: Path) -> Optional[str]:
+    """Codec name of the first audio stream (e.g. 'aac', 'mp3'), None if no audio"""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'a:0',
+        '-show_entries', 'stream=codec_name',
+        '-of', 'default=noprint_wrappers=1:nokey=1',
+        str(media_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    codec = result.stdout.strip()
+    return codec or None
+
+
+def build_still_video_cmd(
+    image_path: Path,
+    audio_source: Path,
+    output_path: Path,
+    profile: RenderProfile,
+    copy_audio: bool = False,
+    video_filter: Optional[str] = None
+) -> List[str]:
+    """
+    Build ffmpeg command for a still image + audio render
+
+    Args:
+        image_path: Banner image (video track)
+        audio_source: Audio file or video file whose first audio stream is used
+        output_path: Output MP4
+        profile: RenderProfile
+        copy_audio: Stream-copy audio (source must already be AAC)
+        video_filter: Optional -vf filter chain (e.g. scale/crop to 1920x1080)
+
+    Returns:
+        ffmpeg argument list (progress written to stdout)
+    """
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-loop', '1',                                # Loop the banner image
+        '-framerate', str(profile.framerate),        # Read it at the output rate
+        '-i', str(image_path),                       # Input: banner image (video track)
+        '-i', str(audio_source),                     # Input: audio (or source video)
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+    ]
+
+    if video_filter:
+        cmd += ['-vf', video_filter]
+
+    cmd += [
+        '-c:v', 'libx264',
+        '-preset', profile.preset,
+        '-crf', str(profile.crf),
+        '-tune', 'stillimage',                       # Optimize for static image
+        '-r', str(profile.framerate),                # One frame per second is enough
+        '-g', str(profile.framerate * profile.keyframe_seconds),
+        '-pix_fmt', 'yuv420p',                       # Pixel format for compatibility
+    ]
+
+    if copy_audio:
+        cmd += ['-c:a', 'copy']
+    else:
+        cmd += ['-c:a', 'aac', '-b:a', profile.audio_bitrate]
+
+    cmd += [
+        '-shortest',                                 # End when audio ends
+        '-movflags', '+faststart',                   # Enable progressive streaming
+        '-progress', 'pipe:1',                       # Machine-readable progress on stdout
+        '-nostats',
+        '-y',
+        str(output_path)
+    ]
+    return cmd
+
+
+def run_ffmpeg_with_progress(cmd: List[str], label: str = 'Rendering') -> Dict[str, Any]:
+    """
+    Run ffmpeg with -progress pipe:1 and collect the encoder's final stats
+
+    Args:
+        cmd: ffmpeg command including '-progress pipe:1'
+        label: Prefix for progress lines
+
+    Returns:
+        Dict with duration_seconds, total_size_bytes, speed
+
+    Raises:
+        Exception: If ffmpeg exits non-zero
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+    stats: Dict[str, str] = {}
+    last_reported = -60.0
+
+    # stderr is drained on a thread so a chatty ffmpeg cannot block on a full pipe
+    stderr_lines: List[str] = []
+
+    def _drain_stderr():
+        for line in process.stderr:
+            stderr_lines.append(line)
+
+    stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    for line in process.stdout:
+        key, _, value = line.strip().partition('=')
+        if not key:
+            continue
+        stats[key] = value
+
+        if key == 'progress':
+            out_seconds = _out_time_seconds(stats)
+            if value == 'end' or out_seconds - last_reported >= 60:
+                print(f"   {label}: {out_seconds / 60:.1f} min encoded (speed {stats.get('speed', '?').strip()})")
+                last_reported = out_seconds
+
+    process.wait()
+    stderr_thread.join()
+
+    if process.returncode != 0:
+        raise Exception(f"FFmpeg render failed: {''.join(stderr_lines[-50:])}")
+
+    return {
+        'duration_seconds': _out_time_seconds(stats),
+        'total_size_bytes': int(stats.get('total_size', 0) or 0),
+        'speed': stats.get('speed', '').strip(),
+    }
+
+
+def _out_time_seconds(stats: Dict[str, str]) -> float:
+    """Encoded output time from progress keys (out_time_us, falling back to out_time_ms)"""
+    for key in ('out_time_us', 'out_time_ms'):
+        value = stats.get(key, '')
+        if value and value != 'N/A':
+            # Both keys are in microseconds (out_time_ms is misnamed in ffmpeg)
+            return max(0.0, int(value) / 1_000_000)
+    return 0.0
+
+
+def banner_track_key(
+    image_path: Path,
+    profile: RenderProfile,
+    video_filter: Optional[str] = None
+) -> str:
+    """
+    Cache key for an encoded banner track
+
+    Hashes the image bytes (not the path, since every job has its own
+    renders/banner.png) together with every setting that changes the encode.
+    """
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    settings = f"{profile.preset}|{profile.crf}|{profile.framerate}|{profile.keyframe_seconds}|{video_filter or ''}"
+    digest.update(settings.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def get_banner_track(
+    image_path: Path,
+    profile: RenderProfile,
+    video_filter: Optional[str] = None,
+    cache_dir: Optional[Path] = None
+) -> Tuple[Path, bool]:
+    """
+    Get the cached looping video segment for a banner, encoding it on a miss
+
+    The segment is exactly one GOP (keyframe_seconds long), so every loop
+    iteration starts on a keyframe and can be stream-copied back to back.
+
+    Args:
+        image_path: Banner image
+        profile: RenderProfile
+        video_filter: Optional -vf filter chain
+        cache_dir: Override BANNER_CACHE_DIR
+
+    Returns:
+        (segment path, True if it was already cached)
+    """
+    cache_dir = cache_dir or BANNER_CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    track_path = cache_dir / f"{banner_track_key(image_path, profile, video_filter)}.mp4"
+    if track_path.exists():
+        return track_path, True
+
+    gop = profile.framerate * profile.keyframe_seconds
+    cmd = [
+        'ffmpeg',
+        '-v', 'error',
+        '-nostdin',
+        '-loop', '1',
+        '-framerate', str(profile.framerate),
+        '-i', str(image_path),
+    ]
+    if video_filter:
+        cmd += ['-vf', video_filter]
+    cmd += [
+        '-frames:v', str(gop),                       # One GOP
+        '-c:v', 'libx264',
+        '-preset', profile.preset,
+        '-crf', str(profile.crf),
+        '-tune', 'stillimage',
+        '-r', str(profile.framerate),
+        '-g', str(gop),
+        '-pix_fmt', 'yuv420p',
+        '-an',
+        '-y',
+    ]
+
+    # Encode to a temp name and rename, so concurrent jobs never read a partial segment
+    tmp_path = track_path.with_name(f".{track_path.stem}.{os.getpid()}.mp4")
+    result = subprocess.run(cmd + [str(tmp_path)], capture_output=True, text=True)
+    if result.returncode != 0:
+        tmp_path.unlink(missing_ok=True)
+        raise Exception(f"FFmpeg banner track encode failed: {result.stderr}")
+    os.replace(tmp_path, track_path)
+
+    return track_path, False
+
+
+def build_banner_mux_cmd(
+    track_path: Path,
+    audio_source: Path,
+    output_path: Path,
+    profile: RenderProfile,
+    copy_audio: bool = False
+) -> List[str]:
+    """
+    Build ffmpeg command that loops a cached banner track under the audio
+
+    Video is stream-copied (no encode); audio is copied or encoded to AAC.
+
+    Returns:
+        ffmpeg argument list (progress written to stdout)
+    """
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-stream_loop', '-1',                        # Repeat banner segment indefinitely
+        '-i', str(track_path),                       # Input: cached banner track
+        '-i', str(audio_source),                     # Input: audio (or source video)
+        '-map', '0:v:0',
+        '-map', '1:a:0',
+        '-c:v', 'copy',                              # Remux only - no video encode
+    ]
+
+    if copy_audio:
+        cmd += ['-c:a', 'copy']
+    else:
+        cmd += ['-c:a', 'aac', '-b:a', profile.audio_bitrate]
+
+    cmd += [
+        '-shortest',                                 # End when audio ends
+        '-movflags', '+faststart',                   # Enable progressive streaming
+        '-progress', 'pipe:1',                       # Machine-readable progress on stdout
+        '-nostats',
+        '-y',
+        str(output_path)
+    ]
+    return cmd
+
+
+def render_still_video(
+    image_path: Path,
+    audio_source: Path,
+    output_path: Path,
+    profile: RenderProfile,
+    video_filter: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Render a still image + audio video using a render profile
+
+    Audio is stream-copied when the source's first audio stream is AAC,
+    otherwise encoded to AAC at the profile's bitrate. With use_cache, the
+    video track is a cached banner segment looped by stream copy.
+
+    Args:
+        image_path: Banner image
+        audio_source: Audio file or video file providing the audio track
+        output_path: Output MP4
+        profile: RenderProfile
+        video_filter: Optional -vf filter chain
+        use_cache: Loop a cached banner track instead of encoding the full video
+
+    Returns:
+        Dict with duration_seconds, file_size_bytes, audio_codec, audio_copied,
+        profile, preset, crf, framerate, banner_cache ('hit', 'miss' or 'off')
+    """
+    audio_codec = probe_audio_codec(audio_source)
+    copy_audio = audio_codec == 'aac'
+
+    print(f"   Profile: {profile.name} (preset={profile.preset}, crf={profile.crf}, {profile.framerate} fps)")
+    print(f"   Audio: {audio_codec or 'unknown'} → {'stream copy' if copy_audio else 'aac ' + profile.audio_bitrate}")
+
+    if use_cache:
+        track_path, cached = get_banner_track(image_path, profile, video_filter=video_filter)
+        banner_cache = 'hit' if cached else 'miss'
+        print(f"   Banner track: {track_path.name} ({'cached' if cached else 'encoded'}), remuxing")
+        cmd = build_banner_mux_cmd(track_path, audio_source, output_path, profile, copy_audio=copy_audio)
+    else:
+        banner_cache = 'off'
+        cmd = build_still_video_cmd(
+            image_path,
+            audio_source,
+            output_path,
+            profile,
+            copy_audio=copy_audio,
+            video_filter=video_filter
+        )
+
+    stats = run_ffmpeg_with_progress(cmd)
+
+    return {
+        'duration_seconds': stats['duration_seconds'],
+        'file_size_bytes': output_path.stat().st_size,
+        'encode_speed': stats['speed'],
+        'audio_codec': audio_codec,
+        'audio_copied': copy_audio,
+        'profile': profile.name,
+        'preset': profile.preset,
+        'crf': profile.crf,
+        'framerate': profile.framerate,
+        'banner_cache': banner_cache,
+    }
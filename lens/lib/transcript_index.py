@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Time index over WhisperX transcript segments and words
+
+Built once per job and shared by every stage that asks "which words are spoken
+in [t0, t1]?" or "who is speaking at t?" (shorts, timestamp refinement,
+captioning). Segments and words are kept in start-time order with parallel
+start arrays, so both queries are a bisect instead of a scan over the call.
+
+Usage:
+    from lib.transcript_index import TranscriptIndex, load_index
+
+    index = load_index(job_dir / 'transcripts' / 'transcript.json')
+    words = index.words_between(120.0, 135.0)
+    speaker = index.speaker_at(121.5)
+"""
+
+import json
+import os
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .transcript_store import TranscriptColumns, open_columns, write_sidecar
+
+
+class TranscriptIndex:
+    """Sorted segment/word index with O(log n) time-range queries"""
+
+    def __init__(self, transcript: Dict[str, Any]):
+        """
+        Build index from transcript.json data
+
+        Args:
+            transcript: WhisperX transcript dict with 'segments' (each with
+                optional word-level 'words')
+        """
+        self.transcript = transcript
+
+        self.segments: List[Dict[str, Any]] = sorted(
+            transcript.get('segments', []),
+            key=lambda s: s.get('start', 0)
+        )
+        self.segment_starts: List[float] = [s.get('start', 0) for s in self.segments]
+
+        # Running max of segment ends - monotonic, so overlap queries can bisect
+        # it even when segments overlap (e.g. crosstalk during Q&A)
+        self._max_ends: List[float] = []
+        running = float('-inf')
+        for segment in self.segments:
+            running = max(running, segment.get('end', 0))
+            self._max_ends.append(running)
+
+        # Flattened words across all segments (words without timing inherit the
+        # segment start, as WhisperX leaves some numerals unaligned)
+        self.words: List[Dict[str, Any]] = []
+        for segment in self.segments:
+            segment_start = segment.get('start', 0)
+            speaker = segment.get('speaker')
+            for word_obj in segment.get('words', []):
+                start = word_obj.get('start', segment_start)
+                self.words.append({
+                    'word': word_obj.get('word', ''),
+                    'start': start,
+                    'end': word_obj.get('end', start),
+                    'speaker': word_obj.get('speaker', speaker),
+                })
+        self.words.sort(key=lambda w: w['start'])
+        self.word_starts: List[float] = [w['start'] for w in self.words]
+        self._normalized_words: Optional[List[str]] = None
+
+    @classmethod
+    def from_columns(cls, columns: 'TranscriptColumns') -> 'TranscriptIndex':
+        """
+        Build index from a transcript's columnar sidecar (no JSON parse)
+
+        Same ordering as building from the dict; segments carry start, end,
+        text and speaker but not their word lists (words live in self.words).
+
+        Args:
+            columns: TranscriptColumns from lib.transcript_store.open_columns
+        """
+        index = cls.__new__(cls)
+        segments = columns.segments()
+        index.transcript = {'language': columns.summary.get('language'), 'segments': segments}
+
+        segment_order = np.argsort(columns.segment_start, kind='stable')
+        index.segments = [segments[i] for i in segment_order.tolist()]
+        index.segment_starts = [s['start'] for s in index.segments]
+        index._max_ends = np.maximum.accumulate(
+            np.asarray(columns.segment_end)[segment_order]
+        ).tolist() if len(segment_order) else []
+
+        # Word order: start time, ties kept in flattened (sorted segment) order
+        segment_rank = np.empty_like(segment_order)
+        segment_rank[segment_order] = np.arange(len(segment_order))
+        word_start = np.asarray(columns.word_start)
+        word_order = np.lexsort((
+            np.arange(len(word_start)),
+            segment_rank[np.asarray(columns.word_segment)],
+            word_start,
+        )).tolist()
+
+        texts = columns.word_text
+        starts = word_start.tolist()
+        ends = columns.word_end.tolist()
+        speakers = columns.word_speaker.tolist()
+        names = columns.speakers
+        index.words = [
+            {
+                'word': texts[i],
+                'start': starts[i],
+                'end': ends[i],
+                'speaker': names[speakers[i]] if speakers[i] >= 0 else None,
+            }
+            for i in word_order
+        ]
+        index.word_starts = [w['start'] for w in index.words]
+        index._normalized_words = None
+        return index
+
+    @classmethod
+    def of(cls, transcript: Union['TranscriptIndex', Dict[str, Any]]) -> 'TranscriptIndex':
+        """Return transcript as an index (builds one if given a raw dict)"""
+        if isinstance(transcript, cls):
+            return transcript
+        return cls(transcript)
+
+    @property
+    def normalized_words(self) -> List[str]:
+        """Lowercased, stripped word texts aligned with self.words (computed once)"""
+        if self._normalized_words is None:
+            self._normalized_words = [w['word'].lower().strip() for w in self.words]
+        return self._normalized_words
+
+    def words_between(self, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """
+        Words whose start falls in [start_time, end_time]
+
+        Returns:
+            Word dicts ({word, start, end, speaker}) in time order
+        """
+        lo = bisect_left(self.word_starts, start_time)
+        hi = bisect_right(self.word_starts, end_time)
+        return self.words[lo:hi]
+
+    def segments_between(self, start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """
+        Segments overlapping [start_time, end_time]
+
+        Returns:
+            Segment dicts in start-time order
+        """
+        lo = bisect_left(self._max_ends, start_time)
+        hi = bisect_right(self.segment_starts, end_time)
+        return [s for s in self.segments[lo:hi] if s.get('end', 0) >= start_time]
+
+    def segment_at(self, timestamp: float) -> Optional[Dict[str, Any]]:
+        """First segment containing timestamp (None if in a gap)"""
+        segments = self.segments_between(timestamp, timestamp)
+        return segments[0] if segments else None
+
+    def speaker_at(self, timestamp: float) -> Optional[str]:
+        """Speaker ID (e.g. 'SPEAKER_01') at timestamp (None if in a gap)"""
+        segment = self.segment_at(timestamp)
+        if segment is None:
+            return None
+        return segment.get('speaker', 'Unknown')
+
+
+# Most recently used indexes (a batch process walks many jobs; keep a few)
+INDEX_CACHE_SIZE = 4
+
+_index_cache: "OrderedDict[str, Tuple[Tuple[int, int], TranscriptIndex]]" = OrderedDict()
+
+
+def load_index(transcript_path: Path) -> TranscriptIndex:
+    """
+    Load transcript.json and build its index (cached per process)
+
+    The cache is keyed by path, size and mtime, so steps running in the same
+    workflow process share one index while a re-transcribed file is reloaded.
+    Only the INDEX_CACHE_SIZE most recently used transcripts are kept.
+    Across processes, the index is rebuilt from the columnar sidecar
+    (lib.transcript_store) when it is fresh.
+
+    Args:
+        transcript_path: Path to transcript.json
+
+    Returns:
+        TranscriptIndex
+    """
+    path = os.path.realpath(transcript_path)
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+
+    cached = _index_cache.get(path)
+    if cached and cached[0] == key:
+        _index_cache.move_to_end(path)
+        return cached[1]
+
+    # Prefer the columnar sidecar; otherwise parse the JSON once and write
+    # the sidecar so the next process skips the parse
+    columns = open_columns(path, build=False)
+    if columns is not None:
+        index = TranscriptIndex.from_columns(columns)
+    else:
+        with open(path, 'r') as f:
+            transcript = json.load(f)
+        index = TranscriptIndex(transcript)
+        try:
+            write_sidecar(Path(path), transcript)
+        except OSError:
+            pass  # Read-only job dir - the index is still usable
+
+    _index_cache[path] = (key, index)
+    _index_cache.move_to_end(path)
+    while len(_index_cache) > INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Columnar sidecar for WhisperX transcript.json
+
+transcript.json with word-level data runs to many MB for a one-hour call,
+and several stages parse all of it just to count segments or look up words.
+Next to transcript.json we keep:
+
+    transcripts/transcript.summary.json   small header (counts, speakers,
+                                          duration, source size/mtime)
+    transcripts/transcript.columns/       one .npy per column (mmap-able)
+        word_start.npy, word_end.npy       float64 seconds
+        word_speaker.npy                   int32 index into speakers (-1 = none)
+        word_segment.npy                   int32 segment index
+        word_text.bin + word_offsets.npy   UTF-8 text with int64 offsets
+        segment_start.npy, segment_end.npy, segment_speaker.npy
+        segment_text.bin + segment_offsets.npy
+
+Columns keep the order of transcript.json. The sidecar is stale (and
+rebuilt on demand) when transcript.json's size or mtime no longer matches
+the summary.
+
+Usage:
+    from lib.transcript_store import read_summary, open_columns
+
+    summary = read_summary(job_dir / 'transcripts' / 'transcript.json')
+    print(summary['segment_count'], summary['speaker_count'])
+
+    columns = open_columns(job_dir / 'transcripts' / 'transcript.json')
+    starts = columns.word_start          # np.memmap, nothing else is read
+"""
+
+import json
+import os
+import shutil
+import uuid
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+SIDECAR_VERSION = 1
+
+
+def summary_path(transcript_path: Path) -> Path:
+    """transcript.json → transcript.summary.json"""
+    transcript_path = Path(transcript_path)
+    return transcript_path.with_name(f"{transcript_path.stem}.summary.json")
+
+
+def columns_dir(transcript_path: Path) -> Path:
+    """transcript.json → transcript.columns/"""
+    transcript_path = Path(transcript_path)
+    return transcript_path.with_name(f"{transcript_path.stem}.columns")
+
+
+def _encode_texts(texts: List[str]):
+    """Concatenate texts as UTF-8 with an offsets array (len(texts) + 1)"""
+    encoded = [t.encode('utf-8') for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return b''.join(encoded), offsets
+
+
+def build_columns(transcript: Dict[str, Any]):
+    """
+    Flatten a transcript into column arrays
+
+    Args:
+        transcript: WhisperX transcript dict
+
+    Returns:
+        (columns dict of arrays/bytes, summary dict without source stats)
+    """
+    segments = transcript.get('segments', [])
+
+    speakers: List[str] = []
+    speaker_codes: Dict[str, int] = {}
+
+    def code(speaker: Optional[str]) -> int:
+        if speaker is None:
+            return -1
+        if speaker not in speaker_codes:
+            speaker_codes[speaker] = len(speakers)
+            speakers.append(speaker)
+        return speaker_codes[speaker]
+
+    seg_start, seg_end, seg_speaker, seg_text = [], [], [], []
+    word_start, word_end, word_speaker, word_segment, word_text = [], [], [], [], []
+
+    for seg_idx, segment in enumerate(segments):
+        start = segment.get('start', 0)
+        speaker = segment.get('speaker')
+        seg_start.append(start)
+        seg_end.append(segment.get('end', 0))
+        seg_speaker.append(code(speaker))
+        seg_text.append(segment.get('text', ''))
+
+        # Words without timing inherit the segment start (as in TranscriptIndex)
+        for word_obj in segment.get('words', []):
+            w_start = word_obj.get('start', start)
+            word_start.append(w_start)
+            word_end.append(word_obj.get('end', w_start))
+            word_speaker.append(code(word_obj.get('speaker', speaker)))
+            word_segment.append(seg_idx)
+            word_text.append(word_obj.get('word', ''))
+
+    word_blob, word_offsets = _encode_texts(word_text)
+    segment_blob, segment_offsets = _encode_texts(seg_text)
+
+    columns = {
+        'word_start': np.asarray(word_start, dtype=np.float64),
+        'word_end': np.asarray(word_end, dtype=np.float64),
+        'word_speaker': np.asarray(word_speaker, dtype=np.int32),
+        'word_segment': np.asarray(word_segment, dtype=np.int32),
+        'word_offsets': word_offsets,
+        'word_text': word_blob,
+        'segment_start': np.asarray(seg_start, dtype=np.float64),
+        'segment_end': np.asarray(seg_end, dtype=np.float64),
+        'segment_speaker': np.asarray(seg_speaker, dtype=np.int32),
+        'segment_offsets': segment_offsets,
+        'segment_text': segment_blob,
+    }
+
+    # Matches the historical count: segments without a speaker count as 'unknown'
+    segment_speakers = sorted(set(seg.get('speaker', 'unknown') for seg in segments))
+
+    summary = {
+        'version': SIDECAR_VERSION,
+        'language': transcript.get('language'),
+        'segment_count': len(segments),
+        'word_count': len(word_text),
+        'speakers': speakers,
+        'speaker_count': len(segment_speakers),
+        'segment_speakers': segment_speakers,
+        'duration_seconds': float(max(seg_end)) if seg_end else 0.0,
+    }
+    return columns, summary
+
+
+def write_sidecar(transcript_path: Path, transcript: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Write transcript.summary.json and transcript.columns/ next to transcript.json
+
+    Args:
+        transcript_path: Path to transcript.json (must already be written)
+        transcript: Parsed transcript (loaded from transcript_path if not given)
+
+    Returns:
+        Summary dict
+    """
+    transcript_path = Path(transcript_path)
+    if transcript is None:
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript = json.load(f)
+
+    stat = transcript_path.stat()
+    columns, summary = build_columns(transcript)
+    summary['source_size'] = stat.st_size
+    summary['source_mtime_ns'] = stat.st_mtime_ns
+
+    # Columns go to a temp dir and are swapped in; the summary is written last
+    # and is what marks the sidecar as valid
+    target = columns_dir(transcript_path)
+    tag = f"{os.getpid()}.{uuid.uuid4().hex[:8]}"
+    tmp_dir = target.with_name(f".{target.name}.{tag}")
+    tmp_dir.mkdir(parents=True)
+    for name, value in columns.items():
+        if isinstance(value, bytes):
+            (tmp_dir / f"{name}.bin").write_bytes(value)
+        else:
+            np.save(tmp_dir / f"{name}.npy", value)
+
+    # rename() can't replace a non-empty directory: move the old one aside
+    # first. If another writer swaps its copy in between, theirs (built from
+    # the same transcript.json) wins and ours is dropped.
+    old_dir = target.with_name(f".{target.name}.old.{tag}")
+    try:
+        os.rename(target, old_dir)
+    except FileNotFoundError:
+        pass
+    try:
+        os.rename(tmp_dir, target)
+    except OSError:
+        if not target.is_dir():
+            raise
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    path = summary_path(transcript_path)
+    tmp_summary = path.with_name(f".{path.name}.{tag}")
+    with open(tmp_summary, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_summary, path)
+
+    return summary
+
+
+def _fresh_summary(transcript_path: Path) -> Optional[Dict[str, Any]]:
+    """Summary if it exists and matches the current transcript.json"""
+    path = summary_path(transcript_path)
+    if not path.exists() or not columns_dir(transcript_path).exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    stat = Path(transcript_path).stat()
+    if (summary.get('version') != SIDECAR_VERSION
+            or summary.get('source_size') != stat.st_size
+            or summary.get('source_mtime_ns') != stat.st_mtime_ns):
+        return None
+    return summary
+
+
+def read_summary(transcript_path: Path, build: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Transcript statistics without parsing transcript.json (when the sidecar is fresh)
+
+    Args:
+        transcript_path: Path to transcript.json
+        build: Build the sidecar if missing or stale (one full parse)
+
+    Returns:
+        Summary dict (segment_count, word_count, speakers, speaker_count,
+        duration_seconds, language), or None if stale and build=False
+    """
+    summary = _fresh_summary(transcript_path)
+    if summary is None and build:
+        try:
+            summary = write_sidecar(transcript_path)
+        except OSError:
+            # Read-only job dir or a racing writer: answer from transcript.json
+            summary = _load_in_memory(transcript_path).summary
+    return summary
+
+
+class TranscriptColumns:
+    """Memory-mapped view of a transcript sidecar (columns load on first access)"""
+
+    def __init__(self, transcript_path: Path, summary: Dict[str, Any],
+                 columns: Optional[Dict[str, Any]] = None):
+        self.transcript_path = Path(transcript_path)
+        self.directory = columns_dir(transcript_path)
+        self.summary = summary
+        self.speakers: List[str] = summary.get('speakers', [])
+        self._columns = columns  # In-memory columns when there is no sidecar on disk
+
+    def _array(self, name: str) -> np.ndarray:
+        if self._columns is not None:
+            return self._columns[name]
+        return np.load(self.directory / f"{name}.npy", mmap_mode='r')
+
+    def _texts(self, name: str, offsets: np.ndarray) -> List[str]:
+        if self._columns is not None:
+            blob = self._columns[name]
+        else:
+            blob = (self.directory / f"{name}.bin").read_bytes()
+        bounds = offsets.tolist()
+        return [blob[bounds[i]:bounds[i + 1]].decode('utf-8') for i in range(len(bounds) - 1)]
+
+    @cached_property
+    def word_start(self) -> np.ndarray:
+        return self._array('word_start')
+
+    @cached_property
+    def word_end(self) -> np.ndarray:
+        return self._array('word_end')
+
+    @cached_property
+    def word_speaker(self) -> np.ndarray:
+        return self._array('word_speaker')
+
+    @cached_property
+    def word_segment(self) -> np.ndarray:
+        return self._array('word_segment')
+
+    @cached_property
+    def word_text(self) -> List[str]:
+        return self._texts('word_text', self._array('word_offsets'))
+
+    @cached_property
+    def segment_start(self) -> np.ndarray:
+        return self._array('segment_start')
+
+    @cached_property
+    def segment_end(self) -> np.ndarray:
+        return self._array('segment_end')
+
+    @cached_property
+    def segment_speaker(self) -> np.ndarray:
+        return self._array('segment_speaker')
+
+    @cached_property
+    def segment_text(self) -> List[str]:
+        return self._texts('segment_text', self._array('segment_offsets'))
+
+    def speaker_name(self, code: int) -> Optional[str]:
+        """Speaker label for a code (None for -1)"""
+        return self.speakers[code] if code >= 0 else None
+
+    def segments(self) -> List[Dict[str, Any]]:
+        """Segment dicts without word data (start, end, text, speaker if known)"""
+        segments = []
+        for start, end, speaker, text in zip(
+            self.segment_start.tolist(),
+            self.segment_end.tolist(),
+            self.segment_speaker.tolist(),
+            self.segment_text
+        ):
+            segment = {'start': start, 'end': end, 'text': text}
+            if speaker >= 0:
+                segment['speaker'] = self.speakers[speaker]
+            segments.append(segment)
+        return segments
+
+
+def _load_in_memory(transcript_path: Path) -> TranscriptColumns:
+    """Columns built from transcript.json without touching the sidecar"""
+    with open(transcript_path, 'r', encoding='utf-8') as f:
+        columns, summary = build_columns(json.load(f))
+    return TranscriptColumns(transcript_path, summary, columns)
+
+
+def open_columns(transcript_path: Path, build: bool = True) -> Optional[TranscriptColumns]:
+    """
+    Open the columnar sidecar for transcript.json
+
+    Args:
+        transcript_path: Path to transcript.json
+        build: Build the sidecar if missing or stale
+
+    Returns:
+        TranscriptColumns (in memory if the sidecar can't be written), or
+        None if stale and build=False
+    """
+    summary = _fresh_summary(transcript_path)
+    if summary is None:
+        if not build:
+            return None
+        try:
+            summary = write_sidecar(transcript_path)
+        except OSError:
+            return _load_in_memory(transcript_path)
+    return TranscriptColumns(transcript_path, summary)
+
+
+def load_segments(transcript_path: Path) -> Dict[str, Any]:
+    """
+    Segment-level transcript ({'language', 'segments'}) without word data
+
+    For stages that only need segment text/speaker/timing (e.g. LLM prompt
+    formatting); reads the sidecar instead of the full transcript.json.
+    """
+    columns = open_columns(transcript_path)
+    try:
+        segments = columns.segments()
+    except OSError:
+        # Sidecar swapped out from under us by a concurrent rebuild
+        columns = _load_in_memory(transcript_path)
+        segments = columns.segments()
+    return {
+        'language': columns.summary.get('language'),
+        'segments': segments,
+    }
@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Shared work queue so any number of workers on any host can pull pipeline steps
+
+A work item is one step of one job (plus the job state it needs). Workers
+claim items whose required capabilities (gpu, ffmpeg, network) they have;
+when a step finishes the worker completes its item and enqueues the job's
+next step, which any capable worker - on this host or another - can claim.
+
+Two backends, chosen by the queue URL:
+
+- postgresql://... - a markethawkeye.work_queue table; claims use
+  SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers never block on or
+  double-claim a row. Needs psycopg2.
+- A directory (e.g. /var/markethawk/_queue on the shared mount) - one JSON
+  file per item under pending/, claimed/, done/ and failed/. A claim is an
+  atomic rename out of pending/; the worker that loses the race gets
+  FileNotFoundError and moves on. Required capabilities are encoded in the
+  file name so workers skip unclaimable items without reading them.
+
+Claims take the highest-priority item first (lib/priority.py: explicit
+priority, market cap, freshness, deadline), so a fresh mega-cap call jumps
+a backfill queue; equal priorities are FIFO.
+
+A claim is a lease (lib/leases.py): the worker heartbeats it while the step
+runs, and a claim whose lease expired (worker crashed) goes back to the
+queue on the next claim by any worker. Heartbeats and complete/fail/release
+only touch a claim the worker still owns; after a reclaim they return False.
+
+Usage:
+    from lib.work_queue import WorkItem, detect_capabilities, open_queue
+
+    queue = open_queue(os.getenv('WORK_QUEUE_URL', '/var/markethawk/_queue'))
+    queue.enqueue(WorkItem(batch=str(batch_yaml), job_id=job_id, step='download',
+                           requires=('network',), payload={'job': job}))
+
+    item = queue.claim('sushi:1234', detect_capabilities())
+    ...
+    with Heartbeat(lambda: queue.heartbeat(item), LEASE_SECONDS / 3):
+        ...
+    queue.complete(item, next_item=WorkItem(..., step='transcribe', requires=('gpu', 'ffmpeg')))
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .leases import LEASE_SECONDS
+from .priority import DEFAULT_PRIORITY, URGENT_BOOST, URGENT_SECONDS, schedule_key
+from .serialization import dumps_json, read_json, write_json
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+CAPABILITIES = ('gpu', 'ffmpeg', 'network')
+CAPABILITIES_ENV = 'LENS_CAPABILITIES'
+
+STATUSES = ('pending', 'claimed', 'done', 'failed')
+
+
+@dataclass
+class WorkItem:
+    """One step of one job"""
+    batch: str
+    job_id: str
+    step: str
+    requires: Tuple[str, ...] = ()
+    payload: Dict[str, Any] = field(default_factory=dict)
+    priority: int = DEFAULT_PRIORITY
+    deadline: Optional[float] = None
+    id: Optional[str] = None
+    status: str = 'pending'
+    attempts: int = 0
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[str] = None
+    lease_expires_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+def detect_capabilities() -> Set[str]:
+    """
+    Capabilities of this host
+
+    LENS_CAPABILITIES (comma-separated, may be empty) overrides detection.
+
+    Returns:
+        Subset of CAPABILITIES: gpu (nvidia-smi lists a device), ffmpeg (on
+        PATH), network (api.openai.com reachable)
+    """
+    override = os.getenv(CAPABILITIES_ENV)
+    if override is not None:
+        return {c.strip() for c in override.split(',') if c.strip()}
+
+    capabilities = set()
+    if shutil.which('nvidia-smi'):
+        try:
+            result = subprocess.run(['nvidia-smi', '-L'], capture_output=True, text=True, timeout=10)
+            if result.returncode == 0 and 'GPU' in result.stdout:
+                capabilities.add('gpu')
+        except (OSError, subprocess.SubprocessError):
+            pass
+    if shutil.which('ffmpeg'):
+        capabilities.add('ffmpeg')
+    try:
+        socket.create_connection(('api.openai.com', 443), timeout=3).close()
+        capabilities.add('network')
+    except OSError:
+        pass
+    return capabilities
+
+
+def worker_name() -> str:
+    """host:pid, recorded as claimed_by"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class FileQueue:
+    """Directory-backed queue for hosts that share a filesystem"""
+
+    # <enqueued ns>~<priority>~<deadline epoch or ->~<job_id>~<step>~<cap+cap>.json
+    SEPARATOR = '~'
+
+    def __init__(self, root: Path, lease_seconds: float = LEASE_SECONDS):
+        self.root = Path(root)
+        self.lease_seconds = lease_seconds
+        for status in STATUSES:
+            (self.root / status).mkdir(parents=True, exist_ok=True)
+
+    def _name(self, item: WorkItem) -> str:
+        deadline = f"{item.deadline:.0f}" if item.deadline is not None else '-'
+        return self.SEPARATOR.join([
+            f"{time.time_ns():020d}", str(item.priority), deadline,
+            item.job_id, item.step, '+'.join(sorted(item.requires)),
+        ]) + '.json'
+
+    def _parse_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Fields encoded in an item file name (None for other files)"""
+        parts = name[:-len('.json')].split(self.SEPARATOR)
+        if not name.endswith('.json') or len(parts) != 6:
+            return None
+        order, priority, deadline, job_id, step, requires = parts
+        return {
+            'order': order,
+            'priority': int(priority),
+            'deadline': float(deadline) if deadline != '-' else None,
+            'job_id': job_id,
+            'step': step,
+            'requires': {r for r in requires.split('+') if r},
+        }
+
+    def _claimable(self, capabilities: Set[str], steps: Optional[Set[str]]) -> List[Tuple[tuple, str]]:
+        """(schedule key, name) of pending items this worker can run, best first"""
+        now = time.time()
+        claimable = []
+        for name in os.listdir(self.root / 'pending'):
+            fields = self._parse_name(name)
+            if fields is None or not fields['requires'] <= capabilities:
+                continue
+            if steps is not None and fields['step'] not in steps:
+                continue
+            key = schedule_key(fields['priority'], fields['deadline'], fields['order'], now=now)
+            claimable.append((key, name))
+        return sorted(claimable)
+
+    def _write(self, item: WorkItem) -> None:
+        write_json(self.root / item.status / item.id, asdict(item))
+
+    def _read(self, path: Path) -> WorkItem:
+        data = read_json(path)
+        data['requires'] = tuple(data.get('requires') or ())
+        return WorkItem(**data)
+
+    def enqueue(self, item: WorkItem) -> str:
+        item.id = self._name(item)
+        item.status = 'pending'
+        self._write(item)
+        return item.id
+
+    def claim(self, worker: str, capabilities: Iterable[str],
+              steps: Optional[Iterable[str]] = None) -> Optional[WorkItem]:
+        """
+        Claim the highest-priority pending item this worker can run
+
+        Args:
+            worker: Worker name (recorded on the item)
+            capabilities: What this worker has
+            steps: Only claim these steps (default: any)
+
+        Returns:
+            Claimed item, or None if nothing matches
+        """
+        self.reclaim_expired()
+        capabilities = set(capabilities)
+        steps = set(steps) if steps else None
+        pending = self.root / 'pending'
+        for _, name in self._claimable(capabilities, steps):
+            claimed_path = self.root / 'claimed' / name
+            try:
+                os.rename(pending / name, claimed_path)
+            except FileNotFoundError:
+                continue  # another worker won the race
+            item = self._read(claimed_path)
+            item.status = 'claimed'
+            item.claimed_by = worker
+            item.claimed_at = _now()
+            item.lease_expires_at = time.time() + self.lease_seconds
+            item.attempts += 1
+            self._write(item)
+            return item
+        return None
+
+    def waiting_priority(self, capabilities: Iterable[str],
+                         steps: Optional[Iterable[str]] = None) -> Optional[int]:
+        """Effective priority of the best pending item this worker could claim (None if none)"""
+        claimable = self._claimable(set(capabilities), set(steps) if steps else None)
+        return -claimable[0][0][0] if claimable else None
+
+    def _hold(self, item: WorkItem) -> Optional[Path]:
+        """
+        Move a claim file aside if this worker still owns it
+
+        reclaim_expired and other workers ignore a held file, so the owner
+        can rewrite or finish it without racing a reclaim (which would
+        otherwise let a write re-create claimed/<id> after it moved).
+
+        Returns:
+            Path of the held file, or None if the claim was reclaimed
+        """
+        path = self.root / 'claimed' / item.id
+        held = path.with_name(f"{item.id}.{os.getpid()}-{threading.get_ident()}.held")
+        try:
+            os.rename(path, held)
+        except FileNotFoundError:
+            return None
+        try:
+            owner = self._read(held).claimed_by
+        except BaseException:
+            os.rename(held, path)
+            raise
+        if owner != item.claimed_by:
+            os.rename(held, path)  # reclaimed and claimed again by another worker
+            return None
+        return held
+
+    def heartbeat(self, item: WorkItem) -> bool:
+        """Extend a claim's lease; False if the claim was reclaimed"""
+        held = self._hold(item)
+        if held is None:
+            return False
+        # Only the lease changes: the payload is being updated by the running step
+        current = self._read(held)
+        current.lease_expires_at = item.lease_expires_at = time.time() + self.lease_seconds
+        write_json(held, asdict(current))
+        os.rename(held, self.root / 'claimed' / item.id)
+        return True
+
+    def reclaim_expired(self) -> int:
+        """Return claims whose lease expired (crashed workers) to pending"""
+        count = 0
+        now = time.time()
+        for path in (self.root / 'claimed').glob('*.json'):
+            try:
+                item = self._read(path)
+            except (FileNotFoundError, ValueError):
+                continue  # finished or being written
+            if item.lease_expires_at is None or item.lease_expires_at >= now:
+                continue
+            try:
+                os.rename(path, self.root / 'pending' / path.name)
+            except FileNotFoundError:
+                continue  # finished or reclaimed by another worker
+            print(f"♻️  Reclaimed {item.job_id} {item.step} from expired claim by {item.claimed_by}")
+            count += 1
+
+        # Held by a worker that died between _hold and putting the file back
+        for path in (self.root / 'claimed').glob('*.held'):
+            try:
+                if now - path.stat().st_mtime < self.lease_seconds:
+                    continue
+                os.rename(path, self.root / 'pending' / path.name.rsplit('.', 2)[0])
+            except FileNotFoundError:
+                continue
+            count += 1
+        return count
+
+    def _finish(self, item: WorkItem, status: str, next_item: Optional[WorkItem] = None) -> bool:
+        """Move an item to status (claims only while still owned); False if the claim was lost"""
+        previous = item.status
+        if previous == 'claimed':
+            source = self._hold(item)
+            if source is None:
+                return False
+        else:
+            source = self.root / previous / item.id
+        # Next step first: a crash in between leaves a duplicate claim, never a lost job
+        if next_item is not None:
+            self.enqueue(next_item)
+        if status == 'pending':
+            item.claimed_by = None
+            item.claimed_at = None
+            item.lease_expires_at = None
+        item.status = status
+        self._write(item)
+        source.unlink(missing_ok=True)
+        return True
+
+    def complete(self, item: WorkItem, next_item: Optional[WorkItem] = None) -> bool:
+        """Mark a claimed item done (saving its payload) and enqueue the job's next step"""
+        return self._finish(item, 'done', next_item=next_item)
+
+    def fail(self, item: WorkItem, error: str) -> bool:
+        item.error = error
+        return self._finish(item, 'failed')
+
+    def release(self, item: WorkItem) -> bool:
+        """Return a claimed item to pending (e.g. worker interrupted)"""
+        return self._finish(item, 'pending')
+
+    def retry_failed(self, batch: Optional[str] = None) -> int:
+        """Move failed items (optionally of one batch) back to pending"""
+        count = 0
+        for path in sorted((self.root / 'failed').glob('*.json')):
+            item = self._read(path)
+            if batch and item.batch != batch:
+                continue
+            item.error = None
+            self._finish(item, 'pending')
+            count += 1
+        return count
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{status: {step: count}}"""
+        counts = {}
+        for status in STATUSES:
+            for name in os.listdir(self.root / status):
+                fields = self._parse_name(name)
+                if fields:
+                    by_step = counts.setdefault(status, {})
+                    by_step[fields['step']] = by_step.get(fields['step'], 0) + 1
+        return counts
+
+    def latest(self, batch: str) -> Dict[str, WorkItem]:
+        """Most recently enqueued item per job of a batch"""
+        latest = {}
+        paths = [p for status in STATUSES for p in (self.root / status).glob('*.json')]
+        for path in sorted(paths, key=lambda p: p.name):
+            try:
+                item = self._read(path)
+            except FileNotFoundError:
+                continue  # moved while scanning
+            if item.batch == batch:
+                latest[item.job_id] = item
+        return latest
+
+
+SCHEMA_SQL = """
+CREATE SCHEMA IF NOT EXISTS markethawkeye;
+CREATE TABLE IF NOT EXISTS markethawkeye.work_queue (
+    id BIGSERIAL PRIMARY KEY,
+    batch TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    requires TEXT[] NOT NULL DEFAULT '{}',
+    payload JSONB NOT NULL DEFAULT '{}',
+    priority INTEGER NOT NULL DEFAULT %(default_priority)s,
+    deadline TIMESTAMPTZ,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    claimed_at TIMESTAMPTZ,
+    lease_expires_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+ALTER TABLE markethawkeye.work_queue ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE markethawkeye.work_queue ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT %(default_priority)s;
+ALTER TABLE markethawkeye.work_queue ADD COLUMN IF NOT EXISTS deadline TIMESTAMPTZ;
+CREATE INDEX IF NOT EXISTS idx_work_queue_pending_priority
+    ON markethawkeye.work_queue (priority DESC, id) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_work_queue_pending_deadline
+    ON markethawkeye.work_queue (deadline) WHERE status = 'pending' AND deadline IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_work_queue_claimed
+    ON markethawkeye.work_queue (lease_expires_at) WHERE status = 'claimed';
+CREATE INDEX IF NOT EXISTS idx_work_queue_batch_job
+    ON markethawkeye.work_queue (batch, job_id, id);
+"""
+
+# Effective priority (lib.priority.effective_priority) in SQL
+EFFECTIVE_PRIORITY_SQL = (
+    f"priority + CASE WHEN deadline < now() + interval '{URGENT_SECONDS} seconds' THEN {URGENT_BOOST} ELSE 0 END"
+)
+
+RUNNABLE_SQL = """requires <@ %(capabilities)s::text[]
+      AND (%(steps)s::text[] IS NULL OR step = ANY(%(steps)s::text[]))"""
+
+CLAIMABLE_SQL = f"""(status = 'pending' OR (status = 'claimed' AND lease_expires_at < now()))
+      AND {RUNNABLE_SQL}"""
+
+# The effective priority depends on now(), so no index can order by it. The
+# best claimable item is among the top of three index-ordered sets: pending
+# by priority (idx_work_queue_pending_priority), pending urgent - the
+# deadline range scan of idx_work_queue_pending_deadline, re-sorted by
+# priority - and expired claims. Only those candidates are ranked.
+CANDIDATES_SQL = f"""
+    (SELECT id FROM markethawkeye.work_queue
+     WHERE status = 'pending' AND {RUNNABLE_SQL}
+     ORDER BY priority DESC, id LIMIT %(candidates)s)
+    UNION ALL
+    (SELECT id FROM markethawkeye.work_queue
+     WHERE status = 'pending' AND deadline < now() + interval '{URGENT_SECONDS} seconds' AND {RUNNABLE_SQL}
+     ORDER BY priority DESC, deadline LIMIT %(candidates)s)
+    UNION ALL
+    (SELECT id FROM markethawkeye.work_queue
+     WHERE status = 'claimed' AND lease_expires_at < now() AND {RUNNABLE_SQL}
+     ORDER BY lease_expires_at LIMIT %(candidates)s)"""
+
+# Candidates per set: enough that concurrent claimers skipping each other's
+# locked rows still find one
+CLAIM_CANDIDATES = 32
+
+CLAIM_SQL = f"""
+UPDATE markethawkeye.work_queue
+SET status = 'claimed', claimed_by = %(worker)s, claimed_at = now(), attempts = attempts + 1,
+    lease_expires_at = now() + make_interval(secs => %(lease_seconds)s)
+WHERE id = (
+    SELECT id FROM markethawkeye.work_queue
+    WHERE id IN ({CANDIDATES_SQL})
+      AND {CLAIMABLE_SQL}
+    ORDER BY {EFFECTIVE_PRIORITY_SQL} DESC, deadline ASC NULLS LAST, id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, batch, job_id, step, requires, payload, priority, deadline, status, attempts,
+    claimed_by, claimed_at
+"""
+
+WAITING_PRIORITY_SQL = f"""
+SELECT max({EFFECTIVE_PRIORITY_SQL})
+FROM markethawkeye.work_queue
+WHERE id IN ({CANDIDATES_SQL})
+"""
+
+HEARTBEAT_SQL = """
+UPDATE markethawkeye.work_queue
+SET lease_expires_at = now() + make_interval(secs => %s)
+WHERE id = %s AND status = 'claimed' AND claimed_by = %s
+"""
+
+ENQUEUE_SQL = """
+INSERT INTO markethawkeye.work_queue (batch, job_id, step, requires, payload, priority, deadline)
+VALUES (%s, %s, %s, %s::text[], %s::jsonb, %s, to_timestamp(%s))
+RETURNING id
+"""
+
+
+class PostgresQueue:
+    """markethawkeye.work_queue table, claimed with FOR UPDATE SKIP LOCKED"""
+
+    def __init__(self, database_url: str, lease_seconds: float = LEASE_SECONDS):
+        self.lease_seconds = lease_seconds
+        if psycopg2 is None:
+            raise ImportError("psycopg2 is required for a Postgres work queue (pip install psycopg2-binary)")
+        self.database_url = database_url
+        self.conn = psycopg2.connect(database_url)
+        self._heartbeat_conn = None
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL % {'default_priority': DEFAULT_PRIORITY})
+
+    def _row_to_item(self, row: tuple) -> WorkItem:
+        (id_, batch, job_id, step, requires, payload, priority, deadline,
+         status, attempts, claimed_by, claimed_at) = row
+        return WorkItem(
+            batch=batch, job_id=job_id, step=step, requires=tuple(requires), payload=payload,
+            priority=priority, deadline=deadline.timestamp() if deadline else None,
+            id=str(id_), status=status, attempts=attempts, claimed_by=claimed_by,
+            claimed_at=claimed_at.isoformat(timespec='seconds') if claimed_at else None,
+        )
+
+    def _insert(self, cursor, item: WorkItem) -> str:
+        cursor.execute(ENQUEUE_SQL, (item.batch, item.job_id, item.step, list(item.requires),
+                                     dumps_json(item.payload, indent=False).decode(),
+                                     item.priority, item.deadline))
+        item.id = str(cursor.fetchone()[0])
+        item.status = 'pending'
+        return item.id
+
+    def enqueue(self, item: WorkItem) -> str:
+        with self.conn, self.conn.cursor() as cursor:
+            return self._insert(cursor, item)
+
+    def claim(self, worker: str, capabilities: Iterable[str],
+              steps: Optional[Iterable[str]] = None) -> Optional[WorkItem]:
+        """Claim the best pending (or lease-expired) item this worker can run (see FileQueue.claim)"""
+        params = {
+            'worker': worker,
+            'lease_seconds': self.lease_seconds,
+            'capabilities': sorted(capabilities),
+            'steps': sorted(steps) if steps else None,
+            'candidates': CLAIM_CANDIDATES,
+        }
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute(CLAIM_SQL, params)
+            row = cursor.fetchone()
+        return self._row_to_item(row) if row else None
+
+    def waiting_priority(self, capabilities: Iterable[str],
+                         steps: Optional[Iterable[str]] = None) -> Optional[int]:
+        params = {'capabilities': sorted(capabilities), 'steps': sorted(steps) if steps else None, 'candidates': 1}
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute(WAITING_PRIORITY_SQL, params)
+            return cursor.fetchone()[0]
+
+    def heartbeat(self, item: WorkItem) -> bool:
+        """Extend a claim's lease; False if another worker reclaimed it"""
+        # Heartbeats come from another thread: give them their own connection
+        if self._heartbeat_conn is None:
+            self._heartbeat_conn = psycopg2.connect(self.database_url)
+            self._heartbeat_conn.autocommit = True
+        with self._heartbeat_conn.cursor() as cursor:
+            cursor.execute(HEARTBEAT_SQL, (self.lease_seconds, int(item.id), item.claimed_by))
+            return cursor.rowcount == 1
+
+    def _finish(self, cursor, item: WorkItem, status: str) -> bool:
+        cursor.execute(
+            "UPDATE markethawkeye.work_queue SET status = %s, payload = %s::jsonb, error = %s, "
+            "finished_at = CASE WHEN %s = 'pending' THEN NULL ELSE now() END, "
+            "claimed_by = CASE WHEN %s = 'pending' THEN NULL ELSE claimed_by END, "
+            "lease_expires_at = NULL "
+            "WHERE id = %s AND claimed_by IS NOT DISTINCT FROM %s",
+            (status, dumps_json(item.payload, indent=False).decode(), item.error, status, status,
+             int(item.id), item.claimed_by),
+        )
+        if cursor.rowcount != 1:
+            return False  # reclaimed by another worker
+        item.status = status
+        return True
+
+    def complete(self, item: WorkItem, next_item: Optional[WorkItem] = None) -> bool:
+        """Mark a claimed item done and enqueue the job's next step in one transaction"""
+        with self.conn, self.conn.cursor() as cursor:
+            finished = self._finish(cursor, item, 'done')
+            if finished and next_item is not None:
+                self._insert(cursor, next_item)
+            return finished
+
+    def fail(self, item: WorkItem, error: str) -> bool:
+        item.error = error
+        with self.conn, self.conn.cursor() as cursor:
+            return self._finish(cursor, item, 'failed')
+
+    def release(self, item: WorkItem) -> bool:
+        with self.conn, self.conn.cursor() as cursor:
+            return self._finish(cursor, item, 'pending')
+
+    def retry_failed(self, batch: Optional[str] = None) -> int:
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute(
+                "UPDATE markethawkeye.work_queue SET status = 'pending', error = NULL, "
+                "claimed_by = NULL, finished_at = NULL "
+                "WHERE status = 'failed' AND (%s::text IS NULL OR batch = %s)",
+                (batch, batch),
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute("SELECT status, step, count(*) FROM markethawkeye.work_queue GROUP BY status, step")
+            rows = cursor.fetchall()
+        counts = {}
+        for status, step, count in rows:
+            counts.setdefault(status, {})[step] = count
+        return counts
+
+    def latest(self, batch: str) -> Dict[str, WorkItem]:
+        with self.conn, self.conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT DISTINCT ON (job_id) id, batch, job_id, step, requires, payload, priority, deadline, "
+                "status, attempts, claimed_by, claimed_at, error FROM markethawkeye.work_queue "
+                "WHERE batch = %s ORDER BY job_id, id DESC",
+                (batch,),
+            )
+            rows = cursor.fetchall()
+        latest = {}
+        for row in rows:
+            item = self._row_to_item(row[:-1])
+            item.error = row[-1]
+            latest[item.job_id] = item
+        return latest
+
+
+def open_queue(url: str):
+    """
+    Open a work queue
+
+    Args:
+        url: postgresql://... for the Postgres backend, otherwise a directory
+             (file:// prefix optional) for the shared-filesystem backend
+
+    Returns:
+        PostgresQueue or FileQueue
+    """
+    if url.startswith(('postgresql://', 'postgres://')):
+        return PostgresQueue(url)
+    if url.startswith('file://'):
+        url = url[len('file://'):]
+    return FileQueue(Path(url))
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Quota-aware YouTube Data API wrapper with ETag caching
+
+Every script that talks to the YouTube Data API (channel discovery, uploads,
+description updates) goes through one wrapper so that:
+
+- Quota units are counted per method against a daily budget shared by all
+  processes on the machine (the API's day resets at midnight Pacific).
+  A call that would exceed the budget raises QuotaExceededError before it is
+  sent, instead of failing halfway through a backfill.
+- GET responses are cached with their ETag and revalidated with
+  If-None-Match; a 304 returns the cached body. Callers may also accept a
+  cached response younger than max_age seconds without any request.
+- videos.list lookups are deduplicated, packed 50 IDs per call and the calls
+  run concurrently.
+
+Usage:
+    from lib.youtube_api import YouTubeAPI
+
+    api = YouTubeAPI(build('youtube', 'v3', developerKey=api_key))
+    channel = api.list('channels', part='contentDetails', id=channel_id)
+    videos = api.videos_list(video_ids, part='snippet')
+    print(api.quota.summary())
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+try:
+    from googleapiclient.errors import HttpError
+    from googleapiclient.http import build_http
+except ImportError:
+    HttpError = None
+    build_http = None
+
+# Units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'playlists.list': 1,
+    'videos.list': 1,
+    'search.list': 100,
+    'videos.insert': 1600,
+    'videos.update': 50,
+    'videos.delete': 50,
+    'thumbnails.set': 50,
+    'captions.insert': 400,
+    'captions.update': 450,
+    'playlistItems.insert': 50,
+}
+
+DEFAULT_COST = 1
+
+DAILY_QUOTA = int(os.getenv('YOUTUBE_DAILY_QUOTA', '10000'))
+
+QUOTA_FILE = Path(os.getenv('YOUTUBE_QUOTA_FILE', str(Path.home() / '.youtube_quota.json')))
+
+CACHE_DIR = Path(os.getenv('YOUTUBE_CACHE_DIR', str(Path.home() / '.cache' / 'markethawk' / 'youtube')))
+
+# Days of usage history kept in the quota file
+QUOTA_HISTORY_DAYS = 14
+
+# IDs per videos.list call (API maximum)
+VIDEOS_PER_CALL = 50
+
+# Concurrent videos.list calls
+LIST_WORKERS = 4
+
+_PACIFIC = ZoneInfo('America/Los_Angeles')
+
+
+class QuotaExceededError(Exception):
+    """Raised when a call would exceed the daily quota budget"""
+    pass
+
+
+def quota_day() -> str:
+    """Current quota day (YouTube quota resets at midnight Pacific Time)"""
+    return datetime.now(_PACIFIC).date().isoformat()
+
+
+class QuotaTracker:
+    """Daily per-method quota usage, persisted and shared across processes"""
+
+    def __init__(self, budget: int = DAILY_QUOTA, quota_file: Path = QUOTA_FILE):
+        """
+        Args:
+            budget: Daily quota units available to this machine
+            quota_file: JSON usage file (file-locked on update)
+        """
+        self.budget = budget
+        self.quota_file = Path(quota_file)
+        self.lock_file = self.quota_file.with_suffix('.lock')
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Any]:
+        if not self.quota_file.exists():
+            return {'days': {}}
+        with open(self.quota_file, 'r') as f:
+            return json.load(f)
+
+    def charge(self, method: str, calls: int = 1) -> int:
+        """
+        Reserve quota for calls to a method
+
+        Args:
+            method: API method (e.g. 'videos.list')
+            calls: Number of calls
+
+        Returns:
+            Units charged
+
+        Raises:
+            QuotaExceededError: If the calls would exceed today's budget
+        """
+        units = QUOTA_COSTS.get(method, DEFAULT_COST) * calls
+        day = quota_day()
+
+        self.quota_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.lock_file, 'w') as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                state = self._read()
+                usage = state['days'].setdefault(day, {'total': 0, 'methods': {}})
+
+                if usage['total'] + units > self.budget:
+                    raise QuotaExceededError(
+                        f"YouTube quota exceeded: {method} needs {units} units, "
+                        f"{self.budget - usage['total']} of {self.budget} left for {day} (Pacific)"
+                    )
+
+                usage['total'] += units
+                method_usage = usage['methods'].setdefault(method, {'calls': 0, 'units': 0})
+                method_usage['calls'] += calls
+                method_usage['units'] += units
+
+                # Drop old days
+                for old_day in sorted(state['days'])[:-QUOTA_HISTORY_DAYS]:
+                    del state['days'][old_day]
+
+                temp_file = self.quota_file.with_suffix('.json.tmp')
+                with open(temp_file, 'w') as f:
+                    json.dump(state, f, indent=2)
+                temp_file.replace(self.quota_file)
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+        return units
+
+    def usage(self, day: Optional[str] = None) -> Dict[str, Any]:
+        """Usage for a day ({'total': units, 'methods': {method: {calls, units}}})"""
+        return self._read()['days'].get(day or quota_day(), {'total': 0, 'methods': {}})
+
+    def remaining(self) -> int:
+        """Units left today"""
+        return max(0, self.budget - self.usage()['total'])
+
+    def history(self) -> Dict[str, Dict[str, Any]]:
+        """Usage for every recorded day, oldest first"""
+        days = self._read()['days']
+        return {day: days[day] for day in sorted(days)}
+
+    def summary(self) -> str:
+        """One-line usage summary for today"""
+        used = self.usage()['total']
+        return f"YouTube quota: {used}/{self.budget} units used today ({self.remaining()} left)"
+
+
+class ETagCache:
+    """On-disk cache of GET responses keyed by request URI"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, uri: str) -> Path:
+        # Strip the API key so cache entries survive key rotation
+        uri = '&'.join(p for p in uri.split('&') if not p.startswith('key='))
+        return self.cache_dir / f"{hashlib.sha256(uri.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, uri: str) -> Optional[Dict[str, Any]]:
+        """Cached entry ({'etag', 'fetched_at', 'response'}) or None"""
+        path = self._path(uri)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, uri: str, response: Dict[str, Any]) -> None:
+        """Store a response (only responses carrying an ETag are cacheable)"""
+        etag = response.get('etag')
+        if not etag:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(uri)
+        temp_file = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        with open(temp_file, 'w') as f:
+            json.dump({'etag': etag, 'fetched_at': time.time(), 'response': response}, f)
+        os.replace(temp_file, path)
+
+    def touch(self, uri: str, entry: Dict[str, Any]) -> None:
+        """Mark a cached entry as revalidated now"""
+        self.put(uri, entry['response'])
+
+
+class YouTubeAPI:
+    """googleapiclient YouTube service with quota accounting and ETag caching"""
+
+    def __init__(
+        self,
+        service,
+        quota: Optional[QuotaTracker] = None,
+        cache: Optional[ETagCache] = None
+    ):
+        """
+        Args:
+            service: Client from googleapiclient.discovery.build('youtube', 'v3', ...)
+            quota: Shared QuotaTracker (default: machine-wide quota file)
+            cache: ETagCache (default: CACHE_DIR)
+        """
+        self.service = service
+        self.quota = quota or QuotaTracker()
+        self.cache = cache or ETagCache()
+        self._local = threading.local()
+
+    @staticmethod
+    def method_name(request) -> str:
+        """API method of a request, e.g. 'youtube.videos.list' → 'videos.list'"""
+        method_id = getattr(request, 'methodId', '') or ''
+        return method_id[len('youtube.'):] if method_id.startswith('youtube.') else method_id
+
+    def _thread_http(self):
+        """Per-thread HTTP transport (httplib2 is not thread-safe)"""
+        if not hasattr(self._local, 'http'):
+            http = build_http()
+            credentials = getattr(getattr(self.service, '_http', None), 'credentials', None)
+            if credentials is not None:
+                import google_auth_httplib2
+                http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+            self._local.http = http
+        return self._local.http
+
+    def execute(self, request, max_age: float = 0, http=None) -> Dict[str, Any]:
+        """
+        Execute a request with quota accounting (and ETag caching for GETs)
+
+        Args:
+            request: googleapiclient HttpRequest (e.g. service.videos().list(...))
+            max_age: Return a cached response younger than this many seconds
+                without contacting the API
+            http: Optional transport (for use from worker threads)
+
+        Returns:
+            Response dict
+
+        Raises:
+            QuotaExceededError: If the call would exceed today's budget
+        """
+        method = self.method_name(request)
+        cacheable = request.method == 'GET'
+        entry = self.cache.get(request.uri) if cacheable else None
+
+        if entry and max_age and time.time() - entry['fetched_at'] < max_age:
+            return entry['response']
+
+        self.quota.charge(method)
+
+        if entry:
+            request.headers['If-None-Match'] = entry['etag']
+
+        try:
+            response = request.execute(http=http) if http is not None else request.execute()
+        except HttpError as e:
+            if entry and e.resp.status == 304:
+                self.cache.touch(request.uri, entry)
+                return entry['response']
+            raise
+
+        if cacheable:
+            self.cache.put(request.uri, response)
+        return response
+
+    def list(self, resource: str, max_age: float = 0, **params) -> Dict[str, Any]:
+        """
+        Shorthand for execute(service.<resource>().list(**params))
+
+        Example:
+            api.list('playlistItems', part='contentDetails', playlistId=pid, maxResults=50)
+        """
+        return self.execute(getattr(self.service, resource)().list(**params), max_age=max_age)
+
+    def videos_list(
+        self,
+        video_ids: List[str],
+        part: str = 'snippet',
+        max_age: float = 0,
+        max_workers: int = LIST_WORKERS
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch video resources for many IDs (50 per call, calls run concurrently)
+
+        Args:
+            video_ids: Video IDs (duplicates are fetched once)
+            part: Resource parts
+            max_age: Accept cached responses younger than this many seconds
+            max_workers: Concurrent videos.list calls
+
+        Returns:
+            Video resources in input ID order (missing/private videos omitted)
+        """
+        unique_ids = list(dict.fromkeys(video_ids))
+        chunks = [unique_ids[i:i + VIDEOS_PER_CALL] for i in range(0, len(unique_ids), VIDEOS_PER_CALL)]
+        if not chunks:
+            return []
+
+        # Fail before sending anything if the whole lookup cannot fit in today's budget
+        needed = len(chunks) * QUOTA_COSTS['videos.list']
+        if needed > self.quota.remaining():
+            raise QuotaExceededError(
+                f"YouTube quota exceeded: videos.list needs {needed} units, {self.quota.remaining()} left today"
+            )
+
+        def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            request = self.service.videos().list(part=part, id=','.join(chunk), maxResults=VIDEOS_PER_CALL)
+            return self.execute(request, max_age=max_age, http=self._thread_http()).get('items', [])
+
+        if len(chunks) == 1:
+            results = [fetch(chunks[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+                results = list(executor.map(fetch, chunks))
+
+        by_id = {item['id']: item for items in results for item in items}
+        return [by_id[video_id] for video_id in unique_ids if video_id in by_id]
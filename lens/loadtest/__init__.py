@@ -0,0 +1,7 @@
+"""
+Synthetic end-to-end load harness
+
+fakes.py holds the local stand-ins (RapidAPI, media, OpenAI, rclone, psql,
+WhisperX) and harness.py runs BatchProcessor/WorkflowOrchestrator jobs against
+them. Run with scripts/load_harness.py.
+"""
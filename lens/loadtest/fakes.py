@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the paid/remote services the pipeline calls
+
+- FakeServices: one local HTTP server answering as
+    - RapidAPI youtube-media-downloader (GET /v2/video/details)
+    - the MP4 CDN its format URLs point to (GET /media/<video_id>.mp4)
+    - OpenAI chat completions (POST /v1/chat/completions), returning a
+      fixed EarningsInsights as structured output
+  with configurable per-request latency
+- write_shims(): `rclone` (copies into a local directory instead of R2) and
+  `psql` (appends SQL to a log) executables to put first on PATH
+- fake transcription: a transcribe_whisperx.py stand-in (script and step
+  handler) that writes a synthetic transcript after a simulated delay
+
+Processes are pointed at these with environment variables the pipeline
+already reads (RAPID_API_URL, OPENAI_BASE_URL, DATABASE_URL, PATH).
+"""
+
+import json
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+LENS_DIR = Path(__file__).parent.parent
+
+# Companies the stub LLM "detects" - all in companies_master.csv, so the
+# fuzzy match step succeeds
+COMPANIES = [
+    ('NVIDIA Corporation', 'NVDA'),
+    ('Microsoft Corporation', 'MSFT'),
+    ('Apple Inc.', 'AAPL'),
+    ('Palantir Technologies', 'PLTR'),
+    ('Robinhood Markets', 'HOOD'),
+    ('Advanced Micro Devices', 'AMD'),
+]
+
+
+def make_test_media(path: Path, seconds: int = 60) -> Path:
+    """
+    Generate a small MP4 (tone + color frames) with ffmpeg
+
+    Args:
+        path: Output file
+        seconds: Duration
+
+    Returns:
+        path
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-f', 'lavfi', '-i', f'color=c=0x1a2b3c:s=640x360:r=10:d={seconds}',
+        '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={seconds}',
+        '-c:v', 'libx264', '-preset', 'ultrafast', '-c:a', 'aac', '-shortest',
+        str(path)
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def media_duration(path: Path) -> float:
+    """Duration of a media file in seconds (ffprobe, falling back to ffmpeg's banner)"""
+    ffprobe = shutil.which('ffprobe')
+    if ffprobe:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', str(path)],
+            capture_output=True, text=True
+        )
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            pass
+    result = subprocess.run(['ffmpeg', '-i', str(path)], capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        if 'Duration:' in line:
+            h, m, s = line.split('Duration:')[1].split(',')[0].strip().split(':')
+            return int(h) * 3600 + int(m) * 60 + float(s)
+    return 0.0
+
+
+def fixed_insights(call_seconds: float, rng: random.Random, earnings_call: bool = True) -> Dict[str, Any]:
+    """EarningsInsights-shaped dict (what the stub OpenAI server returns)"""
+    company, ticker = rng.choice(COMPANIES)
+    span = max(int(call_seconds) - 30, 1)
+    stamps = sorted(rng.randrange(span) for _ in range(8))
+    return {
+        'is_earnings_call': earnings_call,
+        'company_name': company,
+        'company_ticker': ticker,
+        'quarter': rng.choice(['Q1', 'Q2', 'Q3', 'Q4']),
+        'year': 2025,
+        'speakers': [
+            {'speaker_id': 'SPEAKER_00', 'speaker_name': 'Operator', 'role': None},
+            {'speaker_id': 'SPEAKER_01', 'speaker_name': 'Jane Doe', 'role': 'CEO'},
+            {'speaker_id': 'SPEAKER_02', 'speaker_name': 'John Roe', 'role': 'CFO'},
+        ],
+        'financial_metrics': [
+            {'metric': 'Revenue', 'value': '$35.1B', 'change': '+94% YoY', 'timestamp': t,
+             'context': 'record quarterly revenue'}
+            for t in stamps[:4]
+        ],
+        'highlights': [
+            {'timestamp': t, 'text': 'Record data center revenue driven by strong demand',
+             'category': 'financial', 'speaker': 'Jane Doe'}
+            for t in stamps
+        ],
+        'chapters': [
+            {'timestamp': 0, 'title': 'Introduction'},
+            {'timestamp': stamps[len(stamps) // 2], 'title': 'Q&A'},
+        ],
+        'sentiment': {
+            'management_tone': 'bullish', 'confidence_level': 'high', 'analyst_sentiment': 'positive',
+            'key_themes': ['growth', 'margins', 'guidance'], 'notable_quotes': ['A record quarter.'],
+        },
+        'summary': 'Load test summary.',
+        'youtube_title': f'{company} ({ticker}) Earnings Call',
+        'youtube_description': 'Load test description.',
+    }
+
+
+class FakeServices:
+    """Local HTTP server standing in for RapidAPI, the media CDN and OpenAI"""
+
+    def __init__(self, media_file: Path, api_latency: float = 0.0, llm_latency: float = 0.0,
+                 non_earnings_ratio: float = 0.0, seed: int = 0):
+        """
+        Args:
+            media_file: MP4 served for every video ID
+            api_latency: Seconds added to each RapidAPI details request
+            llm_latency: Seconds added to each chat completion
+            non_earnings_ratio: Fraction of completions with is_earnings_call=false
+            seed: Random seed for detected companies/timestamps
+        """
+        self.media_file = Path(media_file)
+        self.media_seconds = media_duration(self.media_file)
+        self.api_latency = api_latency
+        self.llm_latency = llm_latency
+        self.non_earnings_ratio = non_earnings_ratio
+        self.rng = random.Random(seed)
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def video_details(self, video_id: str) -> Dict[str, Any]:
+        """RapidAPI /v2/video/details response"""
+        return {
+            'id': video_id,
+            'title': f'Load test earnings call {video_id}',
+            'description': 'Synthetic video served by the load harness',
+            'channel': {'id': 'UCloadtest', 'name': 'Load Test IR'},
+            'lengthSeconds': int(self.media_seconds),
+            'videos': {'items': [{
+                'url': f"{self.url}/media/{video_id}.mp4",
+                'extension': 'mp4',
+                'hasAudio': True,
+                'height': 360,
+                'size': self.media_file.stat().st_size,
+            }]},
+        }
+
+    def chat_completion(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """OpenAI chat.completions response carrying EarningsInsights JSON"""
+        with self._lock:
+            earnings_call = self.rng.random() >= self.non_earnings_ratio
+            insights = fixed_insights(self.media_seconds, self.rng, earnings_call)
+        content = json.dumps(insights)
+        prompt_chars = sum(len(str(m.get('content', ''))) for m in request.get('messages', []))
+        prompt_tokens, completion_tokens = prompt_chars // 4, len(content) // 4
+        return {
+            'id': f"chatcmpl-loadtest-{int(time.time() * 1000)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'gpt-4o-2024-08-06'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content, 'refusal': None},
+                'finish_reason': 'stop',
+                'logprobs': None,
+            }],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        }
+
+    def start(self) -> 'FakeServices':
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _json(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == '/v2/video/details':
+                    services.count('rapidapi')
+                    time.sleep(services.api_latency)
+                    video_id = parse_qs(parts.query).get('videoId', [''])[0]
+                    self._json(200, services.video_details(video_id))
+                elif parts.path.startswith('/media/'):
+                    services.count('media')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'video/mp4')
+                    self.send_header('Content-Length', str(services.media_file.stat().st_size))
+                    self.end_headers()
+                    with open(services.media_file, 'rb') as f:
+                        shutil.copyfileobj(f, self.wfile, 1 << 20)
+                else:
+                    self._json(404, {'message': f'Unknown path {parts.path}'})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if urlsplit(self.path).path.endswith('/chat/completions'):
+                    services.count('openai')
+                    time.sleep(services.llm_latency)
+                    self._json(200, services.chat_completion(json.loads(body or b'{}')))
+                else:
+                    self._json(404, {'error': {'message': f'Unknown path {self.path}'}})
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> 'FakeServices':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# =============================================================================
+# Command shims
+# =============================================================================
+
+RCLONE_SHIM = '''#!{python}
+"""rclone stand-in: copy/copyto into a local directory instead of R2"""
+import shutil, sys, time
+from pathlib import Path
+
+ROOT = Path({root!r})
+LATENCY = {latency!r}
+args = [a for a in sys.argv[1:] if not a.startswith('--')]
+if len(args) != 3 or args[0] not in ('copy', 'copyto'):
+    sys.exit(f"rclone shim: unsupported arguments {{sys.argv[1:]}}")
+_, source, dest = args
+dest_path = ROOT / dest.split(':', 1)[-1]
+if args[0] == 'copy':
+    dest_path = dest_path / Path(source).name
+dest_path.parent.mkdir(parents=True, exist_ok=True)
+time.sleep(LATENCY)
+shutil.copyfile(source, dest_path)
+'''
+
+PSQL_SHIM = '''#!{python}
+"""psql stand-in: append the SQL file to a log instead of running it"""
+import fcntl, sys, time
+
+LOG = {log!r}
+LATENCY = {latency!r}
+argv = sys.argv[1:]
+if '-f' not in argv:
+    sys.exit("psql shim: only -f <file> is supported")
+sql = open(argv[argv.index('-f') + 1]).read()
+time.sleep(LATENCY)
+with open(LOG, 'a') as f:
+    fcntl.flock(f, fcntl.LOCK_EX)
+    f.write(sql + '\\n')
+print('BEGIN\\nUPDATE 0\\nINSERT 0 1\\nCOMMIT')
+'''
+
+
+def write_shims(bin_dir: Path, r2_root: Path, sql_log: Optional[Path] = None,
+                upload_latency: float = 0.0, db_latency: float = 0.0) -> Path:
+    """
+    Write rclone (and psql, unless a real database is used) stand-ins
+
+    Args:
+        bin_dir: Directory to prepend to PATH
+        r2_root: Local directory uploads are copied into (<root>/<bucket>/<path>)
+        sql_log: File psql statements are appended to (None = keep real psql)
+        upload_latency: Seconds added per upload
+        db_latency: Seconds added per psql call
+
+    Returns:
+        bin_dir
+    """
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    r2_root.mkdir(parents=True, exist_ok=True)
+    shims = {'rclone': RCLONE_SHIM.format(python=sys.executable, root=str(r2_root), latency=upload_latency)}
+    if sql_log is not None:
+        shims['psql'] = PSQL_SHIM.format(python=sys.executable, log=str(sql_log), latency=db_latency)
+    for name, source in shims.items():
+        path = bin_dir / name
+        path.write_text(source)
+        path.chmod(0o755)
+    return bin_dir
+
+
+# =============================================================================
+# Fake transcription
+# =============================================================================
+
+def fake_transcribe(input_file: Path, output_dir: Path, realtime_factor: float) -> Path:
+    """
+    Write a synthetic transcript.json (+ sidecar) for a media file
+
+    Sleeps duration * realtime_factor to stand in for GPU time.
+
+    Returns:
+        transcript.json path
+    """
+    sys.path.insert(0, str(LENS_DIR))
+    from benchmarks.fixtures import make_transcript
+    from lib.serialization import write_json
+    from lib.transcript_store import write_sidecar
+
+    seconds = media_duration(input_file)
+    time.sleep(seconds * realtime_factor)
+
+    transcript = make_transcript(max(1, round(seconds / 60)))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    transcript_file = output_dir / 'transcript.json'
+    write_json(transcript_file, transcript)
+    write_sidecar(transcript_file, transcript)
+    return transcript_file
+
+
+def transcribe_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Step handler stand-in for transcribe_whisperx (workflow mode)"""
+    import os
+    input_file = next((job_dir / 'input').glob('source.*'))
+    output_dir = job_dir / 'transcripts'
+    fake_transcribe(input_file, output_dir, float(os.getenv('LOADTEST_TRANSCRIBE_RTF', '0')))
+    return {
+        'transcript_file': str(output_dir / 'transcript.json'),
+        'audio_file': str(input_file),
+        'model': 'loadtest',
+        'language': 'en'
+    }
+
+
+def main():
+    """transcribe_whisperx.py stand-in: <input>... --output-dir <dir per input>..."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Fake WhisperX transcription")
+    parser.add_argument("input_files", type=Path, nargs="+")
+    parser.add_argument("--output-dir", type=Path, nargs="+", required=True)
+    args, _ = parser.parse_known_args()
+
+    for input_file, output_dir in zip(args.input_files, args.output_dir):
+        fake_transcribe(input_file, output_dir, float(os.getenv('LOADTEST_TRANSCRIBE_RTF', '0')))
+
+
+if __name__ == "__main__":
+    main()
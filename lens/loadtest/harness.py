@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+End-to-end load harness: run BatchProcessor or WorkflowOrchestrator jobs
+concurrently against local stand-ins (loadtest/fakes.py)
+
+Jobs arrive all at once (closed batch) or as a Poisson stream at a given
+rate, and are processed by `concurrency` worker processes. Each worker owns
+one BatchProcessor (its own batch.yaml) or runs one WorkflowOrchestrator
+per job, exactly as in production - only the endpoints differ:
+
+    RapidAPI, media CDN, OpenAI  →  FakeServices HTTP server
+    rclone / R2                  →  shim copying into <work_dir>/r2
+    psql / Postgres              →  shim logging SQL, or a real local
+                                    Postgres via --database-url
+    WhisperX                     →  synthetic transcript after
+                                    duration × realtime factor (or the
+                                    real transcriber with --real-transcribe)
+
+Per-stage latency comes from the metrics.jsonl each step already writes
+(lib/metrics.py); queue depth is reconstructed from submit/start times.
+"""
+
+import math
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+LENS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(LENS_DIR))
+
+from lib.metrics import load_metrics
+from lib.postgres import libpq_env
+from lib.serialization import write_yaml
+
+from .fakes import FakeServices, make_test_media, write_shims
+
+FAKE_TRANSCRIBE_SCRIPT = Path(__file__).parent / 'fakes.py'
+
+# Workflow-mode pipeline: the automated part of youtube-ffmpeg (metadata is
+# pre-confirmed in job.yaml, as after interactive_confirm_metadata)
+WORKFLOW_STEPS = [
+    {'name': 'download', 'handler': 'download_source_cached', 'required': True},
+    {'name': 'transcribe', 'handler': 'transcribe_whisperx', 'required': True},
+    {'name': 'extract_insights', 'handler': 'extract_insights_structured', 'required': True},
+    {'name': 'refine_timestamps', 'handler': 'refine_timestamps', 'required': True},
+    {'name': 'upload_artifacts', 'handler': 'upload_artifacts_r2', 'required': True},
+]
+DATABASE_STEP = {'name': 'update_database', 'handler': 'update_database', 'required': False}
+
+# Stand-in for markethawkeye.earnings_calls (no primary key: harness jobs
+# reuse company/quarter/batch_code, so record IDs repeat)
+SCHEMA_SQL = """
+CREATE SCHEMA IF NOT EXISTS markethawkeye;
+CREATE TABLE IF NOT EXISTS markethawkeye.earnings_calls (
+  id text, cik_str text, symbol text, quarter text, year int, media_url text,
+  is_latest boolean, metadata jsonb, artifacts jsonb,
+  created_at timestamptz DEFAULT now(), updated_at timestamptz DEFAULT now()
+);
+"""
+
+
+@dataclass
+class LoadConfig:
+    """Load test parameters"""
+    work_dir: Path
+    mode: str = 'batch'                     # 'batch' (BatchProcessor) or 'workflow' (WorkflowOrchestrator)
+    jobs: int = 20
+    concurrency: int = 4
+    arrival_rate: Optional[float] = None    # Jobs/hour (Poisson); None = all queued at start
+    media_file: Optional[Path] = None       # MP4 served for every job (default: generated)
+    media_seconds: int = 60                 # Length of the generated MP4
+    transcribe_rtf: float = 0.05            # Fake transcription seconds per media second
+    real_transcribe: bool = False
+    api_latency: float = 0.2                # RapidAPI details request
+    llm_latency: float = 2.0                # OpenAI completion
+    upload_latency: float = 0.1             # Per rclone upload
+    db_latency: float = 0.05                # Per psql call (shim only)
+    non_earnings_ratio: float = 0.0
+    database_url: Optional[str] = None      # Local Postgres; None = psql shim
+    sample_interval: float = 5.0            # Queue depth timeline resolution (seconds)
+    seed: int = 0
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+# =============================================================================
+# Worker processes
+# =============================================================================
+
+_worker: Dict[str, Any] = {}
+
+
+def _redirect_output(log_file: Path) -> None:
+    """Send a worker's stdout/stderr (pipeline progress prints) to a log file"""
+    fd = os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    os.close(fd)
+
+
+def _init_worker(mode: str, work_dir: str, real_transcribe: bool) -> None:
+    work_dir = Path(work_dir)
+    worker_dir = work_dir / 'workers' / f"worker_{os.getpid()}"
+    worker_dir.mkdir(parents=True, exist_ok=True)
+    _redirect_output(worker_dir / 'output.log')
+
+    if mode == 'batch':
+        from batch_processor import BatchProcessor
+
+        batch_yaml = worker_dir / 'batch.yaml'
+        write_yaml(batch_yaml, {
+            'batch_name': f"loadtest-{work_dir.name}",
+            'batch_code': 'load',
+            'pipeline_type': 'audio-only',
+            'jobs': [],
+        })
+        processor = BatchProcessor(batch_yaml)
+        if not real_transcribe:
+            processor.transcribe_script = FAKE_TRANSCRIBE_SCRIPT
+        _worker['processor'] = processor
+    else:
+        import step_registry
+        if not real_transcribe:
+            step_registry.STEP_HANDLERS['transcribe_whisperx'] = 'loadtest.fakes:transcribe_step'
+        _worker['workflow_file'] = work_dir / 'workflow.yaml'
+
+
+def _run_job(mode: str, job_id: str, youtube_id: str, submitted_at: float) -> Dict[str, Any]:
+    """Process one job in a worker; returns timing and final status"""
+    started_at = time.time()
+    error = None
+    try:
+        if mode == 'batch':
+            job = {'job_id': job_id, 'youtube_id': youtube_id, 'status': 'pending'}
+            processor = _worker['processor']
+            processor.batch_config['jobs'].append(job)
+            processor.process_job(job)
+            status = job.get('status', 'failed')
+            if status == 'failed':
+                error = '; '.join(f"{step}: {msg}" for step, msg in job.get('errors', {}).items())[:300] or None
+            job_dir = processor.jobs_dir / job_id
+        else:
+            from workflow import WorkflowOrchestrator
+
+            job_dir = Path(os.environ['JOBS_DIR']) / job_id
+            job_dir.mkdir(parents=True, exist_ok=True)
+            job_file = job_dir / 'job.yaml'
+            rng = random.Random(job_id)
+            write_yaml(job_file, {
+                'job_id': job_id,
+                'status': 'pending',
+                'input': {'type': 'youtube_url', 'value': f"https://www.youtube.com/watch?v={youtube_id}"},
+                'company': {'name': 'NVIDIA Corporation', 'ticker': 'NVDA',
+                            'quarter': rng.choice(['Q1', 'Q2', 'Q3', 'Q4']), 'year': 2025},
+                'processing': {},
+            })
+            orchestrator = WorkflowOrchestrator(job_file, _worker['workflow_file'])
+            orchestrator.run_all()
+            status = orchestrator.job.job.get('status', 'failed')
+            if status == 'failed':
+                error = '; '.join(
+                    f"{step}: {data['error']}" for step, data in orchestrator.job.job['processing'].items()
+                    if isinstance(data, dict) and data.get('error')
+                )[:300] or None
+    except Exception as e:
+        status, error = 'failed', str(e)
+        job_dir = None
+
+    return {
+        'job_id': job_id,
+        'status': status,
+        'error': error,
+        'job_dir': str(job_dir) if job_dir else None,
+        'worker': os.getpid(),
+        'submitted_at': submitted_at,
+        'started_at': started_at,
+        'finished_at': time.time(),
+    }
+
+
+# =============================================================================
+# Setup
+# =============================================================================
+
+def prepare(cfg: LoadConfig, services: FakeServices) -> Dict[str, str]:
+    """
+    Point the pipeline at the stand-ins (environment inherited by workers)
+
+    Returns:
+        Environment variables set
+    """
+    work_dir = cfg.work_dir
+    bin_dir = write_shims(
+        work_dir / 'bin', work_dir / 'r2',
+        sql_log=None if cfg.database_url else work_dir / 'db.sql',
+        upload_latency=cfg.upload_latency, db_latency=cfg.db_latency,
+    )
+    env = {
+        'PATH': f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+        'JOBS_DIR': str(work_dir / 'jobs'),
+        'DOWNLOADS_DIR': str(work_dir / 'downloads'),
+        'BATCH_RUNS_DIR': str(work_dir / 'batch_runs'),
+        'RAPID_API_URL': services.url,
+        'RAPID_API_KEY': 'loadtest',
+        'OPENAI_BASE_URL': f"{services.url}/v1",
+        'OPENAI_API_KEY': 'loadtest',
+        'R2_BUCKET_NAME': 'loadtest',
+        'R2_RCLONE_REMOTE': 'r2-loadtest',
+        'DATABASE_URL': cfg.database_url or 'postgresql://loadtest@localhost/loadtest',
+        'LOADTEST_TRANSCRIBE_RTF': str(cfg.transcribe_rtf),
+        **cfg.env,
+    }
+    os.environ.update(env)
+    (work_dir / 'jobs').mkdir(parents=True, exist_ok=True)
+
+    if cfg.mode == 'workflow':
+        steps = WORKFLOW_STEPS + ([DATABASE_STEP] if cfg.database_url else [])
+        write_yaml(work_dir / 'workflow.yaml', {
+            'name': 'loadtest',
+            'description': 'Load harness pipeline (automated youtube-ffmpeg steps)',
+            'steps': steps,
+        })
+
+    if cfg.database_url:
+        subprocess.run(['psql', '-v', 'ON_ERROR_STOP=1', '-c', SCHEMA_SQL],
+                       check=True, capture_output=True, env={**os.environ, **libpq_env(cfg.database_url)})
+
+    return env
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """count/mean/p50/p90/p99/max (nearest-rank)"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        'count': len(ordered),
+        'mean': round(statistics.fmean(ordered), 3),
+        'p50': round(rank(50), 3),
+        'p90': round(rank(90), 3),
+        'p99': round(rank(99), 3),
+        'max': round(ordered[-1], 3),
+    }
+
+
+def queue_depth(results: List[Dict[str, Any]], start: float, end: float,
+                interval: float) -> Dict[str, Any]:
+    """
+    Jobs waiting for a worker over time (submitted but not started)
+
+    Returns:
+        {'max', 'mean' (time-weighted), 'timeline': [[seconds, depth], ...]}
+    """
+    events = sorted(
+        [(r['submitted_at'], 1) for r in results] + [(r['started_at'], -1) for r in results]
+    )
+    depth, peak, area, last_t = 0, 0, 0.0, start
+    timeline, next_sample = [], start
+    for t, delta in events:
+        while next_sample < t and next_sample <= end:
+            timeline.append([round(next_sample - start, 1), depth])
+            next_sample += interval
+        area += depth * (t - last_t)
+        depth += delta
+        peak = max(peak, depth)
+        last_t = t
+    while next_sample <= end:
+        timeline.append([round(next_sample - start, 1), depth])
+        next_sample += interval
+    duration = max(end - start, 1e-9)
+    return {'max': peak, 'mean': round(area / duration, 2), 'timeline': timeline}
+
+
+def build_report(cfg: LoadConfig, results: List[Dict[str, Any]], start: float, end: float,
+                 services: FakeServices) -> Dict[str, Any]:
+    elapsed = end - start
+    by_status: Dict[str, int] = {}
+    for r in results:
+        by_status[r['status']] = by_status.get(r['status'], 0) + 1
+    done = by_status.get('completed', 0) + by_status.get('skipped', 0)
+
+    stage_seconds: Dict[str, List[float]] = {}
+    for r in results:
+        if not r['job_dir']:
+            continue
+        for rec in load_metrics(Path(r['job_dir'])):
+            if rec.get('status') == 'completed' and 'wall_seconds' in rec:
+                stage_seconds.setdefault(rec['step'], []).append(rec['wall_seconds'])
+
+    return {
+        'mode': cfg.mode,
+        'jobs': len(results),
+        'concurrency': cfg.concurrency,
+        'arrival_rate_per_hour': cfg.arrival_rate,
+        'elapsed_seconds': round(elapsed, 2),
+        'status': by_status,
+        'throughput_jobs_per_hour': round(done / elapsed * 3600, 1) if elapsed else 0,
+        'job_latency_seconds': percentiles([r['finished_at'] - r['submitted_at'] for r in results]),
+        'queue_wait_seconds': percentiles([r['started_at'] - r['submitted_at'] for r in results]),
+        'stages': {step: percentiles(values) for step, values in stage_seconds.items()},
+        'queue_depth': queue_depth(results, start, end, cfg.sample_interval),
+        'service_requests': dict(services.requests),
+        'errors': sorted({r['error'] for r in results if r['error']}),
+    }
+
+
+# =============================================================================
+# Run
+# =============================================================================
+
+def run_load(cfg: LoadConfig, progress=None) -> Dict[str, Any]:
+    """
+    Run a load test
+
+    Args:
+        cfg: LoadConfig
+        progress: Called with each finished job's result dict
+
+    Returns:
+        Report dict (see build_report)
+    """
+    cfg.work_dir.mkdir(parents=True, exist_ok=True)
+    media_file = cfg.media_file or make_test_media(cfg.work_dir / 'media' / 'source.mp4', cfg.media_seconds)
+    rng = random.Random(cfg.seed)
+
+    with FakeServices(media_file, api_latency=cfg.api_latency, llm_latency=cfg.llm_latency,
+                      non_earnings_ratio=cfg.non_earnings_ratio, seed=cfg.seed) as services:
+        prepare(cfg, services)
+
+        results = []
+        start = time.time()
+        with ProcessPoolExecutor(
+            max_workers=cfg.concurrency,
+            initializer=_init_worker,
+            initargs=(cfg.mode, str(cfg.work_dir), cfg.real_transcribe),
+        ) as pool:
+            futures = []
+            next_arrival = start
+            for i in range(cfg.jobs):
+                if cfg.arrival_rate:
+                    next_arrival += rng.expovariate(cfg.arrival_rate / 3600)
+                    time.sleep(max(0.0, next_arrival - time.time()))
+                # 11-character IDs, unique per run so every job downloads
+                youtube_id = f"lt{cfg.seed % 1000:03d}{i:06d}"
+                job_id = f"LOAD_{cfg.work_dir.name}_{i:05d}"
+                futures.append(pool.submit(_run_job, cfg.mode, job_id, youtube_id, time.time()))
+
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if progress:
+                    progress(result)
+        end = time.time()
+
+        report = build_report(cfg, results, start, end, services)
+
+    write_yaml(cfg.work_dir / 'report.yaml', report)
+    return report
@@ -61,6 +61,7 @@ sys.path.insert(0, str(PIPELINE_DIR / "scripts"))
 from download_source import download_video
 from parse_metadata import parse_video_metadata
 from remove_silence import remove_silence as remove_silence_func
+from lib.audio_activity import compute_trim_point, first_speech_from_transcript
 
 # Data directories
 DOWNLOADS_DIR = Path(os.getenv("DOWNLOADS_DIR", "/var/markethawk/_downloads"))
@@ -348,27 +349,26 @@ class EarningsProcessor:
             transcript = json.load(f)
 
         # Find first segment with actual speech (not music/silence)
-        first_speech_time = None
-        for segment in transcript.get('segments', []):
-            text = segment.get('text', '').strip()
-            # Skip if text is empty or just music/filler
-            if text and len(text) > 10:  # At least 10 characters
-                first_speech_time = segment.get('start', 0)
-                self.logger.info(f"First speech detected at: {first_speech_time:.2f}s")
-                self.logger.info(f"Text: '{text[:60]}...'")
-                break
+        first_speech_time = first_speech_from_transcript(transcript)
+        if first_speech_time is not None:
+            self.logger.info(f"First speech detected at: {first_speech_time:.2f}s")
 
         if first_speech_time is None:
             self.logger.warning("Could not detect first speech, trimming from start")
             first_speech_time = 0
 
-        # Cut 5 seconds before first speech (for title card + music)
-        cut_start = max(0, first_speech_time - 5)
-
         source_file = video_dir / "source.mp4"
+
+        # Cut 5 seconds before first speech (for title card + music), but never
+        # keep leading dead air - the audio scan stops at the first sound
+        trim = compute_trim_point(str(source_file), first_speech_time, pre_speech_buffer=5)
+        cut_start = trim['trim_start']
+        if trim['sound_start'] is not None:
+            self.logger.info(f"Audio starts at: {trim['sound_start']:.2f}s")
+
         trimmed_file = video_dir / "source.trimmed.mp4"
 
-        self.logger.info(f"Cutting from {cut_start:.2f}s onwards (5s before first speech)")
+        self.logger.info(f"Cutting from {cut_start:.2f}s onwards (up to 5s before first speech)")
 
         # Use ffmpeg to cut from calculated start time
         cmd = [
@@ -386,7 +386,8 @@ class EarningsProcessor:
         self.state.update_state("smart_trim", "completed", {
             "trimmed_file": str(trimmed_file),
             "cut_start": cut_start,
-            "first_speech_time": first_speech_time
+            "first_speech_time": first_speech_time,
+            "sound_start": trim['sound_start']
         })
 
         # Record runtime trim results in production config
@@ -50,6 +50,8 @@ from download_source import download_video
 from parse_metadata import parse_video_metadata
 from download_hls import download_hls_stream
 from transcribe_whisperx import transcribe_earnings_call
+from lib.model_policy import transcription_plan
+from lib.speaker_store import enroll_speakers, label_speakers
 from extract_insights_structured import extract_earnings_insights
 from refine_timestamps import refine_job_timestamps
 
@@ -231,12 +233,18 @@ class JobPipeline:
         # Run WhisperX transcription with speaker diarization
         transcripts_dir = self.job_dir / "transcripts"
 
+        # Model from audio, device and queue (no draft: this pipeline has no upgrade step)
+        plan = transcription_plan({**self.job.job, 'draft_transcribe': False}, video_file)
+        print(f"  Model: {plan['model']} {plan['compute_type']} ({plan['reason']})")
+
         try:
             result = transcribe_earnings_call(
                 video_file=video_file,
                 output_dir=transcripts_dir,
-                model_size="medium",
-                language="en"
+                model_size=plan['model'],
+                language="en",
+                compute_type=plan['compute_type'],
+                ticker=self.job.job['company'].get('ticker')
             )
         except Exception as e:
             self.job.update_step("transcribe", "failed", error=str(e))
@@ -255,7 +263,7 @@ class JobPipeline:
             'transcript_file': str(transcript_file),
             'word_count': word_count,
             'duration_seconds': duration,
-            'model_used': 'whisperx-medium',
+            'model_used': f"whisperx-{plan['model']}",
             'has_speaker_diarization': True
         })
 
@@ -321,18 +329,31 @@ class JobPipeline:
         # Run insights extraction with OpenAI structured outputs
         raw_output = self.job_dir / "insights.raw.json"
 
+        # Speakers recognized by voice are given to the model instead of re-identified
+        known_speakers = label_speakers(transcript_file, ticker)
+        if known_speakers:
+            print(f"  Voice-matched: {', '.join(info['name'] for info in known_speakers.values())}")
+
         try:
             insights = extract_earnings_insights(
                 transcript_file=transcript_file,
                 company_name=company_name,
                 ticker=ticker,
                 quarter=quarter,
-                output_file=raw_output
+                output_file=raw_output,
+                known_speakers=known_speakers
             )
         except Exception as e:
             self.job.update_step("insights", "failed", error=str(e))
             raise RuntimeError(f"Insights extraction failed: {e}")
 
+        # Remember the named speakers' voices for this company's next call
+        try:
+            enroll_speakers(transcript_file, ticker, [s.model_dump() for s in insights.speakers],
+                            job_id=self.job.job['job_id'])
+        except OSError as e:
+            print(f"  ⚠️  Speaker enrollment failed: {e}")
+
         # Save usage stats
         with open(raw_output, 'r') as f:
             raw_data = json.load(f)
@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Queue-backed batch executor: any number of workers on any host pull pipeline steps
+
+batch_processor.py runs a batch.yaml start to finish in one process. Here a
+batch is enqueued once (one work item per job, at its first unfinished
+step) and workers on the GPU box and CPU hosts claim steps they can run
+(lib/work_queue.py). Each step needs some capabilities (STEP_REQUIREMENTS);
+a worker advertises what it has and only claims matching steps. After a
+step the worker carries on with the job's next step if it can run it,
+otherwise it hands the job back to the queue for a worker that can.
+Workers claim the highest-priority step first (lib/priority.py) and, at
+each step boundary, hand the job back if higher-priority work they could
+run is waiting, so a fresh mega-cap call preempts queued backfill.
+Claims are leases kept alive by a heartbeat; if a worker dies, its step
+goes back to the queue once the lease expires (LENS_LEASE_SECONDS).
+A GPU worker that claims a short call's transcription also claims other
+waiting short transcriptions (up to LENS_TRANSCRIBE_GROUP) and runs them
+in one transcribe_whisperx.py pass per model: one model load, with every
+file's chunks packed into shared batches.
+
+Steps are the BatchProcessor step methods, so job directories, job.yaml,
+metrics.jsonl and trace.jsonl look the same as in a batch_processor.py
+run. Workers do not write batch.yaml; `sync` folds queue state back into it.
+
+Queue: WORK_QUEUE_URL - a directory on the shared mount (default
+/var/markethawk/_queue) or postgresql://... for the Postgres backend.
+
+Usage:
+    python lens/queue_worker.py enqueue /var/markethawk/batch_runs/.../batch.yaml
+    python lens/queue_worker.py enqueue .../batch.yaml --priority hot --deadline 2025-11-14T18:00
+    python lens/queue_worker.py work                           # CPU hosts (detected capabilities)
+    python lens/queue_worker.py work --steps transcribe        # GPU box: keep the GPU on transcription
+    python lens/queue_worker.py status
+    python lens/queue_worker.py sync /var/markethawk/batch_runs/.../batch.yaml
+    python lens/queue_worker.py retry [--batch .../batch.yaml]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from batch_processor import BatchProcessor
+from lib.gpu_lane import gpu_slot
+from lib.leases import Heartbeat
+from lib.metrics import StepMetrics, append_metrics
+from lib.model_policy import SHORT_SECONDS
+from lib.priority import PRIORITY_LEVELS, effective_priority, format_deadline, job_deadline, job_priority, job_ticker, parse_priority, parse_time
+from lib.serialization import read_yaml
+from lib.tracing import span
+from lib.work_queue import WorkItem, detect_capabilities, open_queue, worker_name
+
+WORK_QUEUE_URL = os.getenv('WORK_QUEUE_URL', '/var/markethawk/_queue')
+
+# Pipeline order: (step, BatchProcessor method, takes job_dir)
+PIPELINE = [
+    ('download', 'step_download', True),
+    ('transcribe', 'step_transcribe', True),
+    ('insights', 'step_insights', True),
+    ('validate', 'step_validate', False),
+    ('fuzzy_match', 'step_fuzzy_match', False),
+    ('extract_audio', 'step_extract_audio', True),
+    ('upload_r2', 'step_upload_r2', True),
+    ('upload_artifacts', 'step_upload_artifacts', True),
+    ('update_db', 'step_update_db', False),
+    ('upgrade_transcript', 'step_upgrade_transcript', True),
+]
+
+# Capabilities a worker needs to claim a step
+STEP_REQUIREMENTS = {
+    'download': ('network',),
+    'transcribe': ('gpu', 'ffmpeg'),
+    'insights': ('network',),
+    'validate': (),
+    'fuzzy_match': (),
+    'extract_audio': ('ffmpeg',),
+    'upload_r2': ('network',),
+    'upload_artifacts': ('network',),
+    'update_db': ('network',),
+    'upgrade_transcript': ('gpu', 'ffmpeg'),
+}
+
+# Failures that do not stop the job (as in BatchProcessor.process_job)
+OPTIONAL_STEPS = {'upload_artifacts', 'upgrade_transcript'}
+
+# Steps after the job is published: run only when marked pending, at backfill priority
+BACKGROUND_STEPS = {'upgrade_transcript'}
+
+# Short-call transcriptions a worker claims and runs together (1 disables grouping)
+TRANSCRIBE_GROUP_SIZE = int(os.getenv('LENS_TRANSCRIBE_GROUP', '4'))
+
+
+def next_step(job: Dict, after: Optional[str] = None) -> Optional[str]:
+    """
+    The job's next step to run
+
+    Args:
+        job: Job dictionary
+        after: Step just finished (default: start of the pipeline)
+
+    Returns:
+        First later step not completed or skipped (steps without a status,
+        like upload_artifacts, always run; background steps only when
+        pending), or None when the job is done
+    """
+    names = [name for name, _, _ in PIPELINE]
+    start = names.index(after) + 1 if after else 0
+    for name in names[start:]:
+        status = job.get('steps', {}).get(name)
+        if name in BACKGROUND_STEPS and status != 'pending':
+            continue
+        if status not in ('completed', 'skipped'):
+            return name
+    return None
+
+
+def is_short_call(job: Dict) -> bool:
+    """Known duration (download metadata) of SHORT_SECONDS or less"""
+    try:
+        duration = float(job.get('youtube_metadata', {}).get('duration') or 0)
+    except (TypeError, ValueError):
+        return False
+    return 0 < duration <= SHORT_SECONDS
+
+
+def step_priority(job: Dict, step: str) -> int:
+    """Job priority, or backfill for background steps"""
+    return PRIORITY_LEVELS['backfill'] if step in BACKGROUND_STEPS else job_priority(job)
+
+
+def work_item(batch_yaml: str, job: Dict, step: str) -> WorkItem:
+    """Work item for a job's step (priority recomputed: later steps know the company)"""
+    background = step in BACKGROUND_STEPS
+    return WorkItem(batch=batch_yaml, job_id=job['job_id'], step=step,
+                    requires=STEP_REQUIREMENTS[step], payload={'job': job},
+                    priority=step_priority(job, step), deadline=None if background else job_deadline(job))
+
+
+class QueueBatchProcessor(BatchProcessor):
+    """BatchProcessor whose steps run under a queue worker"""
+
+    queue = None  # set by QueueWorker.processor_for
+
+    def save_batch_config(self):
+        """No-op: many workers share a batch, so batch.yaml is only written by `sync`"""
+
+    def pending_transcriptions(self, job: Dict) -> int:
+        """Transcriptions waiting in the shared queue (queue pressure for the model policy)"""
+        return self.queue.counts().get('pending', {}).get('transcribe', 0)
+
+
+class QueueWorker:
+    """Claim and run pipeline steps until the queue has nothing this worker can run"""
+
+    def __init__(self, queue, capabilities: Iterable[str], steps: Optional[Iterable[str]] = None,
+                 name: Optional[str] = None, transcribe_group: int = TRANSCRIBE_GROUP_SIZE):
+        """
+        Args:
+            queue: FileQueue or PostgresQueue (lib.work_queue.open_queue)
+            capabilities: What this host has (gpu, ffmpeg, network)
+            steps: Only claim these steps (default: any step the capabilities allow)
+            name: Worker name recorded on claimed items (default: host:pid)
+            transcribe_group: Short-call transcriptions run together (1: one at a time)
+        """
+        self.queue = queue
+        self.capabilities = set(capabilities)
+        self.steps = set(steps) if steps else None
+        self.name = name or worker_name()
+        self.transcribe_group = transcribe_group
+        self.processors: Dict[str, QueueBatchProcessor] = {}
+
+    def can_run(self, step: str) -> bool:
+        if self.steps is not None and step not in self.steps:
+            return False
+        return set(STEP_REQUIREMENTS[step]) <= self.capabilities
+
+    def processor_for(self, batch_yaml: str) -> QueueBatchProcessor:
+        """One processor per batch (loading the company matcher once)"""
+        if batch_yaml not in self.processors:
+            self.processors[batch_yaml] = QueueBatchProcessor(Path(batch_yaml))
+            self.processors[batch_yaml].queue = self.queue
+        return self.processors[batch_yaml]
+
+    def process(self, item: WorkItem, heartbeat: Optional[Heartbeat] = None,
+                transcribed: Optional[bool] = None) -> str:
+        """
+        Run a claimed item's step, then following steps while this worker can
+
+        Args:
+            item: Claimed work item
+            heartbeat: The item's running heartbeat (default: start one)
+            transcribed: Result of the item's transcribe step when it already
+                         ran in a group (process_group)
+
+        Returns:
+            Job status after this worker is done with it: 'completed',
+            'skipped', 'failed', 'queued' (handed to another worker) or 'lost'
+            (claim expired and was reclaimed by another worker)
+        """
+        heartbeat = heartbeat or Heartbeat(lambda: self.queue.heartbeat(item), self.queue.lease_seconds / 3)
+        error = None
+        with heartbeat:
+            try:
+                outcome, detail = self._run_steps(item, heartbeat, transcribed)
+            except Exception as e:
+                outcome, detail, error = 'failed', item.step, f"unexpected error: {e}"
+        if outcome == 'lost' or heartbeat.failed:
+            return 'lost'  # the reclaiming worker owns the job now
+
+        if outcome == 'failed':
+            error = error or item.payload['job'].get('errors', {}).get(detail) or f"{detail} failed"
+            finished = self.queue.fail(item, f"{detail}: {error}")
+        else:
+            finished = self.queue.complete(item, next_item=detail if outcome == 'queued' else None)
+        return outcome if finished else 'lost'
+
+    def fail_unexpected(self, item: WorkItem, error: Exception) -> str:
+        """Fail an item after an unexpected (queue) error; steps' own errors are handled in process"""
+        return 'failed' if self.queue.fail(item, f"{item.step}: unexpected error: {error}") else 'lost'
+
+    def claim_group(self, item: WorkItem) -> List[WorkItem]:
+        """
+        The claimed item plus other waiting short-call transcriptions to run with it
+
+        One short call leaves most of the GPU idle; grouped calls share a
+        model load and packed batches. A long call claimed while filling the
+        group is released for any worker.
+        """
+        if item.step != 'transcribe' or self.transcribe_group <= 1 or not is_short_call(item.payload['job']):
+            return [item]
+        group = [item]
+        while len(group) < self.transcribe_group:
+            other = self.queue.claim(self.name, self.capabilities, {'transcribe'})
+            if other is None:
+                break
+            if not is_short_call(other.payload['job']):
+                self.queue.release(other)
+                break
+            group.append(other)
+        return group
+
+    def process_group(self, items: List[WorkItem]) -> List[str]:
+        """
+        Transcribe claimed short calls together, then run each job's following steps
+
+        Returns:
+            Outcome per item (see process)
+        """
+        heartbeats = [Heartbeat(lambda item=item: self.queue.heartbeat(item), self.queue.lease_seconds / 3).start()
+                      for item in items]
+        try:
+            transcribed = self._transcribe_group(items)
+            outcomes = []
+            for item, heartbeat in zip(items, heartbeats):
+                if heartbeat.failed:
+                    outcomes.append('lost')
+                    continue
+                try:
+                    outcomes.append(self.process(item, heartbeat, transcribed[item.id]))
+                except Exception as e:
+                    outcomes.append(self.fail_unexpected(item, e))
+            return outcomes
+        finally:
+            for heartbeat in heartbeats:
+                heartbeat.stop()
+
+    def _transcribe_group(self, items: List[WorkItem]) -> Dict[str, bool]:
+        """
+        Transcribe the items' jobs with one transcribe_whisperx.py run per model
+
+        Returns:
+            {item id: transcription succeeded}
+        """
+        results: Dict[str, bool] = {}
+        passes: Dict[tuple, list] = {}
+        for item in items:
+            processor = self.processor_for(item.batch)
+            job = item.payload['job']
+            job['status'] = 'processing'
+            job_dir = processor.prepare_job(job)
+            try:
+                input_file, transcripts_dir, plan = processor.start_transcription(job, job_dir)
+            except Exception as e:
+                processor.update_job_status(job, 'transcribe', 'failed', f"model choice failed: {e}")
+                results[item.id] = False
+                continue
+            passes.setdefault((plan['model'], plan['compute_type']), []).append(
+                (item, processor, job, job_dir, input_file, transcripts_dir))
+
+        for (model, compute_type), members in passes.items():
+            processor = members[0][1]
+            processor.start_tracing()
+            jobs = [job for _, _, job, _, _, _ in members]
+            job_ids = [job['job_id'] for job in jobs]
+            deadlines = [job_deadline(job) for job in jobs if job_deadline(job) is not None]
+            cmd = processor.transcribe_command(
+                [(input_file, transcripts_dir, job_ticker(job))
+                 for _, _, job, _, input_file, transcripts_dir in members],
+                model, compute_type)
+            processor.log(f"{self.name} transcribing {len(members)} short calls with {model}: {', '.join(job_ids)}")
+
+            metrics = StepMetrics('transcribe', batch=processor.batch_name, group_size=len(members))
+            with span('transcribe group', jobs=','.join(job_ids), model=model), metrics, \
+                    gpu_slot(job_ids[0], priority=max(job_priority(job) for job in jobs),
+                             deadline=min(deadlines, default=None)):
+                returncode, _, stderr = processor.run_command(cmd)
+
+            for item, member_processor, job, job_dir, _, transcripts_dir in members:
+                results[item.id] = member_processor.finish_transcription(job, transcripts_dir, returncode, stderr)
+                if metrics.result:
+                    append_metrics(job_dir, {**metrics.result, 'job_id': job['job_id'],
+                                             'status': 'completed' if results[item.id] else 'failed'})
+                member_processor.update_job_yaml(job, job_dir)
+        return results
+
+    def _run_steps(self, item: WorkItem, heartbeat: Heartbeat, transcribed: Optional[bool] = None):
+        """
+        Run the item's step and following steps this worker can run
+
+        Stops at the next step boundary once the heartbeat has failed, so a
+        worker whose claim was reclaimed doesn't keep running the job's
+        steps alongside the new owner. With `transcribed`, the item's
+        transcribe step already ran (process_group) and is not run again.
+
+        Returns:
+            (outcome, detail): ('failed', failed step), ('queued', next
+            WorkItem), ('skipped', None), ('completed', None) or ('lost', None)
+        """
+        processor = self.processor_for(item.batch)
+        processor.start_tracing()  # spans go to this item's batch, not the last processor built
+        job = item.payload['job']
+        if item.step not in BACKGROUND_STEPS:
+            job['status'] = 'processing'
+        job_dir = processor.prepare_job(job)
+        step = item.step
+
+        with span(f"job {job['job_id']}", job_id=job['job_id'], batch=processor.batch_name,
+                  worker=self.name, step=step):
+            while step is not None:
+                if heartbeat.failed:
+                    processor.log(f"[{job['job_id']}] {self.name} lost its claim before {step}", 'WARNING')
+                    return 'lost', None
+                _, method, takes_job_dir = next(p for p in PIPELINE if p[0] == step)
+                args = (job, job_dir) if takes_job_dir else (job,)
+                if transcribed is not None and step == 'transcribe':
+                    success, transcribed = transcribed, None
+                else:
+                    processor.log(f"[{job['job_id']}] {self.name} running {step}")
+                    success = processor.run_step(job, job_dir, step, getattr(processor, method), *args)
+                processor.update_job_yaml(job, job_dir)
+
+                if not success and step not in OPTIONAL_STEPS:
+                    if job.get('status') == 'skipped':
+                        return 'skipped', None
+                    return 'failed', step
+
+                step = next_step(job, step)
+                if step is None:
+                    break
+                if step in BACKGROUND_STEPS and job.get('status') != 'completed':
+                    # Published: the job counts as done while its background steps wait
+                    job['status'] = 'completed'
+                    processor.update_job_yaml(job, job_dir)
+                if not self.can_run(step):
+                    return 'queued', work_item(item.batch, job, step)
+
+                # Step boundary: yield to higher-priority work this worker could run
+                waiting = self.queue.waiting_priority(self.capabilities, self.steps)
+                current = effective_priority(step_priority(job, step),
+                                             None if step in BACKGROUND_STEPS else job_deadline(job))
+                if waiting is not None and waiting > current:
+                    processor.log(f"[{job['job_id']}] ⏸️  Yielding before {step} to priority {waiting} work "
+                                  f"(this job: {current})")
+                    return 'queued', work_item(item.batch, job, step)
+
+        job['status'] = 'completed'
+        processor.update_job_yaml(job, job_dir)
+        processor.log(f"✅ Job Completed: {job['job_id']}")
+        return 'completed', None
+
+    def run(self, idle_exit: Optional[float] = None, poll_interval: float = 5.0,
+            max_items: Optional[int] = None) -> Dict[str, int]:
+        """
+        Claim and process items
+
+        Args:
+            idle_exit: Exit after this many seconds without claimable work
+                       (default: run forever)
+            poll_interval: Seconds between claims while idle
+            max_items: Exit after this many items
+
+        Returns:
+            {outcome: count} for processed items
+        """
+        outcomes: Dict[str, int] = {}
+        idle_since = time.monotonic()
+        processed = 0
+
+        while max_items is None or processed < max_items:
+            item = self.queue.claim(self.name, self.capabilities, self.steps)
+            if item is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            group = self.claim_group(item)
+            for claimed in group:
+                print(f"📥 {self.name} claimed {claimed.job_id} {claimed.step} "
+                      f"(priority {claimed.priority}, deadline {format_deadline(claimed.deadline)}, "
+                      f"attempt {claimed.attempts})")
+            try:
+                results = self.process_group(group) if len(group) > 1 else [self.process(item)]
+            except KeyboardInterrupt:
+                for claimed in group:
+                    if claimed.status == 'claimed':
+                        self.queue.release(claimed)
+                raise
+            except Exception as e:
+                results = [self.fail_unexpected(claimed, e) for claimed in group]
+
+            for claimed, outcome in zip(group, results):
+                print(f"   {'❌' if outcome in ('failed', 'lost') else '✅'} {claimed.job_id}: {outcome}")
+                outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            processed += len(group)
+            idle_since = time.monotonic()
+
+        return outcomes
+
+
+def enqueue_batch(queue, batch_yaml: Path, priority=None, deadline=None) -> int:
+    """
+    Enqueue every unfinished job of a batch at its first unfinished step
+
+    Args:
+        queue: Work queue
+        batch_yaml: Path to batch.yaml
+        priority: Override every job's priority (number or level name)
+        deadline: Set every job's deadline (ISO timestamp)
+
+    Returns:
+        Number of jobs enqueued
+    """
+    batch_yaml = batch_yaml.resolve()
+    batch_config = read_yaml(batch_yaml)
+    count = 0
+    for job in batch_config['jobs']:
+        if job.get('status') in ('completed', 'skipped'):
+            continue
+        if priority is not None:
+            job['priority'] = priority
+        if deadline is not None:
+            job['deadline'] = deadline
+        step = next_step(job)
+        if step is None:
+            continue
+        queue.enqueue(work_item(str(batch_yaml), job, step))
+        count += 1
+    return count
+
+
+def sync_batch(queue, batch_yaml: Path) -> Dict[str, int]:
+    """
+    Write job state from the queue back into batch.yaml (and refresh stats)
+
+    Returns:
+        Batch stats after syncing
+    """
+    batch_yaml = batch_yaml.resolve()
+    processor = BatchProcessor(batch_yaml)
+    latest = queue.latest(str(batch_yaml))
+
+    for i, job in enumerate(processor.batch_config['jobs']):
+        item = latest.get(job['job_id'])
+        if item is None:
+            continue
+        queued_job = item.payload['job']
+        if item.status in ('pending', 'claimed') and item.step in BACKGROUND_STEPS:
+            pass  # published; only the background step is outstanding
+        elif item.status in ('pending', 'claimed'):
+            queued_job['status'] = 'processing' if item.status == 'claimed' else 'pending'
+        elif item.status == 'failed':
+            queued_job['status'] = 'failed'
+        processor.batch_config['jobs'][i] = queued_job
+
+    processor.update_batch_stats()
+    return processor.batch_config['stats']
+
+
+def print_status(counts: Dict[str, Dict[str, int]]) -> None:
+    steps = [name for name, _, _ in PIPELINE]
+    print(f"   {'Step':<18} {'pending':>8} {'claimed':>8} {'done':>8} {'failed':>8}")
+    for step in steps:
+        row = [counts.get(status, {}).get(step, 0) for status in ('pending', 'claimed', 'done', 'failed')]
+        if any(row):
+            print(f"   {step:<18} " + ' '.join(f"{n:>8}" for n in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Queue-backed batch executor')
+    parser.add_argument('--queue', default=WORK_QUEUE_URL,
+                        help=f'Queue directory or postgresql:// URL (default: {WORK_QUEUE_URL})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('enqueue', help='Enqueue unfinished jobs of a batch')
+    p.add_argument('batch_yaml', type=Path)
+    p.add_argument('--priority', help='Override job priorities: number or hot/high/normal/low/backfill')
+    p.add_argument('--deadline', help='Deadline for every job (ISO timestamp, e.g. 2025-11-14T18:00)')
+
+    p = sub.add_parser('work', help='Claim and run steps')
+    p.add_argument('--capabilities', help='Comma-separated, e.g. gpu,ffmpeg,network (default: detected)')
+    p.add_argument('--steps', help='Only claim these steps, e.g. transcribe')
+    p.add_argument('--idle-exit', type=float, help='Exit after this many idle seconds (default: never)')
+    p.add_argument('--poll-interval', type=float, default=5.0, help='Idle poll seconds (default: 5)')
+    p.add_argument('--max-items', type=int, help='Exit after this many items')
+    p.add_argument('--transcribe-group', type=int, default=TRANSCRIBE_GROUP_SIZE,
+                   help=f'Short-call transcriptions run together (default: {TRANSCRIBE_GROUP_SIZE}; 1 disables)')
+
+    sub.add_parser('status', help='Show queue counts per step')
+
+    p = sub.add_parser('sync', help='Write queue state back into batch.yaml')
+    p.add_argument('batch_yaml', type=Path)
+
+    p = sub.add_parser('retry', help='Re-queue failed items')
+    p.add_argument('--batch', type=Path, help='Only items of this batch.yaml')
+
+    args = parser.parse_args()
+    queue = open_queue(args.queue)
+
+    if args.command == 'enqueue':
+        if not args.batch_yaml.exists():
+            print(f"Error: Batch file not found: {args.batch_yaml}")
+            return 1
+        try:
+            parse_priority(args.priority)
+            parse_time(args.deadline)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        count = enqueue_batch(queue, args.batch_yaml, priority=args.priority, deadline=args.deadline)
+        print(f"📤 Enqueued {count} job(s) from {args.batch_yaml}")
+
+    elif args.command == 'work':
+        if args.capabilities is not None:
+            capabilities: Set[str] = {c.strip() for c in args.capabilities.split(',') if c.strip()}
+        else:
+            capabilities = detect_capabilities()
+        steps = [s.strip() for s in args.steps.split(',')] if args.steps else None
+        unknown = set(steps or ()) - set(STEP_REQUIREMENTS)
+        if unknown:
+            print(f"Error: Unknown step(s): {', '.join(sorted(unknown))}")
+            return 1
+
+        worker = QueueWorker(queue, capabilities, steps=steps, transcribe_group=args.transcribe_group)
+        claimable = [s for s in STEP_REQUIREMENTS if worker.can_run(s)]
+        print(f"👷 Worker {worker.name}: capabilities {', '.join(sorted(capabilities)) or 'none'}")
+        print(f"   Claims: {', '.join(claimable) or 'nothing'}")
+        outcomes = worker.run(idle_exit=args.idle_exit, poll_interval=args.poll_interval,
+                              max_items=args.max_items)
+        print(f"🏁 {', '.join(f'{k} {v}' for k, v in sorted(outcomes.items())) or 'no work'}")
+
+    elif args.command == 'status':
+        print(f"📋 Queue: {args.queue}")
+        print_status(queue.counts())
+
+    elif args.command == 'sync':
+        stats = sync_batch(queue, args.batch_yaml)
+        print(f"💾 Synced {args.batch_yaml}: {stats}")
+
+    elif args.command == 'retry':
+        batch = str(args.batch.resolve()) if args.batch else None
+        print(f"🔁 Re-queued {queue.retry_failed(batch)} failed item(s)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -13,11 +13,16 @@ TODO: Improve number matching
 - Fix incorrect matches on common words
 """
 
-import json
 import re
-import yaml
+import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lib.transcript_index import TranscriptIndex, load_index
+from lib.serialization import read_yaml, write_yaml
 
 
 def extract_keywords_from_metric(metric: Dict) -> List[str]:
@@ -116,7 +121,7 @@ def is_number_keyword(keyword: str) -> bool:
 def refine_timestamp_with_words(
     llm_timestamp: float,
     keywords: List[str],
-    transcript_data: Dict,
+    transcript_data: Union[Dict, TranscriptIndex],
     window_seconds: int = 30
 ) -> float:
     """
@@ -136,7 +141,7 @@ def refine_timestamp_with_words(
     Args:
         llm_timestamp: Timestamp suggested by LLM (fallback if no cluster found)
         keywords: Keywords to search for
-        transcript_data: Full transcript with word-level data
+        transcript_data: Full transcript with word-level data (or its TranscriptIndex)
         window_seconds: Cluster window size in seconds (default 30)
 
     Returns:
@@ -147,44 +152,36 @@ def refine_timestamp_with_words(
 
     CLUSTER_WINDOW = 15  # Seconds - keywords must appear within this window to cluster
 
-    # Get all word-level data from segments
-    segments = transcript_data.get("segments", [])
+    # Get all word-level data (flattened and lowercased once per transcript)
+    index = TranscriptIndex.of(transcript_data)
+    keywords = [k for k in keywords if len(k) > 2]
 
     # Collect ALL matches for each keyword
     all_matches = []
 
-    for segment in segments:
-        segment_start = segment.get("start", 0)
-
-        words = segment.get("words", [])
-        if words:
-            for word_obj in words:
-                word_text = word_obj.get("word", "").lower().strip()
-                word_start = word_obj.get("start", segment_start)
-
-                for keyword in keywords:
-                    if len(keyword) <= 2:
-                        continue
-
-                    # Require EXACT match or strong substring match
-                    is_match = False
-                    # For longer keywords (5+ chars), allow substring
-                    if len(keyword) >= 5 and len(word_text) >= 5:
-                        is_match = keyword in word_text or word_text in keyword
-                    # For shorter keywords, require exact match
-                    elif keyword == word_text:
-                        is_match = True
-                    # Also match if word starts with keyword (e.g., "consecutive" matches "consecutively")
-                    elif len(keyword) >= 4 and word_text.startswith(keyword[:4]):
-                        is_match = True
-
-                    if is_match:
-                        all_matches.append({
-                            'word': word_text,
-                            'keyword': keyword,
-                            'timestamp': word_start,
-                            'is_number': is_number_keyword(keyword)
-                        })
+    for word_text, word_obj in zip(index.normalized_words, index.words):
+        word_start = word_obj['start']
+
+        for keyword in keywords:
+            # Require EXACT match or strong substring match
+            is_match = False
+            # For longer keywords (5+ chars), allow substring
+            if len(keyword) >= 5 and len(word_text) >= 5:
+                is_match = keyword in word_text or word_text in keyword
+            # For shorter keywords, require exact match
+            elif keyword == word_text:
+                is_match = True
+            # Also match if word starts with keyword (e.g., "consecutive" matches "consecutively")
+            elif len(keyword) >= 4 and word_text.startswith(keyword[:4]):
+                is_match = True
+
+            if is_match:
+                all_matches.append({
+                    'word': word_text,
+                    'keyword': keyword,
+                    'timestamp': word_start,
+                    'is_number': is_number_keyword(keyword)
+                })
 
     if not all_matches:
         print(f"    ⚠ {llm_timestamp}s → no matches found, keeping original")
@@ -272,12 +269,10 @@ def refine_job_timestamps(
     print(f"   Window: +{window_seconds}s from LLM suggestion\n")
 
     # Load job.yaml
-    with open(job_yaml_path, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_yaml_path)
 
-    # Load transcript
-    with open(transcript_path, 'r') as f:
-        transcript_data = json.load(f)
+    # Load transcript (index shared with other steps in this process)
+    transcript_data = load_index(transcript_path)
 
     # Get insights from job
     insights = job_data.get('processing', {}).get('insights', {})
@@ -346,8 +341,7 @@ def refine_job_timestamps(
         print()
 
     # Save updated job.yaml
-    with open(job_yaml_path, 'w') as f:
-        yaml.safe_dump(job_data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    write_yaml(job_yaml_path, job_data)
 
     print(f"✅ Timestamp refinement complete!")
     print(f"   Metrics: {stats['metrics_refined']} refined, {stats['metrics_unchanged']} unchanged")
@@ -373,8 +367,7 @@ if __name__ == "__main__":
         transcript_path = Path(args.transcript)
     else:
         # Load job to get transcript path
-        with open(job_yaml_path, 'r') as f:
-            job_data = yaml.safe_load(f)
+        job_data = read_yaml(job_yaml_path)
         transcript_file = job_data.get('processing', {}).get('transcribe', {}).get('output', {}).get('transcript_file')
         if not transcript_file:
             print("❌ Error: Could not find transcript path in job.yaml")
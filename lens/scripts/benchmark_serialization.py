@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark job/artifact serialization: stdlib json + pure-Python PyYAML
+(what the pipeline used before) vs lib/serialization (orjson + libyaml)
+
+Usage:
+    python lens/scripts/benchmark_serialization.py /var/markethawk/jobs/{JOB_ID}/transcripts/transcript.json
+    python lens/scripts/benchmark_serialization.py transcript.json --job-yaml /var/markethawk/jobs/{JOB_ID}/job.yaml
+    python lens/scripts/benchmark_serialization.py transcript.json --repeat 10
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.serialization import (
+    JSON_BACKEND,
+    YAML_BACKEND,
+    dumps_json,
+    dumps_yaml,
+    loads_json,
+    loads_yaml,
+)
+
+
+def best_of(fn: Callable, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def report(name: str, before_ms: float, after_ms: float) -> None:
+    speedup = before_ms / after_ms if after_ms else float('inf')
+    print(f"   {name:<22} {before_ms:>10.1f} {after_ms:>10.1f} {speedup:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON/YAML serialization backends")
+    parser.add_argument("transcript", type=Path, help="transcript.json to round-trip")
+    parser.add_argument("--job-yaml", type=Path, help="job.yaml to round-trip (default: transcript's job dir)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+
+    args = parser.parse_args()
+
+    raw = args.transcript.read_bytes()
+    transcript = json.loads(raw)
+    segments = transcript.get('segments', [])
+    words = sum(len(s.get('words', [])) for s in segments)
+
+    print(f"📊 Serialization benchmark (backends: {JSON_BACKEND}, {YAML_BACKEND})")
+    print(f"   Transcript: {args.transcript} ({len(raw) / (1024 * 1024):.1f} MB, "
+          f"{len(segments)} segments, {words} words)")
+    print()
+    print(f"   {'Operation':<22} {'Before ms':>10} {'After ms':>10} {'Speedup':>9}")
+
+    report(
+        "transcript load",
+        best_of(lambda: json.loads(raw.decode('utf-8')), args.repeat),
+        best_of(lambda: loads_json(raw), args.repeat),
+    )
+    report(
+        "transcript dump",
+        best_of(lambda: json.dumps(transcript, indent=2, ensure_ascii=False).encode('utf-8'), args.repeat),
+        best_of(lambda: dumps_json(transcript), args.repeat),
+    )
+
+    # Write to disk as the pipeline does
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "transcript.json"
+
+        def write_before():
+            with open(out, 'w', encoding='utf-8') as f:
+                json.dump(transcript, f, indent=2, ensure_ascii=False)
+
+        def write_after():
+            out.write_bytes(dumps_json(transcript))
+
+        report("transcript write", best_of(write_before, args.repeat), best_of(write_after, args.repeat))
+
+    job_yaml = args.job_yaml
+    if job_yaml is None:
+        candidate = args.transcript.resolve().parent.parent / "job.yaml"
+        job_yaml = candidate if candidate.exists() else None
+
+    if job_yaml is not None:
+        text = job_yaml.read_text()
+        job = yaml.safe_load(text)
+        report("job.yaml load", best_of(lambda: yaml.safe_load(text), args.repeat),
+               best_of(lambda: loads_yaml(text), args.repeat))
+        report(
+            "job.yaml dump",
+            best_of(lambda: yaml.dump(job, default_flow_style=False, sort_keys=False, allow_unicode=True), args.repeat),
+            best_of(lambda: dumps_yaml(job), args.repeat),
+        )
+        report("job.yaml → job.json",
+               best_of(lambda: json.dumps(yaml.safe_load(text), indent=2), args.repeat),
+               best_of(lambda: dumps_json(loads_yaml(text)), args.repeat))
+
+    # Segment-level YAML (stress test for the YAML path: a transcript-sized document)
+    sample = {'segments': [{k: v for k, v in s.items() if k != 'words'} for s in segments]}
+    sample_text = dumps_yaml(sample)
+    report("segments yaml load", best_of(lambda: yaml.safe_load(sample_text), args.repeat),
+           best_of(lambda: loads_yaml(sample_text), args.repeat))
+    report("segments yaml dump",
+           best_of(lambda: yaml.dump(sample, default_flow_style=False, sort_keys=False, allow_unicode=True), args.repeat),
+           best_of(lambda: dumps_yaml(sample), args.repeat))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,192 @@
 #!/usr/bin/env python3
 """
-Download HLS stream (.m3u8) using ffmpeg
+Download HLS stream (.m3u8) with parallel segment fetching
+
+Investor-relations webcasts are often thousands of small segments, and a
+single ffmpeg process fetches them one at a time, so ingestion is bounded by
+per-segment round-trip latency. Instead:
+
+1. Parse the playlist (master playlists resolve to the highest-bandwidth variant)
+2. Download segments concurrently with a bounded thread pool, retrying each
+   segment independently; finished segments are kept on disk, so a rerun
+   resumes where it stopped
+3. Point a local copy of the playlist at the downloaded files and remux it
+   to mp4 with stream copy (keeps encryption keys, init segments and
+   discontinuities working)
+
+Live or byte-range playlists fall back to handing the URL to ffmpeg.
 """
 
+import shutil
 import subprocess
-import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Concurrent segment downloads
+DEFAULT_WORKERS = 8
+
+# Attempts per segment before the download fails
+SEGMENT_RETRIES = 4
+
+REQUEST_TIMEOUT = 30
+
+
+def _make_session(workers: int) -> requests.Session:
+    """HTTP session with a connection pool sized for the worker count"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; MarketHawk HLS)'
+    return session
+
+
+def _attr(line: str, name: str) -> Optional[str]:
+    """Read an attribute (e.g. URI, BANDWIDTH) from an #EXT-X tag line"""
+    _, _, attrs = line.partition(':')
+    for part in attrs.split(','):
+        key, _, value = part.partition('=')
+        if key.strip() == name:
+            return value.strip().strip('"')
+    return None
+
+
+def _replace_uri(line: str, uri: str) -> str:
+    """Rewrite the URI="..." attribute of a tag line"""
+    start = line.index('URI="') + len('URI="')
+    end = line.index('"', start)
+    return line[:start] + uri + line[end:]
+
+
+def resolve_media_playlist(session: requests.Session, url: str) -> Tuple[str, str]:
+    """
+    Fetch playlist, following a master playlist to its best variant
+
+    Returns:
+        (media playlist URL, media playlist text)
+    """
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    text = response.text
+
+    if '#EXT-X-STREAM-INF' not in text:
+        return url, text
+
+    # Master playlist: pick the highest-bandwidth variant
+    best_uri, best_bandwidth = None, -1
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if line.startswith('#EXT-X-STREAM-INF'):
+            bandwidth = int(_attr(line, 'BANDWIDTH') or 0)
+            uri = next((l.strip() for l in lines[i + 1:] if l.strip() and not l.startswith('#')), None)
+            if uri and bandwidth > best_bandwidth:
+                best_uri, best_bandwidth = uri, bandwidth
 
+    if not best_uri:
+        raise RuntimeError(f"No variants found in master playlist: {url}")
 
-def download_hls_stream(url: str, job_dir: str) -> Dict:
+    print(f"  Variant: {best_bandwidth / 1000:.0f} kbps")
+    return resolve_media_playlist(session, urljoin(url, best_uri))
+
+
+def plan_segments(playlist_url: str, text: str) -> Tuple[List[str], List[Tuple[str, str]]]:
     """
-    Download HLS stream to mp4 using ffmpeg
+    Rewrite playlist to local file names and list the files to fetch
 
     Args:
-        url: HLS stream URL (m3u8)
-        job_dir: Job directory to save video (will save to job_dir/input/source.mp4)
+        playlist_url: Media playlist URL (base for relative URIs)
+        text: Media playlist text
 
     Returns:
-        Dictionary with download info
+        (local playlist lines, [(remote URL, local file name), ...])
     """
-    job_dir = Path(job_dir)
+    local_lines = []
+    downloads = []
 
-    # Ensure input directory exists
-    input_dir = job_dir / "input"
-    input_dir.mkdir(parents=True, exist_ok=True)
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
 
-    output_file = input_dir / "source.mp4"
+        if line.startswith('#EXT-X-MAP') and 'URI="' in line:
+            # fMP4 init segment
+            name = f"init_{len(downloads):05d}.mp4"
+            downloads.append((urljoin(playlist_url, _attr(line, 'URI')), name))
+            local_lines.append(_replace_uri(line, name))
+        elif line.startswith('#EXT-X-KEY') and 'URI="' in line:
+            # Keys stay remote (absolute) - ffmpeg fetches the few key files itself
+            local_lines.append(_replace_uri(line, urljoin(playlist_url, _attr(line, 'URI'))))
+        elif line.startswith('#'):
+            local_lines.append(line)
+        else:
+            suffix = Path(line.split('?')[0]).suffix or '.ts'
+            name = f"seg_{len(downloads):05d}{suffix}"
+            downloads.append((urljoin(playlist_url, line), name))
+            local_lines.append(name)
 
-    print(f"📥 Downloading HLS stream...")
-    print(f"  URL: {url}")
-    print(f"  Output: {output_file}")
+    return local_lines, downloads
+
+
+def download_segment(session: requests.Session, url: str, dest: Path, retries: int = SEGMENT_RETRIES) -> int:
+    """
+    Download one segment with retry and exponential backoff
+
+    Writes to a .part file and renames on success, so an existing dest is
+    always complete (which is what makes resume safe).
+
+    Returns:
+        Bytes downloaded (0 if already present)
+    """
+    if dest.exists():
+        return 0
+
+    tmp = dest.with_name(dest.name + '.part')
+    for attempt in range(1, retries + 1):
+        try:
+            with session.get(url, timeout=REQUEST_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                with open(tmp, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=256 * 1024):
+                        f.write(chunk)
+            tmp.rename(dest)
+            return dest.stat().st_size
+        except (requests.RequestException, OSError) as e:
+            if attempt == retries:
+                tmp.unlink(missing_ok=True)
+                raise RuntimeError(f"Segment failed after {retries} attempts: {url} ({e})")
+            time.sleep(min(2 ** attempt, 30))
 
-    # Use ffmpeg to download and convert
+    return 0
+
+
+def remux_to_mp4(local_playlist: Path, output_file: Path) -> None:
+    """Stream-copy the local playlist into a single mp4"""
+    cmd = [
+        "ffmpeg",
+        "-v", "error",
+        "-nostdin",
+        "-allowed_extensions", "ALL",
+        "-protocol_whitelist", "file,http,https,tcp,tls,crypto",
+        "-i", str(local_playlist),
+        "-c", "copy",  # Copy streams without re-encoding (faster)
+        "-bsf:a", "aac_adtstoasc",  # Fix AAC stream
+        "-movflags", "+faststart",
+        "-y",  # Overwrite output file
+        str(output_file)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg remux failed: {result.stderr}")
+
+
+def download_with_ffmpeg(url: str, output_file: Path) -> None:
+    """Let ffmpeg fetch the stream itself (live / byte-range playlists)"""
     cmd = [
         "ffmpeg",
         "-i", url,
@@ -48,14 +202,92 @@ def download_hls_stream(url: str, job_dir: str) -> Dict:
     if result.returncode != 0:
         raise RuntimeError(f"ffmpeg download failed: {result.stderr}")
 
+
+def download_hls_stream(url: str, job_dir: str, workers: int = DEFAULT_WORKERS) -> Dict:
+    """
+    Download HLS stream to mp4 (segments fetched in parallel, then remuxed)
+
+    Args:
+        url: HLS stream URL (m3u8)
+        job_dir: Job directory to save video (will save to job_dir/input/source.mp4)
+        workers: Concurrent segment downloads
+
+    Returns:
+        Dictionary with download info
+    """
+    job_dir = Path(job_dir)
+
+    # Ensure input directory exists
+    input_dir = job_dir / "input"
+    input_dir.mkdir(parents=True, exist_ok=True)
+
+    output_file = input_dir / "source.mp4"
+
+    print(f"📥 Downloading HLS stream...")
+    print(f"  URL: {url}")
+    print(f"  Output: {output_file}")
+
+    session = _make_session(workers)
+    playlist_url, text = resolve_media_playlist(session, url)
+
+    if '#EXT-X-ENDLIST' not in text or '#EXT-X-BYTERANGE' in text:
+        print(f"  Live or byte-range playlist, downloading with ffmpeg")
+        download_with_ffmpeg(url, output_file)
+        size_mb = output_file.stat().st_size / (1024 * 1024)
+        print(f"✓ Downloaded: {size_mb:.1f} MB")
+        return {
+            "file": str(output_file),
+            "size_mb": size_mb,
+            "segments": None,
+            "method": "ffmpeg"
+        }
+
+    local_lines, downloads = plan_segments(playlist_url, text)
+
+    # Segments live next to the output until the remux succeeds (resume on rerun)
+    segments_dir = input_dir / ".hls_segments"
+    segments_dir.mkdir(exist_ok=True)
+    local_playlist = segments_dir / "playlist.m3u8"
+    local_playlist.write_text('\n'.join(local_lines) + '\n')
+
+    resumed = sum(1 for _, name in downloads if (segments_dir / name).exists())
+    print(f"  Segments: {len(downloads)} ({resumed} already downloaded), {workers} workers")
+
+    start = time.time()
+    downloaded_bytes = 0
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(download_segment, session, seg_url, segments_dir / name)
+            for seg_url, name in downloads
+        ]
+        for future in as_completed(futures):
+            try:
+                downloaded_bytes += future.result()
+            except Exception:
+                # Fail fast: drop the queued segments (finished ones are kept for a rerun)
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            done += 1
+            if done % 100 == 0 or done == len(futures):
+                elapsed = max(time.time() - start, 1e-6)
+                print(f"  {done}/{len(futures)} segments ({downloaded_bytes / elapsed / (1024 * 1024):.1f} MB/s)")
+
+    remux_to_mp4(local_playlist, output_file)
+    shutil.rmtree(segments_dir)
+
     # Get file size
     size_mb = output_file.stat().st_size / (1024 * 1024)
 
-    print(f"✓ Downloaded: {size_mb:.1f} MB")
+    print(f"✓ Downloaded: {size_mb:.1f} MB in {time.time() - start:.1f}s")
 
     return {
         "file": str(output_file),
-        "size_mb": size_mb
+        "size_mb": size_mb,
+        "segments": len(downloads),
+        "resumed_segments": resumed,
+        "workers": workers,
+        "method": "parallel"
     }
 
 
@@ -66,10 +298,13 @@ if __name__ == "__main__":
     parser.add_argument("url", help="HLS stream URL (.m3u8)")
     parser.add_argument("--output-dir", default="/var/markethawk/_downloads",
                        help="Output directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                       help=f"Concurrent segment downloads (default: {DEFAULT_WORKERS})")
 
     args = parser.parse_args()
 
-    result = download_hls_stream(args.url, args.output_dir)
+    result = download_hls_stream(args.url, args.output_dir, workers=args.workers)
     print(f"\n✓ Success!")
-    print(f"  Video ID: {result['video_id']}")
     print(f"  File: {result['file']}")
+    if result['segments']:
+        print(f"  Segments: {result['segments']}")
@@ -16,6 +16,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 RAPID_API_KEY = os.getenv("RAPID_API_KEY")
+RAPID_API_HOST = "youtube-media-downloader.p.rapidapi.com"
+# Overridable so load tests can point at a local stand-in
+RAPID_API_URL = os.getenv("RAPID_API_URL", f"https://{RAPID_API_HOST}")
 
 
 class VideoSourceDownloader:
@@ -36,16 +39,20 @@ class VideoSourceDownloader:
         if not video_id:
             raise ValueError(f"Invalid YouTube URL: {youtube_url}")
 
-        # Call RapidAPI
-        api_url = "https://youtube-media-downloader.p.rapidapi.com/v2/video/details"
+        data = self.fetch_metadata(video_id)
+        return self.download_media(data, youtube_url)
+
+    def fetch_metadata(self, video_id: str) -> Dict:
+        """Fetch video details (incl. format URLs) from RapidAPI and save metadata.json"""
+        api_url = f"{RAPID_API_URL}/v2/video/details"
         headers = {
-            "x-rapidapi-host": "youtube-media-downloader.p.rapidapi.com",
+            "x-rapidapi-host": RAPID_API_HOST,
             "x-rapidapi-key": RAPID_API_KEY,
         }
         params = {"videoId": video_id}
 
         print(f"  Fetching video details from RapidAPI...")
-        response = requests.get(api_url, headers=headers, params=params)
+        response = requests.get(api_url, headers=headers, params=params, timeout=60)
         response.raise_for_status()
         data = response.json()
 
@@ -55,6 +62,12 @@ class VideoSourceDownloader:
             json.dump(data, f, indent=2)
         print(f"✓ Metadata saved to: {metadata_path}")
 
+        return data
+
+    def download_media(self, data: Dict, youtube_url: Optional[str] = None) -> Dict:
+        """Download the best MP4 from previously fetched video details"""
+        youtube_url = youtube_url or f"https://www.youtube.com/watch?v={self.video_id}"
+
         # Find best MP4 with audio
         download_url = self._find_best_mp4_url(data)
         if not download_url:
@@ -69,9 +82,9 @@ class VideoSourceDownloader:
         return {
             "source": "youtube",
             "url": youtube_url,
-            "video_id": video_id,
+            "video_id": self.video_id,
             "file_path": str(output_path),
-            "metadata_path": str(metadata_path),
+            "metadata_path": str(self.output_dir / "metadata.json"),
             "title": data.get("title", ""),
             "description": data.get("description", ""),
             "channel": data.get("channel", {}),
@@ -105,7 +118,7 @@ class VideoSourceDownloader:
             return url
         return None
 
-    def _find_best_mp4_url(self, video_data: dict) -> Optional[str]:
+    def _find_best_mp4(self, video_data: dict) -> Optional[dict]:
         """Find best MP4 format with audio"""
         videos = video_data.get("videos", {}).get("items", [])
 
@@ -124,17 +137,38 @@ class VideoSourceDownloader:
             mp4_videos_with_audio, key=lambda x: abs(x.get("height", 0) - 720)
         )
 
-        return sorted_videos[0].get("url")
+        return sorted_videos[0]
+
+    def _find_best_mp4_url(self, video_data: dict) -> Optional[str]:
+        """Find URL of best MP4 format with audio"""
+        best = self._find_best_mp4(video_data)
+        return best.get("url") if best else None
+
+    def expected_size(self, video_data: dict) -> int:
+        """Expected download size in bytes (estimated from duration if the API omits it)"""
+        best = self._find_best_mp4(video_data) or {}
+        for key in ("size", "contentLength"):
+            try:
+                size = int(best.get(key) or 0)
+            except (TypeError, ValueError):
+                size = 0
+            if size > 0:
+                return size
+
+        # ~2.5 Mbps for 720p MP4
+        return int(float(video_data.get("lengthSeconds") or 0) * 312_500)
 
     def _download_file(self, url: str, output_path: Path):
         """Download file with progress"""
-        response = requests.get(url, stream=True)
+        response = requests.get(url, stream=True, timeout=60)
         response.raise_for_status()
 
         total_size = int(response.headers.get("content-length", 0))
         downloaded = 0
 
-        with open(output_path, "wb") as f:
+        # Write to .part and rename, so an interrupted download never looks complete
+        part_path = output_path.with_name(output_path.name + ".part")
+        with open(part_path, "wb") as f:
             for chunk in response.iter_content(chunk_size=8192):
                 if chunk:
                     f.write(chunk)
@@ -145,6 +179,7 @@ class VideoSourceDownloader:
                             f"\r  Progress: {percent:.1f}% ({downloaded / 1024 / 1024:.1f} MB)",
                             end="",
                         )
+        part_path.replace(output_path)
         print()  # New line after progress
 
 
@@ -5,6 +5,18 @@ Download YouTube videos to cache using Rapid API
 Reads video IDs from a text file and downloads them to /var/markethawk/_downloads/
 using the Rapid API (same as batch processor).
 
+Two stages run concurrently:
+1. Metadata prefetch - fetches RapidAPI video details far ahead of the
+   downloads, under its own rate limit (api_rate requests/second)
+2. Download - a worker pool fed by a priority queue ordered by expected file
+   size (smallest first by default), so workers never wait on API latency
+
+Queue state is appended to <cache_dir>/.download_queue.jsonl (one line per
+transition). A restarted run resumes from it: videos it records as
+downloaded are skipped even without --skip-existing, and interrupted or
+failed ones are queued again. Their metadata is reused from metadata.json
+while its format URLs are still fresh.
+
 Usage:
     python lens/scripts/download_to_cache_pipeline.py videos.txt [--workers 3] [--skip-existing]
 
@@ -26,18 +38,118 @@ Examples:
 """
 
 import argparse
+import itertools
+import os
+import queue
 import sys
-import yaml
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Optional
 from datetime import datetime
 import json
 
 # Add lens directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.download_source import download_video
+from lib.serialization import read_yaml, write_json
+from scripts.download_source import VideoSourceDownloader
+
+# Format URLs returned by RapidAPI expire after a few hours
+METADATA_TTL_SECONDS = 4 * 3600
+
+# Queue entry states
+PENDING = 'pending'          # Waiting for metadata
+QUEUED = 'queued'            # Metadata fetched, waiting for a download worker
+DOWNLOADING = 'downloading'
+DONE = 'done'
+CACHED = 'cached'
+FAILED = 'failed'
+
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart (shared across threads)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class DownloadQueue:
+    """
+    Persistent per-video state for the pipeline
+
+    Each update appends the video's entry as one JSON line, so an update
+    costs one short write under the lock. Loading replays the lines (last
+    one wins) and rewrites the file compacted. A queue file in the old
+    single-document format ({"videos": {...}}), or the old default
+    .download_queue.json next to a missing .jsonl, is migrated on load.
+    """
+
+    def __init__(self, queue_file: Path):
+        self.queue_file = queue_file
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        source = queue_file
+        legacy_file = queue_file.with_suffix('.json')
+        if not queue_file.exists() and queue_file.suffix == '.jsonl' and legacy_file.exists():
+            source = legacy_file
+        if source.exists():
+            self._load(source)
+        self._compact()
+        self._file = open(queue_file, 'a')
+
+    def _load(self, source: Path):
+        with open(source, 'r') as f:
+            text = f.read()
+        try:
+            document = json.loads(text)
+        except ValueError:
+            document = None
+        if isinstance(document, dict) and isinstance(document.get('videos'), dict):
+            print(f"Migrating legacy queue file {source} to {self.queue_file}")
+            self.entries = {video_id: dict(entry) for video_id, entry in document['videos'].items()}
+            return
+        for line in text.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # blank, or cut short by a crash
+            if isinstance(record, dict) and 'video_id' in record:
+                self.entries[record.pop('video_id')] = record
+
+    def get(self, video_id: str) -> Dict:
+        with self._lock:
+            return dict(self.entries.get(video_id, {}))
+
+    def update(self, video_id: str, **fields):
+        with self._lock:
+            entry = self.entries.setdefault(video_id, {'status': PENDING, 'attempts': 0})
+            entry.update(fields)
+            entry['updated_at'] = datetime.now().isoformat()
+            self._file.write(json.dumps({'video_id': video_id, **entry}) + '\n')
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def _compact(self):
+        self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.queue_file.with_suffix('.jsonl.tmp')
+        with open(temp_file, 'w') as f:
+            for video_id, entry in self.entries.items():
+                f.write(json.dumps({'video_id': video_id, **entry}) + '\n')
+        os.replace(temp_file, self.queue_file)
 
 
 class DownloadPipeline:
@@ -54,6 +166,12 @@ class DownloadPipeline:
         self.cache_dir = Path(config.get('cache_dir', '/var/markethawk/_downloads'))
         self.workers = config.get('workers', 3)
         self.skip_existing = config.get('skip_existing', True)  # Default: skip cached videos
+        self.metadata_workers = config.get('metadata_workers', 2)
+        rate_limit = config.get('rate_limit') or {}
+        default_rate = rate_limit.get('max_per_minute', 120) / 60 if rate_limit.get('enabled') else 2.0
+        self.api_rate = float(config.get('api_rate', default_rate))  # RapidAPI requests per second
+        self.order = config.get('order', 'smallest')  # 'smallest' or 'largest' first
+        self.queue_file = Path(config.get('queue_file', self.cache_dir / '.download_queue.jsonl'))
 
         self.stats = {
             'total': 0,
@@ -62,6 +180,7 @@ class DownloadPipeline:
             'failed': 0,
             'errors': []
         }
+        self._stats_lock = threading.Lock()
 
     def is_cached(self, video_id: str) -> bool:
         """
@@ -79,42 +198,85 @@ class DownloadPipeline:
 
         return video_file.exists() and metadata_file.exists()
 
-    def download_single_video(self, video_id: str) -> Dict:
-        """
-        Download single video
-
-        Args:
-            video_id: YouTube video ID
-
-        Returns:
-            Result dictionary
-        """
-        youtube_url = f'https://www.youtube.com/watch?v={video_id}'
-
-        # Check cache
-        if self.skip_existing and self.is_cached(video_id):
-            return {
-                'video_id': video_id,
-                'status': 'cached',
-                'message': 'Already in cache'
-            }
-
-        # Download
-        try:
-            result = download_video(youtube_url, str(self.cache_dir))
-            return {
-                'video_id': video_id,
-                'status': 'downloaded',
-                'message': 'Successfully downloaded',
-                'file_path': result['file_path'],
-                'title': result.get('title', 'Unknown')
-            }
-        except Exception as e:
-            return {
-                'video_id': video_id,
-                'status': 'failed',
-                'message': str(e)
-            }
+    def _downloader(self, video_id: str) -> VideoSourceDownloader:
+        return VideoSourceDownloader(video_id, str(self.cache_dir / video_id))
+
+    def _load_fresh_metadata(self, video_id: str) -> Optional[Dict]:
+        """metadata.json from a previous run, if its format URLs have not expired"""
+        metadata_file = self.cache_dir / video_id / 'metadata.json'
+        if not metadata_file.exists():
+            return None
+        if time.time() - metadata_file.stat().st_mtime > METADATA_TTL_SECONDS:
+            return None
+        with open(metadata_file, 'r') as f:
+            return json.load(f)
+
+    def _fetch_metadata(self, video_id: str) -> Dict:
+        """Fetch video details under the API rate limit"""
+        self.rate_limiter.wait()
+        return self._downloader(video_id).fetch_metadata(video_id)
+
+    def _record(self, video_id: str, status: str, message: str = '', title: str = ''):
+        """Update stats and print one progress line"""
+        with self._stats_lock:
+            if status == DONE:
+                self.stats['downloaded'] += 1
+                print(f"✓ [{self.stats['downloaded']}/{self.stats['total']}] Downloaded: {video_id} - {title}")
+            elif status == CACHED:
+                self.stats['cached'] += 1
+                print(f"⊘ [{self.stats['cached']}/{self.stats['total']}] Cached: {video_id}")
+            else:
+                self.stats['failed'] += 1
+                self.stats['errors'].append({
+                    'video_id': video_id,
+                    'error': message
+                })
+                print(f"✗ [{self.stats['failed']}/{self.stats['total']}] Failed: {video_id} - {message}")
+
+    def _metadata_worker(self, pending: "queue.Queue[str]"):
+        """Stage 1: fetch details far ahead of the downloads and enqueue by size"""
+        while True:
+            try:
+                video_id = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                data = self._load_fresh_metadata(video_id) or self._fetch_metadata(video_id)
+                size = self._downloader(video_id).expected_size(data)
+            except Exception as e:
+                self.queue.update(video_id, status=FAILED, error=f"metadata: {e}")
+                self._record(video_id, FAILED, f"metadata: {e}")
+                continue
+
+            self.queue.update(video_id, status=QUEUED, expected_size=size, title=data.get('title', ''))
+            priority = size if self.order == 'smallest' else -size
+            self.download_queue.put((priority, next(self._sequence), video_id, data))
+
+    def _download_worker(self):
+        """Stage 2: download videos in priority order"""
+        while True:
+            _, _, video_id, data = self.download_queue.get()
+            if video_id is None:
+                return
+
+            entry = self.queue.get(video_id)
+            self.queue.update(video_id, status=DOWNLOADING, attempts=entry.get('attempts', 0) + 1)
+            downloader = self._downloader(video_id)
+
+            try:
+                try:
+                    result = downloader.download_media(data)
+                except Exception:
+                    # Format URLs expire - refetch details once and retry
+                    data = self._fetch_metadata(video_id)
+                    result = downloader.download_media(data)
+
+                self.queue.update(video_id, status=DONE, error=None)
+                self._record(video_id, DONE, title=result.get('title', ''))
+            except Exception as e:
+                self.queue.update(video_id, status=FAILED, error=str(e))
+                self._record(video_id, FAILED, str(e))
 
     def process_video_list(self, video_ids: List[str]):
         """
@@ -123,53 +285,57 @@ class DownloadPipeline:
         Args:
             video_ids: List of YouTube video IDs
         """
+        video_ids = list(dict.fromkeys(video_ids))
         self.stats['total'] = len(video_ids)
+        self.queue = DownloadQueue(self.queue_file)
+        self.rate_limiter = RateLimiter(self.api_rate)
+        self.download_queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
 
         print(f"\n{'='*60}")
         print(f"Download Pipeline")
         print(f"{'='*60}")
         print(f"Videos: {len(video_ids)}")
-        print(f"Workers: {self.workers}")
+        print(f"Workers: {self.workers} download, {self.metadata_workers} metadata ({self.api_rate}/s)")
+        print(f"Order: {self.order} first")
         print(f"Cache: {self.cache_dir}")
+        print(f"Queue: {self.queue_file}")
         print(f"Skip existing: {self.skip_existing}")
         print(f"{'='*60}\n")
 
-        # Download with thread pool
-        with ThreadPoolExecutor(max_workers=self.workers) as executor:
-            # Submit all tasks
-            futures = {
-                executor.submit(self.download_single_video, video_id): video_id
-                for video_id in video_ids
-            }
-
-            # Process results as they complete
-            for future in as_completed(futures):
-                video_id = futures[future]
-
-                try:
-                    result = future.result()
-
-                    if result['status'] == 'downloaded':
-                        self.stats['downloaded'] += 1
-                        print(f"✓ [{self.stats['downloaded']}/{self.stats['total']}] Downloaded: {result['video_id']} - {result.get('title', '')}")
-                    elif result['status'] == 'cached':
-                        self.stats['cached'] += 1
-                        print(f"⊘ [{self.stats['cached']}/{self.stats['total']}] Cached: {result['video_id']}")
-                    else:
-                        self.stats['failed'] += 1
-                        self.stats['errors'].append({
-                            'video_id': video_id,
-                            'error': result['message']
-                        })
-                        print(f"✗ [{self.stats['failed']}/{self.stats['total']}] Failed: {result['video_id']} - {result['message']}")
-
-                except Exception as e:
-                    self.stats['failed'] += 1
-                    self.stats['errors'].append({
-                        'video_id': video_id,
-                        'error': str(e)
-                    })
-                    print(f"✗ Failed: {video_id} - {e}")
+        # Stage 0: settle cached / finished videos before any API call
+        # (a video a previous run downloaded is resumed as done)
+        pending: "queue.Queue[str]" = queue.Queue()
+        for video_id in video_ids:
+            downloaded = self.queue.get(video_id).get('status') == DONE
+            if (self.skip_existing or downloaded) and self.is_cached(video_id):
+                if not downloaded:
+                    self.queue.update(video_id, status=CACHED)
+                self._record(video_id, CACHED)
+                continue
+            self.queue.update(video_id, status=PENDING)
+            pending.put(video_id)
+
+        metadata_threads = [
+            threading.Thread(target=self._metadata_worker, args=(pending,), daemon=True)
+            for _ in range(max(1, self.metadata_workers))
+        ]
+        download_threads = [
+            threading.Thread(target=self._download_worker, daemon=True)
+            for _ in range(max(1, self.workers))
+        ]
+        for thread in metadata_threads + download_threads:
+            thread.start()
+
+        # Downloads drain the queue while metadata is still being prefetched;
+        # once prefetch is done, one sentinel per worker (sorted last) ends the pool
+        for thread in metadata_threads:
+            thread.join()
+        for _ in download_threads:
+            self.download_queue.put((float('inf'), next(self._sequence), None, None))
+        for thread in download_threads:
+            thread.join()
+        self.queue.close()
 
         # Print summary
         self.print_summary()
@@ -206,8 +372,7 @@ class DownloadPipeline:
             'stats': self.stats
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        write_json(output_file, report)
 
         print(f"📄 Report saved: {output_file}")
 
@@ -244,8 +409,7 @@ def load_config(config_file: Path) -> Dict:
     if not config_file.exists():
         return {}
 
-    with open(config_file, 'r') as f:
-        return yaml.safe_load(f) or {}
+    return read_yaml(config_file) or {}
 
 
 def main():
@@ -273,6 +437,9 @@ Examples:
     parser.add_argument('--workers', type=int, help='Number of parallel workers (default: 3)')
     parser.add_argument('--skip-existing', action='store_true', help='Skip videos already in cache')
     parser.add_argument('--cache-dir', type=Path, help='Cache directory (default: /var/markethawk/_downloads)')
+    parser.add_argument('--metadata-workers', type=int, help='Parallel metadata prefetch workers (default: 2)')
+    parser.add_argument('--api-rate', type=float, help='RapidAPI requests per second (default: 2.0)')
+    parser.add_argument('--order', choices=['smallest', 'largest'], help='Download order by expected size (default: smallest)')
     parser.add_argument('--report', type=Path, help='Save report to JSON file')
 
     args = parser.parse_args()
@@ -304,6 +471,12 @@ Examples:
         config['skip_existing'] = True
     if args.cache_dir:
         config['cache_dir'] = str(args.cache_dir)
+    if args.metadata_workers:
+        config['metadata_workers'] = args.metadata_workers
+    if args.api_rate:
+        config['api_rate'] = args.api_rate
+    if args.order:
+        config['order'] = args.order
 
     # Run pipeline
     pipeline = DownloadPipeline(config)
@@ -5,18 +5,28 @@ Generate YouTube Shorts from Earnings Call Highlights
 Creates props files for Remotion EarningsShort composition
 """
 
-import json
+import sys
 import argparse
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def extract_words_for_highlight(transcript: Dict, highlight: Dict, window_seconds: int = 5) -> List[Dict]:
+from lib.transcript_index import TranscriptIndex, load_index
+from lib.serialization import read_json, write_json, read_yaml
+
+
+def extract_words_for_highlight(
+    transcript: Union[Dict, TranscriptIndex],
+    highlight: Dict,
+    window_seconds: int = 5
+) -> List[Dict]:
     """
     Extract word-level timestamps for a highlight segment
 
     Args:
-        transcript: Full transcript with word-level data
+        transcript: Full transcript with word-level data (or its TranscriptIndex)
         highlight: Highlight dict with timestamp
         window_seconds: Extra seconds before/after highlight (for context)
 
@@ -28,32 +38,17 @@ def extract_words_for_highlight(transcript: Dict, highlight: Dict, window_second
     estimated_duration = len(highlight['text'].split()) / 2.5
     end_time = start_time + estimated_duration + window_seconds
 
-    words = []
-    segments = transcript.get('segments', [])
-
-    for segment in segments:
-        segment_start = segment.get('start', 0)
-        segment_end = segment.get('end', 0)
-
-        # Skip segments outside our time window
-        if segment_end < start_time - window_seconds or segment_start > end_time:
-            continue
-
-        # Extract words from segment
-        for word_obj in segment.get('words', []):
-            word_start = word_obj.get('start', segment_start)
-            word_end = word_obj.get('end', segment_start + 1)
-            word_text = word_obj.get('word', '').strip()
+    index = TranscriptIndex.of(transcript)
 
-            if start_time - window_seconds <= word_start <= end_time:
-                # Normalize timestamp to start from 0
-                words.append({
-                    'word': word_text,
-                    'start': word_start - start_time,
-                    'end': word_end - start_time
-                })
-
-    return words
+    # Normalize timestamp to start from 0
+    return [
+        {
+            'word': word_obj['word'].strip(),
+            'start': word_obj['start'] - start_time,
+            'end': word_obj['end'] - start_time
+        }
+        for word_obj in index.words_between(start_time - window_seconds, end_time)
+    ]
 
 
 def generate_shorts(job_dir: Path, max_shorts: int = 5):
@@ -69,23 +64,20 @@ def generate_shorts(job_dir: Path, max_shorts: int = 5):
     if not insights_file.exists():
         raise FileNotFoundError(f"Insights file not found: {insights_file}")
 
-    with open(insights_file, 'r') as f:
-        insights_data = json.load(f)
-        insights = insights_data.get('insights', {})
+    insights_data = read_json(insights_file)
+    insights = insights_data.get('insights', {})
 
     # Load transcript
     transcript_file = job_dir / 'transcripts' / 'transcript.json'
     if not transcript_file.exists():
         raise FileNotFoundError(f"Transcript file not found: {transcript_file}")
 
-    with open(transcript_file, 'r') as f:
-        transcript = json.load(f)
+    # Index built once, shared by every highlight
+    transcript = load_index(transcript_file)
 
     # Load job.yaml for metadata
-    import yaml
     job_yaml = job_dir / 'job.yaml'
-    with open(job_yaml, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_yaml)
 
     # Get company info
     confirmed = job_data.get('processing', {}).get('confirm_metadata', {}).get('confirmed', {})
@@ -150,8 +142,7 @@ def generate_shorts(job_dir: Path, max_shorts: int = 5):
 
         # Save props file
         props_file = shorts_dir / f'short_{i+1}_props.json'
-        with open(props_file, 'w') as f:
-            json.dump(props, f, indent=2)
+        write_json(props_file, props)
 
         print(f"✅ Created short {i+1}: {highlight['text'][:50]}...")
         print(f"   Speaker: {highlight.get('speaker', 'Unknown')}")
@@ -170,6 +161,7 @@ def generate_shorts(job_dir: Path, max_shorts: int = 5):
     print(f"1. Add speaker photos to {shorts_dir}/ (speaker_1.jpg, speaker_2.jpg, etc.)")
     print(f"2. Preview in Remotion Studio: cd ~/markethawk/studio && npm run start")
     print(f"3. Render: npx remotion render EarningsShort {shorts_dir}/short_1.mp4 --props {shorts_dir}/short_1_props.json")
+    print(f"   Or render all shorts in one ffmpeg pass: python lens/steps/render_shorts.py {job_dir}")
 
 
 if __name__ == "__main__":
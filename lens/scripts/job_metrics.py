@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Show where time and money go: per-step metrics for jobs or batches
+
+Reads the metrics.jsonl files written around every step (workflow.py and
+batch_processor.py) and rolls them up per step.
+
+Usage:
+    python lens/scripts/job_metrics.py /var/markethawk/jobs/{JOB_ID}
+    python lens/scripts/job_metrics.py /var/markethawk/batch_runs/{BATCH}/batch.yaml
+    python lens/scripts/job_metrics.py /var/markethawk/jobs/*  --json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.metrics import aggregate, load_metrics
+from lib.serialization import read_yaml
+
+JOBS_DIR = Path(os.getenv("JOBS_DIR", "/var/markethawk/jobs"))
+
+
+def collect_records(paths: List[Path]) -> List[Dict[str, Any]]:
+    """Step records from job directories and/or batch.yaml files"""
+    records = []
+    for path in paths:
+        if path.is_file() and path.suffix in ('.yaml', '.yml'):
+            batch = read_yaml(path) or {}
+            for job in batch.get('jobs', []):
+                records.extend(load_metrics(JOBS_DIR / job['job_id']))
+        elif path.is_dir():
+            records.extend(load_metrics(path))
+    return records
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(n) < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}TB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate per-step job metrics")
+    parser.add_argument("paths", nargs="+", type=Path, help="Job directories or batch.yaml files")
+    parser.add_argument("--json", action="store_true", help="Print aggregate as JSON")
+
+    args = parser.parse_args()
+
+    records = collect_records(args.paths)
+    if not records:
+        print("No metrics found (metrics.jsonl is written when steps run)")
+        return 1
+
+    summary = aggregate(records)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    total = summary['total']
+    print(f"📊 Step metrics ({total['runs']} step runs, {total['failed']} failed)")
+    print()
+    print(f"   {'Step':<28} {'Runs':>5} {'Wall':>9} {'CPU':>9} {'Sub CPU':>9} {'GPU':>8} "
+          f"{'Peak RSS':>9} {'Read':>8} {'Write':>8} {'Tokens':>9} {'Cost':>9}")
+
+    rows = sorted(summary['steps'].items(), key=lambda kv: kv[1].get('wall_seconds', 0), reverse=True)
+    for name, step in rows + [('TOTAL', total)]:
+        tokens = step.get('llm_prompt_tokens', 0) + step.get('llm_completion_tokens', 0)
+        print(
+            f"   {name:<28} {step['runs']:>5} "
+            f"{step.get('wall_seconds', 0):>8.1f}s {step.get('cpu_seconds', 0):>8.1f}s "
+            f"{step.get('subprocess_cpu_seconds', 0):>8.1f}s {step.get('gpu_seconds', 0):>7.1f}s "
+            f"{step.get('peak_rss_mb', 0):>7.0f}MB "
+            f"{_fmt_bytes(step.get('read_bytes', 0)):>8} {_fmt_bytes(step.get('write_bytes', 0)):>8} "
+            f"{tokens:>9} {'$' + format(step.get('llm_cost_usd', 0), '.4f'):>9}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
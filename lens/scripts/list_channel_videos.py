@@ -15,24 +15,53 @@ Examples:
     # Use channel URL instead of ID
     python lens/scripts/list_channel_videos.py @nvidia --output nvidia_videos.txt
 
+    # Daily sweep: only videos uploaded since the last run
+    python lens/scripts/list_channel_videos.py UCBJycsmduvYEL83R_U4JriQ --incremental --filter-earnings
+
+    # Include publish dates so batch_setup.py can prioritize fresh calls
+    python lens/scripts/list_channel_videos.py UCBJycsmduvYEL83R_U4JriQ --incremental --with-dates -o new.txt
+
+Incremental mode stores a per-channel watermark (newest video ID/publishedAt
+plus recently seen IDs) in /var/markethawk/_channels/<channel_id>.json and
+stops paging the uploads playlist as soon as it reaches a known video, so a
+sweep costs one playlistItems call per 50 new uploads.
+
 Environment:
     YOUTUBE_API_KEY - Required, get from Google Cloud Console
 """
 
 import argparse
+import json
 import os
 import sys
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.youtube_api import LIST_WORKERS, QuotaExceededError, YouTubeAPI
+
+# Per-channel discovery watermarks
+WATERMARK_DIR = Path(os.getenv('CHANNEL_WATERMARK_DIR', '/var/markethawk/_channels'))
+
+# Recently seen IDs kept in the watermark (guards against deleted/unlisted
+# videos making the newest ID disappear from the playlist)
+WATERMARK_KNOWN_IDS = 200
+
+# Channel ID / uploads playlist lookups change rarely - reuse cached responses for a day
+CHANNEL_CACHE_SECONDS = 24 * 3600
+
+
 def get_channel_id_from_username(youtube, username: str) -> Optional[str]:
     """
     Convert channel username (@nvidia) to channel ID
 
     Args:
-        youtube: YouTube API client
+        youtube: YouTubeAPI client
         username: Channel username (with or without @)
 
     Returns:
@@ -42,11 +71,12 @@ def get_channel_id_from_username(youtube, username: str) -> Optional[str]:
     username = username.lstrip('@')
 
     try:
-        request = youtube.channels().list(
+        response = youtube.list(
+            'channels',
+            max_age=CHANNEL_CACHE_SECONDS,
             part='id',
             forUsername=username
         )
-        response = request.execute()
 
         if response.get('items'):
             return response['items'][0]['id']
@@ -65,18 +95,19 @@ def get_channel_uploads_playlist_id(youtube, channel_id: str) -> Optional[str]:
     Get the uploads playlist ID for a channel
 
     Args:
-        youtube: YouTube API client
+        youtube: YouTubeAPI client
         channel_id: YouTube channel ID
 
     Returns:
         Uploads playlist ID or None
     """
     try:
-        request = youtube.channels().list(
+        response = youtube.list(
+            'channels',
+            max_age=CHANNEL_CACHE_SECONDS,
             part='contentDetails',
             id=channel_id
         )
-        response = request.execute()
 
         if not response['items']:
             print(f"❌ Channel not found: {channel_id}")
@@ -89,22 +120,37 @@ def get_channel_uploads_playlist_id(youtube, channel_id: str) -> Optional[str]:
         return None
 
 
-def get_playlist_videos(youtube, playlist_id: str, max_results: Optional[int] = None) -> List[str]:
+def get_playlist_videos(
+    youtube,
+    playlist_id: str,
+    max_results: Optional[int] = None,
+    watermark: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, str]], bool]:
     """
-    Get all video IDs from a playlist
+    Get video IDs from a playlist (newest first)
 
     Args:
-        youtube: YouTube API client
+        youtube: YouTubeAPI client
         playlist_id: YouTube playlist ID
         max_results: Maximum number of videos to fetch (None = all)
+        watermark: Stop paging at the first video already seen (incremental
+            mode; pass {} on the first incremental run)
 
     Returns:
-        List of video IDs
+        ([{"id": ..., "published_at": ...}, ...], complete) - complete is
+        False when max_results (or an error) cut the listing short, so
+        older unseen videos may remain
+
+    Raises:
+        HttpError: In incremental mode, so a partial listing never advances the watermark
     """
-    video_ids = []
+    videos = []
     next_page_token = None
     total_fetched = 0
 
+    known_ids: Set[str] = set(watermark.get('known_ids', [])) if watermark else set()
+    last_published_at = watermark.get('last_published_at') if watermark else None
+
     try:
         while True:
             # Determine page size
@@ -115,45 +161,123 @@ def get_playlist_videos(youtube, playlist_id: str, max_results: Optional[int] =
                     break
                 page_size = min(50, remaining)
 
-            request = youtube.playlistItems().list(
+            response = youtube.list(
+                'playlistItems',
                 part='contentDetails',
                 playlistId=playlist_id,
                 maxResults=page_size,
                 pageToken=next_page_token
             )
-            response = request.execute()
 
             # Extract video IDs
+            reached_watermark = False
             for item in response['items']:
                 video_id = item['contentDetails']['videoId']
-                video_ids.append(video_id)
+                published_at = item['contentDetails'].get('videoPublishedAt', '')
+
+                # Uploads are newest first - everything past here is already known
+                if video_id in known_ids or (
+                    last_published_at and published_at and published_at < last_published_at
+                ):
+                    reached_watermark = True
+                    break
+
+                videos.append({'id': video_id, 'published_at': published_at})
                 total_fetched += 1
 
             print(f"   Fetched {total_fetched} videos...", end='\r')
 
+            if reached_watermark:
+                print(f"   Fetched {total_fetched} new videos... reached watermark")
+                return videos, True
+
             # Check for next page
             next_page_token = response.get('nextPageToken')
             if not next_page_token:
-                break
+                print(f"   Fetched {total_fetched} videos... Done!")
+                return videos, True
 
-        print(f"   Fetched {total_fetched} videos... Done!")
-        return video_ids
+        print(f"   Fetched {total_fetched} videos... stopped at --max-results")
+        return videos, False
 
     except HttpError as e:
         print(f"\n❌ Error fetching playlist items: {e}")
-        return video_ids
+        if watermark is not None:
+            raise
+        return videos, False
+
+
+def load_watermark(channel_id: str, state_dir: Path = WATERMARK_DIR) -> Optional[Dict[str, Any]]:
+    """Load the discovery watermark for a channel (None on first run)"""
+    path = state_dir / f"{channel_id}.json"
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
 
 
-def filter_earnings_videos(youtube, video_ids: List[str]) -> List[str]:
+def save_watermark(
+    channel_id: str,
+    uploads_playlist_id: str,
+    new_videos: List[Dict[str, str]],
+    previous: Optional[Dict[str, Any]],
+    state_dir: Path = WATERMARK_DIR
+) -> Path:
+    """
+    Advance the channel watermark past the newly discovered videos
+
+    Args:
+        channel_id: YouTube channel ID
+        uploads_playlist_id: Cached so later runs skip the channels.list call
+        new_videos: Videos found this run (newest first)
+        previous: Previous watermark (None on first run)
+        state_dir: Watermark directory
+
+    Returns:
+        Path to the watermark file
+    """
+    previous = previous or {}
+    known_ids = [v['id'] for v in new_videos] + previous.get('known_ids', [])
+
+    watermark = {
+        'channel_id': channel_id,
+        'uploads_playlist_id': uploads_playlist_id,
+        'last_video_id': new_videos[0]['id'] if new_videos else previous.get('last_video_id'),
+        'last_published_at': max(
+            [v['published_at'] for v in new_videos if v['published_at']]
+            + ([previous['last_published_at']] if previous.get('last_published_at') else []),
+            default=None
+        ),
+        'known_ids': known_ids[:WATERMARK_KNOWN_IDS],
+        'updated_at': datetime.now().isoformat(),
+    }
+
+    state_dir.mkdir(parents=True, exist_ok=True)
+    path = state_dir / f"{channel_id}.json"
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(watermark, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def filter_earnings_videos(youtube, video_ids: List[str], max_workers: int = LIST_WORKERS,
+                           raise_errors: bool = False) -> List[str]:
     """
     Filter videos to only include earnings-related ones
 
+    Details are fetched 50 IDs per call (the YouTube API limit) with the
+    calls running concurrently; unchanged results are served from the ETag cache.
+
     Args:
-        youtube: YouTube API client
+        youtube: YouTubeAPI client
         video_ids: List of video IDs to filter
+        max_workers: Concurrent videos.list calls
+        raise_errors: Re-raise HttpError instead of returning [] (incremental
+            mode, so a failed filter never advances the watermark)
 
     Returns:
-        List of earnings video IDs
+        List of earnings video IDs (in input order)
     """
     earnings_keywords = [
         'earnings', 'quarterly results', 'financial results',
@@ -162,29 +286,22 @@ def filter_earnings_videos(youtube, video_ids: List[str]) -> List[str]:
 
     earnings_videos = []
 
-    # Process in batches of 50 (YouTube API limit)
-    for i in range(0, len(video_ids), 50):
-        batch = video_ids[i:i+50]
-
-        try:
-            request = youtube.videos().list(
-                part='snippet',
-                id=','.join(batch)
-            )
-            response = request.execute()
-
-            for item in response['items']:
-                title = item['snippet']['title'].lower()
-                description = item['snippet']['description'].lower()
+    try:
+        items = youtube.videos_list(video_ids, part='snippet', max_workers=max_workers)
+    except HttpError as e:
+        print(f"❌ Error fetching video details: {e}")
+        if raise_errors:
+            raise
+        return earnings_videos
 
-                # Check if earnings-related
-                if any(keyword in title or keyword in description for keyword in earnings_keywords):
-                    earnings_videos.append(item['id'])
-                    print(f"   ✓ {item['snippet']['title']}")
+    for item in items:
+        title = item['snippet']['title'].lower()
+        description = item['snippet']['description'].lower()
 
-        except HttpError as e:
-            print(f"❌ Error fetching video details: {e}")
-            continue
+        # Check if earnings-related
+        if any(keyword in title or keyword in description for keyword in earnings_keywords):
+            earnings_videos.append(item['id'])
+            print(f"   ✓ {item['snippet']['title']}")
 
     return earnings_videos
 
@@ -209,6 +326,9 @@ Examples:
 
   # Use channel handle instead of ID
   python lens/scripts/list_channel_videos.py @nvidia --output nvidia_videos.txt
+
+  # Only videos uploaded since the last run (updates the channel watermark)
+  python lens/scripts/list_channel_videos.py UCBJycsmduvYEL83R_U4JriQ --incremental
         """
     )
 
@@ -216,6 +336,14 @@ Examples:
     parser.add_argument('--output', '-o', help='Output file (default: stdout)')
     parser.add_argument('--max-results', '-n', type=int, help='Maximum number of videos to fetch')
     parser.add_argument('--filter-earnings', action='store_true', help='Only include earnings-related videos')
+    parser.add_argument('--with-dates', action='store_true',
+                        help='Write VIDEO_ID,,PUBLISHED_AT lines (batch_setup.py uses the date for priority)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only list videos newer than the stored channel watermark')
+    parser.add_argument('--state-dir', type=Path, default=WATERMARK_DIR,
+                        help=f'Watermark directory (default: {WATERMARK_DIR})')
+    parser.add_argument('--workers', type=int, default=LIST_WORKERS,
+                        help=f'Concurrent video detail requests (default: {LIST_WORKERS})')
 
     args = parser.parse_args()
 
@@ -227,7 +355,21 @@ Examples:
         return 1
 
     # Build YouTube API client
-    youtube = build('youtube', 'v3', developerKey=api_key)
+    youtube = YouTubeAPI(build('youtube', 'v3', developerKey=api_key))
+    print(f"📊 {youtube.quota.summary()}")
+
+    try:
+        return run(youtube, args)
+    except QuotaExceededError as e:
+        print(f"\n❌ {e}")
+        print("   Resume after the daily reset (midnight Pacific) or raise YOUTUBE_DAILY_QUOTA")
+        return 1
+    finally:
+        print(f"\n📊 {youtube.quota.summary()}")
+
+
+def run(youtube: YouTubeAPI, args) -> int:
+    """Discover channel videos and write the output (quota errors propagate)"""
 
     # Handle channel ID or username
     channel_id = args.channel_id
@@ -238,44 +380,90 @@ Examples:
             return 1
         print(f"   Channel ID: {channel_id}")
 
-    # Get uploads playlist ID
-    print(f"\n📺 Fetching channel details...")
-    uploads_playlist_id = get_channel_uploads_playlist_id(youtube, channel_id)
-    if not uploads_playlist_id:
-        return 1
+    watermark = load_watermark(channel_id, args.state_dir) if args.incremental else None
+    if watermark:
+        print(f"\n🔖 Watermark: {watermark.get('last_video_id')} ({watermark.get('last_published_at')})")
+
+    # Get uploads playlist ID (cached in the watermark)
+    if watermark and watermark.get('uploads_playlist_id'):
+        uploads_playlist_id = watermark['uploads_playlist_id']
+    else:
+        print(f"\n📺 Fetching channel details...")
+        uploads_playlist_id = get_channel_uploads_playlist_id(youtube, channel_id)
+        if not uploads_playlist_id:
+            return 1
 
     print(f"   Uploads playlist: {uploads_playlist_id}")
 
-    # Get all video IDs
+    # Get video IDs (stops at the watermark in incremental mode)
     print(f"\n📋 Fetching video list...")
-    video_ids = get_playlist_videos(youtube, uploads_playlist_id, args.max_results)
+    try:
+        videos, complete = get_playlist_videos(
+            youtube,
+            uploads_playlist_id,
+            args.max_results,
+            watermark=(watermark or {}) if args.incremental else None
+        )
+    except HttpError:
+        print("❌ Watermark not updated")
+        return 1
+    video_ids = [v['id'] for v in videos]
 
     if not video_ids:
+        if args.incremental and complete:
+            update_watermark(channel_id, uploads_playlist_id, videos, watermark, args)
+        if args.incremental and watermark:
+            print("✅ No new videos since last run")
+            return 0
         print("❌ No videos found")
         return 1
 
-    print(f"\n✅ Found {len(video_ids)} videos")
+    print(f"\n✅ Found {len(video_ids)} {'new ' if watermark else ''}videos")
 
     # Filter earnings videos if requested
     if args.filter_earnings:
         print(f"\n🔍 Filtering earnings-related videos...")
-        video_ids = filter_earnings_videos(youtube, video_ids)
+        try:
+            video_ids = filter_earnings_videos(youtube, video_ids, max_workers=args.workers,
+                                               raise_errors=args.incremental)
+        except HttpError:
+            print("❌ Watermark not updated")
+            return 1
         print(f"✅ Found {len(video_ids)} earnings videos")
 
     # Output results
+    if args.with_dates:
+        published = {v['id']: v['published_at'] for v in videos}
+        lines = [f"{video_id},,{published.get(video_id, '')}" for video_id in video_ids]
+    else:
+        lines = video_ids
+
     if args.output:
         output_path = Path(args.output)
         with open(output_path, 'w') as f:
-            for video_id in video_ids:
-                f.write(f"{video_id}\n")
+            for line in lines:
+                f.write(f"{line}\n")
         print(f"\n✅ Saved to: {output_path}")
     else:
         # Print to stdout
-        for video_id in video_ids:
-            print(video_id)
+        for line in lines:
+            print(line)
+
+    # Only once the output exists: a failure above leaves the videos for the next run
+    if args.incremental:
+        if complete:
+            update_watermark(channel_id, uploads_playlist_id, videos, watermark, args)
+        else:
+            print("   Watermark not advanced: listing cut short by --max-results (older videos not listed yet)")
 
     return 0
 
 
+def update_watermark(channel_id: str, uploads_playlist_id: str, videos: List[Dict[str, str]],
+                     watermark: Optional[Dict[str, Any]], args) -> None:
+    watermark_path = save_watermark(channel_id, uploads_playlist_id, videos, watermark, args.state_dir)
+    print(f"   Watermark updated: {watermark_path}")
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -9,7 +9,6 @@ Migrate job from dev to production
 import os
 import sys
 import subprocess
-import yaml
 from pathlib import Path
 
 # Add parent to path
@@ -21,6 +20,7 @@ os.environ['DEV_MODE'] = 'false'
 # Import after setting DEV_MODE
 from steps.match_company import match_company
 from steps.update_database import update_database
+from lib.serialization import read_yaml
 
 
 def migrate_r2_artifacts(job_dir: Path, job_data: dict):
@@ -134,8 +134,7 @@ def main():
     job_dir = job_file.parent
 
     # Load job data
-    with open(job_file, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_file)
 
     job_id = job_data.get('job_id')
     print(f"\n🚀 Migrating job: {job_id}")
@@ -13,6 +13,7 @@ from pathlib import Path
 LENS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(LENS_DIR))
 
+from lib.serialization import read_json, read_yaml
 from scripts.upload_youtube import build_description
 
 
@@ -23,23 +24,19 @@ def preview_youtube_metadata(job_yaml_path: str):
     Args:
         job_yaml_path: Path to job.yaml
     """
-    import yaml
-    import json
 
     job_file = Path(job_yaml_path)
     job_dir = job_file.parent
 
     # Load job config
-    with open(job_file) as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_file)
 
     # Load insights
     insights_file = job_data.get('processing', {}).get('extract_insights', {}).get('insights_file')
     insights = {}
     if insights_file and Path(insights_file).exists():
-        with open(insights_file, 'r') as f:
-            insights_data = json.load(f)
-            insights = insights_data.get('insights', {})
+        insights_data = read_json(insights_file)
+        insights = insights_data.get('insights', {})
 
     # Get metadata
     confirmed = job_data.get('processing', {}).get('confirm_metadata', {}).get('confirmed', {})
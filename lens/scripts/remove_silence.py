@@ -2,6 +2,9 @@
 """
 Remove initial silence from video using ffmpeg.
 Detects silence at the beginning and trims it.
+
+Silence is detected on decoded PCM (lib/audio_activity), reading only until
+sound starts rather than running silencedetect over the whole file.
 """
 
 import sys
@@ -11,6 +14,11 @@ import argparse
 import json
 from pathlib import Path
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.audio_activity import find_activity_start
+
 
 class SilenceRemover:
     """Remove initial silence from video files"""
@@ -22,41 +30,24 @@ class SilenceRemover:
         self.min_duration = min_duration
 
     def detect_silence_end(self) -> float:
-        """Detect when initial silence ends"""
+        """Detect when initial silence ends (decodes only until sound starts)"""
 
         print(f"🔍 Detecting initial silence...")
         print(f"  Threshold: {self.threshold}")
         print(f"  Min duration: {self.min_duration}s")
 
-        # Use ffmpeg silencedetect filter
-        cmd = [
-            "ffmpeg",
-            "-i", str(self.input_path),
-            "-af", f"silencedetect=noise={self.threshold}:d={self.min_duration}",
-            "-f", "null",
-            "-"
-        ]
+        silence_end = find_activity_start(str(self.input_path), threshold_db=self.threshold)
 
-        result = subprocess.run(
-            cmd,
-            stderr=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            text=True
-        )
+        if silence_end is None:
+            print(f"  No sound detected above threshold")
+            return 0.0
 
-        # Parse ffmpeg output for silence_end
-        silence_end = 0.0
-        for line in result.stderr.split('\n'):
-            if 'silence_end:' in line:
-                # Extract timestamp from line like: [silencedetect @ 0x...] silence_end: 3.456 | silence_duration: 3.456
-                parts = line.split('silence_end:')[1].split('|')[0].strip()
-                silence_end = float(parts)
-                print(f"✓ Silence ends at: {silence_end}s")
-                break
-
-        if silence_end == 0.0:
+        # Ignore leading silence shorter than min_duration (same as silencedetect d=)
+        if silence_end < self.min_duration:
             print(f"  No initial silence detected (or audio starts immediately)")
+            return 0.0
 
+        print(f"✓ Silence ends at: {silence_end}s")
         return silence_end
 
     def trim_video(self, start_time: float) -> bool:
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmark suite (lens/benchmarks) and report regressions
+
+Transcript cases run on synthetic 30/60/120 minute calls; company matching
+uses the real data/companies_master.csv. Results are compared against a
+stored baseline (benchmarks/baselines/<name>.json) when one exists.
+
+Usage:
+    python lens/scripts/run_benchmarks.py --list
+    python lens/scripts/run_benchmarks.py --save baseline           # record baseline
+    python lens/scripts/run_benchmarks.py                           # compare to baseline
+    python lens/scripts/run_benchmarks.py -k refine --threshold 0.05
+    python lens/scripts/run_benchmarks.py --compare before.json --report report.json
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.runner import (
+    DEFAULT_THRESHOLD,
+    baseline_path,
+    compare,
+    iter_benchmarks,
+    load_baseline,
+    run_suite,
+    save_baseline,
+)
+from lib.serialization import write_json
+
+STATUS_ICONS = {'regressed': '🔴', 'improved': '🟢', 'ok': '  ', 'new': '🆕', 'skipped': '⏭️ '}
+
+
+def print_progress(benchmark_id: str, result: Dict[str, Any]) -> None:
+    if 'skipped' in result:
+        print(f"   {benchmark_id:<48} skipped ({result['skipped']})")
+    else:
+        print(f"   {benchmark_id:<48} {result['median_ms']:>10.3f} ms "
+              f"(min {result['min_ms']:.3f}, {result['rounds']}x{result['loops']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CPU-side hot paths")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose ID contains this")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round (default: 0.2)")
+    parser.add_argument("--save", metavar="NAME", help="Save results as baseline NAME (or .json path)")
+    parser.add_argument("--compare", metavar="NAME", default="baseline",
+                        help="Baseline to compare against (default: baseline)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative slowdown that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--report", type=Path, help="Write run + comparison as JSON")
+
+    args = parser.parse_args()
+
+    if args.list:
+        for benchmark_id, _, _ in iter_benchmarks(args.pattern):
+            print(benchmark_id)
+        return 0
+
+    print(f"⏱️  Running benchmarks ({args.rounds} rounds, ≥{args.min_time}s each)")
+    run = run_suite(args.pattern, rounds=args.rounds, min_time=args.min_time, progress=print_progress)
+    print()
+
+    rows = []
+    baseline = load_baseline(args.compare)
+    if baseline is None:
+        print(f"ℹ️  No baseline at {baseline_path(args.compare)} (record one with --save {args.compare})")
+    else:
+        if baseline.get('machine') != run['machine']:
+            print(f"⚠️  Baseline recorded on a different machine/Python: {baseline.get('machine')}")
+        rows = compare(run, baseline, threshold=args.threshold)
+        print(f"📊 Compared to {baseline_path(args.compare)} ({baseline.get('created_at')}, "
+              f"threshold {args.threshold:.0%})")
+        print()
+        print(f"     {'Benchmark':<48} {'Baseline':>11} {'Current':>11} {'Change':>8}")
+        for row in rows:
+            if row['ratio'] is None:
+                current = f"{row['current_ms']:.3f}ms" if row['current_ms'] is not None else '-'
+                print(f"   {STATUS_ICONS[row['status']]}{row['id']:<48} {'-':>11} {current:>11} {row['status']:>8}")
+                continue
+            print(f"   {STATUS_ICONS[row['status']]}{row['id']:<48} {row['baseline_ms']:>9.3f}ms "
+                  f"{row['current_ms']:>9.3f}ms {row['ratio'] - 1:>+8.1%}")
+        print()
+
+    if args.save:
+        path = save_baseline(run, args.save)
+        print(f"💾 Saved baseline: {path}")
+
+    if args.report:
+        write_json(args.report, {**run, 'comparison': rows})
+        print(f"💾 Saved report: {args.report}")
+
+    regressed = [row['id'] for row in rows if row['status'] == 'regressed']
+    if regressed:
+        print(f"❌ {len(regressed)} regression(s): {', '.join(regressed)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
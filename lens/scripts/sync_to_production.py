@@ -7,13 +7,13 @@ After testing locally, use this script to sync the earnings_calls record to prod
 
 import sys
 import os
-import yaml
 from pathlib import Path
 
 # Add lens to path
 LENS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(LENS_DIR))
 
+from lib.serialization import read_yaml
 from steps.update_database import update_database
 
 
@@ -33,8 +33,7 @@ def sync_job_to_production(job_yaml_path: str, production_db_url: str):
     job_dir = job_file.parent
 
     # Load job data
-    with open(job_file, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_file)
 
     job_id = job_data.get('job_id', 'unknown')
 
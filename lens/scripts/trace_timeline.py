@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Show a trace as a flame-style timeline: where a job's wall-clock time went
+
+Reads the OTLP/JSON trace.jsonl written by workflow.py / batch_processor.py
+(lib/tracing.py) and prints the span tree with bars on a shared time axis.
+Spans on the critical path (the chain of children that finished last) are
+marked with '*'.
+
+Usage:
+    python lens/scripts/trace_timeline.py /var/markethawk/jobs/{JOB_ID}
+    python lens/scripts/trace_timeline.py /var/markethawk/batch_runs/{BATCH} --all
+    python lens/scripts/trace_timeline.py trace.jsonl --trace-id 4bf92f35... --min-ms 50
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.tracing import STATUS_ERROR, TRACE_FILE, load_spans
+
+
+def _children(spans: List[Dict[str, Any]]) -> Dict[Optional[str], List[Dict[str, Any]]]:
+    """Spans grouped by parent (spans whose parent is missing become roots)"""
+    ids = {s['span_id'] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in sorted(spans, key=lambda s: s['start_ns']):
+        parent = s['parent_id'] if s['parent_id'] in ids else None
+        children.setdefault(parent, []).append(s)
+    return children
+
+
+def critical_path(children: Dict[Optional[str], List[Dict[str, Any]]]) -> Set[str]:
+    """
+    Span IDs on the critical path
+
+    Within each span, start from the child that ends last, then step back to the
+    sibling that ended latest at or before the current one started, and so on;
+    every span on that chain is descended into the same way.
+    """
+    path = set()
+
+    def visit(node: Dict[str, Any]) -> None:
+        path.add(node['span_id'])
+        kids = children.get(node['span_id'])
+        if not kids:
+            return
+        current = max(kids, key=lambda s: s['end_ns'])
+        while current is not None:
+            visit(current)
+            earlier = [s for s in kids if s is not current and s['end_ns'] <= current['start_ns']]
+            current = max(earlier, key=lambda s: s['end_ns']) if earlier else None
+
+    for root in children.get(None, []):
+        visit(root)
+    return path
+
+
+def _fmt_duration(ns: int) -> str:
+    ms = ns / 1e6
+    if ms < 1000:
+        return f"{ms:.0f}ms"
+    if ms < 60_000:
+        return f"{ms / 1000:.1f}s"
+    return f"{ms / 60_000:.1f}m"
+
+
+def render(spans: List[Dict[str, Any]], width: int = 60, min_ms: float = 0.0) -> List[str]:
+    """
+    Render one trace as timeline rows
+
+    Args:
+        spans: Spans of a single trace
+        width: Bar width in characters
+        min_ms: Hide spans shorter than this (and their children)
+
+    Returns:
+        Lines to print
+    """
+    start = min(s['start_ns'] for s in spans)
+    end = max(s['end_ns'] for s in spans)
+    scale = width / max(end - start, 1)
+    children = _children(spans)
+    critical = critical_path(children)
+
+    name_width = 48
+    lines = [f"   {'Span':<{name_width}} {'Duration':>9}  |{'':<{width}}|"]
+
+    def walk(node: Dict[str, Any], depth: int) -> None:
+        duration = node['end_ns'] - node['start_ns']
+        if duration / 1e6 < min_ms:
+            return
+        offset = int((node['start_ns'] - start) * scale)
+        length = max(1, int(round(duration * scale)))
+        bar = ' ' * offset + ('█' if node['span_id'] in critical else '▒') * min(length, width - offset)
+        marker = '*' if node['span_id'] in critical else ' '
+        label = ('  ' * depth + node['name'])[:name_width - 2]
+        if node['status'] == STATUS_ERROR:
+            label = (label + ' ❌')[:name_width]
+        lines.append(f" {marker} {label:<{name_width}} {_fmt_duration(duration):>9}  |{bar:<{width}}|")
+        for child in children.get(node['span_id'], []):
+            walk(child, depth + 1)
+
+    for root in children.get(None, []):
+        walk(root, 0)
+    return lines
+
+
+def find_trace_file(path: Path) -> Path:
+    return path / TRACE_FILE if path.is_dir() else path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a job trace as a timeline")
+    parser.add_argument("path", type=Path, help="Job/batch directory or trace.jsonl")
+    parser.add_argument("--trace-id", help="Trace to show (default: most recent)")
+    parser.add_argument("--all", action="store_true", help="Show every trace in the file")
+    parser.add_argument("--width", type=int, default=60, help="Bar width (default: 60)")
+    parser.add_argument("--min-ms", type=float, default=0.0, help="Hide spans shorter than this")
+
+    args = parser.parse_args()
+
+    trace_file = find_trace_file(args.path)
+    if not trace_file.exists():
+        print(f"❌ Trace file not found: {trace_file}")
+        return 1
+
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for s in load_spans(trace_file):
+        traces.setdefault(s['trace_id'], []).append(s)
+    if not traces:
+        print(f"❌ No spans in {trace_file}")
+        return 1
+
+    ordered = sorted(traces, key=lambda t: min(s['start_ns'] for s in traces[t]))
+    if args.trace_id:
+        selected = [t for t in ordered if t.startswith(args.trace_id)]
+        if not selected:
+            print(f"❌ Trace not found: {args.trace_id}")
+            return 1
+    elif args.all:
+        selected = ordered
+    else:
+        selected = ordered[-1:]
+
+    for trace_id in selected:
+        spans = traces[trace_id]
+        total = max(s['end_ns'] for s in spans) - min(s['start_ns'] for s in spans)
+        errors = sum(1 for s in spans if s['status'] == STATUS_ERROR)
+        print(f"🔍 Trace {trace_id} ({len(spans)} spans, {_fmt_duration(total)}"
+              f"{f', {errors} failed' if errors else ''})")
+        print()
+        for line in render(spans, width=args.width, min_ms=args.min_ms):
+            print(line)
+        print()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,6 @@
 Update YouTube video description without re-uploading video
 """
 
-import yaml
 import os
 import sys
 import argparse
@@ -15,7 +14,8 @@ load_dotenv()
 
 # Import from upload_youtube.py
 sys.path.insert(0, str(Path(__file__).parent))
-from upload_youtube import get_youtube_client, build_description
+from upload_youtube import get_youtube_api, build_description
+from lib.serialization import read_yaml
 
 def update_video_description(video_id: str, metadata_file: Path):
     """
@@ -26,8 +26,7 @@ def update_video_description(video_id: str, metadata_file: Path):
         metadata_file: Path to job.yaml with metadata
     """
     # Load job metadata
-    with open(metadata_file, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(metadata_file)
 
     # Build new description
     description = build_description(job_data)
@@ -44,14 +43,16 @@ def update_video_description(video_id: str, metadata_file: Path):
         print("❌ Cancelled")
         return
 
-    # Get YouTube client
-    youtube = get_youtube_client()
+    # Get YouTube client (quota-tracked, GETs revalidated by ETag)
+    api = get_youtube_api()
+    youtube = api.service
 
     # Get current video details (to preserve title, tags, etc.)
-    video_response = youtube.videos().list(
+    video_response = api.list(
+        'videos',
         part='snippet',
         id=video_id
-    ).execute()
+    )
 
     if not video_response['items']:
         print(f"❌ Video not found: {video_id}")
@@ -63,16 +64,17 @@ def update_video_description(video_id: str, metadata_file: Path):
     snippet['description'] = description
 
     # Update video
-    update_response = youtube.videos().update(
+    update_response = api.execute(youtube.videos().update(
         part='snippet',
         body={
             'id': video_id,
             'snippet': snippet
         }
-    ).execute()
+    ))
 
     print(f"✅ Description updated for video: {video_id}")
     print(f"   URL: https://youtube.com/watch?v={video_id}")
+    print(f"   {api.quota.summary()}")
 
 
 if __name__ == "__main__":
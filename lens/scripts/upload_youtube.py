@@ -4,7 +4,6 @@ Upload earnings call video to YouTube with comprehensive metadata.
 Supports job.yaml format and thumbnail uploads.
 """
 
-import yaml
 import os
 import sys
 import argparse
@@ -26,6 +25,12 @@ except ImportError:
     print("Install: pip install google-api-python-client google-auth-oauthlib")
     sys.exit(1)
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.youtube_api import YouTubeAPI
+from lib.serialization import read_json, read_yaml
+
 
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 
@@ -68,6 +73,11 @@ def get_youtube_client():
     return build('youtube', 'v3', credentials=creds)
 
 
+def get_youtube_api() -> YouTubeAPI:
+    """Get authenticated YouTube client with shared quota tracking and ETag caching."""
+    return YouTubeAPI(get_youtube_client())
+
+
 def format_time(seconds: float) -> str:
     """Format seconds to MM:SS for chapter markers."""
     mins = int(seconds // 60)
@@ -82,10 +92,8 @@ def build_description(job_data: Dict) -> str:
     insights_file = job_data.get('processing', {}).get('extract_insights', {}).get('insights_file')
     insights = {}
     if insights_file and Path(insights_file).exists():
-        import json
-        with open(insights_file, 'r') as f:
-            insights_data = json.load(f)
-            insights = insights_data.get('insights', {})
+        insights_data = read_json(insights_file)
+        insights = insights_data.get('insights', {})
 
     company = job_data.get('company', {})
 
@@ -187,8 +195,7 @@ def upload_video(video_path: str, job_yaml_path: str, thumbnail_path: Optional[s
     """
 
     # Load job.yaml
-    with open(job_yaml_path, 'r') as f:
-        job_data = yaml.safe_load(f)
+    job_data = read_yaml(job_yaml_path)
 
     company = job_data.get('company', {})
     youtube_info = job_data.get('youtube', {})
@@ -197,10 +204,8 @@ def upload_video(video_path: str, job_yaml_path: str, thumbnail_path: Optional[s
     insights_file = job_data.get('processing', {}).get('extract_insights', {}).get('insights_file')
     insights = {}
     if insights_file and Path(insights_file).exists():
-        import json
-        with open(insights_file, 'r') as f:
-            insights_data = json.load(f)
-            insights = insights_data.get('insights', {})
+        insights_data = read_json(insights_file)
+        insights = insights_data.get('insights', {})
 
     # Prefer confirmed metadata (from manual-audio workflow)
     confirmed = job_data.get('processing', {}).get('confirm_metadata', {}).get('confirmed', {})
@@ -257,7 +262,12 @@ def upload_video(video_path: str, job_yaml_path: str, thumbnail_path: Optional[s
     chapters = insights.get('chapters', [])
     print(f"   Chapters: {len(chapters)} chapters")
 
-    youtube = get_youtube_client()
+    api = get_youtube_api()
+    youtube = api.service
+
+    # Resumable upload is driven chunk by chunk, so reserve its quota up front
+    api.quota.charge('videos.insert')
+    print(f"   {api.quota.summary()}")
 
     media = MediaFileUpload(video_path, chunksize=-1, resumable=True, mimetype='video/*')
 
@@ -285,10 +295,10 @@ def upload_video(video_path: str, job_yaml_path: str, thumbnail_path: Optional[s
     if thumbnail_path and Path(thumbnail_path).exists():
         print(f"\n📸 Uploading thumbnail...")
         try:
-            youtube.thumbnails().set(
+            api.execute(youtube.thumbnails().set(
                 videoId=video_id,
                 media_body=MediaFileUpload(thumbnail_path, mimetype='image/jpeg')
-            ).execute()
+            ))
             print(f"✓ Thumbnail uploaded successfully!")
         except Exception as e:
             print(f"⚠️  Warning: Thumbnail upload failed: {e}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+YouTube Data API quota dashboard
+
+Shows units used per method today (quota day resets at midnight Pacific)
+and recent daily totals, from the usage file shared by every script that
+goes through lib/youtube_api.
+
+Usage:
+    python lens/scripts/youtube_quota.py
+    python lens/scripts/youtube_quota.py --days 7
+    python lens/scripts/youtube_quota.py --json
+
+Environment:
+    YOUTUBE_DAILY_QUOTA - Daily budget in units (default: 10000)
+    YOUTUBE_QUOTA_FILE - Usage file (default: ~/.youtube_quota.json)
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.youtube_api import QUOTA_COSTS, QuotaTracker, quota_day
+
+
+def _bar(used: int, budget: int, width: int = 30) -> str:
+    """Text progress bar"""
+    filled = min(width, int(round(width * used / budget))) if budget else width
+    return '█' * filled + '░' * (width - filled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show YouTube Data API quota usage")
+    parser.add_argument("--days", type=int, default=7, help="Days of history to show (default: 7)")
+    parser.add_argument("--json", action="store_true", help="Print raw usage as JSON")
+
+    args = parser.parse_args()
+
+    tracker = QuotaTracker()
+    today = quota_day()
+    usage = tracker.usage(today)
+
+    if args.json:
+        print(json.dumps({
+            'day': today,
+            'budget': tracker.budget,
+            'remaining': tracker.remaining(),
+            'today': usage,
+            'history': tracker.history(),
+        }, indent=2))
+        return 0
+
+    used = usage['total']
+    print(f"📊 YouTube Data API quota - {today} (Pacific)")
+    print(f"   {_bar(used, tracker.budget)} {used}/{tracker.budget} units ({tracker.remaining()} left)")
+
+    methods = sorted(usage['methods'].items(), key=lambda kv: kv[1]['units'], reverse=True)
+    if methods:
+        print()
+        print(f"   {'Method':<24} {'Calls':>7} {'Units':>7} {'Cost':>6}")
+        for method, stats in methods:
+            cost = QUOTA_COSTS.get(method, 1)
+            print(f"   {method:<24} {stats['calls']:>7} {stats['units']:>7} {cost:>6}")
+
+        # Remaining capacity for the expensive calls
+        remaining = tracker.remaining()
+        print()
+        print(f"   Uploads left today: {remaining // QUOTA_COSTS['videos.insert']}")
+        print(f"   Description updates left today: {remaining // QUOTA_COSTS['videos.update']}")
+
+    history = tracker.history()
+    past_days = [day for day in history if day != today][-args.days:]
+    if past_days:
+        print()
+        print("   History:")
+        for day in past_days:
+            total = history[day]['total']
+            print(f"   {day}  {_bar(total, tracker.budget, 20)} {total}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,14 +17,17 @@ Supports both JSON and YAML data files.
 
 import os
 import sys
-import json
-import yaml
 import subprocess
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+from PIL import Image, ImageDraw
 import requests
 from io import BytesIO
 import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from lib.compositing import get_font, gradient_background
+from lib.frames import VideoInfo, probe_video, extract_frames, sample_best_frames
+from lib.serialization import read_json, read_yaml, write_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -117,6 +120,111 @@ def extract_frame_at_timestamp(video_path: str, timestamp: float, output_path: s
         return False
 
 
+VARIATION_NAMES = {
+    1: "Thick Stroke",
+    2: "Drop Shadow",
+    3: "Double Outline",
+    4: "Background Box"
+}
+
+
+def render_branding(img: Image.Image, data: dict, variation: int = 1) -> Image.Image:
+    """
+    Draw branded text overlay onto an in-memory frame
+
+    Args:
+        img: Source frame
+        data: Video metadata (company, quarter, metrics)
+        variation: Style variation (1-4)
+
+    Returns:
+        PIL.Image: Branded RGB image
+    """
+    width, height = img.size
+
+    # Convert to RGBA for drawing
+    img = img.convert('RGBA')
+    draw = ImageDraw.Draw(img)
+
+    # Load fonts (cached per process)
+    font_company = get_font(80, bold=True)
+    font_quarter = get_font(50, bold=True)
+    font_metric = get_font(40, bold=True)
+
+    # Extract data from job.yaml (company info at top level)
+    company_info = data.get('company', {})
+    company = company_info.get('name', 'Company')
+    quarter = company_info.get('quarter', 'Q4')
+    year = company_info.get('year', 2024)
+
+    # Text positioning
+    text_y = height - 200
+    padding = 50
+
+    # Company name and subtitle
+    title_text = f"{company}"
+    subtitle_text = f"Quarterly Report for {quarter}"
+    subtitle_y = text_y + 90
+
+    # Apply different text effects based on variation
+    if variation == 1:
+        # Variation 1: Thick black stroke (most readable)
+        stroke_width = 8
+        # Title with stroke
+        draw.text((padding, text_y), title_text, font=font_company,
+                 fill=(255, 255, 255), stroke_width=stroke_width, stroke_fill=(0, 0, 0))
+        # Subtitle with stroke
+        draw.text((padding, subtitle_y), subtitle_text, font=font_metric,
+                 fill=(255, 255, 255), stroke_width=6, stroke_fill=(0, 0, 0))
+
+    elif variation == 2:
+        # Variation 2: Drop shadow effect
+        shadow_offset = 4
+        # Title shadow + text
+        draw.text((padding + shadow_offset, text_y + shadow_offset), title_text,
+                 font=font_company, fill=(0, 0, 0))
+        draw.text((padding, text_y), title_text, font=font_company, fill=(255, 255, 255))
+        # Subtitle shadow + text
+        draw.text((padding + shadow_offset, subtitle_y + shadow_offset), subtitle_text,
+                 font=font_metric, fill=(0, 0, 0))
+        draw.text((padding, subtitle_y), subtitle_text, font=font_metric, fill=(255, 255, 255))
+
+    elif variation == 3:
+        # Variation 3: Double outline (black + green for Robinhood)
+        # Title
+        draw.text((padding, text_y), title_text, font=font_company,
+                 fill=(255, 255, 255), stroke_width=10, stroke_fill=(0, 0, 0))
+        draw.text((padding, text_y), title_text, font=font_company,
+                 fill=(255, 255, 255), stroke_width=4, stroke_fill=(0, 200, 5))
+        # Subtitle
+        draw.text((padding, subtitle_y), subtitle_text, font=font_metric,
+                 fill=(255, 255, 255), stroke_width=6, stroke_fill=(0, 0, 0))
+
+    else:  # variation == 4
+        # Variation 4: Semi-transparent background box
+        # Calculate text bounding boxes
+        title_bbox = draw.textbbox((padding, text_y), title_text, font=font_company)
+        subtitle_bbox = draw.textbbox((padding, subtitle_y), subtitle_text, font=font_metric)
+
+        # Draw background boxes
+        box_padding = 20
+        draw.rectangle([
+            (title_bbox[0] - box_padding, title_bbox[1] - box_padding),
+            (title_bbox[2] + box_padding, title_bbox[3] + box_padding)
+        ], fill=(0, 0, 0, 200))
+
+        draw.rectangle([
+            (subtitle_bbox[0] - box_padding, subtitle_bbox[1] - box_padding),
+            (subtitle_bbox[2] + box_padding, subtitle_bbox[3] + box_padding)
+        ], fill=(0, 0, 0, 200))
+
+        # Draw text
+        draw.text((padding, text_y), title_text, font=font_company, fill=(255, 255, 255))
+        draw.text((padding, subtitle_y), subtitle_text, font=font_metric, fill=(255, 255, 255))
+
+    return img.convert('RGB')
+
+
 def add_branding_to_frame(frame_path: str, data: dict, output_path: str, variation: int = 1) -> bool:
     """
     Add branded text overlay to an extracted frame
@@ -132,105 +240,13 @@ def add_branding_to_frame(frame_path: str, data: dict, output_path: str, variati
     """
     try:
         # Load frame
-        img = Image.open(frame_path)
-        width, height = img.size
-
-        # Convert to RGBA for drawing
-        img = img.convert('RGBA')
-        draw = ImageDraw.Draw(img)
-
-        # Load fonts
-        try:
-            font_company = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 80)
-            font_quarter = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 50)
-            font_metric = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 40)
-        except:
-            font_company = ImageFont.load_default()
-            font_quarter = ImageFont.load_default()
-            font_metric = ImageFont.load_default()
-
-        # Extract data from job.yaml (company info at top level)
-        company_info = data.get('company', {})
-        company = company_info.get('name', 'Company')
-        quarter = company_info.get('quarter', 'Q4')
-        year = company_info.get('year', 2024)
-
-        # Text positioning
-        text_y = height - 200
-        padding = 50
-
-        # Company name and subtitle
-        title_text = f"{company}"
-        subtitle_text = f"Quarterly Report for {quarter}"
-        subtitle_y = text_y + 90
-
-        # Apply different text effects based on variation
-        if variation == 1:
-            # Variation 1: Thick black stroke (most readable)
-            stroke_width = 8
-            # Title with stroke
-            draw.text((padding, text_y), title_text, font=font_company,
-                     fill=(255, 255, 255), stroke_width=stroke_width, stroke_fill=(0, 0, 0))
-            # Subtitle with stroke
-            draw.text((padding, subtitle_y), subtitle_text, font=font_metric,
-                     fill=(255, 255, 255), stroke_width=6, stroke_fill=(0, 0, 0))
-
-        elif variation == 2:
-            # Variation 2: Drop shadow effect
-            shadow_offset = 4
-            # Title shadow + text
-            draw.text((padding + shadow_offset, text_y + shadow_offset), title_text,
-                     font=font_company, fill=(0, 0, 0))
-            draw.text((padding, text_y), title_text, font=font_company, fill=(255, 255, 255))
-            # Subtitle shadow + text
-            draw.text((padding + shadow_offset, subtitle_y + shadow_offset), subtitle_text,
-                     font=font_metric, fill=(0, 0, 0))
-            draw.text((padding, subtitle_y), subtitle_text, font=font_metric, fill=(255, 255, 255))
-
-        elif variation == 3:
-            # Variation 3: Double outline (black + green for Robinhood)
-            # Title
-            draw.text((padding, text_y), title_text, font=font_company,
-                     fill=(255, 255, 255), stroke_width=10, stroke_fill=(0, 0, 0))
-            draw.text((padding, text_y), title_text, font=font_company,
-                     fill=(255, 255, 255), stroke_width=4, stroke_fill=(0, 200, 5))
-            # Subtitle
-            draw.text((padding, subtitle_y), subtitle_text, font=font_metric,
-                     fill=(255, 255, 255), stroke_width=6, stroke_fill=(0, 0, 0))
-
-        else:  # variation == 4
-            # Variation 4: Semi-transparent background box
-            # Calculate text bounding boxes
-            title_bbox = draw.textbbox((padding, text_y), title_text, font=font_company)
-            subtitle_bbox = draw.textbbox((padding, subtitle_y), subtitle_text, font=font_metric)
-
-            # Draw background boxes
-            box_padding = 20
-            draw.rectangle([
-                (title_bbox[0] - box_padding, title_bbox[1] - box_padding),
-                (title_bbox[2] + box_padding, title_bbox[3] + box_padding)
-            ], fill=(0, 0, 0, 200))
-
-            draw.rectangle([
-                (subtitle_bbox[0] - box_padding, subtitle_bbox[1] - box_padding),
-                (subtitle_bbox[2] + box_padding, subtitle_bbox[3] + box_padding)
-            ], fill=(0, 0, 0, 200))
-
-            # Draw text
-            draw.text((padding, text_y), title_text, font=font_company, fill=(255, 255, 255))
-            draw.text((padding, subtitle_y), subtitle_text, font=font_metric, fill=(255, 255, 255))
+        with Image.open(frame_path) as frame:
+            img = render_branding(frame, data, variation)
 
         # Save
-        img = img.convert('RGB')
         img.save(output_path, quality=95)
 
-        variation_names = {
-            1: "Thick Stroke",
-            2: "Drop Shadow",
-            3: "Double Outline",
-            4: "Background Box"
-        }
-        logger.info(f"✓ Created thumbnail (Style: {variation_names.get(variation, 'Default')}) → {output_path}")
+        logger.info(f"✓ Created thumbnail (Style: {VARIATION_NAMES.get(variation, 'Default')}) → {output_path}")
         return True
 
     except Exception as e:
@@ -238,41 +254,196 @@ def add_branding_to_frame(frame_path: str, data: dict, output_path: str, variati
         return False
 
 
-def extract_frames_from_video(video_path: str, output_dir: str, num_frames: int = 4) -> list:
+# Per-process state for variant rendering workers (set by _init_variant_worker)
+_variant_images = []
+_variant_data = {}
+
+
+def _init_variant_worker(images: list, data: dict):
+    """Receive decoded frames once per worker process instead of once per task"""
+    global _variant_images, _variant_data
+    _variant_images = images
+    _variant_data = data
+
+
+def _render_variant(task: tuple) -> dict:
+    """Render and write one (frame, variation) thumbnail inside a worker"""
+    frame_index, variation, output_path = task
+    entry = {
+        'path': output_path,
+        'frame_index': frame_index,
+        'variation': variation,
+        'style': VARIATION_NAMES.get(variation, 'Default'),
+        'success': False
+    }
+
+    try:
+        img = render_branding(Image.fromarray(_variant_images[frame_index]), _variant_data, variation)
+        img.save(output_path, quality=95)
+        entry['success'] = True
+        entry['width'], entry['height'] = img.size
+        entry['file_size_bytes'] = os.path.getsize(output_path)
+    except Exception as e:
+        entry['error'] = str(e)
+
+    return entry
+
+
+def render_branded_variants(
+    frames: list,
+    data: dict,
+    output_dir: str,
+    variations: list = None,
+    max_workers: int = None
+) -> dict:
+    """
+    Render branded thumbnail variants from decoded frames in a process pool
+
+    Each frame is decoded once (by the caller) and shipped to each worker once;
+    workers draw the branding and encode/write their JPEGs concurrently.
+
+    Args:
+        frames: Frame objects from lib.frames (in-memory RGB arrays)
+        data: Video metadata (company, quarter, metrics)
+        output_dir: Directory to save thumbnails
+        variations: Styles to apply to EVERY frame (e.g. [1, 2, 3, 4] for a
+            16-variant A/B set from 4 frames). None = frame N gets style N.
+        max_workers: Process pool size (default: one per CPU, capped at task count)
+
+    Returns:
+        dict: Manifest with one entry per variant (also saved as manifest.json)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    if variations is None:
+        for i in range(len(frames)):
+            tasks.append((i, i + 1, os.path.join(output_dir, f"thumbnail_{i+1}.jpg")))
+    else:
+        for i in range(len(frames)):
+            for variation in variations:
+                tasks.append((i, variation, os.path.join(output_dir, f"thumbnail_{i+1}_v{variation}.jpg")))
+
+    images = [frame.image for frame in frames]
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+        _init_variant_worker(images, data)
+        variants = [_render_variant(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_variant_worker,
+            initargs=(images, data)
+        ) as pool:
+            variants = list(pool.map(_render_variant, tasks))
+
+    for variant in variants:
+        variant['timestamp'] = frames[variant['frame_index']].timestamp
+        if variant['success']:
+            logger.info(f"✓ Created thumbnail (Style: {variant['style']}) → {variant['path']}")
+        else:
+            logger.error(f"Error adding branding to {variant['path']}: {variant.get('error')}")
+
+    manifest = {
+        'total_variants': len(variants),
+        'successful': sum(1 for v in variants if v['success']),
+        'workers': max(workers, 1),
+        'variants': variants
+    }
+
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    write_json(manifest_path, manifest)
+
+    manifest['manifest_path'] = manifest_path
+    return manifest
+
+
+def extract_frames_from_video(
+    video_path: str,
+    output_dir: str,
+    num_frames: int = 4,
+    dense_candidates: int = 0,
+    info: VideoInfo = None
+) -> list:
     """
-    Extract frames from strategic locations in video
+    Extract frames from strategic locations in video (single ffmpeg pass)
 
     Extracts frames at: 15%, 35%, 55%, 75% of video duration
     (Avoiding very start/end which may have static screens)
 
+    With dense_candidates > 0, samples that many keyframes across the video
+    in the same single pass and keeps the num_frames best by sharpness,
+    exposure and face presence.
+
     Args:
         video_path: Path to video file
         output_dir: Directory to save frames
         num_frames: Number of frames to extract (default: 4)
+        dense_candidates: Number of candidates to score (0 = fixed positions)
+        info: VideoInfo from probe_video (probed if not given)
 
     Returns:
         list: Paths to extracted frame images
     """
 
-    duration = get_video_duration(video_path)
+    os.makedirs(output_dir, exist_ok=True)
+    frames = decode_candidate_frames(video_path, num_frames, dense_candidates, info)
+    return save_frames(frames, output_dir)
+
+
+def decode_candidate_frames(
+    video_path: str,
+    num_frames: int = 4,
+    dense_candidates: int = 0,
+    info: VideoInfo = None
+) -> list:
+    """
+    Decode thumbnail candidate frames into memory (single ffmpeg pass)
+
+    Args:
+        video_path: Path to video file
+        num_frames: Number of frames to return
+        dense_candidates: Number of candidates to score (0 = fixed positions)
+        info: VideoInfo from probe_video (probed if not given)
+
+    Returns:
+        list: Frame objects (in-memory RGB arrays)
+    """
+    info = info or probe_video(video_path)
+    duration = info.duration
 
     if duration <= 0:
         logger.error("Invalid video duration")
         return []
 
-    os.makedirs(output_dir, exist_ok=True)
+    try:
+        if dense_candidates > 0:
+            return sample_best_frames(
+                video_path,
+                num_candidates=dense_candidates,
+                top_k=num_frames,
+                info=info
+            )
+
+        # Extract at strategic positions (avoiding very start/end)
+        positions = [0.15, 0.35, 0.55, 0.75][:num_frames]
+        return extract_frames(video_path, [duration * pos for pos in positions], info=info)
+
+    except (RuntimeError, ValueError) as e:
+        logger.error(f"Error extracting frames: {e}")
+        return []
 
-    # Extract at strategic positions (avoiding very start/end)
-    positions = [0.15, 0.35, 0.55, 0.75][:num_frames]
 
+def save_frames(frames: list, output_dir: str) -> list:
+    """Save decoded frames as JPEGs and return their paths"""
     frame_paths = []
 
-    for i, pos in enumerate(positions):
-        timestamp = duration * pos
-        frame_path = os.path.join(output_dir, f"frame_{i+1}_at_{int(timestamp)}s.jpg")
-
-        if extract_frame_at_timestamp(video_path, timestamp, frame_path):
-            frame_paths.append(frame_path)
+    for i, frame in enumerate(frames):
+        frame_path = os.path.join(output_dir, f"frame_{i+1}_at_{int(frame.timestamp)}s.jpg")
+        Image.fromarray(frame.image).save(frame_path, quality=95)
+        frame_paths.append(frame_path)
+        logger.info(f"✓ Extracted frame at {frame.timestamp:.1f}s → {frame_path}")
 
     logger.info(f"✅ Extracted {len(frame_paths)} frames from video")
     return frame_paths
@@ -387,12 +558,8 @@ def create_stock_chart_simple(
         draw.ellipse([x-4, y-4, x+4, y+4], fill=color)
 
     # Draw large arrow and percentage
-    try:
-        font_large = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 120)
-        font_percent = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 80)
-    except:
-        font_large = ImageFont.load_default()
-        font_percent = ImageFont.load_default()
+    font_large = get_font(120, bold=True)
+    font_percent = get_font(80, bold=True)
 
     # Arrow
     arrow_text = arrow
@@ -445,30 +612,20 @@ def create_eye_catching_thumbnail(
         fiscal_year = data.get('fiscal_year', 2024)
         change_percent = data.get('stock_change_percent', 0.0)  # Default to 0
 
-        # Create gradient background (dark, professional)
-        img = Image.new('RGB', (width, height), (15, 23, 42))
-
-        # Add gradient overlay
-        gradient = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        gradient_draw = ImageDraw.Draw(gradient)
-
-        for i in range(height):
-            alpha = int(100 * (i / height))
-            gradient_draw.rectangle([(0, i), (width, i+1)], fill=(30, 41, 59, alpha))
-
-        img = Image.alpha_composite(img.convert('RGBA'), gradient).convert('RGB')
+        # Create gradient background (dark, professional) with overlay fading in
+        img = gradient_background(
+            width, height,
+            (15, 23, 42),
+            overlay_color=(30, 41, 59),
+            overlay_alpha=100
+        )
 
         draw = ImageDraw.Draw(img, 'RGBA')
 
-        # Load fonts
-        try:
-            font_title = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 110)
-            font_ticker = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 70)
-            font_quarter = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 60)
-        except:
-            font_title = ImageFont.load_default()
-            font_ticker = ImageFont.load_default()
-            font_quarter = ImageFont.load_default()
+        # Load fonts (cached per process)
+        font_title = get_font(110, bold=True)
+        font_ticker = get_font(70, bold=True)
+        font_quarter = get_font(60, bold=True)
 
         # Layout: Left side = Text, Right side = Chart
         left_width = int(width * 0.5)
@@ -514,10 +671,7 @@ def create_eye_catching_thumbnail(
 
         # "EARNINGS CALL" text
         earnings_y = quarter_y + 90
-        try:
-            font_small = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 45)
-        except:
-            font_small = ImageFont.load_default()
+        font_small = get_font(45)
 
         draw.text((50, earnings_y), "EARNINGS CALL", font=font_small, fill=(226, 232, 240))
 
@@ -564,10 +718,7 @@ def create_eye_catching_thumbnail(
                 logger.warning(f"Could not add CEO image: {e}")
 
         # Logo badge (bottom right)
-        try:
-            font_logo = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 35)
-        except:
-            font_logo = ImageFont.load_default()
+        font_logo = get_font(35, bold=True)
 
         logo_x = width - 320
         logo_y = height - 90
@@ -601,7 +752,9 @@ def create_eye_catching_thumbnail(
 def generate_smart_thumbnail(
     video_path: str,
     data: dict,
-    output_dir: str
+    output_dir: str,
+    dense_candidates: int = 0,
+    variations: list = None
 ) -> dict:
     """
     Smart thumbnail generation:
@@ -612,6 +765,10 @@ def generate_smart_thumbnail(
         video_path: Path to video file
         data: Video metadata (company, ticker, etc.)
         output_dir: Directory to save thumbnails
+        dense_candidates: Score this many candidate frames and keep the best 4
+            (0 = fixed positions)
+        variations: Branding styles to render for every frame (e.g. [1, 2, 3, 4]
+            for a 16-thumbnail A/B set). None = one style per frame.
 
     Returns:
         dict: Result with thumbnail paths and metadata
@@ -626,25 +783,35 @@ def generate_smart_thumbnail(
         'success': False
     }
 
-    # Check if video has video stream
-    has_video = has_video_stream(video_path)
+    # Check if video has video stream (one ffprobe for stream + duration)
+    try:
+        info = probe_video(video_path)
+    except RuntimeError as e:
+        logger.error(f"Error checking video stream: {e}")
+        info = VideoInfo(has_video=False, width=0, height=0, duration=0.0)
+
+    has_video = info.has_video
     result['has_video_stream'] = has_video
+    logger.info(f"Video stream detected: {has_video}")
 
     if has_video:
         logger.info("📹 Video stream detected - Extracting frames...")
 
-        # Extract 4 frames from different locations
-        frames = extract_frames_from_video(video_path, output_dir, num_frames=4)
+        # Decode 4 frames from different locations (kept in memory)
+        frames = decode_candidate_frames(
+            video_path,
+            num_frames=4,
+            dense_candidates=dense_candidates,
+            info=info
+        )
 
-        # Add branding to each frame with different variations
-        branded_thumbnails = []
-        for i, frame_path in enumerate(frames, 1):
-            branded_path = os.path.join(output_dir, f"thumbnail_{i}.jpg")
-            if add_branding_to_frame(frame_path, data, branded_path, variation=i):
-                branded_thumbnails.append(branded_path)
+        # Render branded variations from the decoded frames in parallel
+        manifest = render_branded_variants(frames, data, output_dir, variations=variations)
+        branded_thumbnails = [v['path'] for v in manifest['variants'] if v['success']]
 
-        result['extracted_frames'] = frames
+        result['extracted_frames'] = save_frames(frames, output_dir)
         result['branded_thumbnails'] = branded_thumbnails
+        result['manifest'] = manifest['manifest_path']
         result['success'] = len(branded_thumbnails) > 0
 
         logger.info(f"✅ Created {len(branded_thumbnails)} branded thumbnails")
@@ -682,14 +849,16 @@ def generate_smart_thumbnail(
 def main():
     """Main entry point"""
     if len(sys.argv) < 4:
-        print("Usage: python smart_thumbnail_generator.py <video_file> <data_json> <output_dir>")
+        print("Usage: python smart_thumbnail_generator.py <video_file> <data_json> <output_dir> [dense_candidates]")
         print("\nExample:")
         print("  python smart_thumbnail_generator.py uploads/video.mp4 data/AAPL-Q4-2024.json output/thumbnails/")
+        print("  python smart_thumbnail_generator.py uploads/video.mp4 data/AAPL-Q4-2024.json output/thumbnails/ 24")
         sys.exit(1)
 
     video_path = sys.argv[1]
     data_path = sys.argv[2]
     output_dir = sys.argv[3]
+    dense_candidates = int(sys.argv[4]) if len(sys.argv) > 4 else 0
 
     if not os.path.exists(video_path):
         print(f"❌ Error: Video file not found: {video_path}")
@@ -700,14 +869,13 @@ def main():
         sys.exit(1)
 
     # Load data (support both JSON and YAML)
-    with open(data_path, 'r') as f:
-        if data_path.endswith('.yaml') or data_path.endswith('.yml'):
-            data = yaml.safe_load(f)
-        else:
-            data = json.load(f)
+    if data_path.endswith('.yaml') or data_path.endswith('.yml'):
+        data = read_yaml(data_path)
+    else:
+        data = read_json(data_path)
 
     # Generate smart thumbnail
-    result = generate_smart_thumbnail(video_path, data, output_dir)
+    result = generate_smart_thumbnail(video_path, data, output_dir, dense_candidates=dense_candidates)
 
     # Print result
     print("\n" + "="*60)
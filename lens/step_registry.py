@@ -1,190 +1,118 @@
 """
 Step Registry - Central mapping of workflow step handlers to Python functions
+
+Handlers are registered as 'module:function' strings and imported on first
+get_handler(), so running one step (or listing handlers) only imports that
+step's module - not torch/whisperx, openai or googleapiclient for steps that
+never use them.
 """
 
+import importlib
+import importlib.util
 import sys
 from pathlib import Path
-from typing import Dict, Callable, Any
+from typing import Dict, Callable, Tuple
 
 # Add scripts to path
 LENS_DIR = Path(__file__).parent
 sys.path.insert(0, str(LENS_DIR / "scripts"))
 
-# Import existing step handlers
-# (None - all wrapped in steps/)
-from scripts.download_source import download_video
-from scripts.parse_metadata import parse_video_metadata
-
-# Import new step handlers (will be created)
-try:
-    from steps.transcribe_step import transcribe_step
-except ImportError:
-    transcribe_step = None
-
-try:
-    from steps.extract_insights_step import extract_insights_step
-except ImportError:
-    extract_insights_step = None
-
-try:
-    from steps.refine_timestamps_step import refine_timestamps_step
-except ImportError:
-    refine_timestamps_step = None
-
-try:
-    from steps.create_banner import create_banner
-except ImportError:
-    create_banner = None
-
-try:
-    from steps.ffmpeg_audio_intact_with_banner import ffmpeg_audio_intact_with_banner
-except ImportError:
-    ffmpeg_audio_intact_with_banner = None
-
-try:
-    from steps.upload_youtube_step import upload_youtube_step
-except ImportError:
-    upload_youtube_step = None
-
-try:
-    from steps.copy_audio_to_job import copy_audio_to_job
-except ImportError:
-    copy_audio_to_job = None
-
-try:
-    from steps.extract_metadata_llm import extract_metadata_llm
-except ImportError:
-    extract_metadata_llm = None
-
-try:
-    from steps.interactive_confirm_metadata import interactive_confirm_metadata
-except ImportError:
-    interactive_confirm_metadata = None
-
-try:
-    from steps.upload_artifacts_r2 import upload_artifacts_r2
-except ImportError:
-    upload_artifacts_r2 = None
-
-try:
-    from steps.upload_media_r2 import upload_media_r2
-except ImportError:
-    upload_media_r2 = None
-
-try:
-    from steps.remotion_render import remotion_render
-except ImportError:
-    remotion_render = None
-
-try:
-    from steps.generate_thumbnails import generate_thumbnails_step
-except ImportError:
-    generate_thumbnails_step = None
-
-try:
-    from steps.update_database import update_database
-except ImportError:
-    update_database = None
-
-try:
-    from steps.validate_earnings_call import validate_earnings_call
-except ImportError:
-    validate_earnings_call = None
-
-try:
-    from steps.fuzzy_match_company import fuzzy_match_company
-except ImportError:
-    fuzzy_match_company = None
-
-try:
-    from steps.extract_audio_ffmpeg import extract_audio_ffmpeg
-except ImportError:
-    extract_audio_ffmpeg = None
-
-try:
-    from steps.download_source_cached import download_source_cached
-except ImportError:
-    download_source_cached = None
-
-try:
-    from steps.detect_trim_point import detect_trim_point
-except ImportError:
-    detect_trim_point = None
-
-try:
-    from steps.match_company import match_company
-except ImportError:
-    match_company = None
-
-try:
-    from steps.use_input_banner import use_input_banner
-except ImportError:
-    use_input_banner = None
-
-try:
-    from steps.ffmpeg_audio_with_banner import ffmpeg_audio_with_banner
-except ImportError:
-    ffmpeg_audio_with_banner = None
-
-try:
-    from steps.notify_seo import notify_seo
-except ImportError:
-    notify_seo = None
-
 
 # Step Handler Registry
-# Maps handler names (from workflow YAML) to Python functions
-STEP_HANDLERS: Dict[str, Callable] = {
+# Maps handler names (from workflow YAML) to 'module:function'
+STEP_HANDLERS: Dict[str, str] = {
     # Core processing steps
-    'transcribe_whisperx': transcribe_step,
-    'extract_insights_structured': extract_insights_step,
-    'refine_timestamps': refine_timestamps_step,
+    'transcribe_whisperx': 'steps.transcribe_step:transcribe_step',
+    'extract_insights_structured': 'steps.extract_insights_step:extract_insights_step',
+    'refine_timestamps': 'steps.refine_timestamps_step:refine_timestamps_step',
 
     # Download/upload steps
-    'download_source': download_video,
-    'download_source_cached': download_source_cached,
-    'parse_metadata': parse_video_metadata,
-    'upload_youtube': upload_youtube_step,
+    'download_source': 'scripts.download_source:download_video',
+    'download_source_cached': 'steps.download_source_cached:download_source_cached',
+    'parse_metadata': 'scripts.parse_metadata:parse_video_metadata',
+    'upload_youtube': 'steps.upload_youtube_step:upload_youtube_step',
 
     # New step handlers (manual-audio workflow)
-    'copy_audio_to_job': copy_audio_to_job,
-    'extract_metadata_llm': extract_metadata_llm,
-    'interactive_confirm_metadata': interactive_confirm_metadata,
+    'copy_audio_to_job': 'steps.copy_audio_to_job:copy_audio_to_job',
+    'extract_metadata_llm': 'steps.extract_metadata_llm:extract_metadata_llm',
+    'interactive_confirm_metadata': 'steps.interactive_confirm_metadata:interactive_confirm_metadata',
 
     # R2 upload steps
-    'upload_artifacts_r2': upload_artifacts_r2,
-    'upload_media_r2': upload_media_r2,
+    'upload_artifacts_r2': 'steps.upload_artifacts_r2:upload_artifacts_r2',
+    'upload_media_r2': 'steps.upload_media_r2:upload_media_r2',
 
     # Rendering and thumbnails
-    'create_banner': create_banner,
-    'use_input_banner': use_input_banner,
-    'ffmpeg_audio_intact_with_banner': ffmpeg_audio_intact_with_banner,
-    'ffmpeg_audio_with_banner': ffmpeg_audio_with_banner,
-    'remotion_render': remotion_render,
-    'generate_thumbnails': generate_thumbnails_step,
+    'create_banner': 'steps.create_banner:create_banner',
+    'use_input_banner': 'steps.use_input_banner:use_input_banner',
+    'ffmpeg_audio_intact_with_banner': 'steps.ffmpeg_audio_intact_with_banner:ffmpeg_audio_intact_with_banner',
+    'ffmpeg_audio_with_banner': 'steps.ffmpeg_audio_with_banner:ffmpeg_audio_with_banner',
+    'remotion_render': 'steps.remotion_render:remotion_render',
+    'generate_thumbnails': 'steps.generate_thumbnails:generate_thumbnails_step',
+    'render_shorts': 'steps.render_shorts:render_shorts',
 
     # Database steps
-    'update_database': update_database,
+    'update_database': 'steps.update_database:update_database',
 
     # SEO notification
-    'notify_seo': notify_seo,
+    'notify_seo': 'steps.notify_seo:notify_seo',
 
     # Batch workflow steps
-    'validate_earnings_call': validate_earnings_call,
-    'fuzzy_match_company': fuzzy_match_company,
-    'extract_audio_ffmpeg': extract_audio_ffmpeg,
+    'validate_earnings_call': 'steps.validate_earnings_call:validate_earnings_call',
+    'fuzzy_match_company': 'steps.fuzzy_match_company:fuzzy_match_company',
+    'extract_audio_ffmpeg': 'steps.extract_audio_ffmpeg:extract_audio_ffmpeg',
 
     # Company matching
-    'match_company': match_company,
+    'match_company': 'steps.match_company:match_company',
 
     # Utility steps
-    'detect_trim_point': detect_trim_point,
+    'detect_trim_point': 'steps.detect_trim_point:detect_trim_point',
+}
+
+# Third-party packages a handler needs at import time. Checked with
+# find_spec (no import), so list_handlers() can report missing dependencies
+# without loading torch or the API clients.
+STEP_REQUIREMENTS: Dict[str, Tuple[str, ...]] = {
+    'transcribe_whisperx': ('torch', 'whisperx'),
+    'extract_insights_structured': ('openai', 'pydantic'),
+    'extract_metadata_llm': ('openai', 'pydantic'),
+    'download_source': ('dotenv', 'requests'),
+    'upload_youtube': ('dotenv', 'googleapiclient'),
+    'upload_artifacts_r2': ('dotenv',),
+    'upload_media_r2': ('dotenv',),
+    'update_database': ('dotenv',),
+    'notify_seo': ('dotenv', 'requests'),
+    'create_banner': ('PIL',),
+    'match_company': ('rapidfuzz',),
 }
 
+# Handlers imported so far (name → function)
+_resolved: Dict[str, Callable] = {}
+
+
+def _split_target(target: str) -> Tuple[str, str]:
+    module_name, _, function_name = target.partition(':')
+    return module_name, function_name
+
+
+def _module_exists(module_name: str) -> bool:
+    """Whether a module can be found, without executing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def missing_requirements(handler_name: str) -> Tuple[str, ...]:
+    """Required packages for a handler that are not installed (no imports)"""
+    return tuple(
+        package for package in STEP_REQUIREMENTS.get(handler_name, ())
+        if not _module_exists(package)
+    )
+
 
 def get_handler(handler_name: str) -> Callable:
     """
-    Get step handler function by name
+    Get step handler function by name (imports its module on first use)
 
     Args:
         handler_name: Name of handler (e.g., 'transcribe_whisperx')
@@ -193,27 +121,64 @@ def get_handler(handler_name: str) -> Callable:
         Handler function
 
     Raises:
-        ValueError: If handler not found or not implemented
+        ValueError: If handler not found, not implemented, or its
+            dependencies are missing
     """
-    handler = STEP_HANDLERS.get(handler_name)
+    handler = _resolved.get(handler_name)
+    if handler is not None:
+        return handler
 
-    if handler is None:
+    target = STEP_HANDLERS.get(handler_name)
+    if target is None:
         raise ValueError(
             f"Unknown step handler: {handler_name}\n"
             f"Available handlers: {', '.join(STEP_HANDLERS.keys())}"
         )
 
+    module_name, function_name = _split_target(target)
+    if not _module_exists(module_name):
+        raise ValueError(f"Step handler not implemented: {handler_name} ({target})")
+
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ValueError(f"Step handler {handler_name} unavailable: {e}") from e
+
+    handler = getattr(module, function_name, None)
+    if handler is None:
+        raise ValueError(f"Step handler not implemented: {handler_name} ({target})")
+
+    _resolved[handler_name] = handler
     return handler
 
 
+def handler_status(handler_name: str) -> str:
+    """
+    Implementation status of a handler without importing it
+
+    Returns:
+        'available', 'not implemented', or 'missing dependencies: ...'
+    """
+    if handler_name in _resolved:
+        return 'available'
+
+    module_name, _ = _split_target(STEP_HANDLERS[handler_name])
+    if not _module_exists(module_name):
+        return 'not implemented'
+
+    missing = missing_requirements(handler_name)
+    if missing:
+        return f"missing dependencies: {', '.join(missing)}"
+
+    return 'available'
+
+
 def list_handlers() -> Dict[str, str]:
     """
     List all registered handlers with their implementation status
 
     Returns:
-        Dict mapping handler names to status ('available' or 'not implemented')
+        Dict mapping handler names to status ('available', 'not implemented'
+        or 'missing dependencies: ...')
     """
-    return {
-        name: 'available' if handler is not None else 'not implemented'
-        for name, handler in STEP_HANDLERS.items()
-    }
+    return {name: handler_status(name) for name in STEP_HANDLERS}
@@ -12,4 +12,6 @@ __all__ = [
     'upload_media_r2',
     'update_database',
     'notify_seo',
+    'render_shorts',
+    'detect_trim_point',
 ]
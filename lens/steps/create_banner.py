@@ -2,9 +2,15 @@
 Create Banner - Create static banner image for video background
 """
 
+import sys
 from pathlib import Path
 from typing import Dict, Any
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.compositing import get_font, gradient_background
 
 
 def create_banner(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,7 +46,7 @@ def create_banner(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
     width, height = 1920, 1080
 
     # Create image with dark background
-    img = Image.new('RGB', (width, height), color='#1a1a2e')
+    img = gradient_background(width, height, (0x1a, 0x1a, 0x2e))
     draw = ImageDraw.Draw(img)
 
     # Add MarketHawkEye logo (top right corner)
@@ -70,17 +76,10 @@ def create_banner(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
     else:
         print(f"   ⚠️  Logo not found at: {logo_path}")
 
-    # Try to use a nice font, fall back to default
-    try:
-        # Try common font paths
-        font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 120)
-        font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 80)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 60)
-    except:
-        # Fallback to default font
-        font_large = ImageFont.load_default()
-        font_medium = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    # Fonts are loaded once per process (falls back to default font)
+    font_large = get_font(120, bold=True)
+    font_medium = get_font(80)
+    font_small = get_font(60)
 
     # Calculate text positions (centered)
     # Company name (top)
@@ -0,0 +1,94 @@
+"""
+Detect Trim Point - Find where the video should start (no actual trimming)
+
+Combines the transcript's first speech with an acoustic scan of the source
+audio: keeps a few seconds before the first speech for the title card and
+intro music, but never keeps leading dead air. The audio scan decodes only
+until sound starts.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Any
+
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.audio_activity import (
+    DEFAULT_THRESHOLD_DB,
+    compute_trim_point,
+    first_speech_from_transcript,
+    silence_map,
+)
+
+
+def detect_trim_point(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Detect trim_start_seconds for a job
+
+    Workflow YAML can set (all optional):
+        inputs:
+          pre_speech_buffer: 5.0    # Seconds kept before first speech
+          threshold_db: -50         # Silence threshold
+          silence_map: true         # Also write transcripts/silence_map.json
+
+    Args:
+        job_dir: Job directory path
+        job_data: Job data dict
+
+    Returns:
+        Result dict with trim_start_seconds and first speech info
+    """
+    inputs = job_data.get('_resolved_inputs', {})
+    pre_speech_buffer = float(inputs.get('pre_speech_buffer', 5.0))
+    threshold_db = inputs.get('threshold_db', DEFAULT_THRESHOLD_DB)
+
+    source_files = sorted((job_dir / "input").glob("source.*"))
+    if not source_files:
+        raise FileNotFoundError(f"No source file found in {job_dir / 'input'}")
+    source_file = source_files[0]
+
+    # First speech from transcript (optional - falls back to acoustic start)
+    first_speech_time = None
+    transcript_file = job_dir / "transcripts" / "transcript.json"
+    if transcript_file.exists():
+        with open(transcript_file, 'r') as f:
+            first_speech_time = first_speech_from_transcript(json.load(f))
+
+    print(f"🔍 Detecting trim point...")
+    print(f"   Source: {source_file.name}")
+
+    trim = compute_trim_point(
+        str(source_file),
+        first_speech_time,
+        pre_speech_buffer=pre_speech_buffer,
+        threshold_db=threshold_db
+    )
+
+    if trim['sound_start'] is not None:
+        print(f"   Audio starts at: {trim['sound_start']:.2f}s")
+    if first_speech_time is not None:
+        print(f"   First speech at: {first_speech_time:.2f}s")
+    print(f"✅ Video will start at: {trim['trim_start']:.2f}s")
+
+    result = {
+        'trim_start_seconds': trim['trim_start'],
+        'first_speech_at': first_speech_time,
+        'sound_start': trim['sound_start'],
+        'pre_speech_buffer': pre_speech_buffer,
+        'source_file': str(source_file),
+    }
+
+    # Full silence map for later stages (requires a full decode)
+    if inputs.get('silence_map'):
+        gaps = silence_map(str(source_file), threshold_db=threshold_db)
+        map_file = job_dir / "transcripts" / "silence_map.json"
+        map_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(map_file, 'w') as f:
+            json.dump({'threshold_db': threshold_db, 'silences': gaps}, f, indent=2)
+        print(f"   Silence map: {len(gaps)} gaps → {map_file.name}")
+        result['silence_map_file'] = str(map_file)
+        result['silence_count'] = len(gaps)
+
+    return result
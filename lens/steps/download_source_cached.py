@@ -2,17 +2,20 @@
 Download Source Cached Step - Download video from YouTube with caching
 """
 
+import os
 import shutil
 from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
 
+DOWNLOADS_DIR = Path(os.getenv("DOWNLOADS_DIR", "/var/markethawk/_downloads"))
+
 
 def download_source_cached(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Download video from YouTube URL (checks cache first)
 
-    Cache location: /var/markethawk/_downloads/<video_id>/
+    Cache location: $DOWNLOADS_DIR/<video_id>/ (default /var/markethawk/_downloads)
 
     Args:
         job_dir: Job directory path
@@ -43,7 +46,7 @@ def download_source_cached(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
     print(f"   URL: {youtube_url}")
 
     # Check cache first
-    cache_dir = Path("/var/markethawk/_downloads") / video_id
+    cache_dir = DOWNLOADS_DIR / video_id
     cached_video = cache_dir / "source.mp4"
     cached_metadata = cache_dir / "metadata.json"
 
@@ -80,7 +83,7 @@ def download_source_cached(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
     from scripts.download_source import download_video
 
     # Download to cache
-    result = download_video(youtube_url, downloads_dir="/var/markethawk/_downloads")
+    result = download_video(youtube_url, downloads_dir=str(DOWNLOADS_DIR))
 
     # Copy from cache to job input directory
     input_dir = job_dir / "input"
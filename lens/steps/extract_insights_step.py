@@ -11,6 +11,8 @@ LENS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(LENS_DIR))
 
 from extract_insights_structured import extract_earnings_insights, extract_earnings_insights_auto
+from lib.priority import job_ticker
+from lib.speaker_store import enroll_speakers, label_speakers
 
 
 def extract_insights_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -50,6 +52,12 @@ def extract_insights_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
     # Output file for insights
     output_file = job_dir / "insights.raw.json"
 
+    # Speakers recognized by voice are given to the LLM instead of re-identified
+    known_ticker = ticker or job_ticker(job_data)
+    known_speakers = label_speakers(transcript_file, known_ticker)
+    if known_speakers:
+        print(f"🗣️  Voice-matched: {', '.join(info['name'] for info in known_speakers.values())}")
+
     # Call appropriate insights extraction function
     if company_name:
         # Use standard extraction with known metadata
@@ -59,14 +67,16 @@ def extract_insights_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
             company_name=company_name,
             ticker=ticker,
             quarter=quarter,
-            output_file=output_file
+            output_file=output_file,
+            known_speakers=known_speakers
         )
     else:
         # Use auto-detection extraction
         print(f"📊 Extracting insights (LLM will auto-detect company/ticker/quarter)")
         insights = extract_earnings_insights_auto(
             transcript_file=transcript_file,
-            output_file=output_file
+            output_file=output_file,
+            known_speakers=known_speakers
         )
 
     # Extract auto-detected metadata from insights if it was auto-detected
@@ -85,6 +95,14 @@ def extract_insights_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
             detected_quarter = parts[0]
             detected_year = parts[1]
 
+    # Remember the named speakers' voices (only under a confirmed or known ticker)
+    try:
+        voices_enrolled = enroll_speakers(transcript_file, known_ticker, [s.model_dump() for s in insights.speakers],
+                                          job_id=job_data.get('job_id'))
+    except OSError as e:
+        print(f"⚠️  Speaker enrollment failed: {e}")
+        voices_enrolled = 0
+
     # Return result
     return {
         'insights_file': str(output_file),
@@ -94,5 +112,7 @@ def extract_insights_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str,
         'detected_quarter': detected_quarter or 'N/A',
         'detected_year': detected_year or 'N/A',
         'metrics_count': len(insights.financial_metrics) if hasattr(insights, 'financial_metrics') else 0,
-        'highlights_count': len(insights.highlights) if hasattr(insights, 'highlights') else 0
+        'highlights_count': len(insights.highlights) if hasattr(insights, 'highlights') else 0,
+        'voice_matched_speakers': len(known_speakers),
+        'voices_enrolled': voices_enrolled
     }
@@ -5,12 +5,21 @@ Analyzes transcript to extract ticker, company name, quarter, and year
 """
 
 import os
-import json
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
+
+import numpy as np
 from openai import OpenAI
 from pydantic import BaseModel
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.metrics import record_llm_usage
+from lib.tracing import span
+from lib.transcript_store import open_columns
+
 
 class EarningsMetadata(BaseModel):
     """Structured output for earnings call metadata"""
@@ -40,17 +49,13 @@ def extract_metadata_llm(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, A
             "Run 'transcribe' step first"
         )
 
-    with open(transcript_path, 'r') as f:
-        transcript_data = json.load(f)
-
     # Extract text from transcript (first 10 minutes for metadata extraction)
-    # Usually ticker/company/quarter announced in first few minutes
-    segments = transcript_data.get('segments', [])
-    text_segments = []
-    for seg in segments:
-        if seg['start'] > 600:  # 10 minutes
-            break
-        text_segments.append(seg['text'])
+    # Usually ticker/company/quarter announced in first few minutes.
+    # Segment starts/texts come from the columnar sidecar (no word-level parse)
+    columns = open_columns(transcript_path)
+    past_cutoff = np.flatnonzero(columns.segment_start > 600)  # 10 minutes
+    cutoff = int(past_cutoff[0]) if past_cutoff.size else len(columns.segment_start)
+    text_segments = columns.segment_text[:cutoff]
 
     transcript_text = ' '.join(text_segments)
 
@@ -63,12 +68,13 @@ def extract_metadata_llm(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, A
     # Call OpenAI with structured output
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-    completion = client.beta.chat.completions.parse(
-        model="gpt-4o-2024-08-06",
-        messages=[
-            {
-                "role": "system",
-                "content": """You are an expert at analyzing earnings call transcripts.
+    with span('openai chat.completions.parse', kind='client', **{'gen_ai.request.model': "gpt-4o-2024-08-06"}) as llm_span:
+        completion = client.beta.chat.completions.parse(
+            model="gpt-4o-2024-08-06",
+            messages=[
+                {
+                    "role": "system",
+                    "content": """You are an expert at analyzing earnings call transcripts.
 Extract the following metadata from the transcript:
 
 1. ticker: Stock symbol (e.g., "NVDA", "AAPL", "GOOGL")
@@ -83,15 +89,18 @@ Look for clues in:
 
 If you cannot find a value with confidence, leave it null.
 Set confidence to 'high' if you found explicit mentions, 'medium' if inferred, 'low' if guessing."""
-            },
-            {
-                "role": "user",
-                "content": f"Extract metadata from this earnings call transcript:\n\n{transcript_text}"
-            }
-        ],
-        response_format=EarningsMetadata,
-    )
+                },
+                {
+                    "role": "user",
+                    "content": f"Extract metadata from this earnings call transcript:\n\n{transcript_text}"
+                }
+            ],
+            response_format=EarningsMetadata,
+        )
+        llm_span.set(**{'gen_ai.usage.input_tokens': completion.usage.prompt_tokens,
+                         'gen_ai.usage.output_tokens': completion.usage.completion_tokens})
 
+    record_llm_usage("gpt-4o-2024-08-06", completion.usage)
     metadata = completion.choices[0].message.parsed
 
     print(f"\n📊 Extracted Metadata:")
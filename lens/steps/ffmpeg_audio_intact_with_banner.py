@@ -2,10 +2,15 @@
 FFmpeg Audio Intact with Banner - Extract audio from source video and overlay banner image
 """
 
-import subprocess
+import sys
 from pathlib import Path
 from typing import Dict, Any
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.still_render import profile_from_job, render_still_video
+
 
 def ffmpeg_audio_intact_with_banner(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -49,45 +54,17 @@ def ffmpeg_audio_intact_with_banner(job_dir: Path, job_data: Dict[str, Any]) ->
     print(f"   Output: {output_video.name}")
     print(f"   Strategy: Extract audio from input video + overlay banner image")
 
-    # FFmpeg command: use banner as video track + extract audio from input video
-    cmd = [
-        'ffmpeg',
-        '-loop', '1',                    # Loop the banner image
-        '-i', str(banner_path),          # Input: banner image (video track)
-        '-i', str(input_video),          # Input: source video (for audio track)
-        '-c:v', 'libx264',               # Video codec
-        '-tune', 'stillimage',           # Optimize for static image
-        '-c:a', 'aac',                   # Audio codec
-        '-b:a', '192k',                  # Audio bitrate
-        '-pix_fmt', 'yuv420p',           # Pixel format for compatibility
-        '-map', '0:v:0',                 # Map video from first input (banner)
-        '-map', '1:a:0',                 # Map audio from second input (source video)
-        '-shortest',                     # End when shortest stream ends
-        '-movflags', '+faststart',       # Enable progressive streaming (moov atom at start)
-        '-y',                            # Overwrite output file
-        str(output_video)
-    ]
-
-    # Run FFmpeg
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise Exception(f"FFmpeg render failed: {result.stderr}")
-
-    # Get output file info
-    file_size = output_video.stat().st_size
-    file_size_mb = file_size / (1024 * 1024)
+    # Still-image render: banner as video track + first audio stream of source video
+    # (1 fps, -tune stillimage, AAC audio stream-copied when possible)
+    # Cached banner track is looped by stream copy unless the workflow sets banner_cache: false
+    profile = profile_from_job(job_data)
+    use_cache = job_data.get('_resolved_inputs', {}).get('banner_cache', True)
+    render = render_still_video(banner_path, input_video, output_video, profile, use_cache=use_cache)
 
-    # Get duration using ffprobe
-    duration_cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-show_entries', 'format=duration',
-        '-of', 'default=noprint_wrappers=1:nokey=1',
-        str(output_video)
-    ]
-    duration_result = subprocess.run(duration_cmd, capture_output=True, text=True)
-    duration_seconds = float(duration_result.stdout.strip()) if duration_result.returncode == 0 else 0
+    # Duration comes from the encoder's progress output (no ffprobe pass)
+    duration_seconds = render['duration_seconds']
+    file_size = render['file_size_bytes']
+    file_size_mb = file_size / (1024 * 1024)
 
     print(f"✅ Video rendered: {output_video.name}")
     print(f"   Duration: {duration_seconds:.1f}s")
@@ -101,5 +78,12 @@ def ffmpeg_audio_intact_with_banner(job_dir: Path, job_data: Dict[str, Any]) ->
         'file_size_bytes': file_size,
         'codec': 'h264',
         'resolution': '1920x1080',
-        'renderer': 'ffmpeg'
+        'renderer': 'ffmpeg',
+        'render_profile': render['profile'],
+        'preset': render['preset'],
+        'crf': render['crf'],
+        'framerate': render['framerate'],
+        'audio_copied': render['audio_copied'],
+        'encode_speed': render['encode_speed'],
+        'banner_cache': render['banner_cache']
     }
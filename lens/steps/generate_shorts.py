@@ -18,15 +18,25 @@ Output: shorts/ directory with:
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 
+# Add lens to path for lib imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def get_speaker_at_timestamp(transcript: Dict, insights: Dict, timestamp: int) -> Optional[str]:
+from lib.transcript_index import TranscriptIndex, load_index
+from lib.serialization import read_json, write_json, read_yaml
+
+
+def get_speaker_at_timestamp(
+    transcript: Union[Dict, TranscriptIndex],
+    insights: Dict,
+    timestamp: int
+) -> Optional[str]:
     """
     Auto-detect actual speaker from transcript at given timestamp
 
     Args:
-        transcript: Full transcript.json from WhisperX
+        transcript: Full transcript.json from WhisperX (or its TranscriptIndex)
         insights: insights.raw.json with speaker mappings
         timestamp: Timestamp in seconds
 
@@ -39,20 +49,23 @@ def get_speaker_at_timestamp(transcript: Dict, insights: Dict, timestamp: int) -
         speaker_map[speaker['speaker_id']] = speaker['speaker_name']
 
     # Find segment containing this timestamp
-    for segment in transcript.get('segments', []):
-        if segment.get('start', 0) <= timestamp <= segment.get('end', 0):
-            speaker_id = segment.get('speaker', 'Unknown')
-            return speaker_map.get(speaker_id, 'Unknown')
+    speaker_id = TranscriptIndex.of(transcript).speaker_at(timestamp)
+    if speaker_id is None:
+        return None
 
-    return None
+    return speaker_map.get(speaker_id, 'Unknown')
 
 
-def extract_words_for_highlight(transcript: Dict, start_time: float, duration: float) -> List[Dict]:
+def extract_words_for_highlight(
+    transcript: Union[Dict, TranscriptIndex],
+    start_time: float,
+    duration: float
+) -> List[Dict]:
     """
     Extract word-level timing for a highlight segment
 
     Args:
-        transcript: Full transcript.json
+        transcript: Full transcript.json (or its TranscriptIndex)
         start_time: Start timestamp in seconds
         duration: Duration in seconds
 
@@ -60,28 +73,16 @@ def extract_words_for_highlight(transcript: Dict, start_time: float, duration: f
         List of word objects with relative timing: [{"word": "Revenue", "start": 0.5, "end": 0.8}, ...]
     """
     end_time = start_time + duration
-    words = []
-
-    for segment in transcript.get('segments', []):
-        seg_start = segment.get('start', 0)
-        seg_end = segment.get('end', 0)
-
-        # Check if segment overlaps with our time range
-        if seg_start <= end_time and seg_end >= start_time:
-            for word_obj in segment.get('words', []):
-                word_start = word_obj.get('start', 0)
-                word_end = word_obj.get('end', 0)
 
-                # Check if word is within our time range
-                if start_time <= word_start <= end_time:
-                    # Convert to relative timing (offset from start_time)
-                    words.append({
-                        'word': word_obj.get('word', ''),
-                        'start': word_start - start_time,
-                        'end': word_end - start_time
-                    })
-
-    return words
+    # Convert to relative timing (offset from start_time)
+    return [
+        {
+            'word': word_obj['word'],
+            'start': word_obj['start'] - start_time,
+            'end': word_obj['end'] - start_time
+        }
+        for word_obj in TranscriptIndex.of(transcript).words_between(start_time, end_time)
+    ]
 
 
 def filter_highlights_for_shorts(highlights: List[Dict],
@@ -178,14 +179,12 @@ def generate_shorts(job_yaml_path: str) -> Dict:
     Returns:
         Status dict
     """
-    import yaml
 
     job_file = Path(job_yaml_path)
     job_dir = job_file.parent
 
     # Load job config
-    with open(job_file) as f:
-        job = yaml.safe_load(f)
+    job = read_yaml(job_file)
 
     # Check dependencies
     transcript_file = job_dir / 'transcripts' / 'transcript.json'
@@ -197,13 +196,11 @@ def generate_shorts(job_yaml_path: str) -> Dict:
     if not insights_file.exists():
         return {'status': 'error', 'message': 'insights.raw.json not found'}
 
-    # Load data
-    with open(transcript_file) as f:
-        transcript = json.load(f)
+    # Load data (index built once, shared by every highlight)
+    transcript = load_index(transcript_file)
 
-    with open(insights_file) as f:
-        insights_data = json.load(f)
-        insights = insights_data.get('insights', {})
+    insights_data = read_json(insights_file)
+    insights = insights_data.get('insights', {})
 
     # Get company info
     company_name = insights.get('company_name', 'Unknown')
@@ -269,8 +266,7 @@ def generate_shorts(job_yaml_path: str) -> Dict:
 
         # Save individual short JSON
         short_file = shorts_dir / f'short_{i}.json'
-        with open(short_file, 'w') as f:
-            json.dump(short_data, f, indent=2)
+        write_json(short_file, short_data)
 
         # Add to metadata
         shorts_metadata.append({
@@ -296,6 +292,7 @@ def generate_shorts(job_yaml_path: str) -> Dict:
 
     print(f"\n✅ Generated {len(shorts_metadata)} YouTube Shorts")
     print(f"   Output: {shorts_dir}")
+    print(f"   Render clips: python lens/steps/render_shorts.py {job_dir}")
 
     return {
         'status': 'completed',
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Render Shorts - Cut every highlight clip from rendered.mp4 in ONE ffmpeg process
+
+Pipeline Step: render_shorts
+- Reads the shorts props written by generate_shorts (shorts/short_N.json or
+  shorts/short_N_props.json)
+- Opens rendered.mp4 once per clip with input seeking (-ss/-t before -i), so
+  ffmpeg only reads each clip's byte range - cost scales with total clip
+  length, not clip count x file length
+- Crops each clip to vertical 9:16 (1080x1920) and burns in word-by-word
+  captions (ASS subtitles from the word timings)
+- Writes all clips from the same process (one output per clip)
+
+Output: shorts/ directory with:
+  - short_1.mp4, short_2.mp4, ... (one per short)
+  - short_1.ass, short_2.ass, ... (caption tracks)
+"""
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Vertical output for YouTube Shorts
+SHORT_WIDTH = 1080
+SHORT_HEIGHT = 1920
+
+# Seconds of audio kept after the last word
+TAIL_PADDING = 0.5
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: {width}
+PlayResY: {height}
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Caption,DejaVu Sans,84,&H00FFFFFF,&H00FFFFFF,&H00000000,&H80000000,-1,0,0,0,100,100,0,0,1,6,2,2,60,60,420,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+# Highlighted (current) word color in ASS BGR notation (yellow)
+HIGHLIGHT_COLOR = '&H0015CCFA&'
+
+
+def _ass_time(seconds: float) -> str:
+    """Format seconds as ASS timestamp (H:MM:SS.cc)"""
+    seconds = max(0.0, seconds)
+    centis = int(round(seconds * 100))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def _ass_text(word: str) -> str:
+    """Strip characters that ASS treats as override/control codes"""
+    return re.sub(r'[{}\\]', '', word).strip()
+
+
+def build_caption_ass(words: List[Dict], output_path: Path, words_per_caption: int = 3) -> Path:
+    """
+    Write word-by-word captions as an ASS subtitle file
+
+    Words are grouped into short captions; while each word is spoken the
+    caption is shown with that word highlighted.
+
+    Args:
+        words: [{"word": "Revenue", "start": 0.5, "end": 0.8}, ...] relative to clip start
+        output_path: Where to write the .ass file
+        words_per_caption: Words shown on screen at once
+
+    Returns:
+        Path to the .ass file
+    """
+    lines = [ASS_HEADER.format(width=SHORT_WIDTH, height=SHORT_HEIGHT)]
+    words = [w for w in words if _ass_text(w.get('word', ''))]
+
+    for chunk_start in range(0, len(words), words_per_caption):
+        chunk = words[chunk_start:chunk_start + words_per_caption]
+        texts = [_ass_text(w['word']) for w in chunk]
+
+        for i, word in enumerate(chunk):
+            start = word['start']
+            # Hold each word until the next one starts (no flicker between words)
+            if i + 1 < len(chunk):
+                end = chunk[i + 1]['start']
+            elif chunk_start + words_per_caption < len(words):
+                end = words[chunk_start + words_per_caption]['start']
+            else:
+                end = word['end']
+            end = max(end, start + 0.05)
+
+            rendered = ' '.join(
+                f"{{\\c{HIGHLIGHT_COLOR}}}{text}{{\\c&H00FFFFFF&}}" if j == i else text
+                for j, text in enumerate(texts)
+            )
+            lines.append(
+                f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Caption,,0,0,0,,{rendered}\n"
+            )
+
+    output_path.write_text(''.join(lines), encoding='utf-8')
+    return output_path
+
+
+def _filter_path(path: Path) -> str:
+    """Escape a file path for use inside an ffmpeg filtergraph"""
+    return str(path).replace('\\', '/').replace(':', '\\:').replace("'", "\\'")
+
+
+def render_short_clips(
+    source_video: Path,
+    clips: List[Dict[str, Any]],
+    output_dir: Path,
+    preset: str = 'veryfast',
+    crf: int = 21
+) -> List[Dict[str, Any]]:
+    """
+    Render all clips from one ffmpeg process
+
+    Args:
+        source_video: Full rendered video (renders/rendered.mp4)
+        clips: [{"index": 1, "start": 123.4, "duration": 15.2, "words": [...]}, ...]
+            with word timings relative to the clip start
+        output_dir: Directory for short_N.mp4 / short_N.ass
+        preset: libx264 preset
+        crf: libx264 quality (lower = better)
+
+    Returns:
+        List of {index, output_file, start, duration, caption_file} dicts
+    """
+    if not clips:
+        return []
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    cmd = ['ffmpeg', '-v', 'error', '-nostdin']
+    for clip in clips:
+        cmd += ['-ss', f"{clip['start']:.3f}", '-t', f"{clip['duration']:.3f}", '-i', str(source_video)]
+
+    filters = []
+    outputs = []
+    results = []
+
+    for i, clip in enumerate(clips):
+        ass_file = build_caption_ass(clip['words'], output_dir / f"short_{clip['index']}.ass")
+        output_file = output_dir / f"short_{clip['index']}.mp4"
+
+        # Center-crop to 9:16, scale to 1080x1920, burn in captions
+        filters.append(
+            f"[{i}:v:0]crop=ih*9/16:ih,scale={SHORT_WIDTH}:{SHORT_HEIGHT},setsar=1,"
+            f"subtitles=filename='{_filter_path(ass_file)}'[v{i}]"
+        )
+        outputs += [
+            '-map', f'[v{i}]',
+            '-map', f'{i}:a:0?',
+            '-c:v', 'libx264',
+            '-preset', preset,
+            '-crf', str(crf),
+            '-r', '30',
+            '-pix_fmt', 'yuv420p',
+            '-c:a', 'aac',
+            '-b:a', '128k',
+            '-movflags', '+faststart',
+            '-y', str(output_file)
+        ]
+
+        results.append({
+            'index': clip['index'],
+            'output_file': str(output_file),
+            'caption_file': str(ass_file),
+            'start': round(clip['start'], 3),
+            'duration': round(clip['duration'], 3),
+        })
+
+    cmd += ['-filter_complex', ';'.join(filters)] + outputs
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise Exception(f"FFmpeg shorts render failed: {result.stderr}")
+
+    for entry in results:
+        entry['file_size_bytes'] = Path(entry['output_file']).stat().st_size
+
+    return results
+
+
+def load_short_clips(shorts_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Build clip specs from the props written by generate_shorts
+
+    Supports both steps/generate_shorts.py (short_N.json, words relative to the
+    highlight timestamp) and scripts/generate_shorts.py (short_N_props.json,
+    words may start before the timestamp).
+
+    Args:
+        shorts_dir: Job shorts/ directory
+
+    Returns:
+        Clip specs sorted by index, with word timings relative to the clip start
+    """
+    clips = []
+
+    for props_file in sorted(shorts_dir.glob('short_*.json')):
+        match = re.match(r'short_(\d+)(?:_props)?\.json$', props_file.name)
+        if not match:
+            continue
+
+        with open(props_file) as f:
+            props = json.load(f)
+
+        words = props.get('words', [])
+        if not words:
+            print(f"⚠️  Skipping {props_file.name}: no word timings")
+            continue
+
+        highlight = props.get('highlight', {})
+        timestamp = float(props.get('audioStartTime', highlight.get('timestamp', 0)))
+
+        # Start the clip at the first word when context words precede the timestamp
+        offset = min(0.0, float(words[0]['start']))
+        clip_words = [
+            {'word': w['word'], 'start': w['start'] - offset, 'end': w['end'] - offset}
+            for w in words
+        ]
+        duration = max(clip_words[-1]['end'], float(highlight.get('duration', 0)) - offset) + TAIL_PADDING
+
+        clips.append({
+            'index': int(match.group(1)),
+            'start': max(0.0, timestamp + offset),
+            'duration': duration,
+            'words': clip_words,
+        })
+
+    return sorted(clips, key=lambda c: c['index'])
+
+
+def render_shorts(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Render every short for a job in a single ffmpeg pass (step handler)
+
+    Args:
+        job_dir: Job directory path
+        job_data: Job data dict
+
+    Returns:
+        Result dict with rendered clip info
+    """
+    source_video = job_dir / 'renders' / 'rendered.mp4'
+    if not source_video.exists():
+        raise FileNotFoundError(f"Rendered video not found: {source_video}")
+
+    shorts_dir = job_dir / 'shorts'
+    clips = load_short_clips(shorts_dir) if shorts_dir.exists() else []
+    if not clips:
+        raise FileNotFoundError(f"No shorts props found in {shorts_dir}. Run generate_shorts first.")
+
+    total_seconds = sum(c['duration'] for c in clips)
+    print(f"🎬 Rendering {len(clips)} shorts from {source_video.name} ({total_seconds:.1f}s of clips, one pass)...")
+
+    rendered = render_short_clips(source_video, clips, shorts_dir)
+
+    for entry in rendered:
+        print(f"✓ Short {entry['index']}: {Path(entry['output_file']).name} ({entry['duration']:.1f}s)")
+
+    print(f"\n✅ Rendered {len(rendered)} shorts → {shorts_dir}")
+
+    return {
+        'total_shorts': len(rendered),
+        'total_clip_seconds': round(total_seconds, 2),
+        'output_dir': str(shorts_dir),
+        'shorts': rendered,
+        'resolution': f'{SHORT_WIDTH}x{SHORT_HEIGHT}',
+        'renderer': 'ffmpeg'
+    }
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python render_shorts.py <job_dir>")
+        sys.exit(1)
+
+    render_shorts(Path(sys.argv[1]), {})
@@ -10,6 +10,9 @@ from typing import Dict, Any
 LENS_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(LENS_DIR))
 
+from lib.gpu_lane import gpu_slot
+from lib.model_policy import transcription_plan
+from lib.priority import job_deadline, job_priority, job_ticker
 from transcribe_whisperx import transcribe_earnings_call
 
 
@@ -39,21 +42,29 @@ def transcribe_step(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
     output_dir = job_dir / "transcripts"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"🎤 Transcribing: {audio_file.name}")
+    # Model from audio, device and queue (no draft: workflows have no upgrade step)
+    plan = transcription_plan({**job_data, 'draft_transcribe': False}, audio_file)
+    print(f"🎤 Transcribing: {audio_file.name} ({plan['model']} {plan['compute_type']}: {plan['reason']})")
 
-    # Call WhisperX transcription
-    result = transcribe_earnings_call(
-        video_file=audio_file,
-        output_dir=output_dir,
-        model_size="medium",
-        language="en"
-    )
+    # Call WhisperX transcription (GPU slots are handed out by job priority)
+    with gpu_slot(job_data.get('job_id', audio_file.stem), priority=job_priority(job_data),
+                  deadline=job_deadline(job_data)):
+        result = transcribe_earnings_call(
+            video_file=audio_file,
+            output_dir=output_dir,
+            model_size=plan['model'],
+            language="en",
+            compute_type=plan['compute_type'],
+            ticker=job_ticker(job_data)
+        )
 
     # Return result for job.yaml
     return {
         'transcript_file': str(output_dir / "transcript.json"),
         'paragraphs_file': str(output_dir / "transcript.paragraphs.json"),
         'audio_file': str(audio_file),
-        'model': 'medium',
+        'model': plan['model'],
+        'compute_type': plan['compute_type'],
+        'model_reason': plan['reason'],
         'language': 'en'
     }
@@ -13,6 +13,7 @@ from datetime import datetime
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from env_loader import get_database_url
+from lib.postgres import libpq_env
 
 
 def update_database(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -147,13 +148,13 @@ SET
 
     cmd = [
         'psql',
-        database_url,
         '-c',
         full_sql
     ]
 
+    # Connection via libpq variables: keeps the password off the command line
     print(f"🔄 Executing database update...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = subprocess.run(cmd, capture_output=True, text=True, env={**os.environ, **libpq_env(database_url)})
 
     if result.returncode != 0:
         print(f"❌ Database update failed: {result.stderr}")
@@ -3,7 +3,6 @@ Upload Artifacts to R2 - Upload transcript and insights JSON to R2 storage
 """
 
 import os
-import json
 import subprocess
 from pathlib import Path
 from typing import Dict, Any
@@ -13,6 +12,8 @@ from datetime import datetime
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from env_loader import get_r2_bucket_name
+from lib.transcript_store import read_summary
+from lib.serialization import read_json, write_json, read_yaml
 
 
 def upload_artifacts_r2(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -81,10 +82,10 @@ def upload_artifacts_r2(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, An
 
             # Get file metadata
             file_size = transcript_file.stat().st_size
-            with open(transcript_file, 'r') as f:
-                transcript_data = json.load(f)
-                segment_count = len(transcript_data.get('segments', []))
-                speakers = len(set(seg.get('speaker', 'unknown') for seg in transcript_data.get('segments', [])))
+            # Counts come from the columnar sidecar (no full transcript parse)
+            summary = read_summary(transcript_file)
+            segment_count = summary['segment_count']
+            speakers = summary['speaker_count']
 
             artifacts['transcript'] = {
                 'r2_url': transcript_r2_url,
@@ -126,12 +127,11 @@ def upload_artifacts_r2(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, An
 
             # Get file metadata
             file_size = insights_file.stat().st_size
-            with open(insights_file, 'r') as f:
-                insights_data = json.load(f)
-                # Extract from nested 'insights' object if present
-                insights_obj = insights_data.get('insights', insights_data)
-                metrics_count = len(insights_obj.get('financial_metrics', []))
-                highlights_count = len(insights_obj.get('highlights', []))
+            insights_data = read_json(insights_file)
+            # Extract from nested 'insights' object if present
+            insights_obj = insights_data.get('insights', insights_data)
+            metrics_count = len(insights_obj.get('financial_metrics', []))
+            highlights_count = len(insights_obj.get('highlights', []))
 
             artifacts['insights'] = {
                 'r2_url': insights_r2_url,
@@ -153,16 +153,13 @@ def upload_artifacts_r2(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, An
     job_yaml_file = job_dir / 'job.yaml'
     if job_yaml_file.exists():
         # Convert job.yaml to job.json
-        import yaml
         job_json_file = job_dir / 'job.json'
 
         # Load YAML and save as JSON
-        with open(job_yaml_file, 'r') as f:
-            job_yaml_data = yaml.safe_load(f)
+        job_yaml_data = read_yaml(job_yaml_file)
 
         # Write to temp JSON file
-        with open(job_json_file, 'w') as f:
-            json.dump(job_yaml_data, f, indent=2)
+        write_json(job_json_file, job_yaml_data)
 
         r2_job_path = f"{r2_base_path}/job.json"
         print(f"📤 Uploading job.json to R2: {r2_job_path}")
@@ -183,10 +180,9 @@ def upload_artifacts_r2(job_dir: Path, job_data: Dict[str, Any]) -> Dict[str, An
             # Extract speakers from insights
             speakers = []
             if insights_file.exists():
-                with open(insights_file, 'r') as f:
-                    insights_data = json.load(f)
-                    insights_obj = insights_data.get('insights', insights_data)
-                    speakers = insights_obj.get('speakers', [])
+                insights_data = read_json(insights_file)
+                insights_obj = insights_data.get('insights', insights_data)
+                speakers = insights_obj.get('speakers', [])
 
             artifacts['job'] = {
                 'r2_url': job_r2_url,
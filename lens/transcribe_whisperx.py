@@ -3,17 +3,33 @@
 MarketHawk Transcription with WhisperX
 Speaker-diarized transcription for earnings calls
 
+transcribe_many() transcribes several files in one pass: one model load,
+and every file's VAD chunks packed into shared ASR batches (sized from free
+GPU memory), so short clips don't leave the GPU idle.
+
+Diarization keeps one voice embedding per speaker cluster
+(transcript.speakers.npz) for the per-company voice store
+(lib/speaker_store.py); a --ticker with known regular speakers also bounds
+the diarization speaker count.
+
 Adapted from VideotoBe's x_whisper_service.py
 """
 
 import whisperx
 import gc
+import inspect
 import os
 import torch
-import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from lib.gpu_batching import BatchSizer
+from lib.metrics import record
+from lib.speaker_store import diarization_hints, write_embeddings
+from lib.transcript_store import write_sidecar
+from lib.serialization import write_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,7 +40,9 @@ def transcribe_earnings_call(
     output_dir: Path,
     model_size: str = "medium",
     language: str = "en",
-    device: Optional[str] = None
+    device: Optional[str] = None,
+    compute_type: Optional[str] = None,
+    ticker: Optional[str] = None
 ) -> Dict:
     """
     Transcribe earnings call with speaker diarization
@@ -35,6 +53,8 @@ def transcribe_earnings_call(
         model_size: WhisperX model size (tiny, base, small, medium, large-v2)
         language: Language code (default: en)
         device: cuda or cpu (auto-detected if None)
+        compute_type: CTranslate2 compute type (default: float16 on cuda, int8 on cpu)
+        ticker: Company ticker (diarization hints from its known speakers)
 
     Returns:
         Dictionary with transcription results
@@ -46,9 +66,10 @@ def transcribe_earnings_call(
         device = "cuda" if torch.cuda.is_available() else "cpu"
 
     logger.info(f"Using device: {device}")
+    model_start = time.perf_counter()
 
     # Compute type for GPU
-    compute_type = "float16" if device == "cuda" else "int8"
+    compute_type = compute_type or ("float16" if device == "cuda" else "int8")
 
     # 1. Load WhisperX model
     logger.info(f"Loading WhisperX model: {model_size}")
@@ -60,8 +81,16 @@ def transcribe_earnings_call(
 
     # 3. Transcribe
     logger.info("Transcribing...")
-    batch_size = 16  # Reduce if low on GPU memory
-    result = model.transcribe(audio, batch_size=batch_size, language=language)
+    sizer = BatchSizer.for_model(model_size, device, compute_type)
+    while True:
+        try:
+            result = model.transcribe(audio, batch_size=sizer.size, language=language)
+            break
+        except Exception as e:
+            failed_size = sizer.size
+            if not sizer.on_error(e):
+                raise
+            logger.warning(f"GPU out of memory at batch size {failed_size}; retrying with {sizer.size}")
 
     # Clear GPU memory
     gc.collect()
@@ -70,6 +99,7 @@ def transcribe_earnings_call(
     del model
 
     # 4. Align whisper output (for supported languages)
+    speaker_embeddings = None
     language_code = result["language"]
     if language_code in {"en", "fr", "de", "es", "it"}:
         logger.info(f"Aligning transcription for language: {language_code}")
@@ -102,8 +132,7 @@ def transcribe_earnings_call(
                 use_auth_token=hf_token,
                 device=device
             )
-            diarize_segments = diarize_model(audio)
-            result = whisperx.assign_word_speakers(diarize_segments, result)
+            result, speaker_embeddings = diarize(diarize_model, audio, result, diarization_hints(ticker))
 
             # Clear GPU memory
             gc.collect()
@@ -111,28 +140,275 @@ def transcribe_earnings_call(
                 torch.cuda.empty_cache()
             del diarize_model
 
+    # GPU time for step metrics (ASR + alignment + diarization; reaches the
+    # parent step's metrics even when this runs as a subprocess)
+    if device == "cuda":
+        record(
+            gpu_seconds=time.perf_counter() - model_start,
+            gpu_peak_memory_mb=torch.cuda.max_memory_allocated() / (1024 * 1024)
+        )
+
     # 6. Save outputs
+    save_transcript(result, output_dir, speaker_embeddings)
+
+    logger.info("Transcription complete!")
+
+    return result
+
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 30
+ALIGN_LANGUAGES = {"en", "fr", "de", "es", "it"}
+
+
+def diarize(diarize_model, audio, result: Dict, hints: Optional[Dict] = None) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Diarize and assign speakers to words
+
+    Args:
+        diarize_model: whisperx.DiarizationPipeline
+        audio: Audio array
+        result: Aligned transcription
+        hints: max_speakers (lib.speaker_store.diarization_hints)
+
+    Returns:
+        (result with speakers, {label: embedding} or None if this whisperx
+        version can't return embeddings)
+    """
+    hints = hints or {}
+    if hints:
+        logger.info(f"Diarization hints from known speakers: {hints}")
+    if returns_embeddings(diarize_model):
+        diarize_segments, embeddings = diarize_model(audio, return_embeddings=True, **hints)
+    else:  # whisperx < 3.3.3
+        diarize_segments, embeddings = diarize_model(audio, **hints), None
+    return whisperx.assign_word_speakers(diarize_segments, result), embeddings
+
+
+def returns_embeddings(diarize_model) -> bool:
+    """Whether this whisperx DiarizationPipeline accepts return_embeddings (>= 3.3.3)"""
+    try:
+        return "return_embeddings" in inspect.signature(diarize_model).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _vad_chunks(model, audio) -> List[Dict]:
+    """VAD chunks (start/end seconds, up to CHUNK_SECONDS) as model.transcribe() computes them"""
+    vad_model = model.vad_model
+    if hasattr(vad_model, "preprocess_audio"):  # whisperx >= 3.3
+        waveform = vad_model.preprocess_audio(audio)
+        merge_chunks = vad_model.merge_chunks
+    else:
+        from whisperx.vad import merge_chunks
+        waveform = torch.from_numpy(audio).unsqueeze(0)
+    segments = vad_model({"waveform": waveform, "sample_rate": SAMPLE_RATE})
+    return merge_chunks(
+        segments,
+        CHUNK_SECONDS,
+        onset=model._vad_params["vad_onset"],
+        offset=model._vad_params["vad_offset"]
+    )
+
+
+def _set_language(model, language: str) -> None:
+    """Point the pipeline's tokenizer at language (model.transcribe() does this itself)"""
+    from faster_whisper.tokenizer import Tokenizer
+
+    if model.tokenizer is None or model.tokenizer.language_code != language:
+        model.tokenizer = Tokenizer(
+            model.model.hf_tokenizer,
+            model.model.model.is_multilingual,
+            task="transcribe",
+            language=language
+        )
+
+
+def packed_transcribe(model, audios: List, language: str, sizer: BatchSizer) -> List[List[Dict]]:
+    """
+    ASR over several files with their VAD chunks packed into shared batches
+
+    Chunks are padded to CHUNK_SECONDS by the feature extractor anyway, so a
+    batch costs the same whichever files its chunks come from; packing just
+    keeps batches full when files are short.
+
+    Args:
+        model: Loaded WhisperX pipeline
+        audios: Audio arrays (16 kHz mono, whisperx.load_audio)
+        language: Language code for every file
+        sizer: Batch sizer (halved on OOM, the failed batch retried)
+
+    Returns:
+        Segments ({text, start, end}) per file, in input order
+    """
+    _set_language(model, language)
+
+    chunks = [(index, chunk) for index, audio in enumerate(audios) for chunk in _vad_chunks(model, audio)]
+    segments = [[] for _ in audios]
+    logger.info(f"Packed {len(chunks)} VAD chunks from {len(audios)} file(s)")
+
+    position = 0
+    batches = 0
+    while position < len(chunks):
+        batch = chunks[position:position + sizer.size]
+        inputs = [
+            {"inputs": audios[index][int(chunk["start"] * SAMPLE_RATE):int(chunk["end"] * SAMPLE_RATE)]}
+            for index, chunk in batch
+        ]
+        try:
+            outputs = list(model(inputs, batch_size=len(batch), num_workers=0))
+        except Exception as e:
+            if not sizer.on_error(e):
+                raise
+            logger.warning(f"GPU out of memory at batch size {len(batch)}; retrying with {sizer.size}")
+            continue
+
+        for (index, chunk), output in zip(batch, outputs):
+            text = output["text"]
+            if isinstance(text, list):  # batch_size 1 returns a list
+                text = text[0]
+            segments[index].append({
+                "text": text,
+                "start": round(chunk["start"], 3),
+                "end": round(chunk["end"], 3)
+            })
+        position += len(batch)
+        batches += 1
+        sizer.on_success()
+
+    logger.info(f"ASR done in {batches} batch(es), last size {sizer.size}, {sizer.ooms} OOM back-off(s)")
+    return segments
+
+
+def transcribe_many(
+    files: List[Tuple[Path, Path]],
+    model_size: str = "medium",
+    language: Optional[str] = "en",
+    device: Optional[str] = None,
+    compute_type: Optional[str] = None,
+    tickers: Optional[List[Optional[str]]] = None
+) -> List[Dict]:
+    """
+    Transcribe several files with one model load and shared ASR batches
+
+    Same outputs per file as transcribe_earnings_call(). Alignment models
+    (one per language) and the diarization pipeline are also loaded once.
+
+    Args:
+        files: (video/audio file, output directory) pairs
+        model_size: WhisperX model size (tiny, base, small, medium, large-v2)
+        language: Language code for every file (None: detect per file)
+        device: cuda or cpu (auto-detected if None)
+        compute_type: CTranslate2 compute type (default: float16 on cuda, int8 on cpu)
+        tickers: Company ticker per file (diarization hints), if known
+
+    Returns:
+        Transcription result per file, in input order
+    """
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    compute_type = compute_type or ("float16" if device == "cuda" else "int8")
+
+    logger.info(f"Transcribing {len(files)} file(s) on {device}")
+    model_start = time.perf_counter()
+
+    logger.info(f"Loading WhisperX model: {model_size}")
+    model = whisperx.load_model(model_size, device, compute_type=compute_type)
+
+    logger.info("Loading audio...")
+    audios = [whisperx.load_audio(str(video_file)) for video_file, _ in files]
+    languages = [language or model.detect_language(audio) for audio in audios]
+
+    # Files in the same language share batches
+    results: List[Optional[Dict]] = [None] * len(files)
+    sizer = BatchSizer.for_model(model_size, device, compute_type)
+    for code in sorted(set(languages)):
+        indexes = [i for i, lang in enumerate(languages) if lang == code]
+        segments = packed_transcribe(model, [audios[i] for i in indexes], code, sizer)
+        for i, file_segments in zip(indexes, segments):
+            results[i] = {"segments": file_segments, "language": code}
+
+    gc.collect()
+    if device == "cuda":
+        torch.cuda.empty_cache()
+    del model
+
+    # Align each file (one alignment model per language)
+    for code in sorted(set(languages) & ALIGN_LANGUAGES):
+        logger.info(f"Aligning transcriptions for language: {code}")
+        model_a, metadata = whisperx.load_align_model(language_code=code, device=device)
+        for i, lang in enumerate(languages):
+            if lang == code:
+                results[i] = whisperx.align(
+                    results[i]["segments"],
+                    model_a,
+                    metadata,
+                    audios[i],
+                    device,
+                    return_char_alignments=False
+                )
+        gc.collect()
+        if device == "cuda":
+            torch.cuda.empty_cache()
+        del model_a
+
+    # Diarize aligned files
+    hf_token = os.getenv("HF_TOKEN")
+    embeddings: List[Optional[Dict]] = [None] * len(files)
+    aligned = [i for i, lang in enumerate(languages) if lang in ALIGN_LANGUAGES]
+    if aligned and not hf_token:
+        logger.warning("HF_TOKEN not found. Skipping diarization.")
+    elif aligned:
+        logger.info("Running speaker diarization...")
+        diarize_model = whisperx.DiarizationPipeline(use_auth_token=hf_token, device=device)
+        for i in aligned:
+            hints = diarization_hints(tickers[i]) if tickers else {}
+            results[i], embeddings[i] = diarize(diarize_model, audios[i], results[i], hints)
+        gc.collect()
+        if device == "cuda":
+            torch.cuda.empty_cache()
+        del diarize_model
+
+    if device == "cuda":
+        record(
+            gpu_seconds=time.perf_counter() - model_start,
+            gpu_peak_memory_mb=torch.cuda.max_memory_allocated() / (1024 * 1024)
+        )
+
+    for (_, output_dir), result, speaker_embeddings in zip(files, results, embeddings):
+        save_transcript(result, output_dir, speaker_embeddings)
+
+    logger.info(f"Transcribed {len(files)} file(s)")
+    return results
+
+
+def save_transcript(result: Dict, output_dir: Path, speaker_embeddings: Optional[Dict] = None) -> None:
+    """Write transcript.json, its columnar sidecar, speaker embeddings and transcript.paragraphs.json"""
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Save JSON (full transcript with timestamps and speakers)
     transcript_json = output_dir / "transcript.json"
-    with open(transcript_json, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json(transcript_json, result)
 
     logger.info(f"Saved JSON: {transcript_json}")
 
+    # One voice embedding per speaker for the company voice store
+    if speaker_embeddings:
+        write_embeddings(transcript_json, speaker_embeddings)
+        logger.info(f"Saved speaker embeddings: {len(speaker_embeddings)} speakers")
+
+    # Columnar sidecar (summary + mmap-able word/segment columns) so later
+    # stages don't have to re-parse the full transcript.json
+    write_sidecar(transcript_json, result)
+    logger.info(f"Saved columns: {transcript_json.with_suffix('.columns')}")
+
     # Save paragraphs.json (compact format for LLM - saves tokens)
     paragraphs = create_paragraph_format(result)
     paragraphs_json = output_dir / "transcript.paragraphs.json"
-    with open(paragraphs_json, 'w', encoding='utf-8') as f:
-        json.dump(paragraphs, f, indent=2, ensure_ascii=False)
+    write_json(paragraphs_json, paragraphs)
 
     logger.info(f"Saved paragraphs: {paragraphs_json}")
 
-    logger.info("Transcription complete!")
-
-    return result
-
 
 def create_paragraph_format(result: Dict, min_words: int = 100, max_words: int = 160) -> Dict:
     """
@@ -235,25 +511,63 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Transcribe earnings call with WhisperX")
-    parser.add_argument("video_file", help="Path to video/audio file")
-    parser.add_argument("--output-dir", default=None, help="Output directory (default: same as video)")
-    parser.add_argument("--model", default="medium", choices=["tiny", "base", "small", "medium", "large-v2"])
+    parser.add_argument("video_files", nargs="+", metavar="video_file", help="Path to video/audio file(s)")
+    parser.add_argument("--output-dir", nargs="+", default=None,
+                        help="Output directory, or one per file (default: transcripts/ next to the video; "
+                             "with several files and one directory, a subdirectory per file)")
+    parser.add_argument("--model", default="auto", choices=["auto", "tiny", "base", "small", "medium", "large-v2"],
+                        help="Model size (default: auto - picked from audio, device and queue, lib/model_policy.py)")
+    parser.add_argument("--compute-type", default=None, help="float16, int8_float16 or int8 (default: by device)")
     parser.add_argument("--language", default="en", help="Language code")
     parser.add_argument("--device", choices=["cuda", "cpu"], help="Device (auto-detected if not specified)")
+    parser.add_argument("--ticker", nargs="+",
+                        help="Company ticker, or one per file ('-' for none) (diarization hints from its known speakers)")
 
     args = parser.parse_args()
 
-    video_file = Path(args.video_file)
+    video_files = [Path(f) for f in args.video_files]
 
-    if args.output_dir:
-        output_dir = Path(args.output_dir)
+    if args.output_dir and len(args.output_dir) == len(video_files):
+        output_dirs = [Path(d) for d in args.output_dir]
+    elif args.output_dir and len(args.output_dir) == 1:
+        output_dirs = [Path(args.output_dir[0]) / f.stem for f in video_files]
+    elif args.output_dir:
+        parser.error("--output-dir takes one directory or one per file")
+    elif len(video_files) == 1:
+        output_dirs = [video_files[0].parent / "transcripts"]
     else:
-        output_dir = video_file.parent / "transcripts"
-
-    transcribe_earnings_call(
-        video_file=video_file,
-        output_dir=output_dir,
-        model_size=args.model,
-        language=args.language,
-        device=args.device
-    )
+        output_dirs = [f.parent / "transcripts" / f.stem for f in video_files]
+    if len({d.resolve() for d in output_dirs}) < len(output_dirs):
+        parser.error("several files would write to the same output directory; pass one --output-dir per file")
+
+    if args.ticker and len(args.ticker) not in (1, len(video_files)):
+        parser.error("--ticker takes one ticker or one per file")
+    tickers = [None if t == "-" else t for t in (args.ticker or [None])]
+    tickers = tickers * len(video_files) if len(tickers) == 1 else tickers
+
+    if len(video_files) == 1:
+        video_file, output_dir = video_files[0], output_dirs[0]
+        model_size, compute_type = args.model, args.compute_type
+        if model_size == "auto":
+            from lib.model_policy import transcription_plan
+
+            gpu_mb = None if args.device == "cpu" else -1.0
+            plan = transcription_plan({}, video_file, gpu_mb=gpu_mb)
+            model_size, compute_type = plan["model"], compute_type or plan["compute_type"]
+            logger.info(f"Model policy: {model_size} {plan['compute_type']} ({plan['reason']})")
+        transcribe_earnings_call(
+            video_file=video_file,
+            output_dir=output_dir,
+            model_size=model_size,
+            language=args.language,
+            device=args.device,
+            compute_type=compute_type,
+            ticker=tickers[0]
+        )
+    else:
+        # Several files: one model load, VAD chunks packed into shared batches
+        files = list(zip(video_files, output_dirs))
+        # One model for the pass; auto uses the base size (per-file policy needs one pass per size)
+        model_size = "medium" if args.model == "auto" else args.model
+        transcribe_many(files, model_size=model_size, language=args.language, device=args.device,
+                        compute_type=args.compute_type, tickers=tickers)
@@ -5,7 +5,6 @@ Replaces hardcoded pipeline logic with flexible workflow execution
 """
 
 import sys
-import yaml
 import argparse
 from pathlib import Path
 from typing import Dict, Any, Optional, List
@@ -18,6 +17,10 @@ sys.path.insert(0, str(LENS_DIR))
 sys.path.insert(0, str(LENS_DIR / "scripts"))
 
 from job import JobManager
+from lib.leases import LeaseLost, step_lease
+from lib.metrics import StepMetrics, append_metrics, format_metrics, step_summary
+from lib.serialization import read_yaml
+from lib.tracing import TRACE_FILE, configure as configure_tracing, span
 from step_registry import get_handler, list_handlers
 
 
@@ -136,6 +139,9 @@ class WorkflowOrchestrator:
         self.workflow = self._load_workflow(workflow_file)
         self.force = force
 
+        # Spans for steps, subprocesses and API calls → job_dir/trace.jsonl
+        configure_tracing(self.job_dir / TRACE_FILE, service_name='lens.workflow')
+
         # Initialize step execution context for input/output resolution
         self.context = StepContext()
         self.context.set_job_data(self.job.job)
@@ -156,8 +162,7 @@ class WorkflowOrchestrator:
         """
         if workflow_file:
             # Custom workflow file provided
-            with open(workflow_file, 'r') as f:
-                workflow = yaml.safe_load(f)
+            workflow = read_yaml(workflow_file)
             print(f"📋 Loaded custom workflow: {workflow['name']}")
             return workflow
 
@@ -176,8 +181,7 @@ class WorkflowOrchestrator:
                 f"Available workflows: {list((LENS_DIR / 'workflows').glob('*.yaml'))}"
             )
 
-        with open(workflow_path, 'r') as f:
-            workflow = yaml.safe_load(f)
+        workflow = read_yaml(workflow_path)
 
         print(f"📋 Loaded workflow: {workflow['name']} - {workflow.get('description', '')}")
         return workflow
@@ -318,7 +322,6 @@ class WorkflowOrchestrator:
         """
         step_name = step['name']
         handler_name = step['handler']
-        required = step.get('required', True)
         description = step.get('description', '')
 
         print(f"\n{'='*60}")
@@ -334,9 +337,46 @@ class WorkflowOrchestrator:
             print(f"⏭️  Skipping {step_name}: {skip_reason}")
             return True
 
+        # Lease the step so a second orchestrator waits instead of re-running it;
+        # a lease left by a crashed run expires and is reclaimed here
+        lease = step_lease(self.job_dir, step_name).acquire()
+        try:
+            return self._execute_leased_step(step, lease)
+        finally:
+            lease.release()
+
+    def _execute_leased_step(self, step: Dict[str, Any], lease) -> bool:
+        """
+        Execute a step while holding its lease (see _execute_step)
+
+        Args:
+            step: Step definition from workflow
+            lease: Acquired lib.leases.Lease for the step
+
+        Returns:
+            True if step succeeded, False if failed
+        """
+        step_name = step['name']
+        handler_name = step['handler']
+        required = step.get('required', True)
+
+        if lease.reclaimed_from:
+            print(f"♻️  Reclaimed {step_name} from expired lease held by {lease.reclaimed_from}")
+
+        # Another orchestrator may have run the step while we waited for the lease
+        self.job.reload()
+        self.context.set_job_data(self.job.job)
+        self._restore_context_from_job()
+        should_skip, skip_reason = self._should_skip_step(step)
+        if should_skip:
+            print(f"⏭️  Skipping {step_name}: {skip_reason}")
+            return True
+
         # Mark step as in progress
-        self.job.update_step(step_name, status='in_progress', started_at=datetime.now().isoformat())
+        self.job.update_step(step_name, status='in_progress', started_at=datetime.now().isoformat(),
+                             lease_owner=lease.owner)
 
+        metrics = None
         try:
             # Resolve inputs from workflow YAML (supports variable interpolation)
             resolved_inputs = self._resolve_inputs(step)
@@ -353,9 +393,16 @@ class WorkflowOrchestrator:
                 '_resolved_inputs': resolved_inputs
             }
 
-            # Execute handler
+            # Execute handler (measured: time, CPU, memory, I/O, GPU, LLM cost)
             # Handlers receive (job_dir, job_data) and return result dict
-            result = handler(self.job_dir, handler_job_data)
+            with span(f"step {step_name}", handler=handler_name), lease.heartbeat(), \
+                    StepMetrics(step_name, handler_name, job_id=self.job.job.get('job_id')) as metrics:
+                result = handler(self.job_dir, handler_job_data)
+            append_metrics(self.job_dir, metrics.result)
+
+            # Missed heartbeats: another orchestrator reclaimed the step and owns its result
+            if lease.lost:
+                raise LeaseLost(f"lease on {step_name} expired and was reclaimed; not recording result")
 
             # Register outputs to context for later steps
             self._register_outputs(step, result)
@@ -368,19 +415,28 @@ class WorkflowOrchestrator:
                 step_name,
                 status='completed',
                 completed_at=datetime.now().isoformat(),
-                **result
+                **{**result, 'metrics': step_summary(metrics.result)}
             )
 
-            print(f"✅ {step_name} completed")
+            print(f"✅ {step_name} completed ({format_metrics(metrics.result)})")
             return True
 
+        except LeaseLost as e:
+            print(f"⚠️  {e}")
+            raise
+
         except Exception as e:
             error_msg = f"Failed: {str(e)}"
+            failure = {}
+            if metrics is not None and metrics.result.get('status') == 'failed':
+                append_metrics(self.job_dir, metrics.result)
+                failure['metrics'] = step_summary(metrics.result)
             self.job.update_step(
                 step_name,
                 status='failed',
                 error=error_msg,
-                failed_at=datetime.now().isoformat()
+                failed_at=datetime.now().isoformat(),
+                **failure
             )
 
             print(f"❌ {step_name} failed: {e}")
@@ -413,6 +469,9 @@ class WorkflowOrchestrator:
                     successful_steps += 1
                 else:
                     failed_steps += 1
+            except LeaseLost:
+                print("⚠️  Another orchestrator took over this job. Stopping.")
+                return
             except Exception:
                 failed_steps += 1
                 break  # Stop on required step failure
@@ -457,7 +516,10 @@ class WorkflowOrchestrator:
         print(f"# Job: {self.job.job['job_id']}")
         print(f"{'#'*60}\n")
 
-        self._execute_step(step)
+        try:
+            self._execute_step(step)
+        except LeaseLost:
+            print("⚠️  Another orchestrator took over this job. Stopping.")
 
     def _restore_context_from_job(self):
         """
@@ -506,6 +568,9 @@ class WorkflowOrchestrator:
         for step in self.workflow['steps'][start_index:]:
             try:
                 self._execute_step(step)
+            except LeaseLost:
+                print("⚠️  Another orchestrator took over this job. Stopping.")
+                return
             except Exception:
                 print(f"\n⚠️  Stopping workflow at {step['name']}")
                 break
@@ -514,7 +579,7 @@ class WorkflowOrchestrator:
 def main():
     """CLI entry point"""
     parser = argparse.ArgumentParser(description="Execute MarketHawk workflows")
-    parser.add_argument("job_file", type=Path, help="Path to job.yaml")
+    parser.add_argument("job_file", type=Path, nargs="?", help="Path to job.yaml")
     parser.add_argument(
         "--workflow-file",
         type=Path,
@@ -538,6 +603,8 @@ def main():
         return
 
     # Validate job file
+    if args.job_file is None:
+        parser.error("job_file is required")
     if not args.job_file.exists():
         print(f"❌ Job file not found: {args.job_file}")
         sys.exit(1)
@@ -545,13 +612,15 @@ def main():
     # Create orchestrator
     orchestrator = WorkflowOrchestrator(args.job_file, args.workflow_file, force=args.force)
 
-    # Execute workflow
-    if args.step:
-        orchestrator.run_step(args.step)
-    elif args.from_step:
-        orchestrator.run_from_step(args.from_step)
-    else:
-        orchestrator.run_all()
+    # Execute workflow (one trace per run)
+    job_id = orchestrator.job.job.get('job_id')
+    with span(f"job {job_id}", job_id=job_id, workflow=orchestrator.workflow.get('name')):
+        if args.step:
+            orchestrator.run_step(args.step)
+        elif args.from_step:
+            orchestrator.run_from_step(args.from_step)
+        else:
+            orchestrator.run_all()
 
 
 if __name__ == "__main__":